@@ -0,0 +1,178 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import math
+import sys
+
+# gi is only imported by BatchController, so the sizing helpers can be used
+# (and tested) without GStreamer.
+
+
+def tiler_layout(num_sources):
+    """ Rows and columns of the tiler grid for num_sources tiles """
+    num_sources = max(1, num_sources)
+    rows = int(math.sqrt(num_sources))
+    columns = int(math.ceil((1.0 * num_sources) / rows))
+    return rows, columns
+
+
+def slot_span(source_ids):
+    """ Number of streammux sink pads spanned by source_ids, i.e. the highest
+    pad index plus one. SourceManager hands out sparse ids once sources have
+    been removed, and nvmultistreamtiler places each tile by its pad index, so
+    the grid and the batch must cover the highest id, not just the count. """
+    return max(source_ids) + 1 if source_ids else 0
+
+
+def engine_batch_size(num_sources, engine_batch_sizes):
+    """ Smallest prebuilt engine batch size that fits num_sources frames, or
+    the largest one if none does """
+    sizes = sorted(engine_batch_sizes)
+    for size in sizes:
+        if size >= num_sources:
+            return size
+    return sizes[-1]
+
+
+def push_timeout_usec(source_fps, margin=1.0):
+    """ batched-push-timeout covering one frame interval of the sources """
+    return int(margin * 1000000 / max(source_fps, 1))
+
+
+class BatchConfig:
+    """ Batching parameters derived from the active sources. num_slots is the
+    slot_span() of their ids and defaults to num_sources (dense ids). """
+
+    __slots__ = ("num_sources", "num_slots", "mux_batch_size", "push_timeout",
+                 "pgie_batch_size", "tiler_rows", "tiler_columns")
+
+    def __init__(self, num_sources, engine_batch_sizes, source_fps=30,
+                 max_batch_size=None, num_slots=None):
+        self.num_sources = num_sources
+        self.num_slots = max(num_sources, num_slots or 0)
+        limit = max_batch_size or max(engine_batch_sizes)
+        # Full batches are pushed immediately, so a batch-size matching the
+        # active sources avoids waiting for frames that will never arrive.
+        # It must still cover the highest linked sink pad index.
+        self.mux_batch_size = min(max(1, self.num_slots), limit)
+        self.push_timeout = push_timeout_usec(source_fps)
+        self.pgie_batch_size = engine_batch_size(self.mux_batch_size,
+                                                 engine_batch_sizes)
+        self.tiler_rows, self.tiler_columns = tiler_layout(self.num_slots)
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+class BatchController:
+    """ Re-applies streammux, pgie and tiler batching properties when the
+    number of active sources changes.
+
+    Register on_sources_changed as a SourceManager listener, or call
+    set_num_sources directly with the new count and slot span. Changes are debounced by settle_ms so a
+    burst of add/remove requests results in a single reconfiguration, and
+    are applied from the GLib main loop. A property is only set when its
+    param spec allows changes in the element's current state (e.g. nvinfer
+    batch-size is only mutable up to READY, so at runtime the pgie keeps
+    the batch size of its prebuilt engine); otherwise it is reported in
+    pending and applied on the next reconfiguration in a state that
+    allows it.
+    """
+
+    def __init__(self, streammux, pgie=None, tiler=None,
+                 engine_batch_sizes=(1, 2, 4, 8, 16, 32), source_fps=30,
+                 max_batch_size=None, settle_ms=500):
+        self._streammux = streammux
+        self._pgie = pgie
+        self._tiler = tiler
+        self._engine_batch_sizes = tuple(engine_batch_sizes)
+        self._source_fps = source_fps
+        self._max_batch_size = max_batch_size
+        self._settle_ms = settle_ms
+        self._num_sources = 0
+        self._num_slots = None
+        self._timer = None
+        self.config = None
+        self.pending = {}
+
+    def compute(self, num_sources, num_slots=None):
+        return BatchConfig(num_sources, self._engine_batch_sizes,
+                           self._source_fps, self._max_batch_size, num_slots)
+
+    def on_sources_changed(self, source_manager):
+        source_ids = source_manager.source_ids()
+        self.set_num_sources(len(source_ids), slot_span(source_ids))
+
+    def set_num_sources(self, num_sources, num_slots=None):
+        from gi.repository import GLib
+
+        self._num_sources = num_sources
+        self._num_slots = num_slots
+        if self._timer is None:
+            self._timer = GLib.timeout_add(self._settle_ms, self._reconfigure)
+
+    def apply_now(self, num_sources, num_slots=None):
+        """ Compute and apply immediately, e.g. at startup before PLAYING """
+        self._num_sources = num_sources
+        self._num_slots = num_slots
+        self._reconfigure()
+
+    def _reconfigure(self):
+        from gi.repository import GLib
+
+        self._timer = None
+        config = self.compute(self._num_sources, self._num_slots)
+        wanted = [
+            (self._streammux, "batch-size", config.mux_batch_size),
+            (self._streammux, "batched-push-timeout", config.push_timeout),
+            (self._pgie, "batch-size", config.pgie_batch_size),
+            (self._tiler, "rows", config.tiler_rows),
+            (self._tiler, "columns", config.tiler_columns),
+        ]
+        pending = {}
+        for element, name, value in wanted:
+            if element is None:
+                continue
+            if element.get_property(name) == value:
+                continue
+            if self._is_mutable(element, name):
+                element.set_property(name, value)
+            else:
+                pending[f"{element.get_name()}.{name}"] = value
+        if pending:
+            print("BatchController: deferred until the element state allows it:",
+                  pending)
+        self.pending = pending
+        self.config = config
+        return GLib.SOURCE_REMOVE
+
+    @staticmethod
+    def _is_mutable(element, name):
+        from gi.repository import Gst
+
+        pspec = element.find_property(name)
+        if pspec is None:
+            sys.stderr.write(f"{element.get_name()} has no property {name}\n")
+            return False
+        _, state, _ = element.get_state(0)
+        # Same rules gst-inspect prints: flagged properties are restricted to
+        # the given states, unflagged ones can be changed in any state
+        if pspec.flags & Gst.PARAM_MUTABLE_READY:
+            return state <= Gst.State.READY
+        if pspec.flags & Gst.PARAM_MUTABLE_PAUSED:
+            return state <= Gst.State.PAUSED
+        return True
@@ -0,0 +1,103 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import sys
+import time
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import GLib, Gst
+import pyds
+
+
+class BatchOccupancyMonitor:
+    """ Streammux src pad probe feeding a PushTimeoutTuner.
+
+    For every batch it reads num_frames_in_batch/max_frames_in_batch and the
+    source_id and ntp_timestamp (streammux arrival time, with the default
+    attach-sys-ts=1) of each frame. New timeouts decided by the tuner are
+    applied to the streammux from the GLib main loop. With apply=False the
+    tuner only reports its decisions. trace_path, if set, records the frame
+    arrivals as a CSV trace that batch_tuner.py --trace can replay offline.
+    """
+
+    def __init__(self, streammux, tuner, apply=True, trace_path=None,
+                 verbose=True):
+        self._streammux = streammux
+        self._tuner = tuner
+        self._apply = apply
+        self._verbose = verbose
+        self._trace_file = None
+        if trace_path:
+            self._trace_file = open(trace_path, "w")
+            self._trace_file.write("arrival_us,source_id\n")
+        streammux.set_property("batched-push-timeout", tuner.timeout_us)
+
+    def attach(self):
+        srcpad = self._streammux.get_static_pad("src")
+        if not srcpad:
+            sys.stderr.write(" Unable to get src pad of streammux \n")
+            return False
+        srcpad.add_probe(Gst.PadProbeType.BUFFER, self._probe, 0)
+        return True
+
+    def close(self):
+        if self._trace_file:
+            self._trace_file.close()
+            self._trace_file = None
+
+    def _probe(self, pad, info, u_data):
+        gst_buffer = info.get_buffer()
+        if not gst_buffer:
+            return Gst.PadProbeReturn.OK
+        batch_meta = pyds.gst_buffer_get_nvds_batch_meta(hash(gst_buffer))
+        if not batch_meta:
+            return Gst.PadProbeReturn.OK
+
+        now_us = int(time.time() * 1000000)
+        arrivals = []
+        l_frame = batch_meta.frame_meta_list
+        while l_frame is not None:
+            try:
+                frame_meta = pyds.NvDsFrameMeta.cast(l_frame.data)
+            except StopIteration:
+                break
+            ntp_us = frame_meta.ntp_timestamp // 1000
+            arrivals.append((frame_meta.source_id, ntp_us or now_us))
+            try:
+                l_frame = l_frame.next
+            except StopIteration:
+                break
+
+        if self._trace_file:
+            for source_id, arrival_us in arrivals:
+                self._trace_file.write(f"{arrival_us},{source_id}\n")
+
+        old_timeout = self._tuner.timeout_us
+        decision = self._tuner.observe_batch(batch_meta.num_frames_in_batch,
+                                             batch_meta.max_frames_in_batch,
+                                             arrivals)
+        if decision is not None:
+            if self._verbose:
+                print("BatchOccupancyMonitor:", decision)
+            if self._apply and decision.new_timeout_us != old_timeout:
+                GLib.idle_add(self._set_timeout, decision.new_timeout_us)
+        return Gst.PadProbeReturn.OK
+
+    def _set_timeout(self, timeout_us):
+        self._streammux.set_property("batched-push-timeout", timeout_us)
+        return GLib.SOURCE_REMOVE
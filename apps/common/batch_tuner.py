@@ -0,0 +1,331 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+""" batched-push-timeout auto-tuning.
+
+PushTimeoutTuner consumes per batch occupancy (num_frames_in_batch vs
+max_frames_in_batch) and per source arrival times, and adjusts the streammux
+batched-push-timeout to fill batches without exceeding a batching latency SLO.
+It has no GStreamer dependency: batch_monitor.py feeds it from a streammux src
+pad probe, and simulate() replays a recorded arrival trace through a model of
+the streammux batching so decisions can be validated without GPUs:
+
+    $ python3 common/batch_tuner.py --trace arrivals.csv --batch-size 8 \\
+        --slo-us 40000
+"""
+
+import argparse
+import csv
+import json
+import math
+import random
+import sys
+from collections import deque
+
+
+class ArrivalJitter:
+    """ Running mean/variance (Welford) of a source's frame inter-arrival
+    time, in microseconds """
+
+    __slots__ = ("last", "count", "mean", "m2")
+
+    def __init__(self):
+        self.last = None
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, arrival_us):
+        if self.last is not None:
+            delta = arrival_us - self.last
+            self.count += 1
+            diff = delta - self.mean
+            self.mean += diff / self.count
+            self.m2 += diff * (delta - self.mean)
+        self.last = arrival_us
+
+    def std(self):
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+class TuningDecision:
+    """ One window evaluation of the tuner """
+
+    __slots__ = ("batch_index", "fill", "jitter_us", "old_timeout_us",
+                 "new_timeout_us", "reason")
+
+    def __init__(self, batch_index, fill, jitter_us, old_timeout_us,
+                 new_timeout_us, reason):
+        self.batch_index = batch_index
+        self.fill = fill
+        self.jitter_us = jitter_us
+        self.old_timeout_us = old_timeout_us
+        self.new_timeout_us = new_timeout_us
+        self.reason = reason
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __repr__(self):
+        return (f"TuningDecision(batch={self.batch_index}, fill={self.fill:.3f}, "
+                f"jitter_us={self.jitter_us:.0f}, {self.old_timeout_us}"
+                f"->{self.new_timeout_us}, {self.reason})")
+
+
+class PushTimeoutTuner:
+    """ Adjusts batched-push-timeout from observed batch occupancy.
+
+    Every `window` batches the tuner compares the mean batch fill against
+    target_fill. Fill is measured against the number of sources that were
+    active in the window (capped by max_frames_in_batch), so a batch-size
+    larger than the source count does not read as permanently under-filled.
+
+    * fill below target: the timeout grows (multiplicatively, and by at least
+      twice the worst source arrival jitter) up to latency_slo_us.
+    * fill at target for stable_windows windows in a row: the timeout shrinks
+      towards min_timeout_us, but not below twice the arrival jitter, to
+      give latency back.
+
+    Every evaluation is recorded in decisions (bounded) and passed to
+    on_decision(decision) if set; timeout_us always holds the current value.
+    """
+
+    def __init__(self, initial_timeout_us, latency_slo_us, target_fill=0.95,
+                 window=30, min_timeout_us=1000, increase=1.25, decrease=0.9,
+                 stable_windows=3, history=256, on_decision=None):
+        self.timeout_us = int(min(initial_timeout_us, latency_slo_us))
+        self.latency_slo_us = latency_slo_us
+        self.target_fill = target_fill
+        self.window = window
+        self.min_timeout_us = min_timeout_us
+        self.increase = increase
+        self.decrease = decrease
+        self.stable_windows = stable_windows
+        self.on_decision = on_decision
+        self.decisions = deque(maxlen=history)
+        self._jitter = {}
+        self._batches = 0
+        self._window_frames = 0
+        self._window_max_frames = 0
+        self._window_batches = 0
+        self._window_sources = set()
+        self._stable = 0
+        self.total_frames = 0
+        self.total_batches = 0
+
+    def observe_batch(self, num_frames, max_frames, arrivals=()):
+        """ Record one pushed batch. arrivals is an iterable of
+        (source_id, arrival_us) for the frames in the batch. Returns the
+        TuningDecision when a window was evaluated, else None. """
+        for source_id, arrival_us in arrivals:
+            jitter = self._jitter.get(source_id)
+            if jitter is None:
+                jitter = self._jitter[source_id] = ArrivalJitter()
+            jitter.update(arrival_us)
+            self._window_sources.add(source_id)
+        self._batches += 1
+        self.total_batches += 1
+        self.total_frames += num_frames
+        self._window_batches += 1
+        self._window_frames += num_frames
+        self._window_max_frames = max(self._window_max_frames, max_frames)
+        if self._window_batches < self.window:
+            return None
+        return self._evaluate()
+
+    def _evaluate(self):
+        active = len(self._window_sources) or self._window_max_frames
+        expected = max(1, min(self._window_max_frames, active))
+        fill = self._window_frames / (expected * self._window_batches)
+        jitter = max((j.std() for j in self._jitter.values()), default=0.0)
+        old = self.timeout_us
+
+        if fill < self.target_fill:
+            self._stable = 0
+            if old >= self.latency_slo_us:
+                new, reason = old, "underfilled, at latency SLO"
+            else:
+                grown = max(old * self.increase, old + 2 * jitter)
+                new = int(min(self.latency_slo_us, grown))
+                reason = "underfilled, increase"
+        else:
+            self._stable += 1
+            floor = max(self.min_timeout_us, int(2 * jitter))
+            if self._stable >= self.stable_windows and old > floor:
+                new = int(max(floor, old * self.decrease))
+                reason = "filled, decrease"
+                self._stable = 0
+            else:
+                new, reason = old, "filled, hold"
+
+        self.timeout_us = new
+        decision = TuningDecision(self._batches, fill, jitter, old, new, reason)
+        self.decisions.append(decision)
+        self._window_batches = 0
+        self._window_frames = 0
+        self._window_max_frames = 0
+        self._window_sources = set()
+        if self.on_decision:
+            self.on_decision(decision)
+        return decision
+
+    def stats(self):
+        return {
+            "timeout_us": self.timeout_us,
+            "batches": self.total_batches,
+            "frames": self.total_frames,
+            "jitter_us": {source_id: round(j.std(), 1)
+                          for source_id, j in self._jitter.items()},
+        }
+
+
+def simulate(arrivals, batch_size, tuner):
+    """ Replay (arrival_us, source_id) tuples, sorted by time, through a
+    model of nvstreammux batching: a batch takes at most one frame per
+    source and is pushed when batch_size frames are collected or when the
+    timeout expires after its first frame. The timeout comes from the tuner
+    when a batch opens. Returns a summary dict. """
+    batch = []
+    sources_in_batch = set()
+    deferred = deque()
+    deadline = None
+    latencies = []
+    fills = []
+    num_sources = len({source_id for _, source_id in arrivals}) or 1
+
+    def push(push_us):
+        nonlocal deadline
+        for arrival_us, _ in batch:
+            latencies.append(push_us - arrival_us)
+        fills.append(len(batch) / min(batch_size, num_sources))
+        tuner.observe_batch(len(batch), batch_size,
+                            [(source_id, arrival_us)
+                             for arrival_us, source_id in batch])
+        batch.clear()
+        sources_in_batch.clear()
+        deadline = None
+        # Frames held back because their source was already in the batch
+        # are available from the push time on
+        held = list(deferred)
+        deferred.clear()
+        for frame in held:
+            add(frame, push_us)
+
+    def add(frame, now_us):
+        nonlocal deadline
+        arrival_us, source_id = frame
+        if source_id in sources_in_batch:
+            deferred.append(frame)
+            return
+        if not batch:
+            deadline = now_us + tuner.timeout_us
+        batch.append(frame)
+        sources_in_batch.add(source_id)
+        if len(batch) == batch_size:
+            push(now_us)
+
+    for frame in arrivals:
+        arrival_us = frame[0]
+        while batch and deadline <= arrival_us:
+            push(deadline)
+        add(frame, arrival_us)
+    while batch:
+        push(deadline)
+
+    latencies.sort()
+    summary = {
+        "batches": len(fills),
+        "frames": len(latencies),
+        "mean_fill": round(sum(fills) / len(fills), 4) if fills else 0.0,
+        "final_timeout_us": tuner.timeout_us,
+        "decisions": [d.as_dict() for d in tuner.decisions],
+    }
+    if latencies:
+        summary["mean_latency_us"] = round(sum(latencies) / len(latencies), 1)
+        summary["p95_latency_us"] = latencies[int(0.95 * (len(latencies) - 1))]
+        summary["max_latency_us"] = latencies[-1]
+    return summary
+
+
+def synthetic_trace(num_sources, fps, duration_s, jitter_us=0, seed=0):
+    """ Arrival trace of num_sources cameras at fps with random phase and
+    gaussian jitter, as sorted (arrival_us, source_id) tuples """
+    rng = random.Random(seed)
+    interval = 1000000 / fps
+    arrivals = []
+    for source_id in range(num_sources):
+        phase = rng.uniform(0, interval)
+        for n in range(int(duration_s * fps)):
+            t = phase + n * interval + rng.gauss(0, jitter_us)
+            arrivals.append((max(0, int(t)), source_id))
+    arrivals.sort()
+    return arrivals
+
+
+def load_trace(path):
+    """ Load a recorded trace: CSV rows of arrival_us,source_id (a header
+    row is skipped), or JSON lines with "arrival_us" and "source_id" """
+    arrivals = []
+    with open(path, "r") as trace_file:
+        if path.endswith(".jsonl") or path.endswith(".json"):
+            for line in trace_file:
+                if line.strip():
+                    rec = json.loads(line)
+                    arrivals.append((int(rec["arrival_us"]), int(rec["source_id"])))
+        else:
+            for row in csv.reader(trace_file):
+                if not row or not row[0].strip().lstrip("-").isdigit():
+                    continue
+                arrivals.append((int(row[0]), int(row[1])))
+    arrivals.sort()
+    return arrivals
+
+
+def main(args):
+    parser = argparse.ArgumentParser(
+        description="Simulate batched-push-timeout auto-tuning on an arrival trace")
+    parser.add_argument("--trace", help="Recorded arrival trace (csv or jsonl)")
+    parser.add_argument("--sources", type=int, default=8,
+                        help="Synthetic trace: number of sources")
+    parser.add_argument("--fps", type=float, default=30,
+                        help="Synthetic trace: frame rate per source")
+    parser.add_argument("--duration", type=float, default=60,
+                        help="Synthetic trace: duration in seconds")
+    parser.add_argument("--jitter-us", type=float, default=2000,
+                        help="Synthetic trace: arrival jitter std-dev")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--initial-timeout-us", type=int, default=33000)
+    parser.add_argument("--slo-us", type=int, default=40000,
+                        help="Maximum batched-push-timeout")
+    parser.add_argument("--target-fill", type=float, default=0.95)
+    args = parser.parse_args(args)
+
+    if args.trace:
+        arrivals = load_trace(args.trace)
+    else:
+        arrivals = synthetic_trace(args.sources, args.fps, args.duration,
+                                   args.jitter_us)
+    tuner = PushTimeoutTuner(args.initial_timeout_us, args.slo_us,
+                             target_fill=args.target_fill)
+    print(json.dumps(simulate(arrivals, args.batch_size, tuner), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,328 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# gi is only imported by attach(), so the recorded data can be turned into a
+# waterfall (and tested) without GStreamer.
+
+APP_TRACK = "app"
+
+
+class BringupProfiler:
+    """ Where the startup time of a pipeline goes.
+
+    Records, relative to one origin:
+      - app phases, timed with phase() or taken from a StartupTimer (import,
+        Gst.init i.e. the plugin registry load, element creation),
+      - every state transition of every element (NULL->READY, READY->PAUSED,
+        PAUSED->PLAYING), from the STATE_CHANGED messages, timestamped in the
+        posting thread by a sync bus handler,
+      - the first buffer seen on every pad.
+
+    Bins change the state of their children one after the other, so a
+    transition is taken to start when the previous sibling finished the
+    same transition (or the parent started it). Long NULL->READY spans are
+    typically engine deserialization (nvinfer) or decoder creation, long
+    READY->PAUSED spans of sinks are the preroll.
+
+    Call attach(pipeline) just before pipeline.set_state(). Bring-up is
+    complete when the pipeline is PLAYING and every sink received a buffer;
+    on_complete(profiler) is then called once, from a streaming thread.
+    """
+
+    def __init__(self, origin=None, clock=time.perf_counter, on_complete=None):
+        self._clock = clock
+        self.origin = clock() if origin is None else origin
+        self.on_complete = on_complete
+        self._lock = threading.Lock()
+        self._phases = []
+        self._transitions = []
+        self._first_buffers = {}
+        self._parents = {}
+        self._factories = {}
+        self._sinks = set()
+        self._attach_time = None
+        self._playing = False
+        self._complete = False
+        self._probed_pads = set()
+        self.registry_info = {}
+
+    # ---- recording, GStreamer independent ----
+
+    @contextmanager
+    def phase(self, name, **args):
+        """ Times the body of the with block as an app phase """
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.add_phase(name, start, self._clock(), **args)
+
+    def add_phase(self, name, start, end, **args):
+        with self._lock:
+            self._phases.append((name, start, end, args))
+
+    def add_timer_phases(self, startup_timer):
+        """ Adds the phases marked on a common.startup_timer.StartupTimer """
+        for name, duration, elapsed in startup_timer.phases:
+            end = startup_timer.start + elapsed
+            self.add_phase(name, end - duration, end)
+
+    def record_element(self, name, parent=None, factory=None, is_sink=False):
+        with self._lock:
+            self._parents[name] = parent
+            self._factories[name] = factory
+            if is_sink:
+                self._sinks.add(name)
+
+    def record_transition(self, element, old, new, ts=None):
+        """ element finished the state change old -> new (state names) """
+        ts = self._clock() if ts is None else ts
+        with self._lock:
+            self._transitions.append((element, old, new, ts))
+
+    def record_first_buffer(self, element, pad, ts=None):
+        """ Returns True if this is the first buffer of the pad """
+        ts = self._clock() if ts is None else ts
+        with self._lock:
+            key = (element, pad)
+            if key in self._first_buffers:
+                return False
+            self._first_buffers[key] = ts
+        self._check_complete()
+        return True
+
+    def set_playing(self):
+        with self._lock:
+            self._playing = True
+        self._check_complete()
+
+    def is_complete(self):
+        with self._lock:
+            return self._complete_locked()
+
+    def _complete_locked(self):
+        if not self._playing:
+            return False
+        fed = set(element for element, _ in self._first_buffers)
+        return all(sink in fed for sink in self._sinks)
+
+    def _check_complete(self):
+        with self._lock:
+            if self._complete or not self._complete_locked():
+                return
+            self._complete = True
+        if self.on_complete:
+            self.on_complete(self)
+
+    # ---- output ----
+
+    def _ms(self, ts):
+        return round((ts - self.origin) * 1000.0, 3)
+
+    def spans(self):
+        """ Returns the state transitions as (element, old, new, start, end) """
+        with self._lock:
+            transitions = list(self._transitions)
+            parents = dict(self._parents)
+        default_start = self.origin if self._attach_time is None else self._attach_time
+        starts = {}
+
+        def start_of(index):
+            if index in starts:
+                return starts[index]
+            element, old, new, ts = transitions[index]
+            start = default_start
+            parent = parents.get(element)
+            for i in range(index - 1, -1, -1):
+                other, o_old, o_new, o_ts = transitions[i]
+                if other == element:
+                    start = max(start, o_ts)
+                    break
+            for i in range(index - 1, -1, -1):
+                other, o_old, o_new, o_ts = transitions[i]
+                if (o_old, o_new) == (old, new) and other != element \
+                        and parents.get(other) == parent:
+                    start = max(start, o_ts)
+                    break
+            if parent is not None:
+                for i in range(index + 1, len(transitions)):
+                    if transitions[i][0] == parent and transitions[i][1:3] == (old, new):
+                        start = max(start, start_of(i))
+                        break
+            starts[index] = min(start, ts)
+            return starts[index]
+
+        return [(element, old, new, start_of(i), ts)
+                for i, (element, old, new, ts) in enumerate(transitions)]
+
+    def waterfall(self):
+        """ Returns the bring-up as a JSON serializable dict, times in ms """
+        elements = {}
+        for element, old, new, start, end in self.spans():
+            entry = elements.setdefault(element, {"transitions": [], "first_buffers": {}})
+            entry["transitions"].append({"from": old, "to": new, "start_ms": self._ms(start),
+                                         "end_ms": self._ms(end)})
+        with self._lock:
+            for (element, pad), ts in sorted(self._first_buffers.items(), key=lambda kv: kv[1]):
+                entry = elements.setdefault(element, {"transitions": [], "first_buffers": {}})
+                entry["first_buffers"][pad] = self._ms(ts)
+            phases = [{"name": name, "start_ms": self._ms(start), "end_ms": self._ms(end),
+                       "args": args} for name, start, end, args in self._phases]
+            parents = dict(self._parents)
+            factories = dict(self._factories)
+        for name, entry in elements.items():
+            entry["parent"] = parents.get(name)
+            entry["factory"] = factories.get(name)
+        registry = [p for p in phases if p["name"] == "Gst.init"]
+        return {
+            "phases": phases,
+            "registry_load_ms": (registry[0]["end_ms"] - registry[0]["start_ms"]
+                                 if registry else None),
+            "registry": dict(self.registry_info),
+            "elements": elements,
+        }
+
+    def chrome_trace(self):
+        """ Returns the bring-up in the Chrome trace event format, for
+        chrome://tracing or ui.perfetto.dev. One track per element. """
+        tids = {APP_TRACK: 1}
+        events = []
+
+        def tid(track):
+            if track not in tids:
+                tids[track] = len(tids) + 1
+            return tids[track]
+
+        def us(ts):
+            return round((ts - self.origin) * 1000000.0, 1)
+
+        with self._lock:
+            phases = list(self._phases)
+            first_buffers = sorted(self._first_buffers.items(), key=lambda kv: kv[1])
+        for name, start, end, args in phases:
+            events.append({"name": name, "cat": "app", "ph": "X", "pid": 1,
+                           "tid": tid(APP_TRACK), "ts": us(start),
+                           "dur": round((end - start) * 1000000.0, 1), "args": args})
+        for element, old, new, start, end in self.spans():
+            events.append({"name": "%s->%s" % (old, new), "cat": "state", "ph": "X", "pid": 1,
+                           "tid": tid(element), "ts": us(start),
+                           "dur": round((end - start) * 1000000.0, 1)})
+        for (element, pad), ts in first_buffers:
+            events.append({"name": "first buffer " + pad, "cat": "buffer", "ph": "i",
+                           "s": "t", "pid": 1, "tid": tid(element), "ts": us(ts)})
+        for track, track_id in tids.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": track_id,
+                           "args": {"name": track}})
+            events.append({"name": "thread_sort_index", "ph": "M", "pid": 1, "tid": track_id,
+                           "args": {"sort_index": track_id}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, prefix):
+        """ Writes <prefix>.waterfall.json and <prefix>.trace.json """
+        with open(prefix + ".waterfall.json", "w") as f:
+            json.dump(self.waterfall(), f, indent=1)
+        with open(prefix + ".trace.json", "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def report(self, file=None):
+        """ Prints the slowest state transitions and the first buffers """
+        file = file or sys.stdout
+        spans = sorted(self.spans(), key=lambda s: s[4] - s[3], reverse=True)
+        print("Bring-up, slowest state transitions:", file=file)
+        for element, old, new, start, end in spans[:10]:
+            print("  %-32s %-16s %9.1f ms" % (element, old + "->" + new, (end - start) * 1000.0),
+                  file=file)
+        with self._lock:
+            sink_buffers = [ts for (element, _), ts in self._first_buffers.items()
+                            if element in self._sinks]
+        if sink_buffers:
+            print("  first buffer at the sinks after %.1f ms" % self._ms(max(sink_buffers)),
+                  file=file)
+
+    # ---- GStreamer ----
+
+    def attach(self, pipeline):
+        """ Starts profiling pipeline; elements added later (e.g. inside
+        uridecodebin) are followed through deep-element-added. """
+        import gi
+        gi.require_version("Gst", "1.0")
+        gi.require_version("GstBase", "1.0")
+        from gi.repository import Gst
+
+        self._attach_time = self._clock()
+        self._pipeline_name = pipeline.get_name()
+        registry = Gst.Registry.get()
+        self.registry_info = {"plugins": len(registry.get_plugin_list()),
+                              "features": len(registry.get_feature_list(Gst.ElementFactory))}
+
+        bus = pipeline.get_bus()
+        bus.enable_sync_message_emission()
+        bus.connect("sync-message::state-changed", self._on_state_changed, pipeline)
+        pipeline.connect("deep-element-added", lambda bin, sub_bin, element:
+                         self._follow_element(element))
+        self.record_element(pipeline.get_name())
+        iterator = pipeline.iterate_recurse()
+        while True:
+            result, element = iterator.next()
+            if result == Gst.IteratorResult.RESYNC:
+                iterator.resync()
+                continue
+            if result != Gst.IteratorResult.OK:
+                break
+            self._follow_element(element)
+
+    def _follow_element(self, element):
+        from gi.repository import GstBase
+
+        parent = element.get_parent()
+        factory = element.get_factory()
+        self.record_element(element.get_name(), parent.get_name() if parent else None,
+                            factory.get_name() if factory else None,
+                            isinstance(element, GstBase.BaseSink))
+        for pad in element.iterate_pads():
+            self._probe_pad(element, pad)
+        element.connect("pad-added", lambda element, pad: self._probe_pad(element, pad))
+
+    def _probe_pad(self, element, pad):
+        from gi.repository import Gst
+
+        key = (element.get_name(), pad.get_name())
+        if key in self._probed_pads:
+            return
+        self._probed_pads.add(key)
+
+        def probe(pad, info, _):
+            self.record_first_buffer(key[0], key[1])
+            return Gst.PadProbeReturn.REMOVE
+
+        pad.add_probe(Gst.PadProbeType.BUFFER | Gst.PadProbeType.BUFFER_LIST, probe, None)
+
+    def _on_state_changed(self, bus, message, pipeline):
+        from gi.repository import Gst
+
+        ts = self._clock()
+        old, new, _ = message.parse_state_changed()
+        self.record_transition(message.src.get_name(), old.value_nick.upper(),
+                               new.value_nick.upper(), ts)
+        if message.src == pipeline and new == Gst.State.PLAYING:
+            self.set_playing()
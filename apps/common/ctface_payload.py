@@ -0,0 +1,105 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+""" Encoder/decoder for CTFace payloads produced by libnvds_msg2p_ctface.
+
+The library emits either a JSON array of face objects or, with the binary
+encoding selected, a compact little-endian "CTFB" payload (layout documented
+in bindings/custom_msg2p_ctface_bind/src/binary_writer.hpp). decode() accepts
+both, so consumers do not need to know which mode the pipeline runs in.
+Faces are dicts shaped like the JSON objects:
+
+    {"id", "name", "confidence", "frameId", "sensorid",
+     "bbox": {"left", "top", "width", "height"}, "ts", "objectId", "sensorStr"}
+"""
+
+import json
+import struct
+
+MAGIC = b"CTFB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+RECORD = struct.Struct("<fiiffff")
+STRING_LEN = struct.Struct("<H")
+STRING_FIELDS = ("id", "name", "ts", "objectId", "sensorStr")
+MAX_STRING = 0xFFFF
+
+
+def is_binary(payload):
+    return bytes(payload[:4]) == MAGIC
+
+
+def encode(faces):
+    """ Encodes a list of face dicts as a CTFB payload. Missing strings are
+    encoded as empty strings, like NULL pointers in the C++ encoder. """
+    parts = [HEADER.pack(MAGIC, VERSION, 0, len(faces), 0)]
+    for face in faces:
+        bbox = face.get("bbox", {})
+        parts.append(RECORD.pack(face.get("confidence", 0.0),
+                                 face.get("frameId", 0),
+                                 face.get("sensorid", 0),
+                                 bbox.get("left", 0.0), bbox.get("top", 0.0),
+                                 bbox.get("width", 0.0), bbox.get("height", 0.0)))
+        for field in STRING_FIELDS:
+            data = (face.get(field) or "").encode("utf-8")[:MAX_STRING]
+            parts.append(STRING_LEN.pack(len(data)))
+            parts.append(data)
+    return b"".join(parts)
+
+
+def decode_binary(payload):
+    view = memoryview(payload)
+    if len(view) < HEADER.size:
+        raise ValueError("CTFB payload shorter than its header")
+    magic, version, _, count, _ = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a CTFB payload")
+    if version != VERSION:
+        raise ValueError("Unsupported CTFB version %d" % version)
+    faces = []
+    offset = HEADER.size
+    try:
+        for _ in range(count):
+            (confidence, frame_id, sensor_id,
+             left, top, width, height) = RECORD.unpack_from(view, offset)
+            offset += RECORD.size
+            face = {
+                "confidence": confidence,
+                "frameId": frame_id,
+                "sensorid": sensor_id,
+                "bbox": {"left": left, "top": top,
+                         "width": width, "height": height},
+            }
+            for field in STRING_FIELDS:
+                (length,) = STRING_LEN.unpack_from(view, offset)
+                offset += STRING_LEN.size
+                if offset + length > len(view):
+                    raise ValueError("Truncated CTFB string")
+                face[field] = bytes(view[offset:offset + length]).decode("utf-8")
+                offset += length
+            faces.append(face)
+    except struct.error as e:
+        raise ValueError("Truncated CTFB payload") from e
+    return faces
+
+
+def decode(payload):
+    """ Decodes a JSON or CTFB payload (bytes-like) into a list of faces. """
+    if is_binary(payload):
+        return decode_binary(payload)
+    # JSON payloads carry a terminating NUL
+    return json.loads(bytes(payload).rstrip(b"\0").decode("utf-8"))
@@ -0,0 +1,135 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+from collections import OrderedDict
+from threading import Lock
+
+
+class _GateEntry:
+    __slots__ = ("last_seen", "last_emit", "left", "top", "width", "height",
+                 "confidence")
+
+    def __init__(self, now, bbox, confidence):
+        self.last_seen = now
+        self.last_emit = now
+        self.left, self.top, self.width, self.height = bbox
+        self.confidence = confidence
+
+
+class EventGate:
+    """ Rate limiter and de-duplicator for event messages.
+
+    Decides per (source_id, tracking_id, event_type) whether an event should
+    be sent, so that NvDsEventMsgMeta allocation, nvmsgconv serialization and
+    broker traffic follow real changes instead of the frame rate:
+
+    * the first sighting of a key is always emitted;
+    * no key is emitted twice within min_interval seconds;
+    * after that, a key is emitted again when its bbox moved or resized by
+      more than bbox_threshold (relative to the last emitted bbox size), when
+      its confidence changed by more than confidence_threshold, or, if
+      max_interval is set, as a heartbeat every max_interval seconds.
+
+    Entries live in an LRU-ordered table and expire once not seen for ttl
+    seconds; the least recently seen are evicted when the table grows beyond
+    max_entries. Timestamps are
+    supplied by the caller (e.g. frame ntp_timestamp), so the gate can also
+    be driven from recorded data.
+
+    Without a tracker all objects share the untracked object id, so the gate
+    then limits events per source and event type.
+    """
+
+    def __init__(self, min_interval=1.0, bbox_threshold=0.2,
+                 confidence_threshold=0.2, max_interval=None, ttl=5.0,
+                 max_entries=65536):
+        self.min_interval = min_interval
+        self.bbox_threshold = bbox_threshold
+        self.confidence_threshold = confidence_threshold
+        self.max_interval = max_interval
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._table = OrderedDict()
+        self._lock = Lock()
+        self.emitted = 0
+        self.suppressed = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    def should_emit(self, source_id, tracking_id, event_type, bbox, confidence,
+                    now):
+        """ bbox is (left, top, width, height). Returns True if an event
+        should be generated for this observation. """
+        key = (source_id, tracking_id, event_type)
+        with self._lock:
+            self._evict(now)
+            entry = self._table.get(key)
+            if entry is None:
+                self._table[key] = _GateEntry(now, bbox, confidence)
+                self._evict(now)
+                self.emitted += 1
+                return True
+            entry.last_seen = now
+            self._table.move_to_end(key)
+            if self._changed(entry, bbox, confidence, now):
+                entry.last_emit = now
+                entry.left, entry.top, entry.width, entry.height = bbox
+                entry.confidence = confidence
+                self.emitted += 1
+                return True
+            self.suppressed += 1
+            return False
+
+    def _changed(self, entry, bbox, confidence, now):
+        elapsed = now - entry.last_emit
+        if elapsed < self.min_interval:
+            return False
+        if self.max_interval is not None and elapsed >= self.max_interval:
+            return True
+        if abs(confidence - entry.confidence) > self.confidence_threshold:
+            return True
+        left, top, width, height = bbox
+        scale = max(entry.width, entry.height, 1.0)
+        delta = max(abs(left - entry.left), abs(top - entry.top),
+                    abs(width - entry.width), abs(height - entry.height))
+        return delta / scale > self.bbox_threshold
+
+    def _evict(self, now):
+        # The table is ordered by last_seen, so expired entries are at the front
+        table = self._table
+        while table:
+            key, entry = next(iter(table.items()))
+            if now - entry.last_seen > self.ttl:
+                self.expired += 1
+            elif len(table) > self.max_entries:
+                self.evicted += 1
+            else:
+                break
+            del table[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._table),
+                "emitted": self.emitted,
+                "suppressed": self.suppressed,
+                "expired": self.expired,
+                "evicted": self.evicted,
+            }
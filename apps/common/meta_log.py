@@ -0,0 +1,353 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+""" Record the metadata produced by a pipeline and replay it offline.
+
+MetaRecorder is a pad probe that appends, for every batch, the frame,
+object, classifier, tracker and nvdsanalytics metadata to Arrow IPC stream
+files (one row per frame, the objects as a nested list), flushed every
+flush_batches batches or flush_interval seconds and rotated every
+rotate_frames frames. MetaLogReader reads the files back as batches of
+plain objects with the attribute names of the pyds metadata (frame.source_id,
+obj.rect_params.left, ...), so the probe callbacks written for pyds can be
+run on them, e.g. through FrameIterator.replay(), without GPUs or video.
+
+  python3 meta_log.py log-00000.arrow [log-00001.arrow ...]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+try:
+    import pyds
+except ImportError:
+    pyds = None
+
+# pyarrow takes hundreds of milliseconds to import, so it is only imported
+# once a log is written or read, not by apps that merely import this module
+pa = None
+
+
+def _require_pyarrow():
+    global pa
+    if pa is None:
+        try:
+            import pyarrow
+        except ImportError:
+            raise RuntimeError("metadata logs require the pyarrow package") from None
+        pa = pyarrow
+
+
+def log_schema():
+    _require_pyarrow()
+    f32 = pa.float32()
+    classifier = pa.struct([
+        ("unique_component_id", pa.int32()),
+        ("result_class_id", pa.int32()),
+        ("result_prob", f32),
+        ("result_label", pa.string()),
+    ])
+    analytics = pa.struct([
+        ("roi_status", pa.list_(pa.string())),
+        ("oc_status", pa.list_(pa.string())),
+        ("lc_status", pa.list_(pa.string())),
+        ("dir_status", pa.string()),
+    ])
+    obj = pa.struct([
+        ("object_id", pa.uint64()),
+        ("class_id", pa.int32()),
+        ("obj_label", pa.string()),
+        ("unique_component_id", pa.int32()),
+        ("confidence", f32),
+        ("left", f32), ("top", f32), ("width", f32), ("height", f32),
+        ("tracker_confidence", f32),
+        ("tracker_left", f32), ("tracker_top", f32),
+        ("tracker_width", f32), ("tracker_height", f32),
+        ("classifiers", pa.list_(classifier)),
+        ("analytics", analytics),
+    ])
+    return pa.schema([
+        ("batch_id", pa.uint64()),
+        ("batch_size", pa.int32()),
+        ("source_id", pa.uint32()),
+        ("frame_num", pa.int32()),
+        ("buf_pts", pa.uint64()),
+        ("ntp_timestamp", pa.uint64()),
+        ("source_frame_width", pa.uint32()),
+        ("source_frame_height", pa.uint32()),
+        # NvDsAnalyticsFrameMeta counters, as JSON
+        ("analytics", pa.string()),
+        ("objects", pa.list_(obj)),
+    ])
+
+
+# ---- extraction from pyds ----
+
+def _glist(l_item, cast):
+    while l_item is not None:
+        try:
+            yield cast(l_item.data)
+        except StopIteration:
+            break
+        try:
+            l_item = l_item.next
+        except StopIteration:
+            break
+
+
+def _object_row(obj_meta):
+    rect = obj_meta.rect_params
+    tracker = obj_meta.tracker_bbox_info.org_bbox_coords
+    classifiers = []
+    for classifier_meta in _glist(obj_meta.classifier_meta_list, pyds.NvDsClassifierMeta.cast):
+        for label_info in _glist(classifier_meta.label_info_list, pyds.NvDsLabelInfo.cast):
+            classifiers.append({"unique_component_id": classifier_meta.unique_component_id,
+                                "result_class_id": label_info.result_class_id,
+                                "result_prob": label_info.result_prob,
+                                "result_label": label_info.result_label})
+    analytics = None
+    for user_meta in _glist(obj_meta.obj_user_meta_list, pyds.NvDsUserMeta.cast):
+        if user_meta.base_meta.meta_type == pyds.NvDsMetaType.NVDS_OBJ_META_NVDSANALYTICS:
+            info = pyds.NvDsAnalyticsObjInfo.cast(user_meta.user_meta_data)
+            analytics = {"roi_status": list(info.roiStatus), "oc_status": list(info.ocStatus),
+                         "lc_status": list(info.lcStatus), "dir_status": info.dirStatus}
+    return {
+        "object_id": obj_meta.object_id,
+        "class_id": obj_meta.class_id,
+        "obj_label": obj_meta.obj_label,
+        "unique_component_id": obj_meta.unique_component_id,
+        "confidence": obj_meta.confidence,
+        "left": rect.left, "top": rect.top, "width": rect.width, "height": rect.height,
+        "tracker_confidence": obj_meta.tracker_confidence,
+        "tracker_left": tracker.left, "tracker_top": tracker.top,
+        "tracker_width": tracker.width, "tracker_height": tracker.height,
+        "classifiers": classifiers,
+        "analytics": analytics,
+    }
+
+
+def batch_rows(batch_meta, batch_id):
+    """ Returns the rows of log_schema() for one NvDsBatchMeta """
+    rows = []
+    for frame_meta in _glist(batch_meta.frame_meta_list, pyds.NvDsFrameMeta.cast):
+        analytics = None
+        for user_meta in _glist(frame_meta.frame_user_meta_list, pyds.NvDsUserMeta.cast):
+            if user_meta.base_meta.meta_type == pyds.NvDsMetaType.NVDS_FRAME_META_NVDSANALYTICS:
+                info = pyds.NvDsAnalyticsFrameMeta.cast(user_meta.user_meta_data)
+                analytics = json.dumps({"objInROIcnt": dict(info.objInROIcnt),
+                                        "objLCCurrCnt": dict(info.objLCCurrCnt),
+                                        "objLCCumCnt": dict(info.objLCCumCnt),
+                                        "ocStatus": dict(info.ocStatus),
+                                        "objCnt": dict(info.objCnt)})
+        rows.append({
+            "batch_id": batch_id,
+            "batch_size": batch_meta.num_frames_in_batch,
+            "source_id": frame_meta.source_id,
+            "frame_num": frame_meta.frame_num,
+            "buf_pts": frame_meta.buf_pts,
+            "ntp_timestamp": frame_meta.ntp_timestamp,
+            "source_frame_width": frame_meta.source_frame_width,
+            "source_frame_height": frame_meta.source_frame_height,
+            "analytics": analytics,
+            "objects": [_object_row(obj_meta) for obj_meta in
+                        _glist(frame_meta.obj_meta_list, pyds.NvDsObjectMeta.cast)],
+        })
+    return rows
+
+
+# ---- writing ----
+
+class MetaLogWriter:
+    """ Appends frame rows to <prefix>-NNNNN.arrow files.
+
+    Rows are buffered and written as one record batch per flush; a new file is
+    started after rotate_frames frames (0: never). The IPC stream format stays
+    readable up to the last flush if the app is killed.
+    """
+
+    def __init__(self, prefix, flush_batches=30, flush_interval=1.0, rotate_frames=100000,
+                 compression="zstd", clock=time.monotonic):
+        _require_pyarrow()
+        self._prefix = prefix
+        self._flush_batches = flush_batches
+        self._flush_interval = flush_interval
+        self._rotate_frames = rotate_frames
+        self._options = pa.ipc.IpcWriteOptions(compression=compression)
+        self._clock = clock
+        self._schema = log_schema()
+        self._lock = threading.Lock()
+        self._rows = []
+        self._pending_batches = 0
+        self._last_flush = clock()
+        self._writer = None
+        self._file_frames = 0
+        self.files = []
+        self.frames_written = 0
+
+    def append_batch(self, rows):
+        with self._lock:
+            self._rows.extend(rows)
+            self._pending_batches += 1
+            if (self._pending_batches >= self._flush_batches
+                    or self._clock() - self._last_flush >= self._flush_interval):
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            if self._writer:
+                self._writer.close()
+                self._writer = None
+
+    def _flush_locked(self):
+        self._last_flush = self._clock()
+        self._pending_batches = 0
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        while rows:
+            if self._writer is None:
+                path = "%s-%05d.arrow" % (self._prefix, len(self.files))
+                self._writer = pa.ipc.new_stream(path, self._schema, options=self._options)
+                self.files.append(path)
+                self._file_frames = 0
+            room = len(rows)
+            if self._rotate_frames:
+                room = min(room, self._rotate_frames - self._file_frames)
+            self._writer.write_table(pa.Table.from_pylist(rows[:room], schema=self._schema))
+            self._file_frames += room
+            self.frames_written += room
+            rows = rows[room:]
+            if self._rotate_frames and self._file_frames >= self._rotate_frames:
+                self._writer.close()
+                self._writer = None
+
+
+class MetaRecorder:
+    """ Pad probe recording the batch metadata into a MetaLogWriter; attach it
+    downstream of the elements whose metadata should be kept (e.g. the OSD
+    sink pad). """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self._batch_id = 0
+
+    def __call__(self, pad, info, u_data):
+        from gi.repository import Gst
+
+        gst_buffer = info.get_buffer()
+        if gst_buffer:
+            batch_meta = pyds.gst_buffer_get_nvds_batch_meta(hash(gst_buffer))
+            if batch_meta:
+                self.writer.append_batch(batch_rows(batch_meta, self._batch_id))
+                self._batch_id += 1
+        return Gst.PadProbeReturn.OK
+
+
+# ---- replay ----
+
+def _replay_object(row):
+    return SimpleNamespace(
+        object_id=row["object_id"], class_id=row["class_id"], obj_label=row["obj_label"],
+        unique_component_id=row["unique_component_id"], confidence=row["confidence"],
+        tracker_confidence=row["tracker_confidence"],
+        rect_params=SimpleNamespace(left=row["left"], top=row["top"], width=row["width"],
+                                    height=row["height"]),
+        tracker_bbox_info=SimpleNamespace(org_bbox_coords=SimpleNamespace(
+            left=row["tracker_left"], top=row["tracker_top"], width=row["tracker_width"],
+            height=row["tracker_height"])),
+        classifiers=[SimpleNamespace(**c) for c in row["classifiers"] or []],
+        analytics=SimpleNamespace(**row["analytics"]) if row["analytics"] else None)
+
+
+def _replay_frame(row):
+    objects = [_replay_object(o) for o in row["objects"] or []]
+    return SimpleNamespace(
+        source_id=row["source_id"], frame_num=row["frame_num"], buf_pts=row["buf_pts"],
+        ntp_timestamp=row["ntp_timestamp"], source_frame_width=row["source_frame_width"],
+        source_frame_height=row["source_frame_height"], num_obj_meta=len(objects),
+        analytics=json.loads(row["analytics"]) if row["analytics"] else None,
+        objects=objects)
+
+
+class MetaLogReader:
+    """ Iterates over the recorded batches of one or more log files (or a
+    glob such as 'log-*.arrow'), in order. Each batch has batch_id,
+    num_frames_in_batch and frames; each frame has the recorded NvDsFrameMeta
+    fields and objects, each object the recorded NvDsObjectMeta fields plus
+    classifiers and analytics. These are plain lists/namespaces: the pyds
+    list fields (classifier_meta_list, obj_user_meta_list, ...) are not
+    replayed, so callbacks read obj.classifiers and obj.analytics instead. """
+
+    def __init__(self, paths):
+        _require_pyarrow()
+        if isinstance(paths, str):
+            paths = sorted(glob.glob(paths)) if any(c in paths for c in "*?[") else [paths]
+        self.paths = list(paths)
+
+    def record_batches(self):
+        """ The Arrow record batches of all files, one per writer flush """
+        for path in self.paths:
+            with pa.OSFile(path, "rb") as f:
+                for record_batch in pa.ipc.open_stream(f):
+                    yield record_batch
+
+    def __iter__(self):
+        frames, batch_id, batch_size = [], None, 0
+        for record_batch in self.record_batches():
+            for row in record_batch.to_pylist():
+                if frames and row["batch_id"] != batch_id:
+                    yield SimpleNamespace(batch_id=batch_id, num_frames_in_batch=batch_size,
+                                          frames=frames)
+                    frames = []
+                batch_id, batch_size = row["batch_id"], row["batch_size"]
+                frames.append(_replay_frame(row))
+        if frames:
+            yield SimpleNamespace(batch_id=batch_id, num_frames_in_batch=batch_size,
+                                  frames=frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="+", help="Log files, in order")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    batches = frames = objects = 0
+    for batch in MetaLogReader(args.paths):
+        batches += 1
+        frames += len(batch.frames)
+        objects += sum(frame.num_obj_meta for frame in batch.frames)
+    elapsed = time.perf_counter() - start
+    size = sum(os.path.getsize(p) for p in args.paths)
+    print("%d batches, %d frames, %d objects, %.1f MB on disk" % (
+        batches, frames, objects, size / 1e6))
+    print("replayed in %.2f s, %.0f frames/s" % (elapsed, frames / elapsed if elapsed else 0))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+""" Micro-batching stage in front of a message broker.
+
+Payloads produced by nvmsgconv are coalesced per topic and delivered in
+batches of up to max_messages / max_bytes, or after max_delay_ms at the
+latest, optionally compressed. Delivery happens on a sender thread through a
+pluggable Transport, so the streaming thread only appends to a list.
+
+A batch is sent as (headers, body): headers is a small dict (topic, count,
+framing, compression) and body holds the payloads, each prefixed with its
+length as u32 little-endian, then compressed as a whole. decode_batch()
+turns it back into the list of payloads.
+"""
+
+import abc
+import json
+import queue
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+from urllib.parse import urlparse
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+LENGTH = struct.Struct("<I")
+COMPRESSIONS = ("none", "zlib", "lz4")
+
+
+def compress(data, compression):
+    if compression == "zlib":
+        return zlib.compress(data, 1)
+    if compression == "lz4":
+        if lz4_frame is None:
+            raise RuntimeError("lz4 compression requires the lz4 package")
+        return lz4_frame.compress(data)
+    return data
+
+
+def decompress(data, compression):
+    if compression == "zlib":
+        return zlib.decompress(data)
+    if compression == "lz4":
+        if lz4_frame is None:
+            raise RuntimeError("lz4 compression requires the lz4 package")
+        return lz4_frame.decompress(data)
+    return data
+
+
+def encode_batch(topic, payloads, compression="none"):
+    body = b"".join(LENGTH.pack(len(p)) + p for p in payloads)
+    headers = {
+        "topic": topic,
+        "count": len(payloads),
+        "framing": "u32le",
+        "compression": compression,
+    }
+    return headers, compress(body, compression)
+
+
+def decode_batch(headers, body):
+    data = decompress(body, headers.get("compression", "none"))
+    payloads = []
+    offset = 0
+    while offset < len(data):
+        (size,) = LENGTH.unpack_from(data, offset)
+        offset += LENGTH.size
+        payloads.append(data[offset:offset + size])
+        offset += size
+    if len(payloads) != headers.get("count", len(payloads)):
+        raise ValueError("Batch holds %d payloads, header says %d"
+                         % (len(payloads), headers["count"]))
+    return payloads
+
+
+class Transport(abc.ABC):
+    """ Delivers encoded batches. Subclasses implement send(); the broker
+    protocol adaptors (Kafka, Redis, ...) plug in here. """
+
+    @abc.abstractmethod
+    def send(self, headers, body):
+        pass
+
+    def close(self):
+        pass
+
+
+class FileTransport(Transport):
+    """ Appends batches to a file, for tests and offline inspection. Each
+    record is the u32le length of the JSON headers, the headers, the u32le
+    body length and the body; read_records() reads them back. """
+
+    def __init__(self, path):
+        self._file = open(path, "ab")
+
+    def send(self, headers, body):
+        self._file.write(_frame(headers, body))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class UnixSocketTransport(Transport):
+    """ Streams batches to a local Unix socket server using the same record
+    framing as FileTransport; reconnects on the next batch after an error. """
+
+    def __init__(self, path, timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._sock = None
+
+    def send(self, headers, body):
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(self.timeout)
+            self._sock.connect(self.path)
+        try:
+            self._sock.sendall(_frame(headers, body))
+        except OSError:
+            self.close()
+            raise
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+def _frame(headers, body):
+    header_bytes = json.dumps(headers).encode()
+    return b"".join((LENGTH.pack(len(header_bytes)), header_bytes,
+                     LENGTH.pack(len(body)), body))
+
+
+def read_records(stream):
+    """ Yields (headers, body) from a file or socket stream written by
+    FileTransport / UnixSocketTransport. """
+    while True:
+        size = stream.read(LENGTH.size)
+        if len(size) < LENGTH.size:
+            return
+        headers = json.loads(stream.read(LENGTH.unpack(size)[0]))
+        (body_size,) = LENGTH.unpack(stream.read(LENGTH.size))
+        yield headers, stream.read(body_size)
+
+
+def make_transport(uri):
+    """ file:///path/to/file or unix:///path/to/socket """
+    parsed = urlparse(uri)
+    if parsed.scheme == "file":
+        return FileTransport(parsed.path)
+    if parsed.scheme == "unix":
+        return UnixSocketTransport(parsed.path)
+    raise ValueError("Unsupported transport URI: %s" % uri)
+
+
+class _TopicBuffer:
+    __slots__ = ("payloads", "num_bytes", "opened")
+
+    def __init__(self, now):
+        self.payloads = []
+        self.num_bytes = 0
+        self.opened = now
+
+
+class MessageBatcher:
+    """ Coalesces payloads per topic and hands full batches to a sender
+    thread.
+
+    submit() is cheap and thread-safe; a batch is closed when it reaches
+    max_messages or max_bytes, or max_delay_ms after its first payload. Call
+    close() to flush and stop the sender.
+    """
+
+    def __init__(self, transport, max_messages=200, max_bytes=1 << 20,
+                 max_delay_ms=100, compression="none", max_pending=64):
+        if compression not in COMPRESSIONS:
+            raise ValueError("compression must be one of %s" % (COMPRESSIONS,))
+        if compression == "lz4" and lz4_frame is None:
+            raise RuntimeError("lz4 compression requires the lz4 package")
+        self.transport = transport
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay_ms / 1000.0
+        self.compression = compression
+        self._buffers = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # Bounded so that a stuck transport applies back-pressure
+        self._pending = queue.Queue(max_pending)
+        self._closed = False
+        self.messages = 0
+        self.batches = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.errors = 0
+        self._timer = threading.Thread(target=self._timer_loop, daemon=True)
+        self._sender = threading.Thread(target=self._send_loop, daemon=True)
+        self._timer.start()
+        self._sender.start()
+
+    def submit(self, topic, payload):
+        full = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MessageBatcher is closed")
+            buf = self._buffers.get(topic)
+            if buf is None:
+                buf = self._buffers[topic] = _TopicBuffer(time.monotonic())
+                self._wakeup.notify()
+            buf.payloads.append(payload)
+            buf.num_bytes += len(payload)
+            self.messages += 1
+            self.bytes_in += len(payload)
+            if (len(buf.payloads) >= self.max_messages
+                    or buf.num_bytes >= self.max_bytes):
+                full = self._buffers.pop(topic)
+        if full is not None:
+            self._pending.put((topic, full.payloads))
+
+    def flush(self):
+        """ Closes all open batches now. """
+        with self._lock:
+            buffers, self._buffers = self._buffers, {}
+        for topic, buf in buffers.items():
+            self._pending.put((topic, buf.payloads))
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        self.flush()
+        self._pending.put(None)
+        self._sender.join()
+        self._timer.join()
+        self.transport.close()
+
+    def _timer_loop(self):
+        while True:
+            expired = []
+            with self._lock:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                deadline = None
+                for topic, buf in list(self._buffers.items()):
+                    due = buf.opened + self.max_delay
+                    if due <= now:
+                        expired.append((topic, self._buffers.pop(topic).payloads))
+                    elif deadline is None or due < deadline:
+                        deadline = due
+                if not expired:
+                    self._wakeup.wait(None if deadline is None else deadline - now)
+            for item in expired:
+                self._pending.put(item)
+
+    def _send_loop(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            topic, payloads = item
+            headers, body = encode_batch(topic, payloads, self.compression)
+            try:
+                self.transport.send(headers, body)
+            except Exception as e:
+                self.errors += 1
+                sys.stderr.write("Failed to send batch of %d messages to %s: %s\n"
+                                 % (len(payloads), topic, e))
+                continue
+            self.batches += 1
+            self.bytes_out += len(body)
+
+    def stats(self):
+        return {
+            "messages": self.messages,
+            "batches": self.batches,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "errors": self.errors,
+            "pending": self._pending.qsize(),
+        }
@@ -16,13 +16,96 @@
 ################################################################################
 
 import sys
+import os
+import json
 import platform
+import tempfile
 from threading import Lock
-from cuda.bindings import runtime
-from cuda.bindings import driver
 
 guard_platform_info = Lock()
 
+# Platform facts that need CUDA are cached in this file, keyed by the boot id
+# and the driver version, so that only the first app started after a reboot
+# or a driver update pays for importing cuda-python and initializing CUDA.
+# DS_PLATFORM_CACHE overrides the path, DS_PLATFORM_CACHE=0 disables the cache.
+PLATFORM_CACHE_ENV = "DS_PLATFORM_CACHE"
+
+
+def _read_first_line(path):
+    try:
+        with open(path, "r") as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+
+def platform_cache_key():
+    """ Returns the key of the cached platform facts, or None when the boot
+    cannot be identified """
+    boot_id = _read_first_line("/proc/sys/kernel/random/boot_id")
+    if not boot_id:
+        return None
+    # dGPU driver, then Jetson (L4T) release
+    driver_version = (_read_first_line("/sys/module/nvidia/version")
+                      or _read_first_line("/proc/driver/nvidia/version")
+                      or _read_first_line("/etc/nv_tegra_release") or "")
+    return {"boot_id": boot_id, "driver": driver_version}
+
+
+def platform_cache_path():
+    path = os.environ.get(PLATFORM_CACHE_ENV)
+    if path == "0":
+        return None
+    if path:
+        return path
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "deepstream-python-apps", "platform_info.json")
+
+
+def load_platform_cache():
+    """ Returns the cached platform facts if they belong to this boot and
+    driver, else an empty dict """
+    path = platform_cache_path()
+    key = platform_cache_key()
+    if not path or not key:
+        return {}
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("key") != key:
+        return {}
+    return cache.get("facts", {})
+
+
+def store_platform_cache(facts):
+    path = platform_cache_path()
+    key = platform_cache_key()
+    if not path or not key:
+        return
+    merged = load_platform_cache()
+    merged.update(facts)
+    tmp_path = None
+    try:
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # Written to a temporary file and renamed, so that concurrently
+        # starting apps never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".platform_info")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"key": key, "facts": merged}, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        print(f"WARNING: Writing platform cache {path} failed: {e}")
+
+
 class PlatformInfo:
     def __init__(self):
         self.is_wsl_system = False
@@ -56,8 +139,20 @@ class PlatformInfo:
         #Using cuda apis to identify whether integrated/discreet
         #This is required to distinguish Tegra and ARM_SBSA devices
         with guard_platform_info:
+            if not self.is_integrated_gpu_verified:
+                cached = load_platform_cache().get("integrated_gpu")
+                if cached is not None:
+                    self.is_integrated_gpu_system = bool(cached)
+                    self.is_integrated_gpu_verified = True
             #Cuda initialize
             if not self.is_integrated_gpu_verified:
+                # cuda-python is only imported when the answer is not cached
+                try:
+                    from cuda.bindings import runtime
+                    from cuda.bindings import driver
+                except ImportError as e:
+                    print(f"ERROR: Importing cuda-python failed: {e}")
+                    return self.is_integrated_gpu_system
                 cuda_init_result, = driver.cuInit(0)
                 if  cuda_init_result == driver.CUresult.CUDA_SUCCESS:
                     #Get cuda devices count
@@ -72,6 +167,8 @@ class PlatformInfo:
                                 print("Is it Integrated GPU? :", properties.integrated)
                                 self.is_integrated_gpu_system = properties.integrated
                                 self.is_integrated_gpu_verified = True
+                                store_platform_cache(
+                                    {"integrated_gpu": bool(properties.integrated)})
                             else:
                                 print("ERROR: Getting cuda device property failed: {}".format(property_result))
                         else:
@@ -0,0 +1,550 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+""" Frames exported to a shared-memory slab pool, mapped by consumers in other
+processes as NumPy arrays without copying.
+
+The exporter copies each selected frame once, from the mapped NvBufSurface
+into a free slab, where the apps would otherwise make their own copy with
+np.array(n_frame, copy=True). Consumers get a read-only array on the slab
+itself, whatever the frame size.
+
+  header:      magic, version, slab count, slab size, max readers, descriptor
+               count, data offset, frames published, frames dropped
+  readers:     pid, active                           [max readers]
+  refs:        one byte per (slab, reader)           [slabs x max readers]
+  slab frame:  index of the frame last put in a slab [slabs]
+  descriptors: seq | crc32 | index, buf_pts, slab, source_id, frame_num,
+               height, width, channels              [descriptor count]
+  slabs:       page aligned                          [slabs x slab size]
+
+Reference counting needs no atomics: refs[slab, reader] is set by the
+exporter, only while it is 0, to give a reference to every active reader, and
+cleared by that reader only, once it released the frame (or skipped it). A
+slab is free when no active reader holds it. When every slab is held, frames
+are dropped and counted, the pipeline is never blocked by a slow consumer.
+Readers register under a file lock on the segment; the slots of dead readers
+are reclaimed by the exporter.
+
+Descriptors are seqlocked and checksummed like the slots of shm_meta. The
+pixels are not: on weakly ordered CPUs (Jetson) a consumer could in theory
+read a slab before all of its bytes are visible.
+
+  python3 shm_frames.py --bench [--frames 2000] [--width 1920] [--height 1080] [--readers 1]
+  python3 shm_frames.py --read NAME
+"""
+
+import argparse
+import fcntl
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    import pyds
+except ImportError:
+    pyds = None
+
+MAGIC = 0x46534453  # "SDSF"
+VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "<u4"), ("version", "<u4"), ("slab_count", "<u4"), ("max_readers", "<u4"),
+    ("slab_size", "<u8"), ("desc_count", "<u4"), ("reserved", "<u4"), ("data_offset", "<u8"),
+    ("write_index", "<u8"), ("dropped", "<u8"),
+])
+HEADER_SIZE = 64
+
+READER_DTYPE = np.dtype([("pid", "<i4"), ("active", "<u4")])
+
+DESC_DTYPE = np.dtype([
+    ("seq", "<u8"), ("crc", "<u4"), ("reserved", "<u4"),
+    ("index", "<u8"), ("buf_pts", "<u8"), ("slab", "<u4"), ("source_id", "<u4"),
+    ("frame_num", "<i4"), ("height", "<u4"), ("width", "<u4"), ("channels", "<u4"),
+])
+# Offset of the checksummed payload in a descriptor
+PAYLOAD_OFFSET = 16
+MAX_READ_ATTEMPTS = 10000
+
+
+def _align(size, alignment):
+    return (size + alignment - 1) // alignment * alignment
+
+
+def _layout(slabs, max_readers, descriptors, slab_size):
+    """ Offsets of the sections of a pool, and its total size """
+    readers = HEADER_SIZE
+    refs = readers + max_readers * READER_DTYPE.itemsize
+    slab_frame = _align(refs + slabs * max_readers, 8)
+    desc = _align(slab_frame + slabs * 8, 8)
+    data = _align(desc + descriptors * DESC_DTYPE.itemsize, mmap.PAGESIZE)
+    return {"readers": readers, "refs": refs, "slab_frame": slab_frame, "desc": desc,
+            "data": data, "size": data + slabs * slab_size}
+
+
+class _Pool:
+    """ numpy views of a pool mapped at 'buffer' """
+
+    def __init__(self, buffer, slabs, max_readers, descriptors, slab_size):
+        offsets = _layout(slabs, max_readers, descriptors, slab_size)
+        self.header = np.ndarray((), HEADER_DTYPE, buffer, 0)
+        self.readers = np.ndarray((max_readers,), READER_DTYPE, buffer, offsets["readers"])
+        self.refs = np.ndarray((slabs, max_readers), np.uint8, buffer, offsets["refs"])
+        self.slab_frame = np.ndarray((slabs,), "<u8", buffer, offsets["slab_frame"])
+        self.desc = np.ndarray((descriptors,), DESC_DTYPE, buffer, offsets["desc"])
+        self.desc_raw = np.ndarray((descriptors, DESC_DTYPE.itemsize), np.uint8, buffer,
+                                   offsets["desc"])
+        self.data = np.ndarray((slabs, slab_size), np.uint8, buffer, offsets["data"])
+
+
+class FrameSelector:
+    """ Which frames to export: those of the given source ids (all if None),
+    one frame out of 'interval' per source, and for which predicate(frame_meta)
+    is true, if given (e.g. a detection of interest). """
+
+    def __init__(self, streams=None, interval=1, predicate=None):
+        self.streams = None if streams is None else set(streams)
+        self.interval = max(1, interval)
+        self.predicate = predicate
+        self._seen = {}
+
+    def select(self, frame_meta):
+        source_id = frame_meta.source_id
+        if self.streams is not None and source_id not in self.streams:
+            return False
+        seen = self._seen.get(source_id, 0)
+        self._seen[source_id] = seen + 1
+        if seen % self.interval:
+            return False
+        return self.predicate is None or bool(self.predicate(frame_meta))
+
+
+class ShmFrameExporter:
+    """ Producer side of a slab pool. Creates the shared memory segment 'name'
+    (under /dev/shm) and removes it on close(). Slabs hold frames of up to
+    max_width x max_height x channels bytes. Use export() with arrays from any
+    source, or probe() as a pad probe on batched RGBA buffers. On Jetson, pass
+    unmap_surfaces=True for probe() to unmap the surfaces it mapped. """
+
+    def __init__(self, name, max_width, max_height, channels=4, slabs=8, max_readers=8,
+                 selector=None, unmap_surfaces=False):
+        self.slabs = slabs
+        self.max_readers = max_readers
+        self.slab_size = _align(max_width * max_height * channels, mmap.PAGESIZE)
+        self.descriptors = slabs * 4
+        self.selector = selector or FrameSelector()
+        self.unmap_surfaces = unmap_surfaces
+        offsets = _layout(slabs, max_readers, self.descriptors, self.slab_size)
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=offsets["size"])
+        self.name = self._shm.name
+        self._pool = _Pool(self._shm.buf, slabs, max_readers, self.descriptors, self.slab_size)
+        header = self._pool.header
+        header["magic"] = MAGIC
+        header["version"] = VERSION
+        header["slab_count"] = slabs
+        header["max_readers"] = max_readers
+        header["slab_size"] = self.slab_size
+        header["desc_count"] = self.descriptors
+        header["data_offset"] = offsets["data"]
+        header["write_index"] = 0
+        header["dropped"] = 0
+        self._write_index = 0
+        self._next_slab = 0
+        self.dropped = 0
+
+    def _free_slab(self):
+        pool = self._pool
+        active = pool.readers["active"] == 1
+        busy = pool.refs[:, active].any(axis=1)
+        order = (np.arange(self.slabs) + self._next_slab) % self.slabs
+        free = order[~busy[order]]
+        return int(free[0]) if len(free) else None
+
+    def reap_readers(self):
+        """ Deactivates the readers whose process is gone, releasing their
+        references. Returns how many were reaped. """
+        readers = self._pool.readers
+        reaped = 0
+        for slot in np.flatnonzero(readers["active"] == 1):
+            try:
+                os.kill(int(readers["pid"][slot]), 0)
+            except ProcessLookupError:
+                readers["active"][slot] = 0
+                reaped += 1
+            except PermissionError:
+                pass
+        return reaped
+
+    def export(self, frame, source_id=0, frame_num=0, buf_pts=0):
+        """ Copies frame, a (height, width[, channels]) uint8 array, into a
+        free slab and publishes it. Returns False if every slab is held by
+        the readers and the frame was dropped. """
+        frame = np.asarray(frame)
+        if frame.dtype != np.uint8:
+            raise ValueError("frames must be uint8 arrays, not %s" % frame.dtype)
+        height, width = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        if height * width * channels > self.slab_size:
+            raise ValueError("a %dx%dx%d frame does not fit in slabs of %d bytes" % (
+                width, height, channels, self.slab_size))
+        pool = self._pool
+        slab = self._free_slab()
+        if slab is None and self.reap_readers():
+            slab = self._free_slab()
+        if slab is None:
+            self.dropped += 1
+            pool.header["dropped"] = self.dropped
+            return False
+        self._next_slab = (slab + 1) % self.slabs
+
+        np.copyto(pool.data[slab, :frame.size].reshape(frame.shape), frame)
+        index = self._write_index
+        pool.slab_frame[slab] = index
+        pool.refs[slab] = pool.readers["active"] == 1
+
+        position = index % self.descriptors
+        seq = int(pool.desc["seq"][position]) + 1
+        pool.desc["seq"][position] = seq  # odd: being written
+        pool.desc[position] = (seq, 0, 0, index, buf_pts, slab, source_id, frame_num,
+                               height, width, channels)
+        pool.desc["crc"][position] = zlib.crc32(pool.desc_raw[position, PAYLOAD_OFFSET:])
+        pool.desc["seq"][position] = seq + 1
+        self._write_index = index + 1
+        pool.header["write_index"] = index + 1
+        return True
+
+    def export_batch(self, gst_buffer, batch_meta):
+        """ Exports the selected frames of a batched RGBA buffer """
+        l_frame = batch_meta.frame_meta_list
+        while l_frame is not None:
+            try:
+                frame_meta = pyds.NvDsFrameMeta.cast(l_frame.data)
+            except StopIteration:
+                break
+            if self.selector.select(frame_meta):
+                n_frame = pyds.get_nvds_buf_surface(hash(gst_buffer), frame_meta.batch_id)
+                self.export(n_frame, frame_meta.source_id, frame_meta.frame_num,
+                            frame_meta.buf_pts)
+                if self.unmap_surfaces:
+                    pyds.unmap_nvds_buf_surface(hash(gst_buffer), frame_meta.batch_id)
+            try:
+                l_frame = l_frame.next
+            except StopIteration:
+                break
+
+    def probe(self, pad, info, u_data):
+        from gi.repository import Gst
+
+        gst_buffer = info.get_buffer()
+        if gst_buffer:
+            batch_meta = pyds.gst_buffer_get_nvds_batch_meta(hash(gst_buffer))
+            if batch_meta:
+                self.export_batch(gst_buffer, batch_meta)
+        return Gst.PadProbeReturn.OK
+
+    def close(self):
+        self._pool = None
+        self._shm.close()
+        self._shm.unlink()
+
+
+class SharedFrame:
+    """ A frame held by a reader. 'array' is a read-only view of the slab,
+    valid until release(), which hands the slab back to the exporter. Also a
+    context manager releasing the frame on exit. """
+
+    def __init__(self, reader, slab, array, index, source_id, frame_num, buf_pts):
+        self._reader = reader
+        self.slab = slab
+        self.array = array
+        self.index = index
+        self.source_id = source_id
+        self.frame_num = frame_num
+        self.buf_pts = buf_pts
+
+    def release(self):
+        if self._reader is not None:
+            self.array = None
+            self._reader._release(self.slab)
+            self._reader = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class ShmFrameReader:
+    """ Consumer side of a slab pool; up to max_readers of them, in any
+    process. Registers on creation and starts at the next exported frame.
+    Frames must be released, each held frame pins a slab. """
+
+    def __init__(self, name):
+        fd = os.open(os.path.join("/dev/shm", name.lstrip("/")), os.O_RDWR)
+        try:
+            self._map = mmap.mmap(fd, 0)
+            header = np.ndarray((), HEADER_DTYPE, self._map, 0)
+            if int(header["magic"]) != MAGIC or int(header["version"]) != VERSION:
+                del header
+                self._map.close()
+                raise ValueError("%s is not a frame pool" % name)
+            self.slabs = int(header["slab_count"])
+            self.slab_size = int(header["slab_size"])
+            self.descriptors = int(header["desc_count"])
+            max_readers = int(header["max_readers"])
+            del header
+            self._pool = _Pool(self._map, self.slabs, max_readers, self.descriptors,
+                               self.slab_size)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                self.slot = self._register()
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+        self._held = set()
+        self.next_index = int(self._pool.header["write_index"])
+        self.lost = 0
+
+    def _register(self):
+        readers = self._pool.readers
+        free = np.flatnonzero(readers["active"] == 0)
+        if not len(free):
+            self._pool = None
+            self._map.close()
+            raise RuntimeError("all %d reader slots of the frame pool are in use"
+                               % len(readers))
+        slot = int(free[0])
+        self._pool.refs[:, slot] = 0
+        readers["pid"][slot] = os.getpid()
+        readers["active"][slot] = 1
+        return slot
+
+    def _release(self, slab):
+        self._held.discard(slab)
+        if self._pool is not None:
+            self._pool.refs[slab, self.slot] = 0
+
+    def _read_desc(self, index):
+        """ Returns a consistent copy of descriptor 'index', or None if it was
+        overwritten (or could not be read consistently) """
+        pool = self._pool
+        position = index % self.descriptors
+        for _ in range(MAX_READ_ATTEMPTS):
+            seq = int(pool.desc["seq"][position])
+            if seq & 1:
+                continue
+            raw = pool.desc_raw[position].copy()
+            if int(pool.desc["seq"][position]) != seq:
+                continue
+            desc = raw.view(DESC_DTYPE)[0]
+            if int(desc["index"]) != index:
+                return None
+            if zlib.crc32(raw[PAYLOAD_OFFSET:]) == int(desc["crc"]):
+                return desc
+        return None
+
+    def _drop_skipped(self):
+        """ Releases the slabs given to this reader for frames it will never
+        return (overwritten descriptors) """
+        pool = self._pool
+        mine = pool.refs[:, self.slot] == 1
+        skipped = mine & (pool.slab_frame < self.next_index)
+        for slab in np.flatnonzero(skipped):
+            if int(slab) not in self._held:
+                pool.refs[slab, self.slot] = 0
+
+    def poll(self, max_frames=None):
+        """ Returns the frames exported since the last call, oldest first, as
+        SharedFrame objects """
+        pool = self._pool
+        write_index = int(pool.header["write_index"])
+        oldest = write_index - self.descriptors
+        if self.next_index < oldest:
+            self.lost += oldest - self.next_index
+            self.next_index = oldest
+        end = write_index if max_frames is None else min(write_index,
+                                                         self.next_index + max_frames)
+        frames = []
+        while self.next_index < end:
+            index = self.next_index
+            self.next_index += 1
+            desc = self._read_desc(index)
+            if desc is None:
+                self.lost += 1
+                continue
+            slab = int(desc["slab"])
+            # Registered after the frame was exported, or reaped
+            if pool.refs[slab, self.slot] != 1 or int(pool.slab_frame[slab]) != index:
+                continue
+            shape = (int(desc["height"]), int(desc["width"]), int(desc["channels"]))
+            array = pool.data[slab, :shape[0] * shape[1] * shape[2]].reshape(shape)
+            array.flags.writeable = False
+            self._held.add(slab)
+            frames.append(SharedFrame(self, slab, array, index, int(desc["source_id"]),
+                                      int(desc["frame_num"]), int(desc["buf_pts"])))
+        self._drop_skipped()
+        return frames
+
+    def frames(self, poll_interval=0.001):
+        """ Yields frames as they are exported; release each one """
+        while True:
+            new_frames = self.poll()
+            if not new_frames:
+                time.sleep(poll_interval)
+            for frame in new_frames:
+                yield frame
+
+    def close(self):
+        """ Releases every held frame and unregisters. Arrays of frames still
+        referenced by the caller keep the mapping alive. """
+        pool = self._pool
+        if pool is None:
+            return
+        self._held.clear()
+        pool.readers["active"][self.slot] = 0
+        pool.refs[:, self.slot] = 0
+        pool.readers["pid"][self.slot] = 0
+        self._pool = None
+        del pool
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+
+
+# ---- benchmark ----
+
+def _consume(name, frames, result, ready):
+    reader = ShmFrameReader(name)
+    ready.put(True)
+    received = checksum = 0
+    map_time = 0.0
+    start = time.perf_counter()
+    while True:
+        new_frames = reader.poll()
+        if not new_frames:
+            if reader.next_index >= frames:
+                break
+            time.sleep(0)
+            continue
+        for frame in new_frames:
+            t = time.perf_counter()
+            with frame:
+                # touch the frame, as a consumer would
+                checksum += int(frame.array[0, 0, 0]) + int(frame.array[-1, -1, -1])
+            map_time += time.perf_counter() - t
+            received += 1
+    elapsed = time.perf_counter() - start
+    result.put((received, reader.lost, map_time, elapsed))
+    reader.close()
+
+
+def bench(frames, width, height, slabs, readers):
+    name = "ds_frames_bench_%d" % multiprocessing.current_process().pid
+    exporter = ShmFrameExporter(name, width, height, slabs=slabs, max_readers=max(readers, 1))
+    source = np.random.default_rng(0).integers(0, 255, (height, width, 4), dtype=np.uint8)
+    result = multiprocessing.Queue()
+    ready = multiprocessing.Queue()
+    consumers = [multiprocessing.Process(target=_consume, args=(name, frames, result, ready))
+                 for _ in range(readers)]
+    for consumer in consumers:
+        consumer.start()
+    for _ in consumers:
+        ready.get()
+
+    start = time.perf_counter()
+    for _ in range(min(frames, 200)):
+        np.array(source, copy=True, order='C')
+    copy_time = (time.perf_counter() - start) / min(frames, 200)
+
+    exported = 0
+    start = time.perf_counter()
+    while exported < frames:
+        if exporter.export(source, exported % 4, exported // 4):
+            exported += 1
+        else:
+            time.sleep(0)
+    export_time = time.perf_counter() - start
+    results = [result.get() for _ in consumers]
+    for consumer in consumers:
+        consumer.join()
+    dropped = exporter.dropped
+    exporter.close()
+
+    size = width * height * 4
+    print("%d frames of %dx%d RGBA (%.1f MB), %d slabs" % (frames, width, height,
+                                                           size / 1e6, slabs))
+    print("np.array copy: %8.3f ms/frame" % (copy_time * 1e3))
+    print("exporter:      %8.3f ms/frame %8.0f frames/s  %.1f GB/s, %d drops retried" % (
+        export_time / frames * 1e3, frames / export_time, frames * size / export_time / 1e9,
+        dropped))
+    for i, (received, lost, map_time, elapsed) in enumerate(results):
+        print("reader %d:      %8.3f ms/frame to map, %8.0f frames/s  received %d, lost %d" % (
+            i, map_time / max(received, 1) * 1e3, received / elapsed, received, lost))
+
+
+def tail(name):
+    """ Prints the frames received per second from pool 'name' """
+    reader = ShmFrameReader(name)
+    last = time.monotonic()
+    frames = 0
+    try:
+        while True:
+            new_frames = reader.poll()
+            if not new_frames:
+                time.sleep(0.005)
+            for frame in new_frames:
+                frame.release()
+            frames += len(new_frames)
+            now = time.monotonic()
+            if now - last >= 1.0:
+                print("%8.1f frames/s  lost %d" % (frames / (now - last), reader.lost))
+                last, frames = now, 0
+    except KeyboardInterrupt:
+        pass
+    reader.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--bench", action="store_true",
+                      help="Run the exporter/consumer throughput benchmark")
+    mode.add_argument("--read", metavar="NAME",
+                      help="Print the rate of frames exported to pool NAME")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--slabs", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=1, help="Consumer processes")
+    args = parser.parse_args()
+    if args.read:
+        tail(args.read)
+    else:
+        bench(args.frames, args.width, args.height, args.slabs, args.readers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,412 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+""" Object metadata of every frame in a shared-memory ring, for co-located
+consumers.
+
+The publisher (one per ring) writes one fixed-size slot per frame; readers in
+other processes poll the ring without locks, sockets or serialization:
+
+  header: magic, version, slot count, max objects per slot, frames published
+  slot:   seq | crc32 | index, batch_id, source_id, frame_num, buf_pts,
+          ntp_timestamp, num_objects, dropped_objects | objects[max_objects]
+  object: object_id, class_id, confidence, left, top, width, height,
+          tracker_confidence
+
+Each slot is a seqlock: seq is odd while the publisher writes it. A reader
+copies the slot and keeps the copy if seq was even and unchanged around the
+copy. The crc32 of the payload, which holds the index of the frame, also
+rejects copies torn by store reordering on weakly ordered CPUs (Jetson),
+where python has no way to issue memory barriers. Readers that fall more
+than a ring behind skip ahead and count the frames they lost.
+
+  python3 shm_meta.py --bench [--frames 200000] [--objects 20] [--slots 4096] [--readers 1]
+  python3 shm_meta.py --read NAME
+"""
+
+import argparse
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    import pyds
+except ImportError:
+    pyds = None
+
+MAGIC = 0x4d534453  # "SDSM"
+VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "<u4"), ("version", "<u4"), ("slot_count", "<u4"), ("max_objects", "<u4"),
+    ("slot_size", "<u4"), ("reserved", "<u4"), ("write_index", "<u8"),
+])
+HEADER_SIZE = 64
+
+OBJECT_DTYPE = np.dtype([
+    ("object_id", "<u8"), ("class_id", "<i4"), ("confidence", "<f4"),
+    ("left", "<f4"), ("top", "<f4"), ("width", "<f4"), ("height", "<f4"),
+    ("tracker_confidence", "<f4"), ("reserved", "<u4"),
+])
+
+# Offset of the checksummed payload in a slot
+PAYLOAD_OFFSET = 16
+MAX_READ_ATTEMPTS = 10000
+
+# The payload fields in front of the objects
+HEAD_DTYPE = np.dtype([
+    ("index", "<u8"), ("batch_id", "<u8"), ("source_id", "<u4"), ("frame_num", "<i4"),
+    ("buf_pts", "<u8"), ("ntp_timestamp", "<u8"),
+    ("num_objects", "<u4"), ("dropped_objects", "<u4"),
+])
+
+
+def frame_dtype(max_objects):
+    """ dtype of the frame records, as returned by ShmMetaReader """
+    return np.dtype([
+        ("seq", "<u8"), ("crc", "<u4"), ("reserved", "<u4"),
+        ("index", "<u8"), ("batch_id", "<u8"), ("source_id", "<u4"), ("frame_num", "<i4"),
+        ("buf_pts", "<u8"), ("ntp_timestamp", "<u8"),
+        ("num_objects", "<u4"), ("dropped_objects", "<u4"),
+        ("objects", OBJECT_DTYPE, (max_objects,)),
+    ])
+
+
+def _field_view(buffer, dtype, slots, field, shape=()):
+    """ Array of one field of every slot of the ring """
+    frame = dtype.fields[field]
+    return np.ndarray((slots,) + shape, frame[0].base if shape else frame[0], buffer,
+                      HEADER_SIZE + frame[1],
+                      (dtype.itemsize,) + ((OBJECT_DTYPE.itemsize,) if shape else ()))
+
+
+class _Ring:
+    """ numpy views of a ring mapped at 'buffer' """
+
+    def __init__(self, buffer, slots, max_objects):
+        self.dtype = frame_dtype(max_objects)
+        self.header = np.ndarray((), HEADER_DTYPE, buffer, 0)
+        self.raw = np.ndarray((slots, self.dtype.itemsize), np.uint8, buffer, HEADER_SIZE)
+        self.seq = _field_view(buffer, self.dtype, slots, "seq")
+        self.crc = _field_view(buffer, self.dtype, slots, "crc")
+        self.head = np.ndarray((slots,), HEAD_DTYPE, buffer, HEADER_SIZE + PAYLOAD_OFFSET,
+                               (self.dtype.itemsize,))
+        self.objects = _field_view(buffer, self.dtype, slots, "objects", (max_objects,))
+        self.objects_offset = self.dtype.fields["objects"][1]
+
+
+class ShmMetaPublisher:
+    """ Single producer side of the ring. Creates the shared memory segment
+    'name' (under /dev/shm) and removes it on close(). Use publish() with
+    objects from any source, or probe() as a pad probe on batched buffers. """
+
+    def __init__(self, name, slots=4096, max_objects=64):
+        self.max_objects = max_objects
+        self.slots = slots
+        size = HEADER_SIZE + slots * frame_dtype(max_objects).itemsize
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = self._shm.name
+        self._ring = _Ring(self._shm.buf, slots, max_objects)
+        header = self._ring.header
+        header["magic"] = MAGIC
+        header["version"] = VERSION
+        header["slot_count"] = slots
+        header["max_objects"] = max_objects
+        header["slot_size"] = self._ring.dtype.itemsize
+        header["write_index"] = 0
+        self._write_index = 0
+        self._batch_id = 0
+
+    def publish(self, source_id, frame_num, objects, buf_pts=0, ntp_timestamp=0,
+                batch_id=0):
+        """ Publishes one frame. objects is a sequence of (object_id,
+        class_id, confidence, left, top, width, height, tracker_confidence)
+        or an array of OBJECT_DTYPE; objects past max_objects are dropped. """
+        ring = self._ring
+        index = self._write_index
+        position = index % self.slots
+        count = min(len(objects), self.max_objects)
+
+        seq = int(ring.seq[position]) + 1
+        ring.seq[position] = seq  # odd: being written
+        ring.head[position] = (index, batch_id, source_id, frame_num, buf_pts, ntp_timestamp,
+                               count, len(objects) - count)
+        if isinstance(objects, np.ndarray):
+            ring.objects[position, :count] = objects[:count]
+        elif count:
+            ring.objects[position, :count] = [tuple(o) + (0,) for o in objects[:count]]
+        end = ring.objects_offset + count * OBJECT_DTYPE.itemsize
+        ring.crc[position] = zlib.crc32(ring.raw[position, PAYLOAD_OFFSET:end])
+        ring.seq[position] = seq + 1
+        self._write_index = index + 1
+        ring.header["write_index"] = index + 1
+
+    def publish_batch(self, batch_meta):
+        """ Publishes every frame of an NvDsBatchMeta """
+        l_frame = batch_meta.frame_meta_list
+        while l_frame is not None:
+            try:
+                frame_meta = pyds.NvDsFrameMeta.cast(l_frame.data)
+            except StopIteration:
+                break
+            objects = []
+            l_obj = frame_meta.obj_meta_list
+            while l_obj is not None:
+                try:
+                    obj_meta = pyds.NvDsObjectMeta.cast(l_obj.data)
+                except StopIteration:
+                    break
+                rect = obj_meta.rect_params
+                objects.append((obj_meta.object_id, obj_meta.class_id, obj_meta.confidence,
+                                rect.left, rect.top, rect.width, rect.height,
+                                obj_meta.tracker_confidence))
+                try:
+                    l_obj = l_obj.next
+                except StopIteration:
+                    break
+            self.publish(frame_meta.source_id, frame_meta.frame_num, objects,
+                         frame_meta.buf_pts, frame_meta.ntp_timestamp, self._batch_id)
+            try:
+                l_frame = l_frame.next
+            except StopIteration:
+                break
+        self._batch_id += 1
+
+    def probe(self, pad, info, u_data):
+        from gi.repository import Gst
+
+        gst_buffer = info.get_buffer()
+        if gst_buffer:
+            batch_meta = pyds.gst_buffer_get_nvds_batch_meta(hash(gst_buffer))
+            if batch_meta:
+                self.publish_batch(batch_meta)
+        return Gst.PadProbeReturn.OK
+
+    def close(self):
+        self._ring = None
+        self._shm.close()
+        self._shm.unlink()
+
+
+class ShmMetaReader:
+    """ Consumer side of a ring; any number of readers, in any process. The
+    segment is mapped read-only. Starts at the next published frame (or the
+    oldest one still in the ring with from_start=True). """
+
+    def __init__(self, name, from_start=False):
+        fd = os.open(os.path.join("/dev/shm", name.lstrip("/")), os.O_RDONLY)
+        try:
+            self._map = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        header = np.ndarray((), HEADER_DTYPE, self._map, 0)
+        if int(header["magic"]) != MAGIC or int(header["version"]) != VERSION:
+            del header
+            self._map.close()
+            raise ValueError("%s is not a metadata ring" % name)
+        self.max_objects = int(header["max_objects"])
+        self.slots = int(header["slot_count"])
+        self._ring = _Ring(self._map, self.slots, self.max_objects)
+        self.dtype = self._ring.dtype
+        write_index = int(header["write_index"])
+        self.next_index = max(0, write_index - self.slots) if from_start else write_index
+        self.lost = 0
+
+    def _valid(self, raw, index):
+        """ Whether the copied slot 'raw' holds frame 'index' and matches its crc """
+        frame = raw.view(self.dtype)[0]
+        count = int(frame["num_objects"])
+        if int(frame["index"]) != index or count > self.max_objects:
+            return False
+        end = self._ring.objects_offset + count * OBJECT_DTYPE.itemsize
+        return zlib.crc32(raw[PAYLOAD_OFFSET:end]) == int(frame["crc"])
+
+    def _read_slot(self, index):
+        """ Returns a consistent copy of frame 'index', or None if it was
+        overwritten (or could not be read consistently) """
+        ring = self._ring
+        position = index % self.slots
+        # Bounded, in case the publisher died in the middle of a write
+        for _ in range(MAX_READ_ATTEMPTS):
+            seq = int(ring.seq[position])
+            if seq & 1:
+                continue
+            copy = ring.raw[position].copy()
+            if int(ring.seq[position]) != seq:
+                continue
+            if self._valid(copy, index):
+                return copy.view(self.dtype)[0]
+            if int(copy.view(self.dtype)[0]["index"]) > index:
+                return None
+        return None
+
+    def _read_range(self, first, count):
+        """ Copies 'count' consecutive slots (no wrap) at once, re-reading
+        one by one only the slots that were being written """
+        ring = self._ring
+        position = first % self.slots
+        seq_before = ring.seq[position:position + count].copy()
+        block = ring.raw[position:position + count].copy()
+        seq_after = ring.seq[position:position + count]
+        frames = block.view(self.dtype).reshape(count)
+        indices = np.arange(first, first + count, dtype=np.uint64)
+        consistent = (seq_before == seq_after) & (seq_before & 1 == 0) & \
+            (frames["index"] == indices)
+        keep = np.ones(count, dtype=bool)
+        for i in range(count):
+            if consistent[i] and self._valid(block[i], first + i):
+                continue
+            frame = self._read_slot(first + i)
+            if frame is None:
+                keep[i] = False
+            else:
+                frames[i] = frame
+        self.lost += int(count - keep.sum())
+        return frames if keep.all() else frames[keep]
+
+    def poll(self, max_frames=None):
+        """ Returns the frames published since the last call, oldest first,
+        as an array of frame_dtype(); frame["objects"][:frame["num_objects"]]
+        are the objects of a frame. """
+        write_index = int(self._ring.header["write_index"])
+        oldest = write_index - self.slots
+        if self.next_index < oldest:
+            self.lost += oldest - self.next_index
+            self.next_index = oldest
+        end = write_index if max_frames is None else min(write_index,
+                                                         self.next_index + max_frames)
+        chunks = []
+        while self.next_index < end:
+            position = self.next_index % self.slots
+            count = min(end - self.next_index, self.slots - position)
+            chunks.append(self._read_range(self.next_index, count))
+            self.next_index += count
+        if not chunks:
+            return np.empty(0, self.dtype)
+        return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
+    def frames(self, poll_interval=0.001):
+        """ Yields frames as they are published """
+        while True:
+            new_frames = self.poll()
+            if not len(new_frames):
+                time.sleep(poll_interval)
+            for frame in new_frames:
+                yield frame
+
+    def close(self):
+        self._ring = None
+        self._map.close()
+
+
+# ---- benchmark ----
+
+def _consume(name, frames, result):
+    reader = ShmMetaReader(name, from_start=True)
+    received = objects = 0
+    start = time.perf_counter()
+    while received + reader.lost < frames:
+        new_frames = reader.poll()
+        if not len(new_frames):
+            time.sleep(0)
+            continue
+        received += len(new_frames)
+        objects += int(new_frames["num_objects"].sum())
+    elapsed = time.perf_counter() - start
+    result.put((received, reader.lost, objects, elapsed))
+    reader.close()
+
+
+def bench(frames, num_objects, slots, readers):
+    name = "ds_meta_bench_%d" % multiprocessing.current_process().pid
+    publisher = ShmMetaPublisher(name, slots=slots, max_objects=max(num_objects, 1))
+    objects = np.zeros(num_objects, OBJECT_DTYPE)
+    objects["object_id"] = np.arange(num_objects)
+    objects["class_id"] = np.arange(num_objects) % 4
+    objects["width"] = 50.0
+    result = multiprocessing.Queue()
+    consumers = [multiprocessing.Process(target=_consume, args=(name, frames, result))
+                 for _ in range(readers)]
+    for consumer in consumers:
+        consumer.start()
+    time.sleep(0.5)
+    start = time.perf_counter()
+    for i in range(frames):
+        publisher.publish(i % 16, i // 16, objects, batch_id=i // 16)
+    produce_time = time.perf_counter() - start
+    results = [result.get() for _ in consumers]
+    for consumer in consumers:
+        consumer.join()
+    publisher.close()
+
+    print("%d frames of %d objects, %d slots of %d bytes" % (
+        frames, num_objects, slots, frame_dtype(num_objects).itemsize))
+    print("producer: %10.0f frames/s  %8.2f us/frame" % (
+        frames / produce_time, produce_time / frames * 1e6))
+    for i, (received, lost, n_objects, elapsed) in enumerate(results):
+        print("reader %d: %10.0f frames/s  received %d, lost %d, %d objects" % (
+            i, received / elapsed, received, lost, n_objects))
+
+
+def tail(name):
+    """ Prints the frames and objects received per second from ring 'name' """
+    reader = ShmMetaReader(name)
+    last = time.monotonic()
+    frames = objects = 0
+    try:
+        while True:
+            new_frames = reader.poll()
+            if not len(new_frames):
+                time.sleep(0.005)
+            frames += len(new_frames)
+            objects += int(new_frames["num_objects"].sum())
+            now = time.monotonic()
+            if now - last >= 1.0:
+                print("%8.1f frames/s %10.1f objects/s  lost %d" % (
+                    frames / (now - last), objects / (now - last), reader.lost))
+                last, frames, objects = now, 0, 0
+    except KeyboardInterrupt:
+        pass
+    reader.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--bench", action="store_true",
+                      help="Run the producer/consumer throughput benchmark")
+    mode.add_argument("--read", metavar="NAME",
+                      help="Print the rate of frames published to ring NAME")
+    parser.add_argument("--frames", type=int, default=200000)
+    parser.add_argument("--objects", type=int, default=20, help="Objects per frame")
+    parser.add_argument("--slots", type=int, default=4096)
+    parser.add_argument("--readers", type=int, default=1, help="Consumer processes")
+    args = parser.parse_args()
+    if args.read:
+        tail(args.read)
+    else:
+        bench(args.frames, args.objects, args.slots, args.readers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
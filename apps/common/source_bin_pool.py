@@ -0,0 +1,271 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import sys
+import time
+from collections import deque
+from threading import Lock
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import GLib, Gst
+
+DEFAULT_CLASS = "default"
+TTFF_HISTORY = 1024
+
+
+def codec_class(media_type, width, height):
+    """ Pool class key for a video stream, e.g. ("video/x-h264", 1920, 1080)
+    -> "h264-1920x1080" """
+    codec = media_type.rsplit("/", 1)[-1]
+    if codec.startswith("x-"):
+        codec = codec[2:]
+    return f"{codec}-{width}x{height}"
+
+
+def discover_codec_class(uri, timeout_s=5):
+    """ Codec/resolution class of the first video stream of uri, probed with
+    GstPbutils.Discoverer, or DEFAULT_CLASS if it cannot be determined.
+    Blocks for up to timeout_s, so call it once per distinct uri, e.g. at
+    startup, and pass the result as the source's user_data. """
+    gi.require_version('GstPbutils', '1.0')
+    from gi.repository import GstPbutils
+
+    try:
+        discoverer = GstPbutils.Discoverer.new(timeout_s * Gst.SECOND)
+        info = discoverer.discover_uri(uri)
+    except GLib.Error as e:
+        sys.stderr.write(f"Unable to discover {uri}: {e.message}\n")
+        return DEFAULT_CLASS
+    for stream in info.get_video_streams():
+        caps = stream.get_caps()
+        if caps is not None and caps.get_size() > 0:
+            return codec_class(caps.get_structure(0).get_name(),
+                               stream.get_width(), stream.get_height())
+    return DEFAULT_CLASS
+
+
+class WarmSourceBin:
+    """ Retargetable source bin: urisourcebin -> parsebin -> nvv4l2decoder
+
+    The decoder is created once and kept in READY while the bin is parked,
+    so attaching a new camera skips element creation and opening the decoder
+    device. Parked bins are not pre-rolled: nothing flows in READY, so caps
+    negotiation, the parsebin autoplugging of the new stream and the decoder
+    buffer allocation still happen after attach. The bin exposes a static
+    "src" ghost pad that can be linked to the streammux as soon as the bin
+    is attached.
+    """
+
+    def __init__(self, name, codec_class, decoder_properties):
+        self.codec_class = codec_class
+        self.uri = None
+        self.attach_time = None
+        self.bin = Gst.Bin.new(name)
+        self._source = Gst.ElementFactory.make("urisourcebin", f"{name}-src")
+        self._parser = Gst.ElementFactory.make("parsebin", f"{name}-parse")
+        self._decoder = Gst.ElementFactory.make("nvv4l2decoder", f"{name}-dec")
+        if not self._source or not self._parser or not self._decoder:
+            raise Exception(f"Unable to create warm source bin {name}")
+        for key, val in decoder_properties.items():
+            self._decoder.set_property(key, val)
+
+        for elm in (self._source, self._parser, self._decoder):
+            self.bin.add(elm)
+        self._source.connect("pad-added", self._cb_source_pad)
+        self._parser.connect("pad-added", self._cb_parser_pad)
+        self.bin.add_pad(
+            Gst.GhostPad.new("src", self._decoder.get_static_pad("src")))
+
+    def retarget(self, uri):
+        """ Point the parked bin at a new uri. The bin must be in READY. """
+        self.uri = uri
+        self._source.set_property("uri", uri)
+
+    def park(self):
+        """ Move to READY, which keeps the decoder device open without
+        requiring any data. Returns False (and shuts the bin down) if the
+        state change failed. """
+        if self.bin.set_state(Gst.State.READY) == Gst.StateChangeReturn.FAILURE:
+            sys.stderr.write(f"Unable to park {self.bin.get_name()}\n")
+            self.bin.set_state(Gst.State.NULL)
+            return False
+        return True
+
+    def watch_buffers(self, callback):
+        """ callback(self) runs for every buffer leaving the bin """
+        def probe(pad, info, warm):
+            callback(warm)
+            return Gst.PadProbeReturn.OK
+
+        self.bin.get_static_pad("src").add_probe(
+            Gst.PadProbeType.BUFFER, probe, self)
+
+    def _cb_source_pad(self, element, pad):
+        sinkpad = self._parser.get_static_pad("sink")
+        if sinkpad.is_linked():
+            sinkpad.unlink(sinkpad.get_peer())
+        pad.link(sinkpad)
+
+    def _cb_parser_pad(self, element, pad):
+        caps = pad.get_current_caps() or pad.query_caps()
+        if not caps.get_structure(0).get_name().startswith("video"):
+            return
+        sinkpad = self._decoder.get_static_pad("sink")
+        if sinkpad.is_linked():
+            sinkpad.unlink(sinkpad.get_peer())
+        if pad.link(sinkpad) != Gst.PadLinkReturn.OK:
+            sys.stderr.write(f"Failed to link parser to decoder for {self.uri}\n")
+
+
+class SourceBinPool:
+    """ Pool of pre-created decoder bins, grouped by codec/resolution class.
+
+    Pass bin_factory and bin_releaser to SourceManager, which adds the bins
+    to the pipeline and links their static "src" pad to the streammux. The
+    codec class of a source is taken from the user_data passed to
+    SourceManager.add_source (e.g. "h264-1080p"); sources without one use
+    DEFAULT_CLASS; discover_codec_class() derives it from a uri. Parked bins
+    are kept in READY so the decoder device stays open, but they are not
+    pre-rolled (see WarmSourceBin). After an acquire the pool is topped up to
+    min_idle from a GLib idle callback, outside the attach path. bin_class
+    builds the pooled bins and defaults to WarmSourceBin.
+
+    stats() reports pool hits/misses and time-to-first-frame, measured from
+    the attach request to the first decoded buffer on the bin's src pad.
+    """
+
+    def __init__(self, classes=None, min_idle=1, decoder_properties=None,
+                 bin_class=WarmSourceBin):
+        self._min_idle = min_idle
+        self._bin_class = bin_class
+        self._decoder_properties = decoder_properties or {}
+        self._idle = {}
+        self._attached = {}
+        self._lock = Lock()
+        self._counter = 0
+        self._refill_pending = False
+        self._stats = {}
+        for codec_class in (classes or [DEFAULT_CLASS]):
+            self._idle[codec_class] = deque()
+            self._stats[codec_class] = self._new_stats()
+
+    @staticmethod
+    def _new_stats():
+        return {"hits": 0, "misses": 0, "ttff": deque(maxlen=TTFF_HISTORY)}
+
+    def prewarm(self):
+        """ Create min_idle bins for every class. Call before the main loop
+        runs or from the main loop thread. """
+        for codec_class in list(self._idle.keys()):
+            while self.num_idle(codec_class) < self._min_idle:
+                self._park(self._create(codec_class))
+
+    def num_idle(self, codec_class=DEFAULT_CLASS):
+        with self._lock:
+            return len(self._idle.get(codec_class, ()))
+
+    def _create(self, codec_class):
+        with self._lock:
+            self._counter += 1
+            name = f"warm-bin-{codec_class}-{self._counter:03}"
+        warm = self._bin_class(name, codec_class, self._decoder_properties)
+        warm.watch_buffers(self._on_first_buffer)
+        return warm
+
+    def _park(self, warm):
+        if not warm.park():
+            return
+        with self._lock:
+            self._idle.setdefault(warm.codec_class, deque()).append(warm)
+            self._stats.setdefault(warm.codec_class, self._new_stats())
+
+    def _acquire(self, codec_class):
+        with self._lock:
+            idle = self._idle.setdefault(codec_class, deque())
+            stats = self._stats.setdefault(codec_class, self._new_stats())
+            warm = idle.popleft() if idle else None
+            stats["hits" if warm else "misses"] += 1
+        if warm is None:
+            warm = self._create(codec_class)
+        self._schedule_refill()
+        return warm
+
+    def _schedule_refill(self):
+        with self._lock:
+            if self._refill_pending:
+                return
+            self._refill_pending = True
+        GLib.idle_add(self._refill)
+
+    def _refill(self):
+        with self._lock:
+            self._refill_pending = False
+        self.prewarm()
+        return GLib.SOURCE_REMOVE
+
+    # SourceManager hooks
+
+    def bin_factory(self, source):
+        codec_class = source.user_data if isinstance(source.user_data, str) \
+            else DEFAULT_CLASS
+        warm = self._acquire(codec_class)
+        warm.retarget(source.uri)
+        warm.attach_time = time.monotonic()
+        with self._lock:
+            self._attached[warm.bin.get_name()] = warm
+        return warm.bin
+
+    def bin_releaser(self, source, bin):
+        with self._lock:
+            warm = self._attached.pop(bin.get_name(), None)
+        if warm is None:
+            bin.set_state(Gst.State.NULL)
+            return
+        warm.uri = None
+        warm.attach_time = None
+        self._park(warm)
+
+    def _on_first_buffer(self, warm):
+        attach_time = warm.attach_time
+        if attach_time is not None:
+            warm.attach_time = None
+            with self._lock:
+                self._stats[warm.codec_class]["ttff"].append(
+                    time.monotonic() - attach_time)
+
+    def stats(self):
+        """ Per class dict with idle, hits, misses and time-to-first-frame
+        count/mean/p50/p95/max in milliseconds """
+        result = {}
+        with self._lock:
+            for codec_class, stats in self._stats.items():
+                ttff = sorted(stats["ttff"])
+                entry = {
+                    "idle": len(self._idle.get(codec_class, ())),
+                    "hits": stats["hits"],
+                    "misses": stats["misses"],
+                    "ttff_count": len(ttff),
+                }
+                if ttff:
+                    entry["ttff_mean_ms"] = round(1000 * sum(ttff) / len(ttff), 2)
+                    entry["ttff_p50_ms"] = round(1000 * ttff[len(ttff) // 2], 2)
+                    entry["ttff_p95_ms"] = round(
+                        1000 * ttff[min(len(ttff) - 1, int(0.95 * len(ttff)))], 2)
+                    entry["ttff_max_ms"] = round(1000 * ttff[-1], 2)
+                result[codec_class] = entry
+        return result
@@ -0,0 +1,317 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import sys
+from collections import deque
+from threading import Lock
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import GLib, Gst
+
+
+class SlotAllocator:
+    """ Free-list of streammux sink pad indices.
+
+    acquire() and release() are O(1). Released indices go to the back of the
+    free-list so a pad that was just flushed and released is the last one to
+    be handed out again.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._free = deque(range(capacity))
+        self._in_use = set()
+
+    def acquire(self):
+        if not self._free:
+            return None
+        index = self._free.popleft()
+        self._in_use.add(index)
+        return index
+
+    def release(self, index):
+        if index not in self._in_use:
+            raise ValueError(f"Slot {index} is not in use")
+        self._in_use.remove(index)
+        self._free.append(index)
+
+    def in_use(self, index):
+        return index in self._in_use
+
+    def num_free(self):
+        return len(self._free)
+
+    def num_used(self):
+        return len(self._in_use)
+
+
+class Source:
+    """ Book-keeping for one source attached to the streammux """
+
+    __slots__ = ("source_id", "uri", "bin", "sinkpad", "eos", "user_data")
+
+    def __init__(self, source_id, uri, user_data=None):
+        self.source_id = source_id
+        self.uri = uri
+        self.bin = None
+        self.sinkpad = None
+        self.eos = False
+        self.user_data = user_data
+
+
+class SourceManager:
+    """ Adds and removes uridecodebin sources feeding a nvstreammux at runtime.
+
+    All pipeline mutations run on the GLib main loop. The public add/remove
+    methods only queue work with GLib.idle_add, so they can be called from any
+    thread (e.g. a control-plane RPC handler) without blocking it or racing
+    the streaming threads. Batched variants schedule a single main loop
+    dispatch for the whole batch.
+
+    Listeners registered with add_listener() are called on the main loop as
+    listener(manager) after each add/remove dispatch changed the source set.
+    """
+
+    def __init__(self, pipeline, streammux, max_sources, decoder_properties=None,
+                 bin_factory=None, bin_releaser=None):
+        self._pipeline = pipeline
+        self._streammux = streammux
+        self._slots = SlotAllocator(max_sources)
+        self._sources = {}
+        self._lock = Lock()
+        self._listeners = []
+        # Properties applied to every nvv4l2decoder created inside a source bin
+        self._decoder_properties = decoder_properties or {}
+        # bin_factory(source) -> Gst.Element, defaults to a fresh uridecodebin
+        self._bin_factory = bin_factory or self._make_uridecodebin
+        # bin_releaser(source, bin) takes back a detached bin instead of
+        # destroying it, e.g. to park it in a warm pool (see source_bin_pool.py)
+        self._bin_releaser = bin_releaser
+
+    @property
+    def max_sources(self):
+        return self._slots.capacity
+
+    @property
+    def num_sources(self):
+        with self._lock:
+            return len(self._sources)
+
+    def source_ids(self):
+        with self._lock:
+            return list(self._sources.keys())
+
+    def active_source_ids(self):
+        """ Ids of sources which have not reported stream-eos yet. EOS sources
+        stay in source_ids() until their queued removal has run. """
+        with self._lock:
+            return [s.source_id for s in self._sources.values() if not s.eos]
+
+    def get_source(self, source_id):
+        with self._lock:
+            return self._sources.get(source_id)
+
+    def is_full(self):
+        with self._lock:
+            return self._slots.num_free() == 0
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    # Thread-safe API, marshalled onto the GLib main loop
+
+    def add_source(self, uri, callback=None, user_data=None):
+        """ Queue adding one source. callback(source_id or None) runs on the
+        main loop once the bin is in the pipeline. """
+        self.add_sources([uri], callback and (lambda ids: callback(ids[0])),
+                         user_data)
+
+    def add_sources(self, uris, callback=None, user_data=None):
+        """ Queue adding several sources in one main loop dispatch.
+        callback(list of source_id or None) runs once for the batch. """
+        GLib.idle_add(self._dispatch_add, list(uris), callback, user_data)
+
+    def remove_source(self, source_id, callback=None):
+        """ Queue removing one source. callback(bool) runs on the main loop. """
+        self.remove_sources([source_id],
+                            callback and (lambda res: callback(res[0])))
+
+    def remove_sources(self, source_ids, callback=None):
+        """ Queue removing several sources in one main loop dispatch.
+        callback(list of bool) runs once for the batch. """
+        GLib.idle_add(self._dispatch_remove, list(source_ids), callback)
+
+    def remove_eos_sources(self, callback=None):
+        """ Queue removing every source which already reported stream-eos """
+        with self._lock:
+            eos_ids = [s.source_id for s in self._sources.values() if s.eos]
+        if eos_ids:
+            self.remove_sources(eos_ids, callback)
+
+    def handle_bus_message(self, message):
+        """ Mark a source as EOS from a nvstreammux "stream-eos" element
+        message. Returns True if the message was consumed. """
+        struct = message.get_structure()
+        if struct is None or not struct.has_name("stream-eos"):
+            return False
+        parsed, stream_id = struct.get_uint("stream-id")
+        if parsed:
+            with self._lock:
+                source = self._sources.get(stream_id)
+                if source:
+                    source.eos = True
+        return True
+
+    # Main loop side
+
+    def add_source_sync(self, uri, user_data=None):
+        """ Add a source immediately. Only call this from the main loop thread
+        or before the main loop runs, e.g. for the initial sources. """
+        source_id = self._add_now(uri, user_data)
+        if source_id is not None:
+            self._notify()
+        return source_id
+
+    def _dispatch_add(self, uris, callback, user_data):
+        added = [self._add_now(uri, user_data) for uri in uris]
+        if any(source_id is not None for source_id in added):
+            self._notify()
+        if callback:
+            callback(added)
+        return GLib.SOURCE_REMOVE
+
+    def _dispatch_remove(self, source_ids, callback):
+        removed = [self._remove_now(source_id) for source_id in source_ids]
+        if any(removed):
+            self._notify()
+        if callback:
+            callback(removed)
+        return GLib.SOURCE_REMOVE
+
+    def _add_now(self, uri, user_data):
+        with self._lock:
+            source_id = self._slots.acquire()
+            if source_id is None:
+                sys.stderr.write(f"No free streammux slot for {uri}\n")
+                return None
+            source = Source(source_id, uri, user_data)
+            self._sources[source_id] = source
+
+        source.bin = self._bin_factory(source)
+        if not source.bin:
+            sys.stderr.write(f"Failed to create source bin for {uri}\n")
+            self._forget(source)
+            return None
+        if source.bin.get_parent() is None:
+            self._pipeline.add(source.bin)
+        # Bins with a static "src" pad (e.g. pooled bins) are linked right
+        # away, uridecodebin links from its pad-added callback instead
+        srcpad = source.bin.get_static_pad("src")
+        if srcpad is not None and not self.link_to_streammux(source, srcpad):
+            self._teardown(source)
+            self._forget(source)
+            return None
+        if not source.bin.sync_state_with_parent():
+            sys.stderr.write(f"Failed to start source bin for {uri}\n")
+            self._teardown(source)
+            self._forget(source)
+            return None
+        return source_id
+
+    def _remove_now(self, source_id):
+        with self._lock:
+            source = self._sources.get(source_id)
+        if source is None:
+            return False
+        self._teardown(source)
+        self._forget(source)
+        return True
+
+    def _forget(self, source):
+        with self._lock:
+            del self._sources[source.source_id]
+            self._slots.release(source.source_id)
+
+    def _teardown(self, source):
+        if source.bin is None:
+            return
+        # A bin handed back to its releaser is only stopped to READY so that
+        # its decoder does not have to be created again
+        target = Gst.State.READY if self._bin_releaser else Gst.State.NULL
+        state_return = source.bin.set_state(target)
+        if state_return == Gst.StateChangeReturn.ASYNC:
+            source.bin.get_state(Gst.CLOCK_TIME_NONE)
+        self.release_sinkpad(source)
+        if source.bin.get_parent() is not None:
+            self._pipeline.remove(source.bin)
+        bin, source.bin = source.bin, None
+        if self._bin_releaser:
+            self._bin_releaser(source, bin)
+
+    def _notify(self):
+        for listener in self._listeners:
+            listener(self)
+
+    # Streammux pad handling
+
+    def link_to_streammux(self, source, pad):
+        """ Link a decoded video pad of a source bin to its streammux slot """
+        if source.sinkpad is None:
+            source.sinkpad = self._streammux.request_pad_simple(
+                f"sink_{source.source_id}")
+            if not source.sinkpad:
+                sys.stderr.write("Unable to create sink pad bin \n")
+                return False
+        if pad.link(source.sinkpad) != Gst.PadLinkReturn.OK:
+            sys.stderr.write("Failed to link decodebin to pipeline\n")
+            return False
+        return True
+
+    def release_sinkpad(self, source):
+        if source.sinkpad is None:
+            return
+        # Send flush stop event to the sink pad, then release from the streammux
+        source.sinkpad.send_event(Gst.Event.new_flush_stop(False))
+        self._streammux.release_request_pad(source.sinkpad)
+        source.sinkpad = None
+
+    def _make_uridecodebin(self, source):
+        bin = Gst.ElementFactory.make("uridecodebin",
+                                      f"source-bin-{source.source_id:02}")
+        if not bin:
+            return None
+        bin.set_property("uri", source.uri)
+        bin.connect("pad-added", self._cb_newpad, source)
+        bin.connect("child-added", self._decodebin_child_added, source)
+        return bin
+
+    def _cb_newpad(self, decodebin, pad, source):
+        caps = pad.get_current_caps()
+        if not caps:
+            caps = pad.query_caps()
+        gstname = caps.get_structure(0).get_name()
+        # Need to check if the pad created by the decodebin is for video and not audio.
+        if gstname.find("video") != -1:
+            self.link_to_streammux(source, pad)
+
+    def _decodebin_child_added(self, child_proxy, Object, name, source):
+        if name.find("decodebin") != -1:
+            Object.connect("child-added", self._decodebin_child_added, source)
+        if name.find("nvv4l2decoder") != -1:
+            for key, val in self._decoder_properties.items():
+                Object.set_property(key, val)
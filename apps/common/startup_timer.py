@@ -0,0 +1,80 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import sys
+import time
+
+# Only imports gi when watching a pipeline: the timer is created before the
+# gi/pyds imports, so that it can measure how long they take.
+
+
+class StartupTimer:
+    """ Wall clock time of the startup phases of an app.
+
+    mark() closes the current phase; the apps mark "import", "Gst.init",
+    "element creation" and, through watch_pipeline(), "state change to
+    PLAYING". report() prints the phases, or nothing unless enabled.
+    """
+
+    def __init__(self, enabled=True, clock=time.perf_counter):
+        self.enabled = enabled
+        self._clock = clock
+        self.start = clock()
+        self._last = self.start
+        self.phases = []
+        self._on_playing = None
+
+    def mark(self, phase):
+        """ Records the time since the previous mark as 'phase' """
+        now = self._clock()
+        self.phases.append((phase, now - self._last, now - self.start))
+        self._last = now
+
+    def total(self):
+        return self._last - self.start
+
+    def watch_pipeline(self, pipeline, on_playing=None):
+        """ Marks "state change to PLAYING" when the pipeline reaches PLAYING,
+        then calls on_playing(timer), by default report(). Uses the bus signal
+        watch of the app, which must be added before. """
+        from gi.repository import Gst
+
+        self._on_playing = on_playing or (lambda timer: timer.report())
+        bus = pipeline.get_bus()
+        handler = []
+
+        def on_message(bus, message):
+            if message.src != pipeline:
+                return
+            _, new_state, _ = message.parse_state_changed()
+            if new_state != Gst.State.PLAYING:
+                return
+            bus.disconnect(handler[0])
+            self.mark("state change to PLAYING")
+            self._on_playing(self)
+
+        handler.append(bus.connect("message::state-changed", on_message))
+
+    def report(self, file=None):
+        if not self.enabled:
+            return
+        file = file or sys.stdout
+        print("Startup timing:", file=file)
+        for phase, duration, elapsed in self.phases:
+            print("  %-26s %9.1f ms  (at %9.1f ms)" % (phase, duration * 1000.0, elapsed * 1000.0),
+                  file=file)
+        print("  %-26s %9.1f ms" % ("total", self.total() * 1000.0), file=file)
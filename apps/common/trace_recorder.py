@@ -0,0 +1,297 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import json
+import threading
+import time
+
+try:
+    import pyds
+except ImportError:
+    pyds = None
+
+# Spans waiting for the src pad of an element, per element; entries of
+# buffers that never leave (e.g. streammux inputs) are dropped past this
+MAX_PENDING = 256
+
+# Perfetto TrackEvent types
+SLICE_BEGIN = 1
+SLICE_END = 2
+INSTANT = 3
+
+
+def batch_tags(gst_buffer):
+    """ (source_id, frame_num) of the first frame of a batched buffer, or
+    (-1, -1) without batch meta """
+    if pyds is None or gst_buffer is None:
+        return -1, -1
+    batch_meta = pyds.gst_buffer_get_nvds_batch_meta(hash(gst_buffer))
+    if not batch_meta or batch_meta.frame_meta_list is None:
+        return -1, -1
+    frame_meta = pyds.NvDsFrameMeta.cast(batch_meta.frame_meta_list.data)
+    return frame_meta.source_id, frame_meta.frame_num
+
+
+class TraceRecorder:
+    """ Per-buffer activity of a pipeline, for chrome://tracing or Perfetto.
+
+    Spans (probe calls, time spent in an element or waiting in a queue) and
+    instants are written into a ring of 'capacity' preallocated slots, the
+    oldest being overwritten, and tagged with the source id and frame number
+    of the buffer (tagger(gst_buffer), by default the first frame of the batch
+    meta). dump() writes the last 'capacity' events as Chrome trace JSON or,
+    for a .pftrace/.perfetto-trace path, as a Perfetto protobuf trace.
+
+    A disabled recorder attaches no probe and wrap_probe() returns the probe
+    unchanged, so leaving the calls in an app costs nothing.
+    """
+
+    def __init__(self, capacity=262144, enabled=True, tagger=batch_tags,
+                 clock=time.perf_counter_ns):
+        self.enabled = enabled
+        self.capacity = capacity
+        self._tagger = tagger
+        self._clock = clock
+        self._events = [None] * capacity if enabled else []
+        self._next = 0
+        self._lock = threading.Lock()
+        self.origin = clock()
+
+    # ---- recording ----
+
+    def record(self, name, cat, track, start_ns, dur_ns, source_id=-1, frame_num=-1):
+        """ Records a span, or an instant with dur_ns < 0 """
+        if not self.enabled:
+            return
+        with self._lock:
+            index = self._next
+            self._next = index + 1
+        self._events[index % self.capacity] = (start_ns, dur_ns, name, cat, track,
+                                               source_id, frame_num)
+
+    def instant(self, name, cat, track, source_id=-1, frame_num=-1):
+        self.record(name, cat, track, self._clock(), -1, source_id, frame_num)
+
+    def dropped(self):
+        """ Number of events overwritten so far """
+        return max(0, self._next - self.capacity)
+
+    def events(self):
+        """ Returns the recorded events, oldest first """
+        with self._lock:
+            count = self._next
+        if count <= self.capacity:
+            events = self._events[:count]
+        else:
+            start = count % self.capacity
+            events = self._events[start:] + self._events[:start]
+        return [e for e in events if e is not None]
+
+    def wrap_probe(self, probe, name=None):
+        """ Returns probe, recording a span around each call. For
+        pad.add_probe() and the set_probe() of the test pipelines. """
+        if not self.enabled:
+            return probe
+        name = name or probe.__name__
+        clock = self._clock
+
+        def traced_probe(pad, info, u_data):
+            start = clock()
+            try:
+                return probe(pad, info, u_data)
+            finally:
+                end = clock()
+                source_id, frame_num = self._tagger(info.get_buffer())
+                self.record(name, "probe", _pad_track(pad), start, end - start,
+                            source_id, frame_num)
+
+        return traced_probe
+
+    def trace_element(self, element):
+        """ Records the time from a buffer entering a sink pad of element to
+        it leaving a src pad (matched by PTS): the processing time, or the
+        time spent waiting for a queue. """
+        if not self.enabled:
+            return
+        from gi.repository import Gst
+
+        name = element.get_name()
+        factory = element.get_factory()
+        cat = "queue" if factory and factory.get_name() == "queue" else "element"
+        pending = {}
+        clock = self._clock
+
+        def enter(pad, info, u_data):
+            gst_buffer = info.get_buffer()
+            if gst_buffer is not None:
+                if len(pending) >= MAX_PENDING:
+                    pending.pop(next(iter(pending)), None)
+                pending[gst_buffer.pts] = (clock(),) + tuple(self._tagger(gst_buffer))
+            return Gst.PadProbeReturn.OK
+
+        def leave(pad, info, u_data):
+            gst_buffer = info.get_buffer()
+            entry = pending.pop(gst_buffer.pts, None) if gst_buffer is not None else None
+            if entry is not None:
+                start, source_id, frame_num = entry
+                self.record(name, cat, name, start, clock() - start, source_id, frame_num)
+            return Gst.PadProbeReturn.OK
+
+        for pad in element.iterate_pads():
+            callback = enter if pad.direction == Gst.PadDirection.SINK else leave
+            pad.add_probe(Gst.PadProbeType.BUFFER, callback, 0)
+
+    def trace_pipeline(self, pipeline, factories=None):
+        """ trace_element() for every element of pipeline (recursively, bins
+        excepted), or only those made by the given factories """
+        if not self.enabled:
+            return
+        from gi.repository import Gst
+
+        iterator = pipeline.iterate_recurse()
+        while True:
+            result, element = iterator.next()
+            if result == Gst.IteratorResult.RESYNC:
+                iterator.resync()
+                continue
+            if result != Gst.IteratorResult.OK:
+                break
+            if isinstance(element, Gst.Bin):
+                continue
+            factory = element.get_factory()
+            if factories is None or (factory and factory.get_name() in factories):
+                self.trace_element(element)
+
+    # ---- output ----
+
+    def _lanes(self, events):
+        """ Spreads the events of a track over as many lanes as needed for
+        spans not to overlap (queues hold several buffers at once). Returns
+        (lane track name, event) pairs. """
+        lane_ends = {}
+        placed = []
+        for event in sorted(events, key=lambda e: e[0]):
+            start, dur, track = event[0], event[1], event[4]
+            ends = lane_ends.setdefault(track, [])
+            lane = 0
+            if dur >= 0:
+                while lane < len(ends) and ends[lane] > start:
+                    lane += 1
+                if lane == len(ends):
+                    ends.append(0)
+                ends[lane] = start + dur
+            placed.append((track if lane == 0 else "%s #%d" % (track, lane), event))
+        return placed
+
+    def chrome_trace(self):
+        tids = {}
+        trace_events = []
+        for track, (start, dur, name, cat, _, source_id, frame_num) in \
+                self._lanes(self.events()):
+            tid = tids.setdefault(track, len(tids) + 1)
+            event = {"name": name, "cat": cat, "pid": 1, "tid": tid,
+                     "ts": (start - self.origin) / 1000.0,
+                     "args": {"source_id": source_id, "frame_num": frame_num}}
+            if dur >= 0:
+                event["ph"] = "X"
+                event["dur"] = dur / 1000.0
+            else:
+                event["ph"] = "i"
+                event["s"] = "t"
+            trace_events.append(event)
+        for track, tid in tids.items():
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                                 "args": {"name": track}})
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": str(self.dropped())}}
+
+    def perfetto_trace(self):
+        """ Returns the events as a serialized perfetto.protos.Trace """
+        sequence_id = 1
+        uuids = {}
+        packets = []
+        for track, (start, dur, name, cat, _, source_id, frame_num) in \
+                self._lanes(self.events()):
+            if track not in uuids:
+                uuids[track] = len(uuids) + 1
+                descriptor = _field_varint(1, uuids[track]) + _field_string(2, track)
+                packets.append(_field_bytes(60, descriptor)
+                               + _field_varint(10, sequence_id))
+            annotations = (_field_bytes(4, _field_string(10, "source_id")
+                                        + _field_varint(4, _int64(source_id)))
+                           + _field_bytes(4, _field_string(10, "frame_num")
+                                          + _field_varint(4, _int64(frame_num))))
+            track_event = (_field_varint(9, SLICE_BEGIN if dur >= 0 else INSTANT)
+                           + _field_varint(11, uuids[track]) + _field_string(22, cat)
+                           + _field_string(23, name) + annotations)
+            packets.append(_field_varint(8, start) + _field_bytes(11, track_event)
+                           + _field_varint(10, sequence_id))
+            if dur >= 0:
+                end_event = _field_varint(9, SLICE_END) + _field_varint(11, uuids[track])
+                packets.append(_field_varint(8, start + dur) + _field_bytes(11, end_event)
+                               + _field_varint(10, sequence_id))
+        if packets:
+            # sequence_flags = SEQ_INCREMENTAL_STATE_CLEARED on the first packet
+            packets[0] += _field_varint(13, 1)
+        # Trace.packet = 1
+        return b"".join(_field_bytes(1, packet) for packet in packets)
+
+    def dump(self, path):
+        """ Writes the trace, as Perfetto protobuf for .pftrace and
+        .perfetto-trace paths, else as Chrome trace JSON """
+        if path.endswith((".pftrace", ".perfetto-trace")):
+            with open(path, "wb") as f:
+                f.write(self.perfetto_trace())
+        else:
+            with open(path, "w") as f:
+                json.dump(self.chrome_trace(), f)
+
+
+def _pad_track(pad):
+    parent = pad.get_parent()
+    return "%s:%s" % (parent.get_name() if parent else "", pad.get_name())
+
+
+# Minimal protobuf encoding, enough for the Perfetto trace packets above
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _int64(value):
+    """ Negative int64 values are encoded as two's complement on 64 bits """
+    return value & 0xffffffffffffffff
+
+
+def _field_varint(number, value):
+    return _varint(number << 3) + _varint(value)
+
+
+def _field_bytes(number, data):
+    return _varint((number << 3) | 2) + _varint(len(data)) + data
+
+
+def _field_string(number, text):
+    return _field_bytes(number, text.encode("utf-8"))
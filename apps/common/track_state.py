@@ -0,0 +1,490 @@
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+""" Per-track state in preallocated NumPy columns, bounded in memory.
+
+Each (source_id, object_id) track gets a slot; its state is one row across
+the columns (source_id, object_id, class_id, first_seen, last_seen, hits,
+confidence, left, top, width, height, plus the caller's fields). The slot of
+a track is found through an open addressing hash table (linear probing,
+tombstones on removal, rebuilt when they pile up), looked up and filled for
+a whole batch of objects at once.
+
+Tracks not seen for ttl time units are expired by a vectorized sweep. When a
+batch brings more new tracks than free slots, the least recently seen tracks
+are evicted, so memory stays at what the constructor allocated however many
+tracker ids go by. New tracks that do not fit even then (more of them in one
+batch than the capacity minus the tracks the batch sees again) are dropped
+and counted.
+
+  python3 track_state.py --bench [--tracks 100000] [--batch 64] [--updates 5000]
+"""
+
+import argparse
+import sys
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+try:
+    import pyds
+except ImportError:
+    pyds = None
+
+UNTRACKED_OBJECT_ID = 0xFFFFFFFFFFFFFFFF
+
+BASE_FIELDS = [
+    ("source_id", "<u4"), ("class_id", "<i4"), ("object_id", "<u8"),
+    ("first_seen", "<f8"), ("last_seen", "<f8"), ("hits", "<u4"),
+    ("confidence", "<f4"), ("left", "<f4"), ("top", "<f4"), ("width", "<f4"),
+    ("height", "<f4"),
+]
+
+# Hash table entry states
+EMPTY = 0
+USED = 1
+DELETED = 2
+
+# The hash table has at least capacity / MAX_LOAD entries
+MAX_LOAD = 0.5
+
+# Probe rounds done for the whole batch at once; the few keys still probing
+# after that (clustered entries) are finished one by one, which is cheaper
+# than more rounds of array operations on a handful of elements
+VECTOR_PROBES = 2
+
+# A full store evicts at least this fraction of its capacity at once, so that
+# finding the least recently seen tracks is not paid on every batch
+EVICT_FRACTION = 1 / 32
+
+
+class TrackStateStore:
+    """ State of up to 'capacity' live tracks.
+
+    update() records a batch of observations and returns the slots of their
+    tracks, to index the columns with: store["hits"][slots]. 'now' is any
+    increasing clock shared by all sources, e.g. a batch counter, the frame
+    number with a single source, or the ntp_timestamp in seconds. Extra
+    columns are declared with fields, a list of (name, dtype), and start at
+    zero for every new track.
+
+    Without a tracker all objects share UNTRACKED_OBJECT_ID; update_batch()
+    skips them. New tracks left without a slot after eviction get slot -1
+    and are counted in stats()["dropped"].
+    """
+
+    def __init__(self, capacity=131072, ttl=300, fields=(), sweep_interval=30):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.columns = {name: np.zeros(capacity, dtype)
+                        for name, dtype in BASE_FIELDS + list(fields)}
+        self._live = np.zeros(capacity, dtype=bool)
+        self._position = np.zeros(capacity, dtype=np.int64)
+        # Stack of free slots, the next one at the end
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int64)
+        self._free_count = capacity
+        size = 1
+        while size * MAX_LOAD < capacity:
+            size *= 2
+        self._mask = size - 1
+        self._state = np.zeros(size, dtype=np.uint8)
+        self._keys_source = np.zeros(size, dtype=np.uint32)
+        self._keys_object = np.zeros(size, dtype=np.uint64)
+        self._slots = np.zeros(size, dtype=np.int64)
+        self._deleted = 0
+        self._last_sweep = None
+        self._lock = threading.Lock()
+        self.inserted = 0
+        self.expired = 0
+        self.evicted = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return self.capacity - self._free_count
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def nbytes(self):
+        """ Memory of the columns and of the index """
+        arrays = list(self.columns.values()) + [
+            self._live, self._position, self._free, self._state, self._keys_source,
+            self._keys_object, self._slots]
+        return sum(a.nbytes for a in arrays)
+
+    def live_slots(self):
+        return np.flatnonzero(self._live)
+
+    # ---- hash index ----
+
+    def _hash(self, sources, objects):
+        # splitmix64 finalizer of object_id, mixed with the source id
+        h = objects ^ (sources.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15))
+        h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        h ^= h >> np.uint64(31)
+        return (h & np.uint64(self._mask)).astype(np.int64)
+
+    def _find(self, sources, objects):
+        slots = np.full(len(objects), -1, dtype=np.int64)
+        position = self._hash(sources, objects)
+        pending = np.arange(len(objects))
+        for _ in range(VECTOR_PROBES):
+            if not len(pending):
+                return slots
+            p = position[pending]
+            state = self._state[p]
+            hit = (state == USED) & (self._keys_source[p] == sources[pending]) & \
+                (self._keys_object[p] == objects[pending])
+            slots[pending[hit]] = self._slots[p[hit]]
+            pending = pending[~hit & (state != EMPTY)]
+            position[pending] = (position[pending] + 1) & self._mask
+        for i in pending.tolist():
+            p = int(position[i])
+            source, obj = sources[i], objects[i]
+            while self._state[p] != EMPTY:
+                if self._state[p] == USED and self._keys_object[p] == obj \
+                        and self._keys_source[p] == source:
+                    slots[i] = self._slots[p]
+                    break
+                p = (p + 1) & self._mask
+        return slots
+
+    def _insert(self, sources, objects, slots):
+        """ Indexes keys that are unique and not in the table yet """
+        position = self._hash(sources, objects)
+        pending = np.arange(len(objects))
+        # A few keys (the new tracks of a batch) are faster inserted one by one
+        for _ in range(VECTOR_PROBES if len(objects) > 16 else 0):
+            if not len(pending):
+                return
+            p = position[pending]
+            free = self._state[p] != USED
+            # When several keys probe the same free entry, the first one takes it
+            taken, first = np.unique(p[free], return_index=True)
+            winners = pending[free][first]
+            self._deleted -= int(np.count_nonzero(self._state[taken] == DELETED))
+            self._state[taken] = USED
+            self._keys_source[taken] = sources[winners]
+            self._keys_object[taken] = objects[winners]
+            self._slots[taken] = slots[winners]
+            self._position[slots[winners]] = taken
+            placed = np.zeros(len(pending), dtype=bool)
+            placed[np.flatnonzero(free)[first]] = True
+            pending = pending[~placed]
+            position[pending] = (position[pending] + 1) & self._mask
+        for i in pending.tolist():
+            p = int(position[i])
+            while self._state[p] == USED:
+                p = (p + 1) & self._mask
+            if self._state[p] == DELETED:
+                self._deleted -= 1
+            self._state[p] = USED
+            self._keys_source[p] = sources[i]
+            self._keys_object[p] = objects[i]
+            self._slots[p] = slots[i]
+            self._position[slots[i]] = p
+
+    def _remove_slots(self, slots):
+        self._state[self._position[slots]] = DELETED
+        self._deleted += len(slots)
+        self._live[slots] = False
+        self._free[self._free_count:self._free_count + len(slots)] = slots
+        self._free_count += len(slots)
+        if self._deleted > len(self._state) // 4:
+            self._rebuild()
+
+    def _rebuild(self):
+        """ Re-indexes the live tracks, dropping the tombstones """
+        self._state[:] = EMPTY
+        self._deleted = 0
+        slots = self.live_slots()
+        self._insert(self.columns["source_id"][slots], self.columns["object_id"][slots], slots)
+
+    # ---- eviction ----
+
+    def expire(self, now):
+        """ Removes the tracks not seen for more than ttl. Returns how many. """
+        with self._lock:
+            return self._expire(now)
+
+    def _expire(self, now):
+        self._last_sweep = now
+        expired = np.flatnonzero(self._live & (self.columns["last_seen"] < now - self.ttl))
+        if len(expired):
+            self._remove_slots(expired)
+            self.expired += len(expired)
+        return len(expired)
+
+    def _evict_oldest(self, count, keep):
+        """ Removes the 'count' least recently seen tracks, except 'keep' """
+        candidates = self._live.copy()
+        candidates[keep] = False
+        candidates = np.flatnonzero(candidates)
+        count = min(count, len(candidates))
+        if not count:
+            return
+        last_seen = self.columns["last_seen"][candidates]
+        oldest = candidates[np.argpartition(last_seen, count - 1)[:count]]
+        self._remove_slots(oldest)
+        self.evicted += count
+
+    # ---- updates ----
+
+    def lookup(self, source_ids, object_ids):
+        """ Slots of the given tracks, -1 for unknown ones """
+        with self._lock:
+            return self._find(np.asarray(source_ids, dtype=np.uint32),
+                              np.asarray(object_ids, dtype=np.uint64))
+
+    def get(self, source_id, object_id):
+        return int(self.lookup([source_id], [object_id])[0])
+
+    def remove(self, source_ids, object_ids):
+        """ Removes tracks, e.g. when the tracker reports them terminated """
+        with self._lock:
+            slots = self._find(np.asarray(source_ids, dtype=np.uint32),
+                               np.asarray(object_ids, dtype=np.uint64))
+            slots = np.unique(slots[slots >= 0])
+            if len(slots):
+                self._remove_slots(slots)
+            return len(slots)
+
+    def update(self, source_ids, object_ids, now, class_ids=None, confidences=None,
+               bboxes=None, **fields):
+        """ Records one observation per object (bboxes as rows of left, top,
+        width, height; fields as values for the extra columns) and returns
+        the slots of their tracks. New tracks are created, evicting the least
+        recently seen ones if the store is full; the ones that still do not
+        fit get slot -1 and are not recorded. """
+        sources = np.asarray(source_ids, dtype=np.uint32)
+        objects = np.asarray(object_ids, dtype=np.uint64)
+        with self._lock:
+            if self._last_sweep is None or now - self._last_sweep >= self.sweep_interval:
+                self._expire(now)
+            slots = self._find(sources, objects)
+            new = slots < 0
+            columns = self.columns
+            if new.any():
+                # Seen now, so that making room for the new tracks spares them
+                columns["last_seen"][slots[~new]] = now
+                slots[new] = self._create(sources[new], objects[new], now, slots[~new])
+            recorded = slots >= 0
+            if recorded.all():
+                recorded = slice(None)
+            seen = slots[recorded]
+            columns["last_seen"][seen] = now
+            # A track can be seen more than once in a batch
+            np.add.at(columns["hits"], seen, 1)
+            if class_ids is not None:
+                columns["class_id"][seen] = _select(class_ids, recorded)
+            if confidences is not None:
+                columns["confidence"][seen] = _select(confidences, recorded)
+            if bboxes is not None:
+                bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)[recorded]
+                for i, name in enumerate(("left", "top", "width", "height")):
+                    columns[name][seen] = bboxes[:, i]
+            for name, values in fields.items():
+                columns[name][seen] = _select(values, recorded)
+            return slots
+
+    def _create(self, sources, objects, now, keep):
+        """ Allocates slots for new keys (possibly repeated), returns them """
+        inverse = None
+        if len(objects) > 1:
+            order = np.lexsort((objects, sources))
+            sources, objects = sources[order], objects[order]
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = (sources[1:] != sources[:-1]) | (objects[1:] != objects[:-1])
+            inverse = np.empty(len(order), dtype=np.int64)
+            inverse[order] = np.cumsum(first) - 1
+            sources, objects = sources[first], objects[first]
+        created = np.full(len(objects), -1, dtype=np.int64)
+        count = len(objects)
+        if count > self._free_count:
+            self._expire(now)
+        if count > self._free_count:
+            evictable = self.capacity - self._free_count - len(np.unique(keep))
+            if count > self._free_count + evictable:
+                # Not even evicting every track the batch does not see makes
+                # room for all of them: the last ones are dropped
+                self.dropped += count - self._free_count - evictable
+                count = self._free_count + evictable
+                sources, objects = sources[:count], objects[:count]
+            if count > self._free_count:
+                self._evict_oldest(min(evictable, max(count - self._free_count,
+                                                      int(self.capacity * EVICT_FRACTION))), keep)
+        slots = self._free[self._free_count - count:self._free_count][::-1].copy()
+        self._free_count -= count
+        for column in self.columns.values():
+            column[slots] = 0
+        self.columns["source_id"][slots] = sources
+        self.columns["object_id"][slots] = objects
+        self.columns["first_seen"][slots] = now
+        self._live[slots] = True
+        self._insert(sources, objects, slots)
+        self.inserted += count
+        created[:count] = slots
+        return created if inverse is None else created[inverse]
+
+    def update_batch(self, batch_meta, now, skip_untracked=True):
+        """ update() with the objects of every frame of an NvDsBatchMeta.
+        Returns the slots, in the order of the objects. """
+        sources, objects, classes, confidences, bboxes = [], [], [], [], []
+        l_frame = batch_meta.frame_meta_list
+        while l_frame is not None:
+            try:
+                frame_meta = pyds.NvDsFrameMeta.cast(l_frame.data)
+            except StopIteration:
+                break
+            l_obj = frame_meta.obj_meta_list
+            while l_obj is not None:
+                try:
+                    obj_meta = pyds.NvDsObjectMeta.cast(l_obj.data)
+                except StopIteration:
+                    break
+                if not (skip_untracked and obj_meta.object_id == UNTRACKED_OBJECT_ID):
+                    rect = obj_meta.rect_params
+                    sources.append(frame_meta.source_id)
+                    objects.append(obj_meta.object_id)
+                    classes.append(obj_meta.class_id)
+                    confidences.append(obj_meta.confidence)
+                    bboxes.append((rect.left, rect.top, rect.width, rect.height))
+                try:
+                    l_obj = l_obj.next
+                except StopIteration:
+                    break
+            try:
+                l_frame = l_frame.next
+            except StopIteration:
+                break
+        return self.update(sources, objects, now, classes, confidences, bboxes)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "tracks": len(self),
+                "capacity": self.capacity,
+                "inserted": self.inserted,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "dropped": self.dropped,
+            }
+
+
+def _select(values, recorded):
+    """ The per-object values of the recorded objects; scalars as they are """
+    if np.ndim(values) == 0:
+        return values
+    return np.asarray(values)[recorded]
+
+
+# ---- benchmark ----
+
+def _bench_dict(tracks, batch, updates, rng):
+    """ The same workload on a dict of per-track lists, for comparison """
+    tracemalloc.start()
+    table = {}
+    for oid in range(tracks):
+        table[(0, oid)] = [0, 0, 0, 0, 0.5, 10.0, 10.0, 10.0, 10.0]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    bbox = [10.0, 10.0, 10.0, 10.0]
+    next_id = tracks
+    start = time.perf_counter()
+    for now in range(1, updates + 1):
+        ids = rng.integers(next_id - tracks, next_id, batch)
+        ids[-batch // 16:] = np.arange(next_id, next_id + batch // 16)
+        next_id += batch // 16
+        for oid in ids.tolist():
+            entry = table.get((0, oid))
+            if entry is None:
+                entry = table[(0, oid)] = [0, now, now, 0, 0.0, 0.0, 0.0, 0.0, 0.0]
+            entry[2] = now
+            entry[3] += 1
+            entry[4] = 0.5
+            entry[5:9] = bbox
+    update_time = (time.perf_counter() - start) / updates
+    start = time.perf_counter()
+    per_class = {}
+    for entry in table.values():
+        per_class[entry[0]] = per_class.get(entry[0], 0) + 1
+    query_time = time.perf_counter() - start
+    return update_time, query_time, memory, len(table)
+
+
+def bench(tracks, batch, updates):
+    rng = np.random.default_rng(0)
+    store = TrackStateStore(capacity=tracks, ttl=updates * 10, sweep_interval=updates * 10)
+    for first in range(0, tracks, 4096):
+        ids = np.arange(first, min(first + 4096, tracks))
+        store.update(np.zeros(len(ids)), ids, 0, bboxes=np.full((len(ids), 4), 10.0))
+    confidences = np.full(batch, 0.5, dtype=np.float32)
+    bboxes = np.full((batch, 4), 10.0, dtype=np.float32)
+    sources = np.zeros(batch, dtype=np.uint32)
+
+    # Steady state at the memory cap: each batch sees existing tracks and
+    # batch/16 new ones, which evict the least recently seen
+    next_id = tracks
+    start = time.perf_counter()
+    for now in range(1, updates + 1):
+        ids = rng.integers(next_id - tracks, next_id, batch).astype(np.uint64)
+        ids[-batch // 16:] = np.arange(next_id, next_id + batch // 16)
+        next_id += batch // 16
+        store.update(sources, ids, now, confidences=confidences, bboxes=bboxes)
+    update_time = (time.perf_counter() - start) / updates
+
+    start = time.perf_counter()
+    np.bincount(store["class_id"][store.live_slots()])
+    query_time = time.perf_counter() - start
+    live = len(store)
+    start = time.perf_counter()
+    expired = store.expire(updates * 10 + updates // 2)
+    sweep_time = time.perf_counter() - start
+
+    dict_update, dict_query, dict_memory, dict_tracks = _bench_dict(
+        tracks, batch, updates, np.random.default_rng(0))
+    stats = store.stats()
+    print("%d live tracks, batches of %d objects (%d new)" % (tracks, batch, batch // 16))
+    print("store: %8.1f us/batch %10.0f objects/s  %5.1f MB (%d bytes/track) fixed, "
+          "%d evicted" % (update_time * 1e6, batch / update_time, store.nbytes / 1e6,
+                          store.nbytes // tracks, stats["evicted"]))
+    print("       tracks per class %.2f ms, TTL sweep of %d tracks (%d expired) %.2f ms" % (
+        query_time * 1e3, live, expired, sweep_time * 1e3))
+    print("dict:  %8.1f us/batch %10.0f objects/s  %5.1f MB (%d bytes/track) at start, "
+          "%d tracks at the end" % (dict_update * 1e6, batch / dict_update, dict_memory / 1e6,
+                                    dict_memory // tracks, dict_tracks))
+    print("       tracks per class %.2f ms" % (dict_query * 1e3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bench", action="store_true", required=True,
+                        help="Run the update/eviction benchmark")
+    parser.add_argument("--tracks", type=int, default=100000, help="Live tracks")
+    parser.add_argument("--batch", type=int, default=64, help="Objects per batch")
+    parser.add_argument("--updates", type=int, default=5000, help="Batches")
+    args = parser.parse_args()
+    bench(args.tracks, args.batch, args.updates)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
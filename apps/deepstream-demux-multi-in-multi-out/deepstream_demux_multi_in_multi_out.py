@@ -41,6 +41,7 @@ no_display = False
 silent = False
 file_loop = False
 perf_data = None
+per_stream_probe = False
 
 MAX_DISPLAY_LEN = 64
 PGIE_CLASS_ID_VEHICLE = 0
@@ -395,6 +396,16 @@ def main(args, requested_pgie=None, config=None, disable_probe=False):
             sys.stderr.write("Unable to create queue sink pad \n")
         demuxsrcpad.link(queuesinkpad)
 
+        if per_stream_probe:
+            # Each queue after nvstreamdemux has its own streaming thread, so
+            # the per-stream probes run concurrently (in parallel on
+            # free-threaded python)
+            queuesrcpad = queue.get_static_pad("src")
+            if not queuesrcpad:
+                sys.stderr.write("Unable to get queue src pad \n")
+            else:
+                queuesrcpad.add_probe(Gst.PadProbeType.BUFFER, pgie_src_pad_buffer_probe, i)
+
         # connect  queue -> nvvidconv -> nvosd -> nveglgl
         queue.link(nvvideoconvert)
         nvvideoconvert.link(nvdsosd)
@@ -416,7 +427,8 @@ def main(args, requested_pgie=None, config=None, disable_probe=False):
     if not pgie_src_pad:
         sys.stderr.write(" Unable to get src pad \n")
     else:
-        pgie_src_pad.add_probe(Gst.PadProbeType.BUFFER, pgie_src_pad_buffer_probe, 0)
+        if not per_stream_probe:
+            pgie_src_pad.add_probe(Gst.PadProbeType.BUFFER, pgie_src_pad_buffer_probe, 0)
         # perf callback function to print fps every 5 sec
         GLib.timeout_add(5000, perf_data.perf_print_callback)
 
@@ -453,8 +465,19 @@ def parse_args():
         default=["a"],
         required=True,
     )
+    parser.add_argument(
+        "--per-stream-probe",
+        action="store_true",
+        default=False,
+        help="Run the probe on each stream branch after nvstreamdemux instead of once per batch on pgie",
+    )
 
     args = parser.parse_args()
+    global per_stream_probe
+    per_stream_probe = args.per_stream_probe
+    if per_stream_probe:
+        gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+        print("[=] per-stream probes, GIL", "enabled" if gil_enabled else "disabled")
     stream_paths = args.input
     print(f"[=] stream_paths: {stream_paths}")
     return stream_paths
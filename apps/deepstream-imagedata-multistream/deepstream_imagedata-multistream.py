@@ -33,6 +33,7 @@ import platform
 from common.platform_info import PlatformInfo
 from common.bus_call import bus_call
 from common.FPS import PERF_DATA
+from common.shm_frames import ShmFrameExporter
 import numpy as np
 import pyds
 import cv2
@@ -262,9 +263,17 @@ def create_source_bin(index, uri):
 
 
 def main(args):
+    # Export the frames to a shared-memory pool, for consumers in other processes
+    export_name = None
+    frame_exporter = None
+    if "--export-frames" in args:
+        i = args.index("--export-frames")
+        export_name = args[i + 1] if i + 1 < len(args) else ""
+        del args[i:i + 2]
     # Check input arguments
-    if len(args) < 2:
-        sys.stderr.write("usage: %s <uri1> [uri2] ... [uriN] <folder to save frames>\n" % args[0])
+    if len(args) < 2 or export_name == "":
+        sys.stderr.write("usage: %s [--export-frames NAME] <uri1> [uri2] ... [uriN] "
+                         "<folder to save frames>\n" % args[0])
         sys.exit(1)
 
     global perf_data
@@ -434,6 +443,11 @@ def main(args):
         sys.stderr.write(" Unable to get src pad \n")
     else:
         tiler_sink_pad.add_probe(Gst.PadProbeType.BUFFER, tiler_sink_pad_buffer_probe, 0)
+        if export_name:
+            frame_exporter = ShmFrameExporter(export_name, MUXER_OUTPUT_WIDTH, MUXER_OUTPUT_HEIGHT,
+                                              unmap_surfaces=platform_info.is_integrated_gpu())
+            tiler_sink_pad.add_probe(Gst.PadProbeType.BUFFER, frame_exporter.probe, 0)
+            print("Exporting frames to shared memory pool", frame_exporter.name)
         # perf callback function to print fps every 5 sec
         GLib.timeout_add(5000, perf_data.perf_print_callback)
 
@@ -453,6 +467,8 @@ def main(args):
     # cleanup
     print("Exiting app\n")
     pipeline.set_state(Gst.State.NULL)
+    if frame_exporter:
+        frame_exporter.close()
 
 
 if __name__ == '__main__':
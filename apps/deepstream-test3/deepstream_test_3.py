@@ -20,6 +20,11 @@
 import sys
 
 sys.path.append("../")
+from common.startup_timer import StartupTimer
+
+# Created first so the report includes the time spent importing gi and pyds
+startup_timer = StartupTimer(enabled=False)
+
 from pathlib import Path
 from os import environ
 import gi
@@ -31,19 +36,31 @@ from gi.repository import GLib, Gst  # type: ignore
 from ctypes import *
 import time
 import sys
-import math
 import platform
+import signal
 from common.platform_info import PlatformInfo
 from common.bus_call import bus_call
 from common.FPS import PERF_DATA
+from common.batch_controller import tiler_layout
+from common.batch_tuner import PushTimeoutTuner
+from common.batch_monitor import BatchOccupancyMonitor
+from common.bringup_profiler import BringupProfiler
+from common.trace_recorder import TraceRecorder
+from common.meta_log import MetaLogWriter, MetaRecorder
 
 import pyds
 
+startup_timer.mark("import")
+
 no_display = False
 silent = False
 file_loop = False
 perf_data = None
 measure_latency = False
+batch_timeout_slo_us = None
+bringup_profile = None
+trace_path = None
+record_meta = None
 
 MAX_DISPLAY_LEN = 64
 PGIE_CLASS_ID_VEHICLE = 0
@@ -270,6 +287,7 @@ def main(stream_paths, requested_pgie=None, config=None, disable_probe=False):
     platform_info = PlatformInfo()
     # Standard GStreamer initialization
     Gst.init(None)
+    startup_timer.mark("Gst.init")
 
     # Create gstreamer elements */
     # Create Pipeline element that will form a connection of other elements
@@ -437,8 +455,7 @@ def main(stream_paths, requested_pgie=None, config=None, disable_probe=False):
         --------|--------
         stream2 | stream3
     """
-    tiler_rows = int(math.sqrt(number_sources))
-    tiler_columns = int(math.ceil((1.0 * number_sources) / tiler_rows))
+    tiler_rows, tiler_columns = tiler_layout(number_sources)
     tiler.set_property("rows", tiler_rows)
     tiler.set_property("columns", tiler_columns)
     tiler.set_property("width", TILED_OUTPUT_WIDTH)
@@ -480,17 +497,40 @@ def main(stream_paths, requested_pgie=None, config=None, disable_probe=False):
     bus = pipeline.get_bus()
     bus.add_signal_watch()
     bus.connect("message", bus_call, loop)
+    startup_timer.watch_pipeline(pipeline)
+    # Disabled unless --trace-buffers is given: no probe is added then
+    trace_recorder = TraceRecorder(enabled=trace_path is not None)
+    trace_recorder.trace_pipeline(pipeline, factories=("queue", "nvinfer", "nvmultistreamtiler",
+                                                       "nvvideoconvert", "nvdsosd"))
+    if trace_recorder.enabled:
+        def dump_trace():
+            trace_recorder.dump(trace_path)
+            print("Buffer trace written to %s" % trace_path)
+            return True
+
+        GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signal.SIGUSR1, dump_trace)
+    meta_writer = None
     pgie_src_pad = pgie.get_static_pad("src")
+    if pgie_src_pad and record_meta:
+        meta_writer = MetaLogWriter(record_meta)
+        pgie_src_pad.add_probe(Gst.PadProbeType.BUFFER, MetaRecorder(meta_writer), 0)
     if not pgie_src_pad:
         sys.stderr.write(" Unable to get src pad \n")
     else:
         if not disable_probe:
             pgie_src_pad.add_probe(
-                Gst.PadProbeType.BUFFER, pgie_src_pad_buffer_probe, 0
+                Gst.PadProbeType.BUFFER, trace_recorder.wrap_probe(pgie_src_pad_buffer_probe), 0
             )
             # perf callback function to print fps every 5 sec
             GLib.timeout_add(5000, perf_data.perf_print_callback)
 
+    batch_monitor = None
+    if batch_timeout_slo_us:
+        # Tune batched-push-timeout online from the observed batch occupancy
+        tuner = PushTimeoutTuner(MUXER_BATCH_TIMEOUT_USEC, batch_timeout_slo_us)
+        batch_monitor = BatchOccupancyMonitor(streammux, tuner)
+        batch_monitor.attach()
+
     # Enable latency measurement via probe if environment variable NVDS_ENABLE_LATENCY_MEASUREMENT=1 is set.
     # To enable component level latency measurement, please set environment variable
     # NVDS_ENABLE_COMPONENT_LATENCY_MEASUREMENT=1 in addition to the above.
@@ -509,6 +549,13 @@ def main(stream_paths, requested_pgie=None, config=None, disable_probe=False):
         print(i, ": ", source)
 
     print("===> Starting pipeline \n")
+    startup_timer.mark("element creation")
+    profiler = None
+    if bringup_profile:
+        profiler = BringupProfiler(origin=startup_timer.start,
+                                   on_complete=write_bringup_profile)
+        profiler.add_timer_phases(startup_timer)
+        profiler.attach(pipeline)
     # start play back and listed to events
     pipeline.set_state(Gst.State.PLAYING)
     try:
@@ -518,6 +565,24 @@ def main(stream_paths, requested_pgie=None, config=None, disable_probe=False):
     # cleanup
     print("===> Exiting app\n")
     pipeline.set_state(Gst.State.NULL)
+    if trace_recorder.enabled:
+        dump_trace()
+    if meta_writer:
+        meta_writer.close()
+        print("Metadata of %d frames recorded in %s" % (
+            meta_writer.frames_written, ", ".join(meta_writer.files)))
+    if profiler and not profiler.is_complete():
+        # Bring-up never completed, keep what was recorded
+        write_bringup_profile(profiler)
+    if batch_monitor:
+        batch_monitor.close()
+
+
+def write_bringup_profile(profiler):
+    profiler.write(bringup_profile)
+    profiler.report()
+    print("Bring-up profile written to %s.waterfall.json and %s.trace.json" % (
+        bringup_profile, bringup_profile))
 
 
 def parse_args():
@@ -569,6 +634,42 @@ def parse_args():
         dest="disable_probe",
         help="Disable the probe function and use nvdslogger for FPS",
     )
+    parser.add_argument(
+        "--batch-timeout-slo-us",
+        type=int,
+        default=None,
+        dest="batch_timeout_slo_us",
+        help="Auto-tune streammux batched-push-timeout, never above this value",
+    )
+    parser.add_argument(
+        "--startup-timing",
+        action="store_true",
+        default=False,
+        dest="startup_timing",
+        help="Print the time spent in each startup phase once the pipeline is PLAYING",
+    )
+    parser.add_argument(
+        "--bringup-profile",
+        default=None,
+        dest="bringup_profile",
+        metavar="PREFIX",
+        help="Profile the pipeline bring-up into PREFIX.waterfall.json and PREFIX.trace.json",
+    )
+    parser.add_argument(
+        "--trace-buffers",
+        default=None,
+        dest="trace_path",
+        metavar="PATH",
+        help="Record per-buffer activity and write it on exit (or on SIGUSR1) to PATH, "
+        "as Perfetto protobuf for *.pftrace, else as Chrome trace JSON",
+    )
+    parser.add_argument(
+        "--record-meta",
+        default=None,
+        dest="record_meta",
+        metavar="PREFIX",
+        help="Record the inference metadata into PREFIX-NNNNN.arrow files (needs pyarrow)",
+    )
     parser.add_argument(
         "-s",
         "--silent",
@@ -590,9 +691,18 @@ def parse_args():
     global no_display
     global silent
     global file_loop
+    global batch_timeout_slo_us
+    global bringup_profile
+    global trace_path
+    global record_meta
     no_display = args.no_display
     silent = args.silent
     file_loop = args.file_loop
+    batch_timeout_slo_us = args.batch_timeout_slo_us
+    startup_timer.enabled = args.startup_timing
+    bringup_profile = args.bringup_profile
+    trace_path = args.trace_path
+    record_meta = args.record_meta
 
     if config and not pgie or pgie and not config:
         sys.stderr.write(
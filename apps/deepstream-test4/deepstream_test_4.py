@@ -29,7 +29,11 @@ from optparse import OptionParser
 from common.platform_info import PlatformInfo
 from common.bus_call import bus_call
 from common.utils import long_to_uint64
+from common.event_gate import EventGate
+from common.msg_batcher import MessageBatcher, make_transport
+from common.shm_meta import ShmMetaPublisher
 import pyds
+import time
 
 MAX_DISPLAY_LEN = 64
 MAX_TIME_STAMP_LEN = 32
@@ -47,6 +51,14 @@ conn_str = "localhost;2181;testTopic"
 cfg_file = None
 topic = None
 no_display = False
+event_min_interval = 1.0
+event_bbox_threshold = 0.2
+event_gate = None
+batch_broker = None
+batch_max_messages = 200
+batch_max_delay_ms = 100
+batch_compression = "none"
+shm_meta = None
 
 PGIE_CONFIG_FILE = "dstest4_pgie_config.txt"
 MSCONV_CONFIG_FILE = "dstest4_msgconv_config.txt"
@@ -80,62 +92,54 @@ def demux_pad_added_cb(demux_element, pad, h264parser):
 
 
 # custom object
-def generate_vehicle_meta(data):
-    obj = pyds.NvDsVehicleObject.cast(data)
-    obj.type = "sedan"
-    obj.color = "blue"
-    obj.make = "Bugatti"
-    obj.model = "M"
-    obj.license = "XX1234"
-    obj.region = "CA"
-    return obj
-
-
-def generate_person_meta(data):
-    obj = pyds.NvDsPersonObject.cast(data)
-    obj.age = 45
-    obj.cap = "none"
-    obj.hair = "black"
-    obj.gender = "male"
-    obj.apparel = "formal"
-    return obj
+VEHICLE_ATTRS = {
+    "type": "sedan",
+    "color": "blue",
+    "make": "Bugatti",
+    "model": "M",
+    "license": "XX1234",
+    "region": "CA",
+}
+
+PERSON_ATTRS = {
+    "age": 45,
+    "cap": "none",
+    "hair": "black",
+    "gender": "male",
+    "apparel": "formal",
+}
 
 
 # how to attach custom objects
-def generate_event_msg_meta(data, class_id):
-    # msg_meta = pyds.alloc_nvds_event_msg_meta(user_event_meta)
-    # msg_meta = generate_event_msg_meta(msg_meta, obj_meta.class_id)
-    # meta = pyds.NvDsEventMsgMeta.cast(data)
-    # meta: NvDsEventMsgMeta
-    meta = pyds.NvDsEventMsgMeta.cast(data)
-    meta.sensorId = 0
-    meta.placeId = 0
-    meta.moduleId = 0
-    meta.sensorStr = "sensor-0"
-    meta.ts = pyds.alloc_buffer(MAX_TIME_STAMP_LEN + 1)
-    pyds.generate_ts_rfc3339(meta.ts, MAX_TIME_STAMP_LEN)
+def generate_event_msg_meta(obj_meta, frame_number):
+    # Events are described as dicts and turned into pooled NvDsEventMsgMeta
+    # by pyds.attach_pooled_event_msg_metas(), which copies the strings into
+    # buffers recycled with the meta and fills in the RFC3339 timestamp.
+    rect = obj_meta.rect_params
+    event = {
+        "sensorId": 0,
+        "placeId": 0,
+        "moduleId": 0,
+        "sensorStr": "sensor-0",
+        "bbox": (rect.left, rect.top, rect.width, rect.height),
+        "frameId": frame_number,
+        "trackingId": long_to_uint64(obj_meta.object_id),
+        "confidence": obj_meta.confidence,
+    }
 
     # This demonstrates how to attach custom objects.
     # Any custom object as per requirement can be generated and attached
     # like NvDsVehicleObject / NvDsPersonObject. Then that object should
     # be handled in payload generator library (nvmsgconv.cpp) accordingly.
-    if class_id == PGIE_CLASS_ID_VEHICLE:
-        meta.type = pyds.NvDsEventType.NVDS_EVENT_MOVING
-        meta.objType = pyds.NvDsObjectType.NVDS_OBJECT_TYPE_VEHICLE
-        meta.objClassId = PGIE_CLASS_ID_VEHICLE
-        obj = pyds.alloc_nvds_vehicle_object()
-        obj = generate_vehicle_meta(obj)
-        meta.extMsg = obj
-        meta.extMsgSize = sys.getsizeof(pyds.NvDsVehicleObject)
-    if class_id == PGIE_CLASS_ID_PERSON:
-        meta.type = pyds.NvDsEventType.NVDS_EVENT_ENTRY
-        meta.objType = pyds.NvDsObjectType.NVDS_OBJECT_TYPE_PERSON
-        meta.objClassId = PGIE_CLASS_ID_PERSON
-        obj = pyds.alloc_nvds_person_object()
-        obj = generate_person_meta(obj)
-        meta.extMsg = obj
-        meta.extMsgSize = sys.getsizeof(pyds.NvDsPersonObject)
-    return meta
+    if obj_meta.class_id == PGIE_CLASS_ID_VEHICLE:
+        event["type"] = pyds.NvDsEventType.NVDS_EVENT_MOVING
+        event["objClassId"] = PGIE_CLASS_ID_VEHICLE
+        event["vehicle"] = VEHICLE_ATTRS
+    if obj_meta.class_id == PGIE_CLASS_ID_PERSON:
+        event["type"] = pyds.NvDsEventType.NVDS_EVENT_ENTRY
+        event["objClassId"] = PGIE_CLASS_ID_PERSON
+        event["person"] = PERSON_ATTRS
+    return event
 
 
 # osd_sink_pad_buffer_probe  will extract metadata received on OSD sink pad
@@ -178,7 +182,12 @@ def osd_sink_pad_buffer_probe(pad, info, u_data):
             frame_meta = pyds.NvDsFrameMeta.cast(l_frame.data)
         except StopIteration:
             continue
-        is_first_object = True
+        # ntp_timestamp is in ns; fall back to the local clock if the
+        # muxer does not stamp frames
+        if frame_meta.ntp_timestamp:
+            now = frame_meta.ntp_timestamp / 1e9
+        else:
+            now = time.monotonic()
 
         # Short example of attribute access for frame_meta:
         # print("Frame Number is ", frame_meta.frame_num)
@@ -189,6 +198,7 @@ def osd_sink_pad_buffer_probe(pad, info, u_data):
         # print("Num object meta ", frame_meta.num_obj_meta)
 
         frame_number = frame_meta.frame_num
+        events = []
         l_obj = frame_meta.obj_meta_list
         # TODO slow -> optimize
         while l_obj is not None:
@@ -220,41 +230,32 @@ def osd_sink_pad_buffer_probe(pad, info, u_data):
             # NOTE Ideally ??? NVDS_EVENT_MSG_META should be attached to buffer by the
             # component implementing detection / recognition logic.
             # Here it demonstrates how to use / attach that meta data.
-            if is_first_object and (frame_number % 30) == 0:
-                # Frequency of messages to be send will be based on use case.
-                # Here message is being sent for first object every 30 frames.
-
-                user_event_meta = pyds.nvds_acquire_user_meta_from_pool(batch_meta)
-                if user_event_meta:
-                    # Allocating an NvDsEventMsgMeta instance and getting
-                    # reference to it. The underlying memory is not manged by
-                    # Python so that downstream plugins can access it. Otherwise
-                    # the garbage collector will free it when this probe exits.
-                    msg_meta = pyds.alloc_nvds_event_msg_meta(user_event_meta)
-                    msg_meta.bbox.top = obj_meta.rect_params.top
-                    msg_meta.bbox.left = obj_meta.rect_params.left
-                    msg_meta.bbox.width = obj_meta.rect_params.width
-                    msg_meta.bbox.height = obj_meta.rect_params.height
-                    msg_meta.frameId = frame_number
-                    msg_meta.trackingId = long_to_uint64(obj_meta.object_id)
-                    msg_meta.confidence = obj_meta.confidence
-                    msg_meta = generate_event_msg_meta(msg_meta, obj_meta.class_id)
-
-                    user_event_meta.user_meta_data = msg_meta
-                    user_event_meta.base_meta.meta_type = (
-                        pyds.NvDsMetaType.NVDS_EVENT_MSG_META
-                    )
-                    pyds.nvds_add_user_meta_to_frame(frame_meta, user_event_meta)
-                else:
-                    print("Error in attaching event meta to buffer\n")
-
-                # NOTE 示例代码 仅对每帧的 第一个 object 生成 event msg meta
-                is_first_object = False
+            # Frequency of messages to be send will be based on use case.
+            # Here the event gate sends a message for new objects and for
+            # objects whose bbox/confidence changed, at most once per
+            # --event-min-interval seconds per (source, tracking id, class).
+            # Meta is only allocated for objects that pass the gate, in one
+            # pooled batch per frame below.
+            rect = obj_meta.rect_params
+            if event_gate.should_emit(
+                frame_meta.source_id,
+                obj_meta.object_id,
+                obj_meta.class_id,
+                (rect.left, rect.top, rect.width, rect.height),
+                obj_meta.confidence,
+                now,
+            ):
+                events.append(generate_event_msg_meta(obj_meta, frame_number))
 
             try:
                 l_obj = l_obj.next
             except StopIteration:
                 break
+        if events:
+            # All events of the frame share the frame's ntp_timestamp
+            pyds.attach_pooled_event_msg_metas(
+                batch_meta, frame_meta, events, use_ntp_timestamp=True
+            )
         try:
             l_frame = l_frame.next
         except StopIteration:
@@ -269,13 +270,63 @@ def osd_sink_pad_buffer_probe(pad, info, u_data):
             obj_counter[PGIE_CLASS_ID_VEHICLE],
             "Person Count =",
             obj_counter[PGIE_CLASS_ID_PERSON],
+            "Events =",
+            event_gate.stats(),
+            "Event meta pool =",
+            pyds.event_msg_meta_pool_stats(),
         )
     return Gst.PadProbeReturn.OK
 
 
+def _payload_metas(user_meta_list):
+    l_user = user_meta_list
+    while l_user is not None:
+        try:
+            user_meta = pyds.NvDsUserMeta.cast(l_user.data)
+        except StopIteration:
+            break
+        if user_meta.base_meta.meta_type == pyds.NvDsMetaType.NVDS_PAYLOAD_META:
+            yield pyds.NvDsPayload.cast(user_meta.user_meta_data)
+        try:
+            l_user = l_user.next
+        except StopIteration:
+            break
+
+
+# msgconv_src_pad_buffer_probe hands the payloads generated by nvmsgconv to
+# the message batcher instead of nvmsgbroker (--batch-broker)
+def msgconv_src_pad_buffer_probe(pad, info, batcher):
+    gst_buffer = info.get_buffer()
+    if not gst_buffer:
+        return Gst.PadProbeReturn.OK
+    batch_meta = pyds.gst_buffer_get_nvds_batch_meta(hash(gst_buffer))
+    if not batch_meta:
+        return Gst.PadProbeReturn.OK
+    msg_topic = topic or "default"
+    for payload in _payload_metas(batch_meta.batch_user_meta_list):
+        batcher.submit(msg_topic, payload.get_bytes())
+    l_frame = batch_meta.frame_meta_list
+    while l_frame is not None:
+        try:
+            frame_meta = pyds.NvDsFrameMeta.cast(l_frame.data)
+        except StopIteration:
+            break
+        for payload in _payload_metas(frame_meta.frame_user_meta_list):
+            batcher.submit(msg_topic, payload.get_bytes())
+        try:
+            l_frame = l_frame.next
+        except StopIteration:
+            break
+    return Gst.PadProbeReturn.OK
+
+
 def main(args):
+    global event_gate
     platform_info = PlatformInfo()
     Gst.init(None)
+    event_gate = EventGate(
+        min_interval=event_min_interval, bbox_threshold=event_bbox_threshold
+    )
 
     # Deprecated: following meta_copy_func and meta_free_func
     # have been moved to the binding as event_msg_meta_copy_func()
@@ -338,7 +389,19 @@ def main(args):
         sys.stderr.write(" Unable to create msgconv \n")
 
     # XXX Sends payload metadata to remote server
-    msgbroker = Gst.ElementFactory.make("nvmsgbroker", "nvmsg-broker")
+    batcher = None
+    if batch_broker:
+        # Payloads are batched by a probe on msgconv's src pad and sent
+        # through the batcher's transport; the broker branch ends in fakesink
+        batcher = MessageBatcher(
+            make_transport(batch_broker),
+            max_messages=batch_max_messages,
+            max_delay_ms=batch_max_delay_ms,
+            compression=batch_compression,
+        )
+        msgbroker = Gst.ElementFactory.make("fakesink", "nvmsg-broker")
+    else:
+        msgbroker = Gst.ElementFactory.make("nvmsgbroker", "nvmsg-broker")
     if not msgbroker:
         sys.stderr.write(" Unable to create msgbroker \n")
 
@@ -388,12 +451,17 @@ def main(args):
     # XXX set config
     msgconv.set_property("config", MSCONV_CONFIG_FILE)
     msgconv.set_property("payload-type", schema_type)
-    msgbroker.set_property("proto-lib", proto_lib)
-    msgbroker.set_property("conn-str", conn_str)
-    if cfg_file is not None:
-        msgbroker.set_property("config", cfg_file)
-    if topic is not None:
-        msgbroker.set_property("topic", topic)
+    if batcher is None:
+        msgbroker.set_property("proto-lib", proto_lib)
+        msgbroker.set_property("conn-str", conn_str)
+        if cfg_file is not None:
+            msgbroker.set_property("config", cfg_file)
+        if topic is not None:
+            msgbroker.set_property("topic", topic)
+    else:
+        msgconv.get_static_pad("src").add_probe(
+            Gst.PadProbeType.BUFFER, msgconv_src_pad_buffer_probe, batcher
+        )
     msgbroker.set_property("sync", False)  # 同步 False
 
     print("===> Adding elements to Pipeline \n")
@@ -462,6 +530,11 @@ def main(args):
         sys.stderr.write(" Unable to get sink pad of nvosd \n")
 
     osdsinkpad.add_probe(Gst.PadProbeType.BUFFER, osd_sink_pad_buffer_probe, 0)
+    shm_publisher = None
+    if shm_meta:
+        shm_publisher = ShmMetaPublisher(shm_meta)
+        osdsinkpad.add_probe(Gst.PadProbeType.BUFFER, shm_publisher.probe, 0)
+        print("Publishing object metadata to shared memory ring %s" % shm_publisher.name)
 
     print("===> Starting pipeline \n")
 
@@ -475,6 +548,11 @@ def main(args):
 
     # pyds.unset_callback_funcs()
     pipeline.set_state(Gst.State.NULL)
+    if batcher is not None:
+        batcher.close()
+        print("Message batcher:", batcher.stats())
+    if shm_publisher is not None:
+        shm_publisher.close()
 
 
 # Parse and validate input arguments
@@ -534,6 +612,68 @@ def parse_args():
         default=False,
         help="Disable display",
     )
+    parser.add_option(
+        "",
+        "--batch-broker",
+        dest="batch_broker",
+        help="Send payloads in batches through this transport instead of "
+        "nvmsgbroker, e.g. file:///tmp/events.bin or unix:///tmp/broker.sock",
+        metavar="URI",
+    )
+    parser.add_option(
+        "",
+        "--batch-max-messages",
+        dest="batch_max_messages",
+        type="int",
+        default=200,
+        help="Maximum number of messages per batch, default=200",
+        metavar="N",
+    )
+    parser.add_option(
+        "",
+        "--batch-max-delay-ms",
+        dest="batch_max_delay_ms",
+        type="int",
+        default=100,
+        help="Maximum time a message waits for its batch, default=100",
+        metavar="MS",
+    )
+    parser.add_option(
+        "",
+        "--batch-compression",
+        dest="batch_compression",
+        default="none",
+        choices=["none", "zlib", "lz4"],
+        help="Batch compression (none, zlib, lz4), default=none",
+    )
+    parser.add_option(
+        "",
+        "--shm-meta",
+        dest="shm_meta",
+        help="Also publish the object metadata of every frame to the shared "
+        "memory ring NAME (/dev/shm/NAME), read with common/shm_meta.py",
+        metavar="NAME",
+    )
+    parser.add_option(
+        "",
+        "--event-min-interval",
+        dest="event_min_interval",
+        type="float",
+        default=1.0,
+        help="Minimum interval in seconds between two event messages for the "
+        "same source, tracking id and class, default=1.0",
+        metavar="SECONDS",
+    )
+    parser.add_option(
+        "",
+        "--event-bbox-threshold",
+        dest="event_bbox_threshold",
+        type="float",
+        default=0.2,
+        help="Relative bbox change that triggers a new event message once the "
+        "minimum interval has passed, default=0.2",
+        metavar="RATIO",
+    )
 
     options, args = parser.parse_args()
     print(f"[=] options: {options}" f"args: {args}")
@@ -545,14 +685,28 @@ def parse_args():
     global topic
     global schema_type
     global no_display
+    global event_min_interval
+    global event_bbox_threshold
+    global batch_broker
+    global batch_max_messages
+    global batch_max_delay_ms
+    global batch_compression
+    global shm_meta
     cfg_file = options.cfg_file
     input_file = options.input_file
     proto_lib = options.proto_lib
     conn_str = options.conn_str
     topic = options.topic
     no_display = options.no_display
-
-    if not (proto_lib and input_file):
+    event_min_interval = options.event_min_interval
+    event_bbox_threshold = options.event_bbox_threshold
+    batch_broker = options.batch_broker
+    batch_max_messages = options.batch_max_messages
+    batch_max_delay_ms = options.batch_max_delay_ms
+    batch_compression = options.batch_compression
+    shm_meta = options.shm_meta
+
+    if not ((proto_lib or batch_broker) and input_file):
         print(
             "Usage: python3 deepstream_test_4.py -i <H264 filename> -p "
             "<Proto adaptor library> --conn-str=<Connection string>"
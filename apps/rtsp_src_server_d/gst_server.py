@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+进程内 GStreamer RTSP 测试源服务器（--mode gst）：不依赖外部 MediaMTX，也不为每路启动 FFmpeg。
+
+- 每个不同的视频文件只解析一次：一条 "producer" 管道 filesrc ! parsebin ! appsink 按原速
+  循环读取（EOS 后 seek 回 0，相当于 -re -stream_loop -1 -c copy，不解码）；
+- 每个挂载点（RTSP URL 的 path）是一个 GstRtspServer media：appsrc ! <parse> ! rtp<codec>pay，
+  同一文件的所有挂载点共享同一条 producer 管道，buffer 只增加引用计数，不拷贝数据；
+- 同一挂载点的多个客户端共享一个 media（factory shared=True）。
+
+依赖：python3-gi、gir1.2-gst-rtsp-server-1.0、gstreamer1.0-plugins-good/bad。
+"""
+
+import sys
+from threading import Lock
+from urllib.parse import urlparse
+
+import gi
+
+gi.require_version("Gst", "1.0")
+gi.require_version("GstRtspServer", "1.0")
+from gi.repository import GLib, Gst, GstRtspServer  # type: ignore
+
+# 编码 -> (RTP 打包前的 parser, RTP payloader)
+CODEC_ELEMENTS = {
+    "video/x-h264": ("h264parse", "rtph264pay"),
+    "video/x-h265": ("h265parse", "rtph265pay"),
+}
+
+
+class Consumer:
+    """一个挂载点 media 的 appsrc；新接入时丢弃数据直到第一个关键帧。"""
+
+    __slots__ = ("appsrc", "waiting_keyframe")
+
+    def __init__(self, appsrc):
+        self.appsrc = appsrc
+        self.waiting_keyframe = True
+
+
+class FileProducer:
+    """单个视频文件的共享 producer 管道：解析一次，把每个 access unit 分发给所有挂载点。"""
+
+    def __init__(self, video_path: str):
+        self.video_path = video_path
+        self.caps = None
+        self._consumers = []
+        self._lock = Lock()
+        self._pipeline = Gst.Pipeline.new(None)
+        src = Gst.ElementFactory.make("filesrc")
+        parse = Gst.ElementFactory.make("parsebin")
+        self._sink = Gst.ElementFactory.make("appsink")
+        if not src or not parse or not self._sink:
+            raise RuntimeError("无法创建 filesrc/parsebin/appsink")
+        src.set_property("location", video_path)
+        # sync=True 按时间戳节奏输出，相当于 ffmpeg -re
+        self._sink.set_property("sync", True)
+        self._sink.set_property("emit-signals", True)
+        self._sink.set_property("max-buffers", 8)
+        self._sink.connect("new-sample", self._on_new_sample)
+        for elm in (src, parse, self._sink):
+            self._pipeline.add(elm)
+        src.link(parse)
+        parse.connect("pad-added", self._on_parse_pad)
+        bus = self._pipeline.get_bus()
+        bus.add_signal_watch()
+        bus.connect("message", self._on_bus_message)
+
+    def _on_parse_pad(self, parsebin, pad):
+        caps = pad.get_current_caps() or pad.query_caps()
+        name = caps.get_structure(0).get_name()
+        sinkpad = self._sink.get_static_pad("sink")
+        if name in CODEC_ELEMENTS and not sinkpad.is_linked():
+            pad.link(sinkpad)
+            return
+        # 音频等其它 pad 接 fakesink，避免 not-linked 错误
+        fakesink = Gst.ElementFactory.make("fakesink")
+        fakesink.set_property("sync", False)
+        self._pipeline.add(fakesink)
+        fakesink.sync_state_with_parent()
+        pad.link(fakesink.get_static_pad("sink"))
+
+    def start(self) -> bool:
+        """预滚到 PAUSED 以获得码流 caps，然后进入 PLAYING。"""
+        self._pipeline.set_state(Gst.State.PAUSED)
+        ret, _, _ = self._pipeline.get_state(10 * Gst.SECOND)
+        if ret == Gst.StateChangeReturn.FAILURE:
+            return False
+        sample = self._sink.emit("pull-preroll")
+        if sample is None or sample.get_caps() is None:
+            return False
+        self.caps = sample.get_caps()
+        self._pipeline.set_state(Gst.State.PLAYING)
+        return True
+
+    def stop(self):
+        self._pipeline.set_state(Gst.State.NULL)
+
+    @property
+    def codec(self) -> str:
+        return self.caps.get_structure(0).get_name()
+
+    def add_consumer(self, appsrc) -> Consumer:
+        consumer = Consumer(appsrc)
+        with self._lock:
+            self._consumers.append(consumer)
+        return consumer
+
+    def remove_consumer(self, consumer: Consumer):
+        with self._lock:
+            if consumer in self._consumers:
+                self._consumers.remove(consumer)
+
+    def num_consumers(self) -> int:
+        with self._lock:
+            return len(self._consumers)
+
+    def _on_new_sample(self, sink):
+        sample = sink.emit("pull-sample")
+        if sample is None:
+            return Gst.FlowReturn.OK
+        with self._lock:
+            consumers = list(self._consumers)
+        if not consumers:
+            return Gst.FlowReturn.OK
+        buf = sample.get_buffer()
+        is_keyframe = not buf.has_flags(Gst.BufferFlags.DELTA_UNIT)
+        for consumer in consumers:
+            if consumer.waiting_keyframe:
+                if not is_keyframe:
+                    continue
+                consumer.waiting_keyframe = False
+            # 浅拷贝只复制 buffer 头（数据内存共享）；时间戳交给 appsrc do-timestamp，
+            # 这样循环回到文件开头时下游时间戳仍然单调递增
+            out = buf.copy()
+            out.pts = Gst.CLOCK_TIME_NONE
+            out.dts = Gst.CLOCK_TIME_NONE
+            consumer.appsrc.emit("push-buffer", out)
+        return Gst.FlowReturn.OK
+
+    def _on_bus_message(self, bus, message):
+        t = message.type
+        if t == Gst.MessageType.EOS:
+            # 循环播放
+            self._pipeline.seek_simple(
+                Gst.Format.TIME, Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT, 0
+            )
+        elif t == Gst.MessageType.ERROR:
+            err, debug = message.parse_error()
+            print(f"[producer {self.video_path}] 错误: {err}: {debug}", file=sys.stderr)
+        return True
+
+
+class MountFactory(GstRtspServer.RTSPMediaFactory):
+    """挂载点 media 工厂：appsrc ! parser ! payloader，appsrc 注册到对应文件的 producer。"""
+
+    def __init__(self, producer: FileProducer):
+        super().__init__()
+        self._producer = producer
+        parser, payloader = CODEC_ELEMENTS[producer.codec]
+        self.set_launch(
+            "( appsrc name=src is-live=true do-timestamp=true format=time "
+            f"! {parser} config-interval=-1 ! {payloader} name=pay0 pt=96 )"
+        )
+        # 同一挂载点的多个客户端共享同一个 media
+        self.set_shared(True)
+        self.connect("media-configure", self._on_media_configure)
+
+    def _on_media_configure(self, factory, media):
+        appsrc = media.get_element().get_by_name("src")
+        appsrc.set_property("caps", self._producer.caps)
+        consumer = self._producer.add_consumer(appsrc)
+        media.connect("unprepared", lambda m: self._producer.remove_consumer(consumer))
+
+
+def mount_path(rtsp_url: str) -> str:
+    path = urlparse(rtsp_url).path or "/stream"
+    return path if path.startswith("/") else "/" + path
+
+
+def run(streams: list, port: int, host: str = "0.0.0.0") -> int:
+    """streams: [(video_path, rtsp_url), ...]，URL 只取 path 作为本服务器的挂载点。"""
+    Gst.init(None)
+    producers = {}
+    server = GstRtspServer.RTSPServer()
+    server.set_address(host)
+    server.set_service(str(port))
+    mounts = server.get_mount_points()
+
+    for i, (video_path, rtsp_url) in enumerate(streams):
+        producer = producers.get(video_path)
+        if producer is None:
+            producer = FileProducer(video_path)
+            if not producer.start():
+                print(f"错误: 无法解析视频 {video_path}", file=sys.stderr)
+                return 1
+            if producer.codec not in CODEC_ELEMENTS:
+                print(f"错误: 不支持的编码 {producer.codec}: {video_path}", file=sys.stderr)
+                return 1
+            producers[video_path] = producer
+        path = mount_path(rtsp_url)
+        mounts.add_factory(path, MountFactory(producer))
+        print(f"  [{i}] {video_path} -> rtsp://{host}:{port}{path}")
+
+    if server.attach(None) == 0:
+        print(f"错误: RTSP 服务无法监听端口 {port}", file=sys.stderr)
+        return 1
+    print(f"GStreamer RTSP 服务已启动：{len(streams)} 个挂载点，{len(producers)} 条共享解析管道（Ctrl+C 退出）...")
+
+    loop = GLib.MainLoop()
+    GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, 2, loop.quit)  # SIGINT
+    GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, 15, loop.quit)  # SIGTERM
+    try:
+        loop.run()
+    finally:
+        for producer in producers.values():
+            producer.stop()
+    return 0
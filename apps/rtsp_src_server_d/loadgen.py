@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+合成摄像头负载生成器：为多路吞吐压测提供大量互不相同、可复现的输入源（CPU 即可运行）。
+
+1) build：用 FFmpeg lavfi 测试源一次性预编码一组短片段缓存（分辨率 / 帧率 / GOP / 运动强度 /
+   H.264、H.265 组合），已存在的片段直接复用：
+       python loadgen.py build --resolutions 1920x1080,1280x720 --fps 25,30 --gop 30,60 \\
+           --motion low,high --codec h264,h265 --duration 10
+
+2) list：输出 N 路 file:// URI（按 --seed 从缓存中确定性分配片段），可直接作为 DeepStream 应用输入。
+   文件输入只体现片段分配，不带每路起始偏移与帧间隔抖动（由读取方按文件原速解码），需要这些时用 serve：
+       python3 deepstream_test_3.py -i $(python loadgen.py list -n 16) --no-display
+
+3) serve：单进程 RTSP 服务 N 路 rtsp://<host>:<port>/cam<i>。片段文件只读一次，按 access unit
+   建索引后每个 AU 只创建一个 GstBuffer（共享整段片段的内存），所有路共享；每路有独立的起始时间
+   偏移（从偏移处之前最近的关键帧开始）和帧间隔抖动：
+       python loadgen.py serve -n 100 --fps-jitter 0.05 --rtsp-port 8554
+
+片段为带 AUD 的 Annex-B 裸流（.h264/.h265）、无 B 帧、固定 GOP，便于按 AU 切分与循环。
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ds_loadgen")
+
+# 一路落后超过这么多个帧间隔（如主循环卡顿）时不再补发，直接对齐到当前时刻
+RESYNC_INTERVALS = 4
+
+# 运动强度 -> lavfi 源滤镜（{w} {h} {fps} 会被替换）；high 叠加时域噪声，码率与解码负载更高
+MOTION_SOURCES = {
+    "low": "testsrc2=size={w}x{h}:rate={fps}",
+    "high": "testsrc2=size={w}x{h}:rate={fps},noise=alls=30:allf=t+u",
+}
+
+CODECS = {
+    "h264": {
+        "ext": "h264",
+        "args": lambda gop: ["-c:v", "libx264", "-preset", "veryfast", "-bf", "0",
+                             "-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0",
+                             "-x264-params", "aud=1"],
+    },
+    "h265": {
+        "ext": "h265",
+        "args": lambda gop: ["-c:v", "libx265", "-preset", "veryfast",
+                             "-x265-params",
+                             f"keyint={gop}:min-keyint={gop}:scenecut=0:bframes=0:aud=1"],
+    },
+}
+
+
+class ClipSpec:
+    """一个预编码片段的参数；name 同时作为缓存文件名。"""
+
+    def __init__(self, codec: str, width: int, height: int, fps: int, gop: int, motion: str, duration: int):
+        self.codec = codec
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.gop = gop
+        self.motion = motion
+        self.duration = duration
+
+    @property
+    def name(self) -> str:
+        return (f"{self.codec}_{self.width}x{self.height}_{self.fps}fps_gop{self.gop}"
+                f"_{self.motion}_{self.duration}s.{CODECS[self.codec]['ext']}")
+
+    @classmethod
+    def from_name(cls, name: str):
+        """从缓存文件名还原参数，不符合命名规则时返回 None。"""
+        try:
+            stem, _ = os.path.splitext(name)
+            codec, res, fps, gop, motion, duration = stem.split("_")
+            width, height = res.split("x")
+            return cls(codec, int(width), int(height), int(fps[:-3]), int(gop[3:]), motion,
+                       int(duration[:-1]))
+        except ValueError:
+            return None
+
+    def ffmpeg_cmd(self, out_path: str) -> list:
+        src = MOTION_SOURCES[self.motion].format(w=self.width, h=self.height, fps=self.fps)
+        return (["ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+                 "-f", "lavfi", "-i", src, "-t", str(self.duration), "-pix_fmt", "yuv420p"]
+                + CODECS[self.codec]["args"](self.gop) + [out_path])
+
+
+def build_cache(specs: list, cache_dir: str) -> list:
+    """预编码缺失的片段，返回全部片段路径。"""
+    os.makedirs(cache_dir, exist_ok=True)
+    paths = []
+    for spec in specs:
+        path = os.path.join(cache_dir, spec.name)
+        if not os.path.isfile(path):
+            print(f"编码 {spec.name} ...")
+            tmp = path + ".tmp." + CODECS[spec.codec]["ext"]
+            subprocess.run(spec.ffmpeg_cmd(tmp), check=True)
+            os.replace(tmp, path)
+        paths.append(path)
+    return paths
+
+
+def cached_clips(cache_dir: str) -> list:
+    """缓存目录中的 (path, ClipSpec)，按文件名排序以保证可复现。"""
+    if not os.path.isdir(cache_dir):
+        return []
+    clips = []
+    for name in sorted(os.listdir(cache_dir)):
+        spec = ClipSpec.from_name(name)
+        if spec is not None and spec.codec in CODECS:
+            clips.append((os.path.join(cache_dir, name), spec))
+    return clips
+
+
+def nal_unit_type(codec: str, header: int) -> int:
+    return header & 0x1F if codec == "h264" else (header >> 1) & 0x3F
+
+
+def is_aud(codec: str, nal_type: int) -> bool:
+    return nal_type == (9 if codec == "h264" else 35)
+
+
+def is_keyframe_nal(codec: str, nal_type: int) -> bool:
+    # H.264 IDR；H.265 IRAP（BLA/IDR/CRA，16..23）
+    return nal_type == 5 if codec == "h264" else 16 <= nal_type <= 23
+
+
+def index_access_units(data, codec: str) -> list:
+    """扫描 Annex-B 裸流，按 AUD 切分 access unit，返回 [(offset, size, is_keyframe), ...]。
+    data 可以是 bytes 或 mmap，不拷贝数据。"""
+    units = []
+    start = None
+    keyframe = False
+    pos = data.find(b"\x00\x00\x01")
+    while pos != -1 and pos + 3 < len(data):
+        nal_type = nal_unit_type(codec, data[pos + 3])
+        # 4 字节起始码 00 00 00 01 的前导 0 归入本 NAL
+        nal_start = pos - 1 if pos > 0 and data[pos - 1] == 0 else pos
+        if is_aud(codec, nal_type):
+            if start is not None:
+                units.append((start, nal_start - start, keyframe))
+            start = nal_start
+            keyframe = False
+        elif start is None:
+            # 首个 AU 前没有 AUD
+            start = nal_start
+        if is_keyframe_nal(codec, nal_type):
+            keyframe = True
+        pos = data.find(b"\x00\x00\x01", pos + 3)
+    if start is not None:
+        units.append((start, len(data) - start, keyframe))
+    return units
+
+
+def start_index(units: list, offset_frames: int) -> int:
+    """时间偏移对应的起始 AU：偏移处之前最近的关键帧。"""
+    offset_frames %= max(1, len(units))
+    for i in range(offset_frames, -1, -1):
+        if units[i][2]:
+            return i
+    return 0
+
+
+class FramePacer:
+    """一路的帧到期时间。下一帧从上一帧的到期时间累加（而不是从 tick 时刻），调度延迟不会
+    逐帧累积成帧率损失；落后超过 RESYNC_INTERVALS 个帧间隔时对齐到当前时刻，不突发补发。"""
+
+    def __init__(self, fps: float, jitter: float = 0.0, rng=None):
+        self.interval = 1.0 / fps
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.next_due = None
+
+    def start(self, now: float):
+        self.next_due = now
+
+    def due(self, now: float) -> bool:
+        return self.next_due is not None and self.next_due <= now
+
+    def advance(self, now: float):
+        jitter = self.rng.gauss(0, self.jitter) if self.jitter else 0.0
+        self.next_due += self.interval * max(0.1, 1.0 + jitter)
+        if now - self.next_due > RESYNC_INTERVALS * self.interval:
+            self.next_due = now
+
+
+def assign_clips(clips: list, num_streams: int, seed: int) -> list:
+    """按 seed 为每路确定性地分配片段，尽量让不同参数的片段均匀分布。"""
+    rng = random.Random(seed)
+    order = list(clips)
+    rng.shuffle(order)
+    return [order[i % len(order)] for i in range(num_streams)]
+
+
+def parse_spec_args(args) -> list:
+    specs = []
+    for codec in args.codec.split(","):
+        for res in args.resolutions.split(","):
+            w, h = (int(v) for v in res.lower().split("x"))
+            for fps in (int(v) for v in args.fps.split(",")):
+                for gop in (int(v) for v in args.gop.split(",")):
+                    for motion in args.motion.split(","):
+                        if codec not in CODECS or motion not in MOTION_SOURCES:
+                            raise SystemExit(f"错误: 不支持的 codec/motion: {codec}/{motion}")
+                        specs.append(ClipSpec(codec, w, h, fps, gop, motion, args.duration))
+    return specs
+
+
+def serve(clips: list, args) -> int:
+    """单进程 RTSP 服务：一个全局定时器按各路的到期时间推送共享的 AU buffer。"""
+    import gi
+
+    gi.require_version("Gst", "1.0")
+    gi.require_version("GstRtspServer", "1.0")
+    from gi.repository import GLib, Gst, GstRtspServer  # type: ignore
+
+    from gst_server import CODEC_ELEMENTS
+
+    Gst.init(None)
+    rng = random.Random(args.seed)
+
+    class Clip:
+        """加载后的片段：文件只读一次，整体放进一个 GstBuffer（PyGObject 的 new_wrapped 总会拷贝
+        传入的数据，mmap 省不掉这次拷贝，因此不再 mmap）；每个 AU 是它的一个子区域，与整体共享同一块
+        GstMemory、不再拷贝，各路推送其浅拷贝。"""
+
+        def __init__(self, path: str, spec: ClipSpec):
+            self.spec = spec
+            with open(path, "rb") as f:
+                data = f.read()
+            self.units = index_access_units(data, spec.codec)
+            whole = Gst.Buffer.new_wrapped(data)
+            self.buffers = []
+            for offset, size, keyframe in self.units:
+                buf = whole.copy_region(Gst.BufferCopyFlags.MEMORY, offset, size)
+                if not keyframe:
+                    buf.set_flags(Gst.BufferFlags.DELTA_UNIT)
+                self.buffers.append(buf)
+            caps_name = "video/x-h264" if spec.codec == "h264" else "video/x-h265"
+            self.caps = Gst.Caps.from_string(
+                f"{caps_name},stream-format=byte-stream,alignment=au,"
+                f"width={spec.width},height={spec.height},framerate={spec.fps}/1")
+
+    class StreamFeed:
+        """一路 RTSP 源：起始偏移、抖动后的到期时间，以及当前连接的 appsrc。"""
+
+        def __init__(self, clip: Clip, offset_frames: int):
+            self.clip = clip
+            self.index = start_index(clip.units, offset_frames)
+            self.pacer = FramePacer(clip.spec.fps, args.fps_jitter, rng)
+            self.appsrc = None
+
+        def advance(self, now: float):
+            self.pacer.advance(now)
+            self.index = (self.index + 1) % len(self.clip.buffers)
+
+    loaded = {}
+    feeds = []
+    server = GstRtspServer.RTSPServer()
+    server.set_address(args.host)
+    server.set_service(str(args.rtsp_port))
+    mounts = server.get_mount_points()
+
+    def on_media_configure(factory, media, feed):
+        appsrc = media.get_element().get_by_name("src")
+        appsrc.set_property("caps", feed.clip.caps)
+        # 新客户端从偏移处的关键帧开始
+        feed.index = start_index(feed.clip.units, feed.index)
+        feed.pacer.start(time.monotonic())
+        feed.appsrc = appsrc
+        media.connect("unprepared", lambda m: setattr(feed, "appsrc", None))
+
+    for i, (path, spec) in enumerate(assign_clips(clips, args.num_streams, args.seed)):
+        clip = loaded.get(path)
+        if clip is None:
+            clip = loaded[path] = Clip(path, spec)
+        offset_frames = int(rng.uniform(0, args.max_offset) * spec.fps)
+        feed = StreamFeed(clip, offset_frames)
+        feeds.append(feed)
+        parser, payloader = CODEC_ELEMENTS[clip.caps.get_structure(0).get_name()]
+        factory = GstRtspServer.RTSPMediaFactory()
+        factory.set_launch(
+            "( appsrc name=src is-live=true do-timestamp=true format=time "
+            f"! {parser} ! {payloader} name=pay0 pt=96 )")
+        factory.set_shared(True)
+        factory.connect("media-configure", on_media_configure, feed)
+        mounts.add_factory(f"/cam{i}", factory)
+        print(f"  [{i}] rtsp://{args.host}:{args.rtsp_port}/cam{i} <- {spec.name} "
+              f"(offset {offset_frames / spec.fps:.2f}s)")
+
+    def tick():
+        now = time.monotonic()
+        for feed in feeds:
+            if feed.appsrc is None:
+                continue
+            while feed.pacer.due(now):
+                feed.appsrc.emit("push-buffer", feed.clip.buffers[feed.index].copy())
+                feed.advance(now)
+        return GLib.SOURCE_CONTINUE
+
+    if server.attach(None) == 0:
+        print(f"错误: RTSP 服务无法监听端口 {args.rtsp_port}", file=sys.stderr)
+        return 1
+    print(f"负载生成器已启动：{len(feeds)} 路，{len(loaded)} 个共享片段（Ctrl+C 退出）...")
+    GLib.timeout_add(args.tick_ms, tick)
+    loop = GLib.MainLoop()
+    GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, 2, loop.quit)  # SIGINT
+    GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, 15, loop.quit)  # SIGTERM
+    loop.run()
+    return 0
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="合成摄像头负载生成器（预编码片段缓存 + 文件/RTSP 输出）")
+    p.add_argument("--cache-dir", default=os.environ.get("LOADGEN_CACHE_DIR", DEFAULT_CACHE_DIR),
+                   help="预编码片段缓存目录")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="预编码片段缓存（已存在的跳过）")
+    b.add_argument("--codec", default="h264", help="逗号分隔：h264,h265")
+    b.add_argument("--resolutions", default="1920x1080,1280x720,640x360", help="逗号分隔 WxH")
+    b.add_argument("--fps", default="15,30", help="逗号分隔帧率")
+    b.add_argument("--gop", default="30", help="逗号分隔 GOP 长度（帧）")
+    b.add_argument("--motion", default="low,high", help="逗号分隔：low,high")
+    b.add_argument("--duration", type=int, default=10, help="片段时长（秒）")
+
+    for name, help_text, seed_help in (
+            ("list", "输出 N 路 file:// URI（仅片段分配，无偏移 / 抖动）", "片段分配的随机种子"),
+            ("serve", "以 RTSP 提供 N 路源", "片段分配 / 偏移 / 抖动的随机种子")):
+        s = sub.add_parser(name, help=help_text)
+        s.add_argument("-n", "--num-streams", type=int, default=16, help="路数")
+        s.add_argument("--seed", type=int, default=0, help=seed_help)
+    serve_p = sub.choices["serve"]
+    serve_p.add_argument("--rtsp-port", type=int, default=8554, help="RTSP 监听端口")
+    serve_p.add_argument("--host", default="0.0.0.0", help="RTSP 监听地址")
+    serve_p.add_argument("--max-offset", type=float, default=10.0,
+                         help="每路起始时间偏移的上限秒数（均匀随机）")
+    serve_p.add_argument("--fps-jitter", type=float, default=0.0,
+                         help="帧间隔抖动（相对标准差，如 0.05 表示 5%%）")
+    serve_p.add_argument("--tick-ms", type=int, default=2, help="推送定时器周期（毫秒）")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.command == "build":
+        paths = build_cache(parse_spec_args(args), args.cache_dir)
+        print(f"缓存就绪：{len(paths)} 个片段 -> {args.cache_dir}")
+        return 0
+
+    clips = cached_clips(args.cache_dir)
+    if not clips:
+        print(f"错误: 缓存为空，请先运行 build：{args.cache_dir}", file=sys.stderr)
+        return 1
+    if args.command == "list":
+        print(" ".join("file://" + os.path.abspath(path)
+                       for path, _ in assign_clips(clips, args.num_streams, args.seed)))
+        return 0
+    return serve(clips, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
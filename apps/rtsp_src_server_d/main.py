@@ -14,16 +14,28 @@
 
 环境变量:
     STREAMS_JSON  - 可选，多路配置 JSON 字符串（同 --config 文件内容）
+    STATUS_PORT   - 可选，HTTP 状态接口端口（同 --status-port）
+    PUBLISH_MODE  - 可选，ffmpeg（默认）或 gst（同 --mode）
+    RTSP_PORT     - 可选，gst 模式的 RTSP 监听端口（同 --rtsp-port）
+    RTSP_HOST     - 可选，gst 模式的 RTSP 监听地址（同 --rtsp-host）
+
+所有 FFmpeg 子进程由单个 asyncio 事件循环监管（不再每路一个线程）：stderr 非阻塞读取到
+每路的有界环形缓冲，退出后按指数退避 + 抖动重启，启动时错峰，每路记录运行状态/运行时长/重启次数，
+可通过 --status-port 开启的 HTTP 接口查询。
 """
 
 import argparse
+import asyncio
 import json
 import os
+import random
 import signal
-import subprocess
 import sys
-import threading
 import time
+from collections import deque
+
+# 环形缓冲中单行 stderr 的最大字节数
+MAX_STDERR_LINE = 1024
 
 
 def parse_args():
@@ -50,13 +62,70 @@ def parse_args():
         metavar="PATH",
         help='多路：从 JSON 文件读取 [{"video": path, "url": rtsp_url}, ...]',
     )
+    p.add_argument(
+        "--mode",
+        choices=["ffmpeg", "gst"],
+        default=os.environ.get("PUBLISH_MODE", "ffmpeg"),
+        help="ffmpeg: 每路一个 FFmpeg 推流到外部 RTSP 服务（如 MediaMTX）；"
+        "gst: 单进程 GStreamer RTSP 服务直接提供全部挂载点（见 gst_server.py）",
+    )
+    p.add_argument(
+        "--rtsp-port",
+        type=int,
+        default=int(os.environ.get("RTSP_PORT", "8554")),
+        help="gst 模式：RTSP 服务监听端口（挂载点取各 URL 的 path）",
+    )
+    p.add_argument(
+        "--rtsp-host",
+        default=os.environ.get("RTSP_HOST", "0.0.0.0"),
+        help="gst 模式：RTSP 服务监听地址",
+    )
     p.add_argument(
         "--restart-delay",
         type=float,
         default=5.0,
-        help="某路 FFmpeg 退出后重启等待秒数",
+        help="某路 FFmpeg 退出后首次重启的退避基准秒数（连续失败时指数增长，带抖动）",
+    )
+    p.add_argument(
+        "--max-restart-delay",
+        type=float,
+        default=60.0,
+        help="重启退避的上限秒数",
+    )
+    p.add_argument(
+        "--healthy-after",
+        type=float,
+        default=30.0,
+        help="FFmpeg 连续运行超过该秒数后视为健康，退避重新从 --restart-delay 开始",
+    )
+    p.add_argument(
+        "--stagger",
+        type=float,
+        default=0.1,
+        help="错峰启动：相邻两路 FFmpeg 的启动间隔秒数",
+    )
+    p.add_argument(
+        "--stderr-lines",
+        type=int,
+        default=200,
+        help="每路保留的 FFmpeg stderr 行数（环形缓冲）",
+    )
+    p.add_argument(
+        "--status-port",
+        type=int,
+        default=int(os.environ.get("STATUS_PORT", "0")),
+        help="HTTP 状态接口端口，0 表示关闭",
+    )
+    p.add_argument(
+        "--status-host",
+        default=os.environ.get("STATUS_HOST", "0.0.0.0"),
+        help="HTTP 状态接口监听地址",
     )
-    return p.parse_args()
+    args = p.parse_args()
+    # 状态接口只覆盖 ffmpeg 模式的推流进程，gst 模式下没有可报告的状态
+    if args.mode == "gst" and args.status_port:
+        p.error("--status-port（STATUS_PORT）仅支持 ffmpeg 模式，不能与 --mode gst 同时使用")
+    return args
 
 
 def load_streams_from_args(args):
@@ -98,10 +167,14 @@ def load_streams_from_args(args):
     return [(video, url)]
 
 
-def run_ffmpeg_rtsp_push(video_path: str, rtsp_url: str) -> subprocess.Popen:
-    """启动 FFmpeg：-stream_loop -1 无限循环该视频，按原速 -re 推流到 RTSP。"""
-    cmd = [
+def ffmpeg_rtsp_push_cmd(video_path: str, rtsp_url: str) -> list:
+    """FFmpeg 命令：-stream_loop -1 无限循环该视频，按原速 -re 推流到 RTSP。"""
+    return [
         "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-loglevel",
+        "warning",
         "-re",
         "-stream_loop",
         "-1",
@@ -115,54 +188,233 @@ def run_ffmpeg_rtsp_push(video_path: str, rtsp_url: str) -> subprocess.Popen:
         "tcp",
         rtsp_url,
     ]
-    return subprocess.Popen(
-        cmd,
-        stdin=subprocess.DEVNULL,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
 
 
-def stream_worker(
-    stream_id: int,
-    video_path: str,
-    rtsp_url: str,
-    restart_delay: float,
-    stop_event: threading.Event,
-    current_procs: list,
-    lock: threading.Lock,
-):
-    """单路推流循环：不断启动 FFmpeg，失败则等待后重启；遇 stop_event 退出。"""
-    while not stop_event.is_set():
-        if not os.path.isfile(video_path):
-            print(
-                f"[stream-{stream_id}] 错误: 视频不存在 {video_path}", file=sys.stderr
-            )
+class StreamState:
+    """单路推流状态：运行状态、重启/运行时长计数，stderr 保存在有界环形缓冲中。"""
+
+    def __init__(self, stream_id: int, video_path: str, rtsp_url: str, stderr_lines: int):
+        self.stream_id = stream_id
+        self.video_path = video_path
+        self.rtsp_url = rtsp_url
+        self.status = "pending"
+        self.pid = None
+        self.restarts = 0
+        self.consecutive_failures = 0
+        self.last_exit_code = None
+        self.started_at = None
+        self.total_uptime = 0.0
+        self.next_restart_at = None
+        self.stderr = deque(maxlen=stderr_lines)
+
+    def uptime(self) -> float:
+        """当前进程已运行秒数（未运行时为 0）。"""
+        if self.started_at is None:
+            return 0.0
+        return time.monotonic() - self.started_at
+
+    def to_dict(self, with_stderr: bool = False) -> dict:
+        d = {
+            "id": self.stream_id,
+            "video": self.video_path,
+            "url": self.rtsp_url,
+            "status": self.status,
+            "pid": self.pid,
+            "restarts": self.restarts,
+            "consecutive_failures": self.consecutive_failures,
+            "last_exit_code": self.last_exit_code,
+            "uptime": round(self.uptime(), 1),
+            "total_uptime": round(self.total_uptime + self.uptime(), 1),
+        }
+        if self.next_restart_at is not None:
+            d["restart_in"] = round(max(0.0, self.next_restart_at - time.monotonic()), 1)
+        if with_stderr:
+            d["stderr"] = list(self.stderr)
+        return d
+
+
+def backoff_delay(failures: int, base: float, maximum: float) -> float:
+    """指数退避 + 抖动：base * 2^(failures-1)，上限 maximum，取其 [50%, 100%] 区间的随机值，
+    避免大量流同时失败后同时重启。"""
+    delay = min(maximum, base * (2 ** max(0, failures - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+async def pump_stderr(reader: asyncio.StreamReader, state: StreamState):
+    """非阻塞读取 FFmpeg stderr，按行写入环形缓冲（超长行截断），不在内存中累积。"""
+    partial = b""
+    while True:
+        chunk = await reader.read(4096)
+        if not chunk:
             break
-        proc = run_ffmpeg_rtsp_push(video_path, rtsp_url)
-        with lock:
-            current_procs.append((stream_id, proc))
+        lines = (partial + chunk).split(b"\n")
+        partial = lines.pop()[-MAX_STDERR_LINE:]
+        for line in lines:
+            line = line.rstrip(b"\r")
+            if line:
+                state.stderr.append(line[:MAX_STDERR_LINE].decode("utf-8", "replace"))
+    if partial:
+        state.stderr.append(partial.decode("utf-8", "replace"))
+
+
+async def supervise_stream(state: StreamState, args, start_delay: float, stop: asyncio.Event):
+    """单路推流监管：错峰启动 FFmpeg，退出后指数退避重启；stop 置位时退出。"""
+    if await wait_or_stop(stop, start_delay):
+        return
+    while not stop.is_set():
+        if not os.path.isfile(state.video_path):
+            print(f"[stream-{state.stream_id}] 错误: 视频不存在 {state.video_path}", file=sys.stderr)
+            state.status = "failed"
+            return
+        state.status = "starting"
         try:
-            _, stderr = proc.communicate(timeout=None)
-            if stderr and proc.returncode != 0:
-                print(f"[stream-{stream_id}] stderr: {stderr[:500]}", file=sys.stderr)
-        except subprocess.TimeoutExpired:
-            proc.kill()
-            proc.wait()
-        finally:
-            with lock:
-                current_procs[:] = [
-                    (i, p) for (i, p) in current_procs if i != stream_id or p != proc
-                ]
-        if stop_event.is_set():
+            proc = await asyncio.create_subprocess_exec(
+                *ffmpeg_rtsp_push_cmd(state.video_path, state.rtsp_url),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            # 拉起失败（ffmpeg 缺失、EAGAIN、fd 耗尽等）按进程退出处理，进入退避，不影响其他路
+            state.stderr.append(f"启动 FFmpeg 失败: {e}")
+            state.last_exit_code = None
+            ran = 0.0
+            exit_desc = "启动失败"
+        else:
+            state.pid = proc.pid
+            state.started_at = time.monotonic()
+            state.next_restart_at = None
+            state.status = "running"
+            stderr_task = asyncio.ensure_future(pump_stderr(proc.stderr, state))
+            wait_task = asyncio.ensure_future(proc.wait())
+            stop_task = asyncio.ensure_future(stop.wait())
+            await asyncio.wait({wait_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+            if not wait_task.done():
+                await terminate(proc)
+            stop_task.cancel()
+            await stderr_task
+
+            ran = state.uptime()
+            state.total_uptime += ran
+            state.started_at = None
+            state.pid = None
+            state.last_exit_code = proc.returncode
+            exit_desc = f"退出码 {proc.returncode}"
+        if stop.is_set():
+            break
+        # 运行足够久视为健康，失败计数清零，下一次从最短退避开始
+        if ran >= args.healthy_after:
+            state.consecutive_failures = 0
+        state.consecutive_failures += 1
+        state.restarts += 1
+        delay = backoff_delay(state.consecutive_failures, args.restart_delay, args.max_restart_delay)
+        print(
+            f"[stream-{state.stream_id}] {exit_desc}，{delay:.1f}s 后重启...",
+            file=sys.stderr,
+        )
+        if state.stderr:
+            print(f"[stream-{state.stream_id}] stderr: {state.stderr[-1]}", file=sys.stderr)
+        state.status = "backoff"
+        state.next_restart_at = time.monotonic() + delay
+        if await wait_or_stop(stop, delay):
             break
-        if proc.returncode != 0:
-            print(
-                f"[stream-{stream_id}] 退出码 {proc.returncode}，{restart_delay}s 后重启...",
-                file=sys.stderr,
+    state.status = "stopped"
+    state.next_restart_at = None
+
+
+async def wait_or_stop(stop: asyncio.Event, delay: float) -> bool:
+    """等待 delay 秒；期间 stop 置位则提前返回 True。"""
+    if delay <= 0:
+        return stop.is_set()
+    try:
+        await asyncio.wait_for(stop.wait(), timeout=delay)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+async def terminate(proc, timeout: float = 5.0):
+    """先 SIGTERM，超时后 SIGKILL。"""
+    if proc.returncode is not None:
+        return
+    try:
+        proc.terminate()
+        await asyncio.wait_for(proc.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+    except ProcessLookupError:
+        pass
+
+
+def status_summary(states: list) -> dict:
+    counts = {}
+    for st in states:
+        counts[st.status] = counts.get(st.status, 0) + 1
+    return {
+        "streams": len(states),
+        "by_status": counts,
+        "restarts": sum(st.restarts for st in states),
+        "items": [st.to_dict() for st in states],
+    }
+
+
+async def serve_status(states: list, host: str, port: int):
+    """极简 HTTP 状态接口：GET / 或 /status 返回全部流概况，GET /streams/<id> 返回单路详情（含 stderr 尾部）。"""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            # 丢弃请求头
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            path = parts[1] if len(parts) > 1 else "/"
+            code, body = 200, None
+            if path in ("/", "/status"):
+                body = status_summary(states)
+            elif path.startswith("/streams/"):
+                sid = path[len("/streams/"):]
+                if sid.isdigit() and int(sid) < len(states):
+                    body = states[int(sid)].to_dict(with_stderr=True)
+            if body is None:
+                code, body = 404, {"error": f"not found: {path}"}
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {code} {'OK' if code == 200 else 'Not Found'}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + payload
             )
-        time.sleep(restart_delay)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def run(args, streams: list) -> int:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    states = [StreamState(i, v, u, args.stderr_lines) for i, (v, u) in enumerate(streams)]
+    server = None
+    if args.status_port:
+        server = await serve_status(states, args.status_host, args.status_port)
+        print(f"状态接口: http://{args.status_host}:{args.status_port}/status")
+
+    # 错峰启动：第 i 路延迟 i * stagger 秒，避免同时拉起大量 FFmpeg
+    tasks = [
+        asyncio.ensure_future(supervise_stream(st, args, i * args.stagger, stop))
+        for i, st in enumerate(states)
+    ]
+    await asyncio.gather(*tasks)
+    if server:
+        server.close()
+        await server.wait_closed()
+    return 0
 
 
 def main():
@@ -173,49 +425,17 @@ def main():
         if not os.path.isfile(video_path):
             print(f"错误: 视频不存在: {video_path}", file=sys.stderr)
             sys.exit(1)
-        print(f"  [{i}] {video_path} -> {rtsp_url}")
-    print("多路推流已启动（Ctrl+C 退出）...")
-
-    stop_event = threading.Event()
-    current_procs = []
-    lock = threading.Lock()
-
-    def on_sig(signum, frame):
-        stop_event.set()
-        with lock:
-            to_terminate = [(i, p) for i, p in current_procs]
-        for _id, proc in to_terminate:
-            try:
-                proc.terminate()
-                proc.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                proc.kill()
-            except Exception:
-                pass
+        if args.mode == "ffmpeg":
+            print(f"  [{i}] {video_path} -> {rtsp_url}")
 
-    signal.signal(signal.SIGINT, on_sig)
-    signal.signal(signal.SIGTERM, on_sig)
+    if args.mode == "gst":
+        # 按需导入：ffmpeg 模式不依赖 PyGObject/GStreamer
+        import gst_server
 
-    threads = []
-    for i, (video_path, rtsp_url) in enumerate(streams):
-        t = threading.Thread(
-            target=stream_worker,
-            args=(
-                i,
-                video_path,
-                rtsp_url,
-                args.restart_delay,
-                stop_event,
-                current_procs,
-                lock,
-            ),
-            daemon=True,
-        )
-        t.start()
-        threads.append(t)
+        sys.exit(gst_server.run(streams, args.rtsp_port, args.rtsp_host))
 
-    for t in threads:
-        t.join()
+    print("多路推流已启动（Ctrl+C 退出）...")
+    sys.exit(asyncio.run(run(args, streams)))
 
 
 if __name__ == "__main__":
@@ -28,11 +28,13 @@ from gi.repository import Gst, GLib  # type: ignore
 from ctypes import *
 import time
 import sys
-import math
 import random
 from pathlib import Path
 
 from common.platform_info import PlatformInfo
+from common.source_manager import SourceManager
+from common.source_bin_pool import SourceBinPool, discover_codec_class
+from common.batch_controller import BatchController, slot_span
 
 import pyds
 
@@ -44,10 +46,15 @@ PGIE_CLASS_ID_ROADSIGN = 3
 MUXER_OUTPUT_WIDTH = 1920
 MUXER_OUTPUT_HEIGHT = 1080
 MUXER_BATCH_TIMEOUT_USEC = 33000
+# Nominal frame rate of the sources, used to derive batched-push-timeout
+SOURCE_FPS = 30
 TILED_OUTPUT_WIDTH = 1280
 TILED_OUTPUT_HEIGHT = 720
 GPU_ID = 0
 MAX_NUM_SOURCES = 4
+# Number of pre-created decoder bins kept ready for new sources, 0 disables
+# the pool and creates a fresh uridecodebin per source
+WARM_POOL_SIZE = 1
 SINK_ELEMENT = "nveglglessink"
 PGIE_CONFIG_FILE = "dstest_pgie_config.txt"
 TRACKER_CONFIG_FILE = "dstest_tracker_config.txt"
@@ -62,19 +69,17 @@ CONFIG_GROUP_TRACKER_HEIGHT = "tracker-height"
 CONFIG_GROUP_TRACKER_LL_CONFIG_FILE = "ll-config-file"
 CONFIG_GROUP_TRACKER_LL_LIB_FILE = "ll-lib-file"
 
-g_num_sources = 0
-g_source_id_list = [0] * MAX_NUM_SOURCES
-g_eos_list = [False] * MAX_NUM_SOURCES
-g_source_enabled = [False] * MAX_NUM_SOURCES
-g_source_bin_list = [None] * MAX_NUM_SOURCES
-
 pgie_classes_str = ["Vehicle", "TwoWheeler", "Person", "RoadSign"]
 
 uri = ""
+# Codec/resolution class of uri, the user_data of every source (pool key)
+source_class = None
 
 loop = None
 pipeline = None
 streammux = None
+source_manager = None
+source_bin_pool = None
 sink = None
 pgie = None
 sgie1 = None
@@ -85,210 +90,61 @@ tiler = None
 tracker = None
 
 
-def decodebin_child_added(child_proxy, Object, name, user_data):
-    print("Decodebin child added:", name, "\n")
-    if name.find("decodebin") != -1:
-        Object.connect("child-added", decodebin_child_added, user_data)
-    if name.find("nvv4l2decoder") != -1:
-        if platform_info.is_integrated_gpu():
-            Object.set_property("enable-max-performance", True)
-            Object.set_property("drop-frame-interval", 0)
-            Object.set_property("num-extra-surfaces", 0)
-        else:
-            Object.set_property("gpu_id", GPU_ID)
-
-
-def cb_newpad(decodebin, pad, data):
-    global streammux
-    print("===> In cb_newpad\n")
-    caps = pad.get_current_caps()
-    gststruct = caps.get_structure(0)
-    gstname = gststruct.get_name()
-
-    # Need to check if the pad created by the decodebin is for video and not audio.
-    print("\t + gstname=", gstname)
-    if gstname.find("video") != -1:
-        source_id = data
-        pad_name = f"sink_{source_id:02}"
-        print(f"\t + pad_name=", pad_name)
-
-        # Get a sink pad from the streammux, link to decodebin
-        sinkpad = streammux.request_pad_simple(pad_name)
-        if not sinkpad:
-            sys.stderr.write("Unable to create sink pad bin \n")
-
-        if pad.link(sinkpad) == Gst.PadLinkReturn.OK:
-            print("\t + Decodebin linked to pipeline")
-        else:
-            sys.stderr.write("Failed to link decodebin to pipeline\n")
-
-
-def create_uridecode_bin(index, filename):
-    global g_source_id_list
-    print(f"===> Creating uridecodebin for [{filename}]")
-
-    # Create a source GstBin to abstract this bin's content from the rest of the
-    # pipeline
-    g_source_id_list[index] = index
-    bin_name = f"source-bin-{index:02}"
-    print(f"\t + {bin_name}\n")
-
-    # Source element for reading from the uri.
-    # We will use decodebin and let it figure out the container format of the
-    # stream and the codec and plug the appropriate demux and decode plugins.
-    bin = Gst.ElementFactory.make("uridecodebin", bin_name)
-    if not bin:
-        sys.stderr.write(" Unable to create uri decode bin \n")
-
-    # We set the input uri to the source element
-    bin.set_property("uri", filename)
-
-    # 当 uridecodebin 内部解码出视频并产生 pad 时，会触发 cb_newpad, 在回调里把该 pad 接到 streammux
-    bin.connect("pad-added", cb_newpad, g_source_id_list[index])
-    # 可选:观察内部子元素创建(如 nvv4l2decoder), 用于打日志或设置属性
-    bin.connect("child-added", decodebin_child_added, g_source_id_list[index])
-
-    # Set status of the source to enabled
-    g_source_enabled[index] = True
-
-    return bin
-
-
-def stop_release_source(source_id):
-    global g_num_sources
-    global g_source_bin_list
-    global streammux
-    global pipeline
-
-    # Attempt to change status of source to be released
-    state_return = g_source_bin_list[source_id].set_state(Gst.State.NULL)
-
-    if state_return == Gst.StateChangeReturn.SUCCESS:
-        print("STATE CHANGE SUCCESS\n")
-        pad_name = "sink_%u" % source_id
-        print(pad_name)
-        # Retrieve sink pad to be released
-        sinkpad = streammux.get_static_pad(pad_name)
-        # Send flush stop event to the sink pad, then release from the streammux
-        sinkpad.send_event(Gst.Event.new_flush_stop(False))
-        streammux.release_request_pad(sinkpad)
-        print("STATE CHANGE SUCCESS\n")
-        # Remove the source bin from the pipeline
-        pipeline.remove(g_source_bin_list[source_id])
-        source_id -= 1
-        g_num_sources -= 1
-
-    elif state_return == Gst.StateChangeReturn.FAILURE:
-        print("STATE CHANGE FAILURE\n")
-
-    elif state_return == Gst.StateChangeReturn.ASYNC:
-        state_return = g_source_bin_list[source_id].get_state(Gst.CLOCK_TIME_NONE)
-        pad_name = "sink_%u" % source_id
-        print(pad_name)
-        sinkpad = streammux.get_static_pad(pad_name)
-        sinkpad.send_event(Gst.Event.new_flush_stop(False))
-        streammux.release_request_pad(sinkpad)
-        print("STATE CHANGE ASYNC\n")
-        pipeline.remove(g_source_bin_list[source_id])
-        source_id -= 1
-        g_num_sources -= 1
+def on_sources_removed(removed):
+    # Quit if no sources remaining
+    if source_manager.num_sources == 0:
+        print("===> All sources stopped quitting")
+        loop.quit()
 
 
 def delete_sources(data):
-    global loop
-    global g_num_sources
-    global g_eos_list
-    global g_source_enabled
+    if source_bin_pool:
+        print("===> Source bin pool:", source_bin_pool.stats())
 
     # First delete sources that have reached end of stream
-    for source_id in range(MAX_NUM_SOURCES):
-        if g_eos_list[source_id] and g_source_enabled[source_id]:
-            g_source_enabled[source_id] = False
-            stop_release_source(source_id)
-
-    # Quit if no sources remaining
-    if g_num_sources == 0:
-        loop.quit()
-        print("===> All sources stopped quitting")
+    source_manager.remove_eos_sources(on_sources_removed)
+
+    # EOS sources are only queued for removal above, leave them out
+    source_ids = source_manager.active_source_ids()
+    if not source_ids:
+        # Pending EOS removals quit the loop from on_sources_removed
+        if source_manager.num_sources == 0:
+            loop.quit()
+            print("===> All sources stopped quitting")
         return False
 
     # Randomly choose an enabled source to delete
-    source_id = random.randrange(0, MAX_NUM_SOURCES)
-    while not g_source_enabled[source_id]:
-        source_id = random.randrange(0, MAX_NUM_SOURCES)
-    # Disable the source
-    g_source_enabled[source_id] = False
-    # Release the source
+    source_id = random.choice(source_ids)
     print(f"\t + Calling Stop {source_id} ")
-    stop_release_source(source_id)
-
-    # Quit if no sources remaining
-    if g_num_sources == 0:
-        loop.quit()
-        print("===> All sources stopped quitting ")
-        return False
+    source_manager.remove_source(source_id, lambda removed: on_sources_removed([removed]))
 
-    return True
-
-
-def add_sources(data):
-    global g_num_sources
-    global g_source_enabled
-    global g_source_bin_list
-    global pipeline
-
-    source_id = g_num_sources
-
-    # Randomly select an un-enabled source to addstreammux
-    source_id = random.randrange(0, MAX_NUM_SOURCES)
-    while g_source_enabled[source_id]:
-        source_id = random.randrange(0, MAX_NUM_SOURCES)
-
-    # Enable the source
-    g_source_enabled[source_id] = True
+    # Keep deleting until the last source is gone
+    return len(source_ids) > 1
 
-    print("===> Calling Start %d " % source_id)
 
-    # Create a uridecode bin with the chosen source id
-    source_bin = create_uridecode_bin(source_id, uri)
-
-    if not source_bin:
+def on_source_added(source_id):
+    if source_id is None:
         sys.stderr.write("Failed to create source bin. Exiting.")
-        exit(1)
-
-    # Add source bin to our list and to pipeline
-    g_source_bin_list[source_id] = source_bin
-    pipeline.add(source_bin)
-
-    # Set state of source bin to playing
-    state_return = g_source_bin_list[source_id].set_state(Gst.State.PLAYING)
-
-    if state_return == Gst.StateChangeReturn.SUCCESS:
-        print("\t + STATE CHANGE SUCCESS\n")
-        source_id += 1
-
-    elif state_return == Gst.StateChangeReturn.FAILURE:
-        print("\t - STATE CHANGE FAILURE\n")
-
-    elif state_return == Gst.StateChangeReturn.ASYNC:
-        state_return = g_source_bin_list[source_id].get_state(Gst.CLOCK_TIME_NONE)
-        source_id += 1
+        loop.quit()
+        return
+    print("===> Started source %d " % source_id)
 
-    elif state_return == Gst.StateChangeReturn.NO_PREROLL:
-        print("\t * STATE CHANGE NO PREROLL\n")
+    # If reached the maximum number of sources, delete sources every 10 seconds
+    if source_manager.is_full():
+        GLib.timeout_add_seconds(10, delete_sources, None)
 
-    g_num_sources += 1
 
-    # If reached the maximum number of sources, delete sources every 10 seconds
-    if g_num_sources == MAX_NUM_SOURCES:
-        GLib.timeout_add_seconds(10, delete_sources, g_source_bin_list)
+def add_sources(data):
+    if source_manager.is_full():
         return False
-
-    return True
+    print("===> Calling Start")
+    source_manager.add_source(uri, on_source_added, source_class)
+    # The slot is only taken once the main loop runs the queued add, so stop
+    # this timer when the queued add will fill the last slot.
+    return source_manager.num_sources + 1 < source_manager.max_sources
 
 
 def bus_call(bus, message, loop):
-    global g_eos_list
     t = message.type
     if t == Gst.MessageType.EOS:
         sys.stdout.write("End-of-stream\n")
@@ -301,25 +157,20 @@ def bus_call(bus, message, loop):
         sys.stderr.write("Error: %s: %s\n" % (err, debug))
         loop.quit()
     elif t == Gst.MessageType.ELEMENT:
-        struct = message.get_structure()
-        # Check for stream-eos message
-        if struct is not None and struct.has_name("stream-eos"):
-            parsed, stream_id = struct.get_uint("stream-id")
-            if parsed:
-                # Set eos status of stream to True, to be deleted in delete-sources
-                print("Got EOS from stream %d" % stream_id)
-                g_eos_list[stream_id] = True
+        # Check for stream-eos message, the source is deleted in delete_sources
+        source_manager.handle_bus_message(message)
     return True
 
 
 def main(args):
-    global g_num_sources
-    global g_source_bin_list
     global uri
+    global source_class
 
     global loop
     global pipeline
     global streammux
+    global source_manager
+    global source_bin_pool
     global sink
     global pgie
     global sgie1
@@ -356,14 +207,49 @@ def main(args):
     if not streammux:
         sys.stderr.write(" Unable to create NvStreamMux \n")
 
-    streammux.set_property("batched-push-timeout", 25000)
-    streammux.set_property("batch-size", 30)  # TODO ?
+    # batch-size and batched-push-timeout follow the number of active
+    # sources, see batch_controller below
     streammux.set_property("gpu_id", GPU_ID)
 
     pipeline.add(streammux)
     streammux.set_property("live-source", 1)
     # TODO uri -> ???
     uri = args[1]
+
+    if platform_info.is_integrated_gpu():
+        decoder_properties = {
+            "enable-max-performance": True,
+            "drop-frame-interval": 0,
+            "num-extra-surfaces": 0,
+        }
+    else:
+        decoder_properties = {"gpu_id": GPU_ID}
+    # Streammux slots, source bins and their request pads are owned by the
+    # source manager, which also handles the runtime add/delete requests
+    if WARM_POOL_SIZE > 0:
+        # Sources added at runtime take a parked decoder bin from the pool
+        # instead of waiting for uridecodebin autoplugging. Every source uses
+        # uri, so its class is probed once and all parked bins match it.
+        source_class = discover_codec_class(uri)
+        source_bin_pool = SourceBinPool(
+            classes=[source_class],
+            min_idle=WARM_POOL_SIZE,
+            decoder_properties=decoder_properties,
+        )
+        source_bin_pool.prewarm()
+        source_manager = SourceManager(
+            pipeline,
+            streammux,
+            MAX_NUM_SOURCES,
+            decoder_properties,
+            bin_factory=source_bin_pool.bin_factory,
+            bin_releaser=source_bin_pool.bin_releaser,
+        )
+    else:
+        source_manager = SourceManager(
+            pipeline, streammux, MAX_NUM_SOURCES, decoder_properties
+        )
+
     print("===> Creating source_bin")
     for i in range(num_sources):
         uri_name = args[i + 1]
@@ -375,14 +261,9 @@ def main(args):
         if uri_name.find("rtsp://") == 0:
             is_live = True
         # Create first source bin and add to pipeline
-        source_bin = create_uridecode_bin(i, uri_name)
-        if not source_bin:
+        if source_manager.add_source_sync(uri_name, source_class) is None:
             sys.stderr.write("Failed to create source bin. Exiting. \n")
             sys.exit(1)
-        g_source_bin_list[i] = source_bin
-        pipeline.add(source_bin)
-
-    g_num_sources = num_sources
 
     print("===> Creating Pgie \n ")
     pgie = Gst.ElementFactory.make("nvinfer", "primary-inference")
@@ -469,8 +350,7 @@ def main(args):
             tracker.set_property("enable_batch_process", tracker_enable_batch_process)
 
     # Set necessary properties of the nvinfer element, the necessary ones are:
-    # g_source_id_list / g_eos_list / g_source_enabled / g_source_bin_list
-    # 长度固定为 MAX_NUM_SOURCES，不会变 仅元素内容会变(槽位启用/禁用、bin 的创建/移除) batch-size 与槽位数量一致即可
+    # 槽位数量固定为 MAX_NUM_SOURCES，不会变 仅槽位的占用会变(bin 的创建/移除) batch-size 与槽位数量一致即可
     pgie_batch_size = pgie.get_property("batch-size")
     if pgie_batch_size < MAX_NUM_SOURCES:
         print(
@@ -482,16 +362,26 @@ def main(args):
         )
     pgie.set_property("batch-size", MAX_NUM_SOURCES)
 
+    # Streammux batch-size/batched-push-timeout and the tiler grid are
+    # recomputed whenever sources are added or deleted. The pgie engine is
+    # built for MAX_NUM_SOURCES, which is the only batch size it can use.
+    batch_controller = BatchController(
+        streammux,
+        pgie,
+        tiler,
+        engine_batch_sizes=(MAX_NUM_SOURCES,),
+        source_fps=SOURCE_FPS,
+    )
+    source_ids = source_manager.source_ids()
+    batch_controller.apply_now(len(source_ids), slot_span(source_ids))
+    source_manager.add_listener(batch_controller.on_sources_changed)
+
     # Set gpu IDs of the inference engines
     pgie.set_property("gpu_id", GPU_ID)
     sgie1.set_property("gpu_id", GPU_ID)
     sgie2.set_property("gpu_id", GPU_ID)
 
     # Set tiler properties
-    tiler_rows = int(math.sqrt(num_sources))
-    tiler_columns = int(math.ceil((1.0 * num_sources) / tiler_rows))
-    tiler.set_property("rows", tiler_rows)
-    tiler.set_property("columns", tiler_columns)
     tiler.set_property("width", TILED_OUTPUT_WIDTH)
     tiler.set_property("height", TILED_OUTPUT_HEIGHT)
 
@@ -569,10 +459,10 @@ def main(args):
         过 10 秒后调用一次 callback;若 callback 返回 True,会再安排"10 秒后再调一次",如此反复;若 返回 False,就取消定时,不再调用
         实现 管道跑起来一段时间后再动态添加新源 的逻辑
 
-        在 add_sources() 函数内 另 添加一个 GLib.timeout_add_seconds(10, delete_sources, g_source_bin_list)
+        在 on_source_added() 函数内 另 添加一个 GLib.timeout_add_seconds(10, delete_sources, None)
         当 当前流数 达到 MAX_NUM_SOURCES 时 就开始 每隔 10s 停掉一个流
         """
-        GLib.timeout_add_seconds(10, add_sources, g_source_bin_list)
+        GLib.timeout_add_seconds(10, add_sources, None)
     else:
         print("+++> Pipeline is not in playing state to add sources\n")
 
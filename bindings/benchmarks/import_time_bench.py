@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+""" Import time of pyds with lazily and eagerly registered binding groups.
+
+Every measurement runs in a fresh interpreter, so the shared library is loaded
+and all classes are registered again each time. Reports the median time of
+'import pyds' by default (rarely used groups registered on first use) and with
+PYDS_EAGER_IMPORT=1 (everything registered at import), then the cost of the
+first access to each lazily registered group.
+
+  python3 import_time_bench.py [--runs 20]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+GROUPS = ["schema", "tracker", "analytics", "opticalflow", "meta360", "roi",
+          "preprocess", "custom"]
+
+IMPORT_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import pyds
+print(time.perf_counter() - t0)
+"""
+
+GROUP_SNIPPET = """
+import time
+import pyds
+t0 = time.perf_counter()
+pyds.load_lazy_bindings(%r)
+print(time.perf_counter() - t0)
+"""
+
+
+def measure(snippet, runs, eager=False):
+    env = dict(os.environ)
+    env.pop("PYDS_EAGER_IMPORT", None)
+    if eager:
+        env["PYDS_EAGER_IMPORT"] = "1"
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", snippet], env=env, check=True,
+                             capture_output=True, text=True).stdout
+        times.append(float(out.split()[-1]))
+    return statistics.median(times) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=20,
+                        help="Interpreters started per measurement, default=20")
+    args = parser.parse_args()
+
+    lazy = measure(IMPORT_SNIPPET, args.runs)
+    eager = measure(IMPORT_SNIPPET, args.runs, eager=True)
+    print("%-28s %10s" % ("", "median ms"))
+    print("%-28s %10.2f" % ("import pyds", lazy))
+    print("%-28s %10.2f" % ("import pyds (eager)", eager))
+    for group in GROUPS:
+        print("%-28s %10.2f" % ("first access: " + group, measure(GROUP_SNIPPET % group, args.runs)))
+
+
+if __name__ == "__main__":
+    main()
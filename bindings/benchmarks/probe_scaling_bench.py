@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+################################################################################
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+""" Probe throughput against the number of threads.
+
+Every thread owns a batch meta with one frame of --objects objects, built
+with pyds without a pipeline, and runs the work of a typical per-stream probe
+on it (walk the object list, read the bboxes, count classes, update the
+display text) as often as it can for --duration seconds. On a GIL build the
+total throughput stays flat; with pyds built for free-threaded python
+(python3.13t, see bindings/README.md) it should grow with the thread count
+up to the number of cores.
+
+  python3 probe_scaling_bench.py [--threads 1,2,4,8,16] [--objects 50] [--duration 3]
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+import pyds
+
+
+def make_batch(num_objects):
+    batch_meta = pyds.nvds_create_batch_meta(1)
+    frame_meta = pyds.nvds_acquire_frame_meta_from_pool(batch_meta)
+    for i in range(num_objects):
+        obj_meta = pyds.nvds_acquire_obj_meta_from_pool(batch_meta)
+        obj_meta.class_id = i % 4
+        obj_meta.confidence = 0.5
+        rect = obj_meta.rect_params
+        rect.left, rect.top, rect.width, rect.height = 10.0 * i, 20.0, 50.0, 100.0
+        pyds.nvds_add_obj_meta_to_frame(frame_meta, obj_meta, None)
+    pyds.nvds_add_frame_meta_to_batch(batch_meta, frame_meta)
+    return batch_meta
+
+
+def probe(batch_meta):
+    """ The per-buffer work of a simple probe """
+    l_frame = batch_meta.frame_meta_list
+    while l_frame is not None:
+        frame_meta = pyds.NvDsFrameMeta.cast(l_frame.data)
+        counts = [0, 0, 0, 0]
+        area = 0.0
+        l_obj = frame_meta.obj_meta_list
+        while l_obj is not None:
+            obj_meta = pyds.NvDsObjectMeta.cast(l_obj.data)
+            counts[obj_meta.class_id] += 1
+            rect = obj_meta.rect_params
+            area += rect.width * rect.height
+            obj_meta.text_params.font_params.font_color.set(1.0, 1.0, 1.0, 1.0)
+            l_obj = l_obj.next
+        frame_meta.frame_num += 1
+        l_frame = l_frame.next
+    return counts, area
+
+
+def run(num_threads, num_objects, duration):
+    batches = [make_batch(num_objects) for _ in range(num_threads)]
+    counts = [0] * num_threads
+    barrier = threading.Barrier(num_threads + 1)
+    deadline = [0.0]
+
+    def worker(index):
+        batch_meta = batches[index]
+        barrier.wait()
+        n = 0
+        while time.perf_counter() < deadline[0]:
+            probe(batch_meta)
+            n += 1
+        counts[index] = n
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+    for t in threads:
+        t.start()
+    deadline[0] = time.perf_counter() + duration
+    barrier.wait()
+    for t in threads:
+        t.join()
+    for batch_meta in batches:
+        pyds.nvds_destroy_batch_meta(batch_meta)
+    return sum(counts) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", default="1,2,4,8,16",
+                        help="Comma separated thread counts, default=1,2,4,8,16")
+    parser.add_argument("--objects", type=int, default=50,
+                        help="Objects per frame, default=50")
+    parser.add_argument("--duration", type=float, default=3.0,
+                        help="Seconds per thread count, default=3")
+    args = parser.parse_args()
+
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("python %s, GIL %s, %d objects per frame" % (
+        sys.version.split()[0], "enabled" if gil_enabled else "disabled", args.objects))
+    print("%8s %14s %9s %11s" % ("threads", "probes/s", "speedup", "efficiency"))
+    base = None
+    for num_threads in (int(t) for t in args.threads.split(",")):
+        rate = run(num_threads, args.objects, args.duration)
+        if base is None:
+            base = rate / num_threads
+        speedup = rate / base
+        print("%8d %14.0f %8.2fx %10.0f%%" % (
+            num_threads, rate, speedup, 100.0 * speedup / num_threads))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+/*
+ * SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+// Microbenchmark of RFC3339 timestamp generation: the previous
+// generate_ts_rfc3339 implementation against the cached formatter in
+// include/ts_rfc3339.hpp. Only needs a C++17 compiler:
+//
+//   g++ -O2 -std=c++17 ts_rfc3339_bench.cpp -o ts_rfc3339_bench
+//   ./ts_rfc3339_bench [iterations]
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <ctime>
+
+#include "../include/ts_rfc3339.hpp"
+
+using namespace pydeepstream::utils;
+
+// generate_ts_rfc3339 before caching, with g_snprintf replaced by snprintf
+static void legacy_ts_rfc3339(char *buf, int buf_size) {
+    time_t tloc;
+    struct tm tm_log{};
+    struct timespec ts{};
+    char strmsec[6]; //.nnnZ\0
+    clock_gettime(CLOCK_REALTIME, &ts);
+    memcpy(&tloc, (void *) (&ts.tv_sec), sizeof(time_t));
+    gmtime_r(&tloc, &tm_log);
+    strftime(buf, buf_size, "%Y-%m-%dT%H:%M:%S", &tm_log);
+    int ms = ts.tv_nsec / 1000000;
+    snprintf(strmsec, sizeof(strmsec), ".%.3dZ", ms);
+    strncat(buf, strmsec, buf_size);
+}
+
+template<typename F>
+static double bench(const char *name, long iterations, F &&fn) {
+    char buf[33];
+    unsigned checksum = 0;
+    auto start = std::chrono::steady_clock::now();
+    for (long i = 0; i < iterations; i++) {
+        fn(buf, (int) sizeof(buf), i);
+        checksum += (unsigned char) buf[22];
+    }
+    auto end = std::chrono::steady_clock::now();
+    double ns = std::chrono::duration<double, std::nano>(end - start).count() / iterations;
+    printf("%-28s %8.1f ns/call   last=%s (checksum %u)\n", name, ns, buf, checksum);
+    return ns;
+}
+
+int main(int argc, char **argv) {
+    long iterations = argc > 1 ? atol(argv[1]) : 2000000;
+    // 30 fps frames starting at a fixed ntp_timestamp
+    const uint64_t ntp_start = 1700000000ULL * 1000000000ULL;
+    const uint64_t frame_ns = 33333333ULL;
+
+    // Both formatters must produce the same string for the same time
+    char expected[33], actual[33];
+    struct timespec now{};
+    clock_gettime(CLOCK_REALTIME, &now);
+    struct tm tm_log{};
+    gmtime_r(&now.tv_sec, &tm_log);
+    strftime(expected, sizeof(expected), "%Y-%m-%dT%H:%M:%S", &tm_log);
+    snprintf(expected + TS_RFC3339_SECONDS_LEN, 6, ".%.3dZ", (int) (now.tv_nsec / 1000000));
+    format_ts_rfc3339(actual, sizeof(actual), now.tv_sec, (int) (now.tv_nsec / 1000000));
+    if (strcmp(expected, actual) != 0) {
+        fprintf(stderr, "mismatch: %s != %s\n", expected, actual);
+        return 1;
+    }
+
+    double legacy = bench("legacy (wall clock)", iterations,
+                          [](char *buf, int size, long) { legacy_ts_rfc3339(buf, size); });
+    double cached = bench("cached (wall clock)", iterations,
+                          [](char *buf, int size, long) { format_ts_rfc3339_now(buf, size); });
+    double ntp = bench("cached (ntp_timestamp)", iterations,
+                       [&](char *buf, int size, long i) {
+                           format_ts_rfc3339_ns(buf, size, ntp_start + i / 8 * frame_ns);
+                       });
+    printf("speedup: %.1fx wall clock, %.1fx ntp_timestamp\n", legacy / cached, legacy / ntp);
+    return 0;
+}
@@ -0,0 +1,146 @@
+/**
+ * Benchmark of CTFaceObjectMeta JSON payload generation: the previous
+ * snprintf + std::string implementation against the streaming JsonWriter,
+ * on synthetic batches (default 1000 objects spread over 8 frames).
+ *
+ * Build with -DBUILD_BENCHMARK=ON, then:
+ *   ./ctface_json_bench [objects_per_batch] [iterations]
+ */
+
+#include <glib.h>
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <string>
+#include <vector>
+
+#include "ctface_payload.hpp"
+
+/* Previous implementation, kept verbatim for comparison */
+static std::string legacy_object_to_json(const CTFaceObjectMeta* m) {
+    if (!m) return "{}";
+    auto safe = [](const char* p) { return p ? p : ""; };
+    char ts_buf[64] = {};
+    if (m->ts) {
+        size_t len = strnlen(m->ts, 63);
+        if (len) memcpy(ts_buf, m->ts, len);
+    }
+    char buf[2048];
+    int n = snprintf(buf, sizeof(buf),
+                     "{\"id\":\"%s\",\"name\":\"%s\",\"confidence\":%.3f,"
+                     "\"frameId\":%d,\"sensorid\":%d,"
+                     "\"bbox\":{\"left\":%.2f,\"top\":%.2f,\"width\":%.2f,\"height\":%.2f},"
+                     "\"ts\":\"%s\",\"objectId\":\"%s\",\"sensorStr\":\"%s\"}",
+                     safe(m->id), safe(m->name), m->confidence, m->frameId, m->sensorid,
+                     m->bbox.left, m->bbox.top, m->bbox.width, m->bbox.height, ts_buf,
+                     safe(m->objectId), safe(m->sensorStr));
+    if (n <= 0 || (size_t)n >= sizeof(buf)) return "{}";
+    return std::string(buf);
+}
+
+static std::string legacy_batch_to_json(NvDsBatchMeta* batch_meta) {
+    std::vector<std::string> jsons;
+    for_each_ct_face_object_meta(batch_meta, [&](const CTFaceObjectMeta* m) {
+        jsons.push_back(legacy_object_to_json(m));
+    });
+    if (jsons.empty()) return "[]";
+    std::string out = "[";
+    for (size_t i = 0; i < jsons.size(); i++) {
+        if (i) out += ",";
+        out += jsons[i];
+    }
+    out += "]";
+    return out;
+}
+
+struct SyntheticBatch {
+    NvDsBatchMeta batch{};
+    std::vector<NvDsFrameMeta> frames;
+    std::vector<NvDsUserMeta> user_metas;
+    std::vector<CTFaceObjectMeta> objects;
+    std::vector<std::string> strings;
+
+    SyntheticBatch(int num_objects, int num_frames)
+        : frames(num_frames), user_metas(num_objects), objects(num_objects) {
+        strings.reserve(num_objects * 2);
+        for (int i = 0; i < num_objects; i++) {
+            CTFaceObjectMeta& o = objects[i];
+            memset(&o, 0, sizeof(o));
+            strings.push_back("face-" + std::to_string(i));
+            o.id = const_cast<char*>(strings.back().c_str());
+            strings.push_back("person " + std::to_string(i % 97));
+            o.name = const_cast<char*>(strings.back().c_str());
+            o.confidence = 0.5 + (i % 50) / 100.0;
+            o.frameId = 1000 + i / num_frames;
+            o.sensorid = i % num_frames;
+            o.bbox.left = 10.25f * (i % 100);
+            o.bbox.top = 7.5f * (i % 60);
+            o.bbox.width = 64.0f;
+            o.bbox.height = 80.0f;
+            o.ts = const_cast<char*>("2025-01-01T00:00:00.000Z");
+            o.objectId = o.id;
+            o.sensorStr = const_cast<char*>("sensor-0");
+
+            NvDsUserMeta& um = user_metas[i];
+            memset(&um, 0, sizeof(um));
+            um.base_meta.meta_type = NVDS_USER_META;
+            um.user_meta_data = &o;
+            NvDsFrameMeta& fm = frames[i % num_frames];
+            fm.frame_user_meta_list = g_list_append(fm.frame_user_meta_list, &um);
+        }
+        for (auto& fm : frames)
+            batch.frame_meta_list = g_list_append(batch.frame_meta_list, &fm);
+    }
+
+    ~SyntheticBatch() {
+        for (auto& fm : frames) g_list_free(fm.frame_user_meta_list);
+        g_list_free(batch.frame_meta_list);
+    }
+};
+
+template <typename Fn>
+static double bench(const char* name, int iterations, Fn&& fn) {
+    size_t bytes = 0;
+    auto start = std::chrono::steady_clock::now();
+    for (int i = 0; i < iterations; i++) bytes += fn();
+    auto end = std::chrono::steady_clock::now();
+    double us = std::chrono::duration<double, std::micro>(end - start).count() / iterations;
+    printf("%-16s %9.1f us/batch  %7zu bytes\n", name, us, bytes / iterations);
+    return us;
+}
+
+int main(int argc, char** argv) {
+    int num_objects = argc > 1 ? atoi(argv[1]) : 1000;
+    int iterations = argc > 2 ? atoi(argv[2]) : 2000;
+    SyntheticBatch synthetic(num_objects, 8);
+    JsonWriter writer;
+
+    ct_face_batch_to_json(writer, &synthetic.batch);
+    std::string streamed(writer.data(), writer.size());
+    if (streamed != legacy_batch_to_json(&synthetic.batch)) {
+        fprintf(stderr, "payload mismatch between legacy and streaming writer\n");
+        return 1;
+    }
+
+    printf("%d objects per batch, %d iterations\n", num_objects, iterations);
+    double legacy = bench("legacy", iterations, [&]() {
+        std::string body = legacy_batch_to_json(&synthetic.batch);
+        /* nvds_msg2p_generate also copied the body into the payload */
+        char* payload = static_cast<char*>(g_malloc(body.size() + 1));
+        memcpy(payload, body.c_str(), body.size() + 1);
+        g_free(payload);
+        return body.size();
+    });
+    double streaming = bench("streaming", iterations, [&]() {
+        ct_face_batch_to_json(writer, &synthetic.batch);
+        char* payload = static_cast<char*>(g_malloc(writer.size() + 1));
+        memcpy(payload, writer.data(), writer.size());
+        payload[writer.size()] = '\0';
+        g_free(payload);
+        return writer.size();
+    });
+    printf("speedup: %.2fx\n", legacy / streaming);
+    return 0;
+}
@@ -0,0 +1,119 @@
+/**
+ * Compact binary encoding of CTFace payloads ("CTFB"), selected with
+ * nvmsgconv payload-type=258 or encoding=binary in the [ctface] section of the
+ * nvmsgconv config file. All integers and floats are little-endian.
+ *
+ *   header, 16 bytes:
+ *     char[4] magic "CTFB" | u16 version (1) | u16 flags (0) |
+ *     u32 record count     | u32 reserved (0)
+ *   record, repeated count times:
+ *     f32 confidence | i32 frameId | i32 sensorid |
+ *     f32 bbox left | f32 bbox top | f32 bbox width | f32 bbox height |
+ *     5 strings: id, name, ts, objectId, sensorStr, each as
+ *       u16 length | length bytes of UTF-8 (no terminator, NULL -> length 0)
+ *
+ * Decoder: apps/common/ctface_payload.py
+ */
+
+#pragma once
+
+#include <cstdint>
+#include <cstring>
+#include <vector>
+
+constexpr char CTFB_MAGIC[4] = {'C', 'T', 'F', 'B'};
+constexpr uint16_t CTFB_VERSION = 1;
+constexpr size_t CTFB_HEADER_SIZE = 16;
+constexpr size_t CTFB_MAX_STRING = 0xffff;
+
+class BinaryWriter {
+public:
+    explicit BinaryWriter(size_t initial_capacity = 4096) : buf_(initial_capacity) {}
+
+    void clear() { size_ = 0; }
+    const char* data() const { return buf_.data(); }
+    size_t size() const { return size_; }
+
+    void put(const void* p, size_t n) {
+        reserve(n);
+        memcpy(buf_.data() + size_, p, n);
+        size_ += n;
+    }
+
+    void u16(uint16_t v) {
+        unsigned char b[2] = {static_cast<unsigned char>(v), static_cast<unsigned char>(v >> 8)};
+        put(b, sizeof(b));
+    }
+
+    void u32(uint32_t v) {
+        unsigned char b[4] = {static_cast<unsigned char>(v), static_cast<unsigned char>(v >> 8),
+                              static_cast<unsigned char>(v >> 16),
+                              static_cast<unsigned char>(v >> 24)};
+        put(b, sizeof(b));
+    }
+
+    void i32(int32_t v) { u32(static_cast<uint32_t>(v)); }
+
+    void f32(float v) {
+        uint32_t bits;
+        memcpy(&bits, &v, sizeof(bits));
+        u32(bits);
+    }
+
+    /* u16 length prefixed string, truncated to CTFB_MAX_STRING bytes */
+    void string(const char* s) {
+        size_t len = s ? strlen(s) : 0;
+        if (len > CTFB_MAX_STRING) len = CTFB_MAX_STRING;
+        u16(static_cast<uint16_t>(len));
+        put(s, len);
+    }
+
+    /* Overwrites a u32 written earlier, e.g. the record count */
+    void patch_u32(size_t offset, uint32_t v) {
+        size_t saved = size_;
+        size_ = offset;
+        u32(v);
+        size_ = saved;
+    }
+
+private:
+    void reserve(size_t n) {
+        if (size_ + n <= buf_.size()) return;
+        size_t capacity = buf_.size() ? buf_.size() : 64;
+        while (capacity < size_ + n) capacity *= 2;
+        buf_.resize(capacity);
+    }
+
+    std::vector<char> buf_;
+    size_t size_ = 0;
+};
+
+/* Starts a payload; the record count is filled in by ctfb_end */
+static inline void ctfb_begin(BinaryWriter& w) {
+    w.clear();
+    w.put(CTFB_MAGIC, sizeof(CTFB_MAGIC));
+    w.u16(CTFB_VERSION);
+    w.u16(0);
+    w.u32(0);
+    w.u32(0);
+}
+
+static inline void ctfb_end(BinaryWriter& w, uint32_t count) { w.patch_u32(8, count); }
+
+static inline void ctfb_record(BinaryWriter& w, const char* id, const char* name,
+                               double confidence, int frame_id, int sensor_id, float left,
+                               float top, float width, float height, const char* ts,
+                               const char* object_id, const char* sensor_str) {
+    w.f32(static_cast<float>(confidence));
+    w.i32(frame_id);
+    w.i32(sensor_id);
+    w.f32(left);
+    w.f32(top);
+    w.f32(width);
+    w.f32(height);
+    w.string(id);
+    w.string(name);
+    w.string(ts);
+    w.string(object_id);
+    w.string(sensor_str);
+}
@@ -0,0 +1,92 @@
+/**
+ * CTFaceObjectMeta payload serialization shared by libnvds_msg2p_ctface and
+ * its benchmark. Walks frame_user_meta_list of every frame in the batch and
+ * streams all CTFaceObjectMeta into one JSON array, or into one CTFB binary
+ * payload (see binary_writer.hpp).
+ */
+
+#pragma once
+
+#include <glib.h>
+
+#include "gstnvdsmeta.h"
+#include "nvdsmeta_schema.h"
+
+#include "ctmeta_schema.hpp"
+#include "binary_writer.hpp"
+#include "json_writer.hpp"
+
+static inline void ct_face_object_meta_to_json(JsonWriter& w, const CTFaceObjectMeta* m) {
+    w.raw("{\"id\":");
+    w.string(m->id);
+    w.raw(",\"name\":");
+    w.string(m->name);
+    w.raw(",\"confidence\":");
+    w.number(m->confidence, 3);
+    w.raw(",\"frameId\":");
+    w.integer(m->frameId);
+    w.raw(",\"sensorid\":");
+    w.integer(m->sensorid);
+    w.raw(",\"bbox\":{\"left\":");
+    w.number(m->bbox.left, 2);
+    w.raw(",\"top\":");
+    w.number(m->bbox.top, 2);
+    w.raw(",\"width\":");
+    w.number(m->bbox.width, 2);
+    w.raw(",\"height\":");
+    w.number(m->bbox.height, 2);
+    w.raw("},\"ts\":");
+    w.string(m->ts);
+    w.raw(",\"objectId\":");
+    w.string(m->objectId);
+    w.raw(",\"sensorStr\":");
+    w.string(m->sensorStr);
+    w.put('}');
+}
+
+/* Calls fn for each CTFaceObjectMeta attached as NVDS_USER_META to a frame */
+template <typename Fn>
+static inline void for_each_ct_face_object_meta(NvDsBatchMeta* batch_meta, Fn&& fn) {
+    if (!batch_meta) return;
+    for (GList* l_frame = batch_meta->frame_meta_list; l_frame != nullptr;
+         l_frame = l_frame->next) {
+        NvDsFrameMeta* frame_meta = static_cast<NvDsFrameMeta*>(l_frame->data);
+        if (!frame_meta) continue;
+        for (GList* l = frame_meta->frame_user_meta_list; l != nullptr; l = l->next) {
+            NvDsUserMeta* user_meta = static_cast<NvDsUserMeta*>(l->data);
+            if (!user_meta || user_meta->base_meta.meta_type != NVDS_USER_META ||
+                !user_meta->user_meta_data)
+                continue;
+            fn(static_cast<const CTFaceObjectMeta*>(user_meta->user_meta_data));
+        }
+    }
+}
+
+/* Writes all CTFaceObjectMeta of the batch as one JSON array into w (which
+ * is cleared first) and returns the number of objects written. */
+static inline size_t ct_face_batch_to_json(JsonWriter& w, NvDsBatchMeta* batch_meta) {
+    size_t count = 0;
+    w.clear();
+    w.put('[');
+    for_each_ct_face_object_meta(batch_meta, [&](const CTFaceObjectMeta* m) {
+        if (count++) w.put(',');
+        ct_face_object_meta_to_json(w, m);
+    });
+    w.put(']');
+    return count;
+}
+
+/* Writes all CTFaceObjectMeta of the batch as one CTFB payload into w and
+ * returns the number of records written. */
+static inline size_t ct_face_batch_to_binary(BinaryWriter& w, NvDsBatchMeta* batch_meta) {
+    size_t count = 0;
+    ctfb_begin(w);
+    for_each_ct_face_object_meta(batch_meta, [&](const CTFaceObjectMeta* m) {
+        ctfb_record(w, m->id, m->name, m->confidence, m->frameId, m->sensorid, m->bbox.left,
+                    m->bbox.top, m->bbox.width, m->bbox.height, m->ts, m->objectId,
+                    m->sensorStr);
+        count++;
+    });
+    ctfb_end(w, static_cast<uint32_t>(count));
+    return count;
+}
@@ -0,0 +1,134 @@
+/**
+ * Minimal streaming JSON writer for the msg2p payload generators.
+ * Appends into one growable buffer that is kept across payloads, so a warm
+ * writer serializes a batch without any allocation. Strings are escaped as
+ * required by RFC 8259; non-finite numbers are written as null.
+ */
+
+#pragma once
+
+#include <cmath>
+#include <cstdio>
+#include <cstring>
+#include <vector>
+
+class JsonWriter {
+public:
+    explicit JsonWriter(size_t initial_capacity = 4096) : buf_(initial_capacity) {}
+
+    void clear() { size_ = 0; }
+    const char* data() const { return buf_.data(); }
+    size_t size() const { return size_; }
+    size_t capacity() const { return buf_.size(); }
+
+    void put(char c) {
+        reserve(1);
+        buf_[size_++] = c;
+    }
+
+    void put(const char* s, size_t n) {
+        reserve(n);
+        memcpy(buf_.data() + size_, s, n);
+        size_ += n;
+    }
+
+    /* Writes a string literal as is, e.g. punctuation or a quoted key */
+    template <size_t N>
+    void raw(const char (&s)[N]) {
+        put(s, N - 1);
+    }
+
+    /* Writes a quoted, escaped string; nullptr is written as "" */
+    void string(const char* s) {
+        put('"');
+        if (s) {
+            const char* run = s;
+            for (const char* p = s; *p; p++) {
+                unsigned char c = static_cast<unsigned char>(*p);
+                if (c >= 0x20 && c != '"' && c != '\\') continue;
+                put(run, p - run);
+                escape(c);
+                run = p + 1;
+            }
+            put(run, strlen(run));
+        }
+        put('"');
+    }
+
+    void number(double v, int precision) {
+        if (!std::isfinite(v)) {
+            raw("null");
+            return;
+        }
+        static const double scale[] = {1, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6};
+        if (precision >= 0 && precision <= 6 && std::fabs(v) < 1e12) {
+            /* Fast path for the usual bbox/confidence values; rounds half
+             * away from zero */
+            long long scaled = std::llround(v * scale[precision]);
+            if (scaled < 0) {
+                put('-');
+                scaled = -scaled;
+            }
+            long long div = static_cast<long long>(scale[precision]);
+            integer(scaled / div);
+            if (precision > 0) {
+                char frac[8];
+                long long rest = scaled % div;
+                frac[0] = '.';
+                for (int i = precision; i > 0; i--) {
+                    frac[i] = static_cast<char>('0' + rest % 10);
+                    rest /= 10;
+                }
+                put(frac, precision + 1);
+            }
+            return;
+        }
+        char tmp[64];
+        int n = snprintf(tmp, sizeof(tmp), "%.*f", precision, v);
+        if (n < 0 || static_cast<size_t>(n) >= sizeof(tmp))
+            n = snprintf(tmp, sizeof(tmp), "%.17g", v);
+        put(tmp, n);
+    }
+
+    void integer(long long v) {
+        char tmp[24];
+        char* end = tmp + sizeof(tmp);
+        char* p = end;
+        unsigned long long u = v < 0 ? 0ULL - static_cast<unsigned long long>(v)
+                                     : static_cast<unsigned long long>(v);
+        do {
+            *--p = static_cast<char>('0' + u % 10);
+            u /= 10;
+        } while (u);
+        if (v < 0) *--p = '-';
+        put(p, end - p);
+    }
+
+private:
+    void reserve(size_t n) {
+        if (size_ + n <= buf_.size()) return;
+        size_t capacity = buf_.size() ? buf_.size() : 64;
+        while (capacity < size_ + n) capacity *= 2;
+        buf_.resize(capacity);
+    }
+
+    void escape(unsigned char c) {
+        switch (c) {
+            case '"': raw("\\\""); break;
+            case '\\': raw("\\\\"); break;
+            case '\b': raw("\\b"); break;
+            case '\f': raw("\\f"); break;
+            case '\n': raw("\\n"); break;
+            case '\r': raw("\\r"); break;
+            case '\t': raw("\\t"); break;
+            default: {
+                static const char hex[] = "0123456789abcdef";
+                char u[6] = {'\\', 'u', '0', '0', hex[c >> 4], hex[c & 0xf]};
+                put(u, sizeof(u));
+            }
+        }
+    }
+
+    std::vector<char> buf_;
+    size_t size_ = 0;
+};
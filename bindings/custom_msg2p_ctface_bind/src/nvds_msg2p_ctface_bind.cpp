@@ -6,6 +6,12 @@
  *
  * Build: libnvds_msg2p_ctface.so
  * nvmsgconv: payload-type=257 (PAYLOAD_CUSTOM), msg2p-lib=/path/to/libnvds_msg2p_ctface.so
+ * The compact CTFB binary encoding (layout in binary_writer.hpp, Python decoder
+ * in apps/common/ctface_payload.py) is selected instead of JSON either with
+ * payload-type=258 or, where nvmsgconv only accepts the registered payload
+ * types, with this section in the nvmsgconv config file:
+ *   [ctface]
+ *   encoding=binary
  */
 
 #include <glib.h>
@@ -14,8 +20,6 @@
 #include <cstdio>
 #include <cstdlib>
 #include <cstring>
-#include <string>
-#include <vector>
 
 #include "gstnvdsmeta.h"
 #include "nvdsmeta_schema.h"
@@ -27,92 +31,72 @@
 #include "nvmsgconv.h"
 #endif
 
-#include "ctmeta_schema.hpp"
-
-static std::string ct_face_object_meta_to_json(const CTFaceObjectMeta* m) {
-    if (!m) return "{}";
-    auto safe = [](const char* p) { return p ? p : ""; };
-    char ts_buf[64] = {};
-    if (m->ts) {
-        size_t len = strnlen(m->ts, 63);
-        if (len) memcpy(ts_buf, m->ts, len);
-    }
-    char buf[2048];
-    int n = snprintf(buf, sizeof(buf),
-                     "{\"id\":\"%s\",\"name\":\"%s\",\"confidence\":%.3f,"
-                     "\"frameId\":%d,\"sensorid\":%d,"
-                     "\"bbox\":{\"left\":%.2f,\"top\":%.2f,\"width\":%.2f,\"height\":%.2f},"
-                     "\"ts\":\"%s\",\"objectId\":\"%s\",\"sensorStr\":\"%s\"}",
-                     safe(m->id), safe(m->name), m->confidence, m->frameId, m->sensorid,
-                     m->bbox.left, m->bbox.top, m->bbox.width, m->bbox.height, ts_buf,
-                     safe(m->objectId), safe(m->sensorStr));
-    if (n <= 0 || (size_t)n >= sizeof(buf)) return "{}";
-    return std::string(buf);
-}
-
-static void serialize_frame_user_meta_list(GList* frame_user_meta_list,
-                                           std::vector<std::string>* out) {
-    for (GList* l = frame_user_meta_list; l != nullptr; l = l->next) {
-        NvDsUserMeta* user_meta = static_cast<NvDsUserMeta*>(l->data);
-        if (!user_meta || user_meta->base_meta.meta_type != NVDS_USER_META ||
-            !user_meta->user_meta_data)
-            continue;
-        CTFaceObjectMeta* ct = static_cast<CTFaceObjectMeta*>(user_meta->user_meta_data);
-        out->push_back(ct_face_object_meta_to_json(ct));
+#include "ctface_payload.hpp"
+
+/* nvmsgconv payload-type selecting the CTFB binary encoding */
+constexpr int CT_FACE_PAYLOAD_BINARY = NVDS_PAYLOAD_CUSTOM + 1;
+
+/* Per-context state: the payload buffers are reused for every payload */
+struct CtFaceMsg2pPriv {
+    bool binary = false;
+    JsonWriter writer;
+    BinaryWriter binary_writer;
+};
+
+static bool config_selects_binary(const gchar* config_file) {
+    if (!config_file || !*config_file) return false;
+    GKeyFile* key_file = g_key_file_new();
+    bool binary = false;
+    if (g_key_file_load_from_file(key_file, config_file, G_KEY_FILE_NONE, nullptr)) {
+        gchar* encoding = g_key_file_get_string(key_file, "ctface", "encoding", nullptr);
+        binary = encoding && g_ascii_strcasecmp(encoding, "binary") == 0;
+        g_free(encoding);
     }
+    g_key_file_free(key_file);
+    return binary;
 }
 
-static void collect_from_batch_meta(NvDsBatchMeta* batch_meta, std::vector<std::string>* out) {
-    if (!batch_meta || !out) return;
-    for (GList* l_frame = batch_meta->frame_meta_list; l_frame != nullptr;
-         l_frame = l_frame->next) {
-        NvDsFrameMeta* frame_meta = static_cast<NvDsFrameMeta*>(l_frame->data);
-        if (!frame_meta || !frame_meta->frame_user_meta_list) continue;
-        serialize_frame_user_meta_list(frame_meta->frame_user_meta_list, out);
-    }
-}
-
-/* Build one JSON array string from multiple JSON objects */
-static std::string json_array_from_jsons(const std::vector<std::string>& jsons) {
-    if (jsons.empty()) return "[]";
-    std::string out = "[";
-    for (size_t i = 0; i < jsons.size(); i++) {
-        if (i) out += ",";
-        out += jsons[i];
-    }
-    out += "]";
-    return out;
+static NvDsPayload* payload_from_buffer(const char* data, size_t size, size_t payload_size) {
+    NvDsPayload* pl = static_cast<NvDsPayload*>(g_malloc0(sizeof(NvDsPayload)));
+    pl->payloadSize = payload_size;
+    pl->payload = g_malloc(payload_size);
+    memcpy(pl->payload, data, size);
+    if (payload_size > size) static_cast<char*>(pl->payload)[size] = '\0';
+    pl->componentId = 0;
+    return pl;
 }
 
 extern "C" {
 
 NvDsMsg2pCtx* nvds_msg2p_ctx_create(const gchar* config_file, NvDsPayloadType type) {
-    (void)config_file;
-    (void)type;
-    return reinterpret_cast<NvDsMsg2pCtx*>(g_malloc0(1));
+    NvDsMsg2pCtx* ctx = static_cast<NvDsMsg2pCtx*>(g_malloc0(sizeof(NvDsMsg2pCtx)));
+    ctx->payloadType = type;
+    CtFaceMsg2pPriv* priv = new CtFaceMsg2pPriv();
+    priv->binary = static_cast<int>(type) == CT_FACE_PAYLOAD_BINARY ||
+                   config_selects_binary(config_file);
+    ctx->privData = priv;
+    return ctx;
 }
 
-/* Returns one NvDsPayload containing a JSON array of all CTFaceObjectMeta.
- * Only uses frame_user_meta_list: when size==1, events is interpreted as
- * NvDsBatchMeta* and we collect from frame_user_meta_list (no NvDsEventMsgMeta). */
+/* Returns one NvDsPayload containing a JSON array (or a CTFB payload) of all
+ * CTFaceObjectMeta. Only uses frame_user_meta_list: when size==1, events is
+ * interpreted as NvDsBatchMeta* and we collect from frame_user_meta_list
+ * (no NvDsEventMsgMeta). */
 NvDsPayload* nvds_msg2p_generate(NvDsMsg2pCtx* ctx, NvDsEvent* events, guint size) {
-    (void)ctx;
-    std::vector<std::string> jsons;
-
-    if (events && size == 1) {
-        NvDsBatchMeta* batch = reinterpret_cast<NvDsBatchMeta*>(events);
-        if (batch && batch->frame_meta_list)
-            collect_from_batch_meta(batch, &jsons);
+    if (!ctx || !ctx->privData || !events || size != 1) return nullptr;
+    CtFaceMsg2pPriv* priv = static_cast<CtFaceMsg2pPriv*>(ctx->privData);
+    NvDsBatchMeta* batch = reinterpret_cast<NvDsBatchMeta*>(events);
+
+    if (priv->binary) {
+        BinaryWriter& writer = priv->binary_writer;
+        if (ct_face_batch_to_binary(writer, batch) == 0) return nullptr;
+        return payload_from_buffer(writer.data(), writer.size(), writer.size());
     }
 
-    if (jsons.empty()) return nullptr;
-    std::string body = json_array_from_jsons(jsons);
-    NvDsPayload* pl = static_cast<NvDsPayload*>(g_malloc0(sizeof(NvDsPayload)));
-    pl->payloadSize = body.size() + 1;
-    pl->payload = static_cast<char*>(g_malloc(pl->payloadSize));
-    memcpy(pl->payload, body.c_str(), pl->payloadSize);
-    pl->componentId = 0;
-    return pl;
+    JsonWriter& writer = priv->writer;
+    if (ct_face_batch_to_json(writer, batch) == 0) return nullptr;
+    /* JSON payloads keep their terminating '\0' */
+    return payload_from_buffer(writer.data(), writer.size(), writer.size() + 1);
 }
 
 void nvds_msg2p_release(NvDsMsg2pCtx* ctx, NvDsPayload* payload) {
@@ -125,7 +109,9 @@ void nvds_msg2p_release(NvDsMsg2pCtx* ctx, NvDsPayload* payload) {
 }
 
 void nvds_msg2p_ctx_destroy(NvDsMsg2pCtx* ctx) {
-    if (ctx) g_free(ctx);
+    if (!ctx) return;
+    delete static_cast<CtFaceMsg2pPriv*>(ctx->privData);
+    g_free(ctx);
 }
 
 } /* extern "C" */
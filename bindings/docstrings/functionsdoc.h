@@ -381,6 +381,25 @@ namespace pydsdoc
             :arg meta: :class:`NvDsUserMeta` of which to set release function
             :arg func: User-written release function)pyds";
 
+        constexpr const char* register_user_meta_layout=R"pyds(
+            Declares the C layout of a custom user meta type. Structs of this layout are copied and released
+            natively, without a Python copy / release callback. Fields are laid out in the given order with
+            natural alignment, as a C compiler would.
+            Registering the same descriptor again with the same fields returns the existing layout.
+
+            :arg descriptor: User meta descriptor, e.g. "NVIDIA.MYAPP.TRACK_META", see :py:func:`nvds_get_user_meta_type`
+            :arg fields: List of (name, type) tuples, type being one of "bool", "int8", "uint8", "int16",
+                "uint16", "int32", "uint32", "int64", "uint64", "float32", "float64", "char[N]" (inline,
+                NUL terminated) or "str" (char* owned by the struct)
+
+            :returns: :class:`UserMetaLayout`)pyds";
+
+        constexpr const char* get_user_meta_layout=R"pyds(
+            Returns the :class:`UserMetaLayout` registered for the meta type of the given :class:`NvDsUserMeta`
+            (or for the given meta type), None if there is none.
+
+            :arg meta: :class:`NvDsUserMeta`, or the meta type as int)pyds";
+
         constexpr const char* alloc_buffer=R"pyds( 
             Allocate buffer of given size. 
 
@@ -442,6 +461,59 @@ namespace pydsdoc
 
             :returns: Allocated :class:`NvDsEventMsgMeta`)pyds";
 
+        constexpr const char* alloc_pooled_nvds_event_msg_meta=R"pyds( 
+            Allocate an :class:`NvDsEventMsgMeta` from the event message pool. The meta is returned to the pool when the user meta is released.
+            Its ts field already points to a timestamp buffer inside the pooled block, so :py:func:`alloc_buffer` is not needed for it.
+
+            :arg user_meta: An object of type :class:`NvDsUserMeta` acquired from user_meta_pool present in :class:`NvDsBatchMeta`
+
+            :returns: Allocated :class:`NvDsEventMsgMeta`)pyds";
+
+        constexpr const char* attach_pooled_event_msg_metas=R"pyds( 
+            Build pooled :class:`NvDsEventMsgMeta` objects from a list of dicts and attach them to the frame as NVDS_EVENT_MSG_META user meta.
+
+            Keys are the :class:`NvDsEventMsgMeta` field names (type, objType, bbox as (left, top, width, height), objClassId, sensorId, moduleId,
+            placeId, componentId, frameId, confidence, trackingId, ts, objectId, sensorStr, otherAttrs, videoPath). A "vehicle" or "person" dict
+            fills the matching extension object. Strings are copied into buffers recycled with the pooled block. If ts is not given, the current
+            RFC3339 time, or the frame's ntp_timestamp with use_ntp_timestamp, is used.
+
+            Each event is attached only once completely filled. An unknown key raises KeyError and a value of the wrong type RuntimeError
+            (pybind11 cast_error); that event is not attached and its block returns to the pool, the events before it remain attached.
+
+            :arg batch_meta: :class:`NvDsBatchMeta` of the buffer
+            :arg frame_meta: :class:`NvDsFrameMeta` to attach the events to
+            :arg events: list of dicts, one per event
+            :arg use_ntp_timestamp: Derive the timestamp from the frame's ntp_timestamp instead of the current time
+
+            :returns: Number of events attached)pyds";
+
+        constexpr const char* attach_pooled_event_msg_metas_from_arrays=R"pyds( 
+            Attach one pooled :class:`NvDsEventMsgMeta` per row of the given arrays to the frame. All events share the same timestamp, event type and object type.
+
+            :arg batch_meta: :class:`NvDsBatchMeta` of the buffer
+            :arg frame_meta: :class:`NvDsFrameMeta` to attach the events to
+            :arg bboxes: float array of shape (N, 4) with left, top, width, height
+            :arg confidences: array of N confidences
+            :arg tracking_ids: array of N tracking ids
+            :arg class_ids: array of N class ids
+            :arg type: :class:`NvDsEventType` of all events
+            :arg obj_type: :class:`NvDsObjectType` of all events
+            :arg sensor_id: sensor id of all events
+            :arg use_ntp_timestamp: Derive the timestamp from the frame's ntp_timestamp instead of the current time
+
+            :returns: Number of events attached)pyds";
+
+        constexpr const char* event_msg_meta_pool_stats=R"pyds( 
+            Counters of the event message pool: allocated and freed blocks, acquired and released metas, reused blocks, metas still in use,
+            idle blocks, max_idle and string_overflows (strings too long for the pooled buffers, allocated on the heap instead).
+
+            :returns: dict of counters)pyds";
+
+        constexpr const char* event_msg_meta_pool_set_max_idle=R"pyds( 
+            Set how many released blocks the event message pool keeps for reuse, freeing any idle blocks above the limit.
+
+            :arg max_idle: Maximum number of idle blocks)pyds";
+
         constexpr const char* alloc_nvds_event=R"pyds( 
             Allocate an :class:`NvDsEvent`. 
 
@@ -453,6 +525,24 @@ namespace pydsdoc
             :arg buffer: Buffer into which timestamp content is copied
             :arg size: Maximum timestamp length)pyds";
 
+        constexpr const char* generate_ts_rfc3339_from_ntp=R"pyds( 
+            Generate RFC3339 timestamp from a frame's ntp_timestamp (nanoseconds since the Unix epoch).
+            The current time is used if ntp_timestamp is 0.
+
+            :arg buffer: Buffer into which timestamp content is copied
+            :arg size: Maximum timestamp length
+            :arg ntp_timestamp: ntp_timestamp of :class:`NvDsFrameMeta`)pyds";
+
+        constexpr const char* stamp_event_msg_metas=R"pyds( 
+            Set the ts field of all :class:`NvDsEventMsgMeta` attached to the frames of the batch whose ts is not set or empty.
+            Events of one frame get the same timestamp. A ts buffer that is set but empty must hold at least 25 bytes;
+            unset ts fields get a buffer that is freed with the meta.
+
+            :arg batch_meta: :class:`NvDsBatchMeta` of the buffer
+            :arg use_ntp_timestamp: Use the frame's ntp_timestamp instead of the current time, when it is set
+
+            :returns: Number of metas stamped)pyds";
+
         constexpr const char* alloc_nvds_payload=R"pyds( 
             Allocate an :class:`NvDsPayload`. 
 
@@ -345,6 +345,8 @@ namespace pydsdoc
                 :ivar componentId: *int*, ID of component who attached the payload (Optional).)pyds";
 
             constexpr const char* cast=R"pyds(cast given object/data to :class:`NvDsPayload`, call pyds.NvDsPayload.cast(data))pyds";
+
+            constexpr const char* get_bytes=R"pyds(Returns a copy of the payload as bytes (payloadSize bytes), e.g. to forward it from a pad probe.)pyds";
         }
     }
 }
\ No newline at end of file
@@ -57,5 +57,46 @@ constexpr const char *cast =
     R"pyds(cast given object/data to :class:`NvDsObjEncUsrArgs`, call pyds.NvDsObjEncUsrArgs.cast(data))pyds";
 } // namespace NvDsObjEncUsrArgsDoc
 
+namespace UserMetaLayoutDoc {
+constexpr const char *descr = R"pyds(
+                C layout of a custom user meta type, created with :py:func:`register_user_meta_layout`.
+                Metas allocated with :py:meth:`alloc` are copied and released natively (memcpy,
+                strings duplicated), so they survive tee / queue copies without calling back into Python.
+
+                :ivar meta_type: *int*, User meta type of the layout, as returned by :py:func:`nvds_get_user_meta_type`.
+                :ivar descriptor: *str*, Descriptor the layout was registered with.
+                :ivar size: *int*, Size of the C struct in bytes.
+                :ivar fields: *list*, (name, type, offset) of each field.)pyds";
+
+constexpr const char *alloc = R"pyds(
+                Allocates a zeroed struct of this layout as user_meta_data of the given :class:`NvDsUserMeta`
+                and sets its meta type and the native copy / release functions.
+
+                :arg meta: :class:`NvDsUserMeta` to hold the struct, e.g. from :py:func:`nvds_acquire_user_meta_from_pool`
+
+                :returns: C address of the struct)pyds";
+
+constexpr const char *get = R"pyds(
+                Reads a field of the struct held by the given :class:`NvDsUserMeta`.
+
+                :arg meta: :class:`NvDsUserMeta` holding a struct of this layout
+                :arg name: Field name
+
+                :returns: *int*, *float*, *bool* or *str*; None for an unset "str" field)pyds";
+
+constexpr const char *set = R"pyds(
+                Writes a field of the struct held by the given :class:`NvDsUserMeta`.
+                "char[N]" values are truncated to N-1 bytes, "str" values are copied.
+
+                :arg meta: :class:`NvDsUserMeta` holding a struct of this layout
+                :arg name: Field name
+                :arg value: New value)pyds";
+
+constexpr const char *to_dict = R"pyds(
+                Returns all fields of the struct held by the given :class:`NvDsUserMeta` as a dict.
+
+                :arg meta: :class:`NvDsUserMeta` holding a struct of this layout)pyds";
+} // namespace UserMetaLayoutDoc
+
 } // namespace utilsdoc
 } // namespace pydsdoc
\ No newline at end of file
@@ -26,4 +26,8 @@ namespace py = pybind11;
 
 namespace pydeepstream {
     void bindschema(py::module &m);
+
+    NvDsEventMsgMeta *event_msg_meta_pool_copy_func(void *data, void *user_data);
+
+    void event_msg_meta_pool_release_func(void *data, void *user_data);
 }
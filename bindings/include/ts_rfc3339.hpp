@@ -0,0 +1,72 @@
+/*
+ * SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#pragma  once
+
+#include <cstdint>
+#include <cstring>
+#include <ctime>
+
+namespace pydeepstream::utils {
+
+    /// Length of "%Y-%m-%dT%H:%M:%S.nnnZ" without the terminating '\0'
+    constexpr int TS_RFC3339_LEN = 24;
+
+    /// Length of the "%Y-%m-%dT%H:%M:%S" prefix
+    constexpr int TS_RFC3339_SECONDS_LEN = 19;
+
+    /// Formats an RFC3339 UTC timestamp with millisecond precision into buf,
+    /// truncating to buf_size - 1 characters.
+    /// The formatted seconds are cached per thread, so that consecutive
+    /// timestamps within the same second only patch the milliseconds instead
+    /// of going through gmtime_r and strftime again.
+    inline void format_ts_rfc3339(char *buf, int buf_size, time_t sec, int msec) {
+        if (buf == nullptr || buf_size <= 0)
+            return;
+        thread_local time_t cached_sec = -1;
+        thread_local char cached[TS_RFC3339_LEN + 1] = "0000-00-00T00:00:00.000Z";
+        if (sec != cached_sec) {
+            struct tm tm_log{};
+            gmtime_r(&sec, &tm_log);
+            strftime(cached, sizeof(cached), "%Y-%m-%dT%H:%M:%S", &tm_log);
+            cached[TS_RFC3339_SECONDS_LEN] = '.';
+            cached[TS_RFC3339_LEN - 1] = 'Z';
+            cached[TS_RFC3339_LEN] = '\0';
+            cached_sec = sec;
+        }
+        cached[TS_RFC3339_SECONDS_LEN + 1] = (char) ('0' + msec / 100);
+        cached[TS_RFC3339_SECONDS_LEN + 2] = (char) ('0' + msec / 10 % 10);
+        cached[TS_RFC3339_SECONDS_LEN + 3] = (char) ('0' + msec % 10);
+        int len = buf_size - 1 < TS_RFC3339_LEN ? buf_size - 1 : TS_RFC3339_LEN;
+        memcpy(buf, cached, len);
+        buf[len] = '\0';
+    }
+
+    /// Timestamp of a time given in nanoseconds since the Unix epoch, such
+    /// as NvDsFrameMeta::ntp_timestamp.
+    inline void format_ts_rfc3339_ns(char *buf, int buf_size, uint64_t ns) {
+        format_ts_rfc3339(buf, buf_size, (time_t) (ns / 1000000000ULL),
+                          (int) (ns % 1000000000ULL / 1000000ULL));
+    }
+
+    /// Timestamp of the current wall-clock time.
+    inline void format_ts_rfc3339_now(char *buf, int buf_size) {
+        struct timespec ts{};
+        clock_gettime(CLOCK_REALTIME, &ts);
+        format_ts_rfc3339(buf, buf_size, ts.tv_sec, (int) (ts.tv_nsec / 1000000));
+    }
+}
@@ -32,8 +32,12 @@
 #include <memory>
 #include <optional>
 #include <mutex>
+#include <string>
+#include <utility>
+#include <vector>
 #include <pybind11/cast.h>
 #include <pybind11.h>
+#include "ts_rfc3339.hpp"
 
 namespace py = pybind11;
 
@@ -73,38 +77,50 @@ namespace pydeepstream::utils {
 
         /// Stores the provided std::function statically in the instanciated templated struct
         static void store(const function_type &f) {
-            const std::lock_guard<std::mutex> lock(instance().mut_);
             auto &inst = instance();
-            if(!inst.stopped_)
-                inst.fn_ = f;
+            shared_function_type previous;
+            {
+                const std::lock_guard<std::mutex> lock(inst.mut_);
+                if (inst.stopped_)
+                    return;
+                previous = std::move(inst.fn_);
+                if (f.has_value())
+                    inst.fn_ = std::make_shared<const std::function<RetValue(ArgTypes...)>>(f.value());
+            }
+            // previous is destroyed here, outside of the lock: destroying a
+            // function wrapping a python callable takes the GIL
         }
 
 	static void
 	__attribute__((optimize("O0")))
 	free_instance(){
             auto &inst = instance();
-            const std::lock_guard<std::mutex> lock(inst.mut_);
-            auto &opt = inst.fn_;
-            if (opt.has_value()){
-                opt.reset();
-	    }
-            inst.stopped_=true;
+            shared_function_type previous;
+            {
+                const std::lock_guard<std::mutex> lock(inst.mut_);
+                previous = std::move(inst.fn_);
+                inst.stopped_ = true;
+            }
 	}
 
         /// Helps defining the actual function pointer needed
         static RetValue invoke(ArgTypes... args) {
-            const std::lock_guard<std::mutex> lock(instance().mut_);
-            auto &opt = instance().fn_;
+            // The lock only protects taking a reference to the function, so
+            // that callbacks run concurrently from several streaming threads
+            // and a callback may itself register functions
+            shared_function_type fun;
+            {
+                auto &inst = instance();
+                const std::lock_guard<std::mutex> lock(inst.mut_);
+                fun = inst.fn_;
+            }
             // here we check if the function's content is valid before calling it,
             // as it can be empty if free instance is called. In that case we return
             // the default value of RetValue type. RetValue must have a default
             // constructor with no parameters.
-            if (!opt.has_value())
-                return RetValue();
-            auto &fun = opt.value();
-            if (!fun)
+            if (!fun || !*fun)
                 return RetValue();
-            return fun(args...);
+            return (*fun)(args...);
         }
 
         /// Declares the type of pointer returned
@@ -114,13 +130,15 @@ namespace pydeepstream::utils {
         static pointer_type get_ptr() { return &invoke; }
 
     private:
+        typedef std::shared_ptr<const std::function<RetValue(ArgTypes...)>> shared_function_type;
+
         static function_storage &instance() {
             static function_storage inst_;
             return inst_;
         }
 
         /// contains a storage for an std::function.
-        function_type fn_;
+        shared_function_type fn_;
 	std::mutex mut_;
 	bool stopped_=false;
     };
@@ -130,6 +148,9 @@ namespace pydeepstream::utils {
     // as is. We need a char *, that's the reason why a std::shared_ptr<char>
     // is used
     extern std::unordered_map<std::string, std::shared_ptr<char>> font_name_memory;
+    // Guards font_name_memory, which is written from any thread setting a
+    // font name
+    extern std::mutex font_name_mutex;
 
     template<typename TYPE, typename FIELDTYPE>
     auto get_field_content_lambda(FIELDTYPE member) {
@@ -141,6 +162,7 @@ namespace pydeepstream::utils {
     template<typename TYPE, typename FIELDTYPE>
     auto set_field_content_string_lambda(FIELDTYPE member) {
         return [member](TYPE *object, std::string str) {
+            const std::lock_guard<std::mutex> lock(font_name_mutex);
             auto &map_str = font_name_memory;
             const auto &search = map_str.find(str);
             if (search == map_str.end()) {
@@ -182,7 +204,61 @@ namespace pydeepstream::utils {
 
     void release_all_func();
 
+    /// Field of a user meta struct declared from Python, see UserMetaLayout.
+    struct UserMetaField {
+        enum Kind {
+            BOOL, INT8, UINT8, INT16, UINT16, INT32, UINT32, INT64, UINT64,
+            FLOAT32, FLOAT64,
+            CHARS,  ///< inline char[N], NUL terminated
+            STRING  ///< char* owned by the struct, g_strdup'ed on copy
+        };
+        std::string name;
+        std::string type;
+        Kind kind;
+        size_t offset;
+        size_t size;
+    };
+
+    /// C layout (natural alignment, as a C compiler would lay out the struct)
+    /// of a user meta type declared from Python. Copy and release are done
+    /// natively with memcpy, plus g_strdup / g_free of the STRING fields, so
+    /// metas of these types are copied by tee / queue without taking the GIL.
+    /// Layouts are registered once per meta type and never freed.
+    struct UserMetaLayout {
+        NvDsMetaType meta_type;
+        std::string descriptor;
+        size_t size;
+        std::vector<UserMetaField> fields;
+        std::vector<size_t> string_offsets;
+
+        gpointer alloc() const;
+        gpointer copy(gconstpointer src) const;
+        void release(gpointer data) const;
+        const UserMetaField &field(const std::string &name) const;
+    };
+
+    /// Registers (or returns the identical, already registered) layout for
+    /// the user meta type of the given descriptor, e.g. "NVIDIA.APP.MY_META".
+    /// fields are (name, type) pairs; throws std::invalid_argument on an
+    /// unknown type or a conflicting re-registration.
+    const UserMetaLayout &
+    register_user_meta_layout(const std::string &descriptor,
+                              const std::vector<std::pair<std::string, std::string>> &fields);
+
+    /// Returns the layout registered for meta_type, or nullptr.
+    const UserMetaLayout *find_user_meta_layout(NvDsMetaType meta_type);
+
+    /// Copy / release functions of NvDsUserMeta holding a registered layout,
+    /// looked up by base_meta.meta_type.
+    gpointer user_meta_layout_copy_func(gpointer data, gpointer user_data);
+
+    void user_meta_layout_release_func(gpointer data, gpointer user_data);
+
     void generate_ts_rfc3339(char *buf, int buf_size);
+
+    /// Same as generate_ts_rfc3339 but for the given frame ntp_timestamp (ns),
+    /// falling back to the current time if it is 0.
+    void generate_ts_rfc3339_from_ntp(char *buf, int buf_size, guint64 ntp_timestamp);
 }
 
 
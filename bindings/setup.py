@@ -15,11 +15,17 @@
 
 import os
 import subprocess
+import sys
+import sysconfig
 from pathlib import Path
 
 from setuptools import Extension, setup
 from setuptools.command.build_ext import build_ext
 
+# Python minor versions accepted by CMakeLists.txt (PYTHON_MINVERS_ALLOWED)
+SUPPORTED_PYTHON_MINOR = (12, 13, 14)
+
+
 # A CMakeExtension needs a sourcedir instead of a file list.
 # The name must be the _single_ output extension from the CMake build.
 # If you need multiple extensions, see scikit-build.
@@ -39,9 +45,17 @@ class CMakeBuild(build_ext):
         # Can be set with Conda-Build, for example.
         cmake_generator = os.environ.get("CMAKE_GENERATOR", "")
 
-        cmake_args = [
-            f"-DCMAKE_LIBRARY_OUTPUT_DIRECTORY={extdir}{os.sep}"
-        ]
+        cmake_args = [f"-DCMAKE_LIBRARY_OUTPUT_DIRECTORY={extdir}{os.sep}"]
+        # Build for the interpreter running the build if CMakeLists.txt
+        # supports it, else keep its default (3.12) as before; CMAKE_ARGS
+        # below still take precedence
+        if sys.version_info.minor in SUPPORTED_PYTHON_MINOR:
+            free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+            cmake_args += [
+                f"-DPYTHON_MAJOR_VERSION={sys.version_info.major}",
+                f"-DPYTHON_MINOR_VERSION={sys.version_info.minor}",
+                f"-DPYTHON_FREE_THREADED={'ON' if free_threaded else 'OFF'}",
+            ]
         build_args = []
         # Adding CMake arguments set as environment variable
         # (needed to build for SBSA)
@@ -23,6 +23,18 @@
 namespace py = pybind11;
 using namespace std;
 namespace pydeepstream {
+    namespace {
+        /// Returns the NvBufSurface of a DeepStream buffer. The map is only a
+        /// lookup of the system memory holding the NvBufSurface, so the GIL
+        /// is kept; callers release it around NvBufSurfaceMap/SyncForCpu/UnMap
+        NvBufSurface *map_nvbufsurface(GstBuffer *buffer) {
+            GstMapInfo inmap;
+            gst_buffer_map(buffer, &inmap, GST_MAP_READ);
+            auto *surface = reinterpret_cast<NvBufSurface *>(inmap.data);
+            gst_buffer_unmap(buffer, &inmap);
+            return surface;
+        }
+    }
 
     void bindfunctions(py::module &m) {
         m.def("nvds_acquire_meta_lock",
@@ -314,10 +326,7 @@ namespace pydeepstream {
         m.def("get_nvds_buf_surface",
               [](size_t gst_buffer, int batchID) {
                   auto *buffer = reinterpret_cast<GstBuffer *>(gst_buffer);
-                  GstMapInfo inmap;
-                  gst_buffer_map(buffer, &inmap, GST_MAP_READ);
-                  auto *inputnvsurface = reinterpret_cast<NvBufSurface *>(inmap.data);
-                  gst_buffer_unmap(buffer, &inmap);
+                  auto *inputnvsurface = map_nvbufsurface(buffer);
 
                   if (inputnvsurface->surfaceList->colorFormat != NVBUF_COLOR_FORMAT_RGBA &&
                       inputnvsurface->surfaceList->colorFormat != NVBUF_COLOR_FORMAT_RGB ) {
@@ -332,17 +341,20 @@ namespace pydeepstream {
 #if defined __aarch64__ && !defined IS_SBSA
                   /* Map the buffer if it has not been mapped already, before syncing the
                      mapped buffer to CPU.*/
-                  if (nullptr == input_surface.mappedAddr.addr[0]) {
-                      int ret = NvBufSurfaceMap(inputnvsurface, batchID, -1,
-                                                NVBUF_MAP_READ_WRITE);
-                      if (ret < 0) {
-                          cout << "get_nvds_buf_surface: Failed to map "
-                                  << "buffer to CPU" << endl;
+                  {
+                      py::gil_scoped_release release;
+                      if (nullptr == input_surface.mappedAddr.addr[0]) {
+                          int ret = NvBufSurfaceMap(inputnvsurface, batchID, -1,
+                                                    NVBUF_MAP_READ_WRITE);
+                          if (ret < 0) {
+                              cout << "get_nvds_buf_surface: Failed to map "
+                                      << "buffer to CPU" << endl;
+                          }
+                      }
+                      if (NvBufSurfaceSyncForCpu(inputnvsurface, batchID, -1) != 0) {
+                          cout << "get_nvds_buf_surface: Failed to sync "
+                                  << "buffer to CPU " << endl;
                       }
-                  }
-                  if (NvBufSurfaceSyncForCpu(inputnvsurface, batchID, -1) != 0) {
-                      cout << "get_nvds_buf_surface: Failed to sync "
-                              << "buffer to CPU " << endl;
                   }
 
                   int height = input_surface.height;
@@ -382,11 +394,7 @@ namespace pydeepstream {
         m.def("get_nvds_buf_surface_gpu",
               [](size_t gst_buffer, int batchID) {
                   auto *buffer = reinterpret_cast<GstBuffer *>(gst_buffer);
-                  GstMapInfo inmap;
-                  gst_buffer_map(buffer, &inmap, GST_MAP_READ);
-
-                  auto *inputnvsurface = reinterpret_cast<NvBufSurface *>(inmap.data);
-                  gst_buffer_unmap(buffer, &inmap);
+                  auto *inputnvsurface = map_nvbufsurface(buffer);
 
                   if (inputnvsurface->surfaceList->colorFormat != NVBUF_COLOR_FORMAT_RGBA &&
                       inputnvsurface->surfaceList->colorFormat != NVBUF_COLOR_FORMAT_RGB) {
@@ -432,14 +440,12 @@ namespace pydeepstream {
         m.def("unmap_nvds_buf_surface",
               [](size_t gst_buffer, int batchID) {
                   auto *buffer = reinterpret_cast<GstBuffer *>(gst_buffer);
-                  GstMapInfo inmap;
-                  gst_buffer_map(buffer, &inmap, GST_MAP_READ);
-                  auto *inputnvsurface = reinterpret_cast<NvBufSurface *>(inmap.data);
-                  gst_buffer_unmap(buffer, &inmap);
+                  auto *inputnvsurface = map_nvbufsurface(buffer);
 
                   /* use const reference here so input_surface is not altered
                      during mapping and syncing for CPU */
                   const NvBufSurfaceParams &input_surface = inputnvsurface->surfaceList[batchID];
+                  py::gil_scoped_release release;
                   /* Map the buffer if it has not been mapped already, before syncing the
                      mapped buffer to CPU.*/
                   if (nullptr != input_surface.mappedAddr.addr[0]) {
@@ -512,36 +518,6 @@ namespace pydeepstream {
                   return (NvDsLabelInfo *) data;
               },
               py::return_value_policy::reference);
-        /**
-         * Type casting to @NvDsEventMsgMeta
-         */
-        m.def("glist_get_nvds_event_msg_meta",
-              [](void *data) {
-                  return (NvDsEventMsgMeta *) data;
-              },
-              py::return_value_policy::reference);
-
-        m.def("glist_get_nvds_event_msg_meta",
-              [](size_t data) {
-                  return (NvDsEventMsgMeta *) data;
-              },
-              py::return_value_policy::reference);
-        /**
-         * Type casting to @NvDsVehicleObject
-         */
-        m.def("glist_get_nvds_vehicle_object",
-              [](void *data) {
-                  return (NvDsVehicleObject *) data;
-              },
-              py::return_value_policy::reference);
-        /**
-         * Type casting to @NvDsPersonObject
-         */
-        m.def("glist_get_nvds_person_object",
-              [](void *data) {
-                  return (NvDsPersonObject *) data;
-              },
-              py::return_value_policy::reference);
         /**
          * Type casting to @NvDsInferTensorMeta
          */
@@ -598,6 +574,32 @@ namespace pydeepstream {
                   utils::set_freefunc(meta, func);
               });
 
+        m.def("register_user_meta_layout",
+              [](const std::string &descriptor,
+                 const std::vector<std::pair<std::string, std::string>> &fields) {
+                  return &utils::register_user_meta_layout(descriptor, fields);
+              },
+              "descriptor"_a,
+              "fields"_a,
+              py::return_value_policy::reference,
+              pydsdoc::methodsDoc::register_user_meta_layout);
+
+        m.def("get_user_meta_layout",
+              [](NvDsUserMeta *meta) {
+                  return utils::find_user_meta_layout(meta->base_meta.meta_type);
+              },
+              "meta"_a,
+              py::return_value_policy::reference,
+              pydsdoc::methodsDoc::get_user_meta_layout);
+
+        m.def("get_user_meta_layout",
+              [](int meta_type) {
+                  return utils::find_user_meta_layout((NvDsMetaType) meta_type);
+              },
+              "meta_type"_a,
+              py::return_value_policy::reference,
+              pydsdoc::methodsDoc::get_user_meta_layout);
+
         // Required for backward compatibility
         m.def("unset_callback_funcs",
               []() {
@@ -686,48 +688,58 @@ namespace pydeepstream {
         m.def("NvBufSurfaceCreate",
               (int (*)(NvBufSurface *, int,
                        NvBufSurfaceCreateParams)) &NvBufSurfaceCreate,
+              py::call_guard<py::gil_scoped_release>(),
               "surf"_a, "batchSize"_a,
               "params"_a, pydsdoc::methodsDoc::NvBufSurfaceCreate);
 
         m.def("NvBufSurfaceDestroy", &NvBufSurfaceDestroy,
+              py::call_guard<py::gil_scoped_release>(),
               "surf"_a, pydsdoc::methodsDoc::NvBufSurfaceDestroy);
 
         m.def("NvBufSurfaceMap", &NvBufSurfaceMap,
+              py::call_guard<py::gil_scoped_release>(),
               "surf"_a, "index"_a,
               "plane"_a, "type"_a,
               pydsdoc::methodsDoc::NvBufSurfaceMap);
 
         m.def("NvBufSurfaceUnMap", &NvBufSurfaceUnMap,
+              py::call_guard<py::gil_scoped_release>(),
               "surf"_a, "index"_a,
               "plane"_a,
               pydsdoc::methodsDoc::NvBufSurfaceUnMap);
 
         m.def("NvBufSurfaceCopy", &NvBufSurfaceCopy,
+              py::call_guard<py::gil_scoped_release>(),
               "srcSurf"_a, "dstSurf"_a,
               pydsdoc::methodsDoc::NvBufSurfaceCopy);
 
         m.def("NvBufSurfaceSyncForCpu", &NvBufSurfaceSyncForCpu,
+              py::call_guard<py::gil_scoped_release>(),
               "surf"_a, "index"_a,
               "plane"_a,
               pydsdoc::methodsDoc::NvBufSurfaceSyncForCpu);
 
         m.def("NvBufSurfaceSyncForDevice", &NvBufSurfaceSyncForDevice,
+              py::call_guard<py::gil_scoped_release>(),
               "surf"_a, "index"_a,
               "plane"_a,
               pydsdoc::methodsDoc::NvBufSurfaceSyncForDevice);
 
         m.def("NvBufSurfaceFromFd", (int (*)(int, void *)) &NvBufSurfaceFromFd,
               py::return_value_policy::reference,
+              py::call_guard<py::gil_scoped_release>(),
               "dmabuf"_a, "buffer"_a,
               pydsdoc::methodsDoc::NvBufSurfaceFromFd);
 
         m.def("NvBufSurfaceMemSet", &NvBufSurfaceMemSet,
+              py::call_guard<py::gil_scoped_release>(),
               "surf"_a, "index"_a,
               "plane"_a,
               "value"_a,
               pydsdoc::methodsDoc::NvBufSurfaceMemSet);
 
         m.def("NvBufSurfaceMapEglImage", &NvBufSurfaceMapEglImage,
+              py::call_guard<py::gil_scoped_release>(),
               "surf"_a, "index"_a,
               pydsdoc::methodsDoc::NvBufSurfaceMapEglImage);
 
@@ -799,6 +811,7 @@ namespace pydeepstream {
                   auto *element = reinterpret_cast<GstElement *>(gst_element);
                   return gst_element_send_event(element, gst_nvevent_new_stream_reset(source_id));
               },
+              py::call_guard<py::gil_scoped_release>(),
               pydsdoc::methodsDoc::gst_element_send_nvevent_new_stream_reset);
 
         m.def("gst_element_send_nvevent_interval_update",
@@ -853,14 +866,16 @@ namespace pydeepstream {
                   }
                   return num_sources_in_batch;
               },
-              "gst_buffer"_a, py::return_value_policy::reference,
+              "gst_buffer"_a, py::call_guard<py::gil_scoped_release>(),
+              py::return_value_policy::reference,
               pydsdoc::methodsDoc::nvds_measure_buffer_latency);
 
         m.def("nvds_obj_enc_create_context",
             [](int gpu_id) -> size_t {
                 auto handle = nvds_obj_enc_create_context(gpu_id);
                 return reinterpret_cast<size_t>(handle);
-            }, py::return_value_policy::reference,
+            }, py::call_guard<py::gil_scoped_release>(),
+            py::return_value_policy::reference,
             pydsdoc::methodsDoc::nvds_obj_enc_create_context);
 
         m.def("nvds_obj_enc_process",
@@ -880,6 +895,7 @@ namespace pydeepstream {
 
                 return nvds_obj_enc_process(handle, args, inputnvsurface, obj_meta, frame_meta);
             }, "ctx"_a, "args"_a, "gst_buffer"_a, "obj_meta"_a, "frame_meta"_a,
+            py::call_guard<py::gil_scoped_release>(),
             py::return_value_policy::reference,
             pydsdoc::methodsDoc::nvds_obj_enc_process);
 
@@ -889,7 +905,8 @@ namespace pydeepstream {
                 if (handle != nullptr) {
                     nvds_obj_enc_finish(handle);
                 }
-            }, "ctx"_a, pydsdoc::methodsDoc::nvds_obj_enc_finish);
+            }, "ctx"_a, py::call_guard<py::gil_scoped_release>(),
+            pydsdoc::methodsDoc::nvds_obj_enc_finish);
 
         m.def("nvds_obj_enc_destroy_context",
             [](size_t ctx) {
@@ -897,6 +914,7 @@ namespace pydeepstream {
                 if (handle != nullptr) {
                     nvds_obj_enc_destroy_context(handle);
                 }
-            }, "ctx"_a, pydsdoc::methodsDoc::nvds_obj_enc_destroy_context);
+            }, "ctx"_a, py::call_guard<py::gil_scoped_release>(),
+            pydsdoc::methodsDoc::nvds_obj_enc_destroy_context);
      }
 }
@@ -165,6 +165,395 @@ namespace pydeepstream {
             }
         }
     }
+
+    // Pooled NvDsEventMsgMeta
+    //
+    // Each block holds an NvDsEventMsgMeta together with storage for its
+    // vehicle/person extension object, the timestamp and the short strings
+    // written by the bulk helpers, so that a warm pool serves an event
+    // without touching malloc. Blocks are returned to a free-list by
+    // event_msg_meta_pool_release_func. Strings assigned through the regular
+    // property setters are heap allocated and freed as usual.
+
+    constexpr size_t EVENT_POOL_TS_LEN = 32;
+    constexpr size_t EVENT_POOL_STRING_BYTES = 256;
+    constexpr size_t EVENT_POOL_DEFAULT_MAX_IDLE = 1024;
+
+    struct PooledEventMsg {
+        NvDsEventMsgMeta meta; // must stay first, blocks are found from meta pointers
+        union {
+            NvDsVehicleObject vehicle;
+            NvDsPersonObject person;
+        } ext;
+        char ts[EVENT_POOL_TS_LEN + 1];
+        char strings[EVENT_POOL_STRING_BYTES];
+        size_t strings_used;
+        PooledEventMsg *next;
+
+        bool owns(const void *ptr) const {
+            auto *p = (const char *) ptr;
+            auto *begin = (const char *) this;
+            return p >= begin && p < begin + sizeof(PooledEventMsg);
+        }
+    };
+
+    class EventMsgPool {
+    public:
+        PooledEventMsg *acquire() {
+            PooledEventMsg *block = nullptr;
+            {
+                const std::lock_guard<std::mutex> lock(mut_);
+                acquired_++;
+                if (free_list_ != nullptr) {
+                    block = free_list_;
+                    free_list_ = block->next;
+                    idle_--;
+                    reused_++;
+                } else {
+                    allocated_++;
+                }
+            }
+            if (block == nullptr)
+                block = (PooledEventMsg *) g_malloc(sizeof(PooledEventMsg));
+            memset(&block->meta, 0, sizeof(block->meta));
+            memset(&block->ext, 0, sizeof(block->ext));
+            block->ts[0] = '\0';
+            block->strings_used = 0;
+            block->next = nullptr;
+            return block;
+        }
+
+        void release(PooledEventMsg *block) {
+            {
+                const std::lock_guard<std::mutex> lock(mut_);
+                released_++;
+                if (idle_ < max_idle_) {
+                    block->next = free_list_;
+                    free_list_ = block;
+                    idle_++;
+                    return;
+                }
+                freed_++;
+            }
+            g_free(block);
+        }
+
+        /// Copies str into the block's string storage, or onto the heap if
+        /// it does not fit.
+        char *store_string(PooledEventMsg *block, const char *str, size_t len) {
+            if (block->strings_used + len + 1 <= EVENT_POOL_STRING_BYTES) {
+                char *dst = block->strings + block->strings_used;
+                memcpy(dst, str, len);
+                dst[len] = '\0';
+                block->strings_used += len + 1;
+                return dst;
+            }
+            {
+                const std::lock_guard<std::mutex> lock(mut_);
+                string_overflows_++;
+            }
+            return g_strndup(str, len);
+        }
+
+        void set_max_idle(size_t max_idle) {
+            PooledEventMsg *trimmed = nullptr;
+            {
+                const std::lock_guard<std::mutex> lock(mut_);
+                max_idle_ = max_idle;
+                while (idle_ > max_idle_) {
+                    PooledEventMsg *block = free_list_;
+                    free_list_ = block->next;
+                    block->next = trimmed;
+                    trimmed = block;
+                    idle_--;
+                    freed_++;
+                }
+            }
+            while (trimmed != nullptr) {
+                PooledEventMsg *next = trimmed->next;
+                g_free(trimmed);
+                trimmed = next;
+            }
+        }
+
+        py::dict stats() {
+            const std::lock_guard<std::mutex> lock(mut_);
+            py::dict d;
+            d["allocated"] = allocated_;
+            d["freed"] = freed_;
+            d["acquired"] = acquired_;
+            d["released"] = released_;
+            d["reused"] = reused_;
+            d["in_use"] = acquired_ - released_;
+            d["idle"] = idle_;
+            d["max_idle"] = max_idle_;
+            d["string_overflows"] = string_overflows_;
+            return d;
+        }
+
+    private:
+        std::mutex mut_;
+        PooledEventMsg *free_list_ = nullptr;
+        size_t idle_ = 0;
+        size_t max_idle_ = EVENT_POOL_DEFAULT_MAX_IDLE;
+        uint64_t allocated_ = 0;
+        uint64_t freed_ = 0;
+        uint64_t acquired_ = 0;
+        uint64_t released_ = 0;
+        uint64_t reused_ = 0;
+        uint64_t string_overflows_ = 0;
+    };
+
+    // Blocks are handed back from streaming threads at arbitrary times,
+    // including interpreter shutdown, so the pool is never destroyed.
+    static EventMsgPool &event_msg_pool() {
+        static auto *pool = new EventMsgPool();
+        return *pool;
+    }
+
+    static void free_unowned(const PooledEventMsg *block, char *&field) {
+        if (field != nullptr && !block->owns(field))
+            g_free(field);
+        field = nullptr;
+    }
+
+    static char *copy_string(PooledEventMsg *block, const char *str) {
+        if (str == nullptr)
+            return nullptr;
+        return event_msg_pool().store_string(block, str, strlen(str));
+    }
+
+    static char *set_string(PooledEventMsg *block, py::handle value) {
+        if (value.is_none())
+            return nullptr;
+        std::string str = value.cast<std::string>();
+        return event_msg_pool().store_string(block, str.data(), str.size());
+    }
+
+    NvDsEventMsgMeta * event_msg_meta_pool_copy_func(void* data, void* user_data) {
+        NvDsUserMeta * srcMeta = (NvDsUserMeta*) data;
+        NvDsEventMsgMeta * srcData = (NvDsEventMsgMeta *) srcMeta->user_meta_data;
+        PooledEventMsg *block = event_msg_pool().acquire();
+        NvDsEventMsgMeta *destData = &block->meta;
+        destData->type = srcData->type;
+        destData->objType = srcData->objType;
+        destData->bbox = srcData->bbox;
+        destData->location = srcData->location;
+        destData->coordinate = srcData->coordinate;
+        destData->objSignature = srcData->objSignature;
+        destData->objClassId = srcData->objClassId;
+        destData->sensorId = srcData->sensorId;
+        destData->moduleId = srcData->moduleId;
+        destData->placeId = srcData->placeId;
+        destData->componentId = srcData->componentId;
+        destData->frameId = srcData->frameId;
+        destData->confidence = srcData->confidence;
+        destData->trackingId = srcData->trackingId;
+        destData->objectId = copy_string(block, srcData->objectId);
+        destData->sensorStr = copy_string(block, srcData->sensorStr);
+        destData->otherAttrs = copy_string(block, srcData->otherAttrs);
+        destData->videoPath = copy_string(block, srcData->videoPath);
+
+        if (srcData->ts != nullptr) {
+            g_strlcpy(block->ts, srcData->ts, sizeof(block->ts));
+            destData->ts = block->ts;
+        }
+
+        if (srcData->extMsgSize > 0) {
+            if (srcData->objType == NVDS_OBJECT_TYPE_VEHICLE) {
+                auto *srcObj = (NvDsVehicleObject *) srcData->extMsg;
+                NvDsVehicleObject *obj = &block->ext.vehicle;
+                obj->type = copy_string(block, srcObj->type);
+                obj->make = copy_string(block, srcObj->make);
+                obj->model = copy_string(block, srcObj->model);
+                obj->color = copy_string(block, srcObj->color);
+                obj->license = copy_string(block, srcObj->license);
+                obj->region = copy_string(block, srcObj->region);
+                destData->extMsg = obj;
+                destData->extMsgSize = sizeof (NvDsVehicleObject);
+            } else if (srcData->objType == NVDS_OBJECT_TYPE_PERSON) {
+                auto *srcObj = (NvDsPersonObject *) srcData->extMsg;
+                NvDsPersonObject *obj = &block->ext.person;
+                obj->age = srcObj->age;
+                obj->gender = copy_string(block, srcObj->gender);
+                obj->cap = copy_string(block, srcObj->cap);
+                obj->hair = copy_string(block, srcObj->hair);
+                obj->apparel = copy_string(block, srcObj->apparel);
+                destData->extMsg = obj;
+                destData->extMsgSize = sizeof (NvDsPersonObject);
+            }
+        }
+
+        return destData;
+    }
+
+    /// Frees the heap strings and extension object of a block and returns
+    /// it to the pool
+    static void release_pooled_event_msg(PooledEventMsg *block) {
+        NvDsEventMsgMeta *srcData = &block->meta;
+        free_unowned(block, srcData->ts);
+        free_unowned(block, srcData->objectId);
+        free_unowned(block, srcData->sensorStr);
+        free_unowned(block, srcData->otherAttrs);
+        free_unowned(block, srcData->videoPath);
+
+        if (srcData->extMsgSize > 0 && srcData->extMsg != nullptr) {
+            if (srcData->objType == NVDS_OBJECT_TYPE_VEHICLE) {
+                auto *obj = (NvDsVehicleObject *) srcData->extMsg;
+                free_unowned(block, obj->type);
+                free_unowned(block, obj->color);
+                free_unowned(block, obj->make);
+                free_unowned(block, obj->model);
+                free_unowned(block, obj->license);
+                free_unowned(block, obj->region);
+            } else if (srcData->objType == NVDS_OBJECT_TYPE_PERSON) {
+                auto *obj = (NvDsPersonObject *) srcData->extMsg;
+                free_unowned(block, obj->gender);
+                free_unowned(block, obj->cap);
+                free_unowned(block, obj->hair);
+                free_unowned(block, obj->apparel);
+            }
+            // An extension object allocated with alloc_nvds_*_object
+            if (!block->owns(srcData->extMsg))
+                g_free(srcData->extMsg);
+        }
+        srcData->extMsg = nullptr;
+        srcData->extMsgSize = 0;
+        event_msg_pool().release(block);
+    }
+
+    void event_msg_meta_pool_release_func(void * data, void * user_data) {
+        NvDsUserMeta * srcMeta = (NvDsUserMeta*) data;
+        if (srcMeta == nullptr || srcMeta->user_meta_data == nullptr)
+            return;
+        release_pooled_event_msg((PooledEventMsg *) srcMeta->user_meta_data);
+        srcMeta->user_meta_data = NULL;
+    }
+
+    /// Attaches a filled block to the frame. On failure (no user meta left
+    /// in the batch pool) the block is released and false returned.
+    static bool
+    attach_pooled_event_msg_meta(NvDsBatchMeta *batch_meta,
+                                 NvDsFrameMeta *frame_meta,
+                                 PooledEventMsg *block) {
+        NvDsUserMeta *user_meta = nvds_acquire_user_meta_from_pool(batch_meta);
+        if (user_meta == nullptr) {
+            release_pooled_event_msg(block);
+            return false;
+        }
+        user_meta->user_meta_data = &block->meta;
+        user_meta->base_meta.meta_type = NVDS_EVENT_MSG_META;
+        user_meta->base_meta.copy_func = (NvDsMetaCopyFunc) pydeepstream::event_msg_meta_pool_copy_func;
+        user_meta->base_meta.release_func = (NvDsMetaReleaseFunc) pydeepstream::event_msg_meta_pool_release_func;
+        nvds_add_user_meta_to_frame(frame_meta, user_meta);
+        return true;
+    }
+
+    /// Timestamp shared by all events of a frame
+    static void frame_timestamp(char *buf, NvDsFrameMeta *frame_meta,
+                                bool use_ntp_timestamp) {
+        if (use_ntp_timestamp)
+            utils::generate_ts_rfc3339_from_ntp(buf, EVENT_POOL_TS_LEN + 1,
+                                                frame_meta->ntp_timestamp);
+        else
+            utils::generate_ts_rfc3339(buf, EVENT_POOL_TS_LEN + 1);
+    }
+
+    static void fill_timestamp(PooledEventMsg *block, const py::dict &event,
+                               const char *frame_ts) {
+        if (event.contains("ts") && !event["ts"].is_none()) {
+            std::string ts = event["ts"].cast<std::string>();
+            g_strlcpy(block->ts, ts.c_str(), sizeof(block->ts));
+        } else {
+            memcpy(block->ts, frame_ts, sizeof(block->ts));
+        }
+        block->meta.ts = block->ts;
+    }
+
+    static void fill_event_from_dict(PooledEventMsg *block, const py::dict &event,
+                                     const char *frame_ts) {
+        NvDsEventMsgMeta *meta = &block->meta;
+        for (auto item : event) {
+            std::string key = item.first.cast<std::string>();
+            py::handle value = item.second;
+            if (key == "type")
+                meta->type = (NvDsEventType) value.cast<int>();
+            else if (key == "objType")
+                meta->objType = (NvDsObjectType) value.cast<int>();
+            else if (key == "bbox") {
+                auto bbox = value.cast<std::tuple<float, float, float, float>>();
+                meta->bbox.left = std::get<0>(bbox);
+                meta->bbox.top = std::get<1>(bbox);
+                meta->bbox.width = std::get<2>(bbox);
+                meta->bbox.height = std::get<3>(bbox);
+            }
+            else if (key == "objClassId")
+                meta->objClassId = value.cast<gint>();
+            else if (key == "sensorId")
+                meta->sensorId = value.cast<gint>();
+            else if (key == "moduleId")
+                meta->moduleId = value.cast<gint>();
+            else if (key == "placeId")
+                meta->placeId = value.cast<gint>();
+            else if (key == "componentId")
+                meta->componentId = value.cast<gint>();
+            else if (key == "frameId")
+                meta->frameId = value.cast<gint>();
+            else if (key == "confidence")
+                meta->confidence = value.cast<gdouble>();
+            else if (key == "trackingId")
+                meta->trackingId = value.cast<guint64>();
+            else if (key == "objectId")
+                meta->objectId = set_string(block, value);
+            else if (key == "sensorStr")
+                meta->sensorStr = set_string(block, value);
+            else if (key == "otherAttrs")
+                meta->otherAttrs = set_string(block, value);
+            else if (key == "videoPath")
+                meta->videoPath = set_string(block, value);
+            else if (key == "vehicle") {
+                py::dict attrs = value.cast<py::dict>();
+                NvDsVehicleObject *obj = &block->ext.vehicle;
+                // Linked first, so that a failure below still frees the
+                // strings already set
+                meta->objType = NVDS_OBJECT_TYPE_VEHICLE;
+                meta->extMsg = obj;
+                meta->extMsgSize = sizeof (NvDsVehicleObject);
+                for (auto attr : attrs) {
+                    std::string name = attr.first.cast<std::string>();
+                    if (name == "type") obj->type = set_string(block, attr.second);
+                    else if (name == "make") obj->make = set_string(block, attr.second);
+                    else if (name == "model") obj->model = set_string(block, attr.second);
+                    else if (name == "color") obj->color = set_string(block, attr.second);
+                    else if (name == "license") obj->license = set_string(block, attr.second);
+                    else if (name == "region") obj->region = set_string(block, attr.second);
+                    else throw py::key_error("Unknown vehicle attribute: " + name);
+                }
+            }
+            else if (key == "person") {
+                py::dict attrs = value.cast<py::dict>();
+                NvDsPersonObject *obj = &block->ext.person;
+                // Linked first, so that a failure below still frees the
+                // strings already set
+                meta->objType = NVDS_OBJECT_TYPE_PERSON;
+                meta->extMsg = obj;
+                meta->extMsgSize = sizeof (NvDsPersonObject);
+                for (auto attr : attrs) {
+                    std::string name = attr.first.cast<std::string>();
+                    if (name == "age") obj->age = attr.second.cast<gint>();
+                    else if (name == "gender") obj->gender = set_string(block, attr.second);
+                    else if (name == "cap") obj->cap = set_string(block, attr.second);
+                    else if (name == "hair") obj->hair = set_string(block, attr.second);
+                    else if (name == "apparel") obj->apparel = set_string(block, attr.second);
+                    else throw py::key_error("Unknown person attribute: " + name);
+                }
+            }
+            else if (key != "ts")
+                throw py::key_error("Unknown event field: " + key);
+        }
+        fill_timestamp(block, event, frame_ts);
+    }
+
     void bindschema(py::module &m) {
         /*Start of Bindings for nvdsmeta_schema.h*/
         py::enum_<NvDsEventType>(m, "NvDsEventType",
@@ -576,6 +965,110 @@ namespace pydeepstream {
               pydsdoc::methodsDoc::alloc_nvds_event_msg_meta);
 
 
+        m.def("alloc_pooled_nvds_event_msg_meta",
+              [](NvDsUserMeta *user_meta) {
+                  PooledEventMsg *block = event_msg_pool().acquire();
+                  block->meta.ts = block->ts;
+                  user_meta->base_meta.copy_func = (NvDsMetaCopyFunc) pydeepstream::event_msg_meta_pool_copy_func;
+                  user_meta->base_meta.release_func = (NvDsMetaReleaseFunc) pydeepstream::event_msg_meta_pool_release_func;
+                  return &block->meta;
+              },
+              py::return_value_policy::reference,
+              pydsdoc::methodsDoc::alloc_pooled_nvds_event_msg_meta);
+
+        m.def("attach_pooled_event_msg_metas",
+              [](NvDsBatchMeta *batch_meta, NvDsFrameMeta *frame_meta,
+                 const py::list &events, bool use_ntp_timestamp) {
+                  char ts[EVENT_POOL_TS_LEN + 1];
+                  frame_timestamp(ts, frame_meta, use_ntp_timestamp);
+                  int attached = 0;
+                  for (auto item : events) {
+                      py::dict event = item.cast<py::dict>();
+                      // Filled before being attached: an event with a bad
+                      // field never reaches the frame (nvmsgconv expects a
+                      // complete meta, ts included) and its block goes back
+                      // to the pool. The events before it stay attached.
+                      PooledEventMsg *block = event_msg_pool().acquire();
+                      try {
+                          fill_event_from_dict(block, event, ts);
+                      } catch (...) {
+                          release_pooled_event_msg(block);
+                          throw;
+                      }
+                      if (!attach_pooled_event_msg_meta(batch_meta, frame_meta, block))
+                          break;
+                      attached++;
+                  }
+                  return attached;
+              },
+              "batch_meta"_a, "frame_meta"_a, "events"_a,
+              "use_ntp_timestamp"_a = false,
+              pydsdoc::methodsDoc::attach_pooled_event_msg_metas);
+
+        m.def("attach_pooled_event_msg_metas_from_arrays",
+              [](NvDsBatchMeta *batch_meta, NvDsFrameMeta *frame_meta,
+                 py::array_t<float, py::array::c_style | py::array::forcecast> bboxes,
+                 py::array_t<double, py::array::c_style | py::array::forcecast> confidences,
+                 py::array_t<guint64, py::array::c_style | py::array::forcecast> tracking_ids,
+                 py::array_t<gint, py::array::c_style | py::array::forcecast> class_ids,
+                 NvDsEventType type, NvDsObjectType obj_type, gint sensor_id,
+                 bool use_ntp_timestamp) {
+                  if (bboxes.ndim() != 2 || bboxes.shape(1) != 4)
+                      throw py::value_error("bboxes must have shape (N, 4)");
+                  py::ssize_t count = bboxes.shape(0);
+                  if (confidences.size() != count || tracking_ids.size() != count
+                      || class_ids.size() != count)
+                      throw py::value_error("all arrays must have N entries");
+                  auto box = bboxes.unchecked<2>();
+                  const double *conf = confidences.data();
+                  const guint64 *ids = tracking_ids.data();
+                  const gint *classes = class_ids.data();
+                  char ts[EVENT_POOL_TS_LEN + 1];
+                  frame_timestamp(ts, frame_meta, use_ntp_timestamp);
+                  int attached = 0;
+                  for (py::ssize_t i = 0; i < count; i++) {
+                      PooledEventMsg *block = event_msg_pool().acquire();
+                      NvDsEventMsgMeta *meta = &block->meta;
+                      meta->type = type;
+                      meta->objType = obj_type;
+                      meta->bbox.left = box(i, 0);
+                      meta->bbox.top = box(i, 1);
+                      meta->bbox.width = box(i, 2);
+                      meta->bbox.height = box(i, 3);
+                      meta->confidence = conf[i];
+                      meta->trackingId = ids[i];
+                      meta->objClassId = classes[i];
+                      meta->sensorId = sensor_id;
+                      meta->frameId = frame_meta->frame_num;
+                      memcpy(block->ts, ts, sizeof(ts));
+                      meta->ts = block->ts;
+                      if (!attach_pooled_event_msg_meta(batch_meta, frame_meta, block))
+                          break;
+                      attached++;
+                  }
+                  return attached;
+              },
+              "batch_meta"_a, "frame_meta"_a, "bboxes"_a, "confidences"_a,
+              "tracking_ids"_a, "class_ids"_a,
+              "type"_a = NVDS_EVENT_ENTRY,
+              "obj_type"_a = NVDS_OBJECT_TYPE_UNKNOWN,
+              "sensor_id"_a = 0,
+              "use_ntp_timestamp"_a = false,
+              pydsdoc::methodsDoc::attach_pooled_event_msg_metas_from_arrays);
+
+        m.def("event_msg_meta_pool_stats",
+              []() {
+                  return event_msg_pool().stats();
+              },
+              pydsdoc::methodsDoc::event_msg_meta_pool_stats);
+
+        m.def("event_msg_meta_pool_set_max_idle",
+              [](size_t max_idle) {
+                  event_msg_pool().set_max_idle(max_idle);
+              },
+              "max_idle"_a,
+              pydsdoc::methodsDoc::event_msg_meta_pool_set_max_idle);
+
         m.def("generate_ts_rfc3339",
               [](size_t buffer, size_t size) {
                   char *bufptr = (char *) buffer;
@@ -584,6 +1077,51 @@ namespace pydeepstream {
               "buffer"_a, "size"_a,
               pydsdoc::methodsDoc::generate_ts_rfc3339);
 
+        m.def("generate_ts_rfc3339_from_ntp",
+              [](size_t buffer, size_t size, guint64 ntp_timestamp) {
+                  char *bufptr = (char *) buffer;
+                  utils::generate_ts_rfc3339_from_ntp(bufptr, size, ntp_timestamp);
+              },
+              "buffer"_a, "size"_a, "ntp_timestamp"_a,
+              pydsdoc::methodsDoc::generate_ts_rfc3339_from_ntp);
+
+        m.def("stamp_event_msg_metas",
+              [](NvDsBatchMeta *batch_meta, bool use_ntp_timestamp) {
+                  char wall_ts[utils::TS_RFC3339_LEN + 1];
+                  char frame_ts[utils::TS_RFC3339_LEN + 1];
+                  utils::generate_ts_rfc3339(wall_ts, sizeof(wall_ts));
+                  int stamped = 0;
+                  for (NvDsMetaList *l_frame = batch_meta->frame_meta_list;
+                       l_frame != nullptr; l_frame = l_frame->next) {
+                      auto *frame_meta = (NvDsFrameMeta *) l_frame->data;
+                      const char *ts = wall_ts;
+                      if (use_ntp_timestamp && frame_meta->ntp_timestamp != 0) {
+                          utils::format_ts_rfc3339_ns(frame_ts, sizeof(frame_ts),
+                                                      frame_meta->ntp_timestamp);
+                          ts = frame_ts;
+                      }
+                      for (NvDsMetaList *l_user = frame_meta->frame_user_meta_list;
+                           l_user != nullptr; l_user = l_user->next) {
+                          auto *user_meta = (NvDsUserMeta *) l_user->data;
+                          if (user_meta->base_meta.meta_type != NVDS_EVENT_MSG_META)
+                              continue;
+                          auto *msg_meta = (NvDsEventMsgMeta *) user_meta->user_meta_data;
+                          if (msg_meta == nullptr)
+                              continue;
+                          // Only unstamped metas; the release functions free ts
+                          if (msg_meta->ts == nullptr)
+                              msg_meta->ts = (gchar *) g_malloc(utils::TS_RFC3339_LEN + 1);
+                          else if (msg_meta->ts[0] != '\0')
+                              continue;
+                          memcpy(msg_meta->ts, ts, utils::TS_RFC3339_LEN + 1);
+                          stamped++;
+                      }
+                  }
+                  return stamped;
+              },
+              "batch_meta"_a, "use_ntp_timestamp"_a = true,
+              pydsdoc::methodsDoc::stamp_event_msg_metas);
+
 
         py::class_<NvDsEvent>(m, "NvDsEvent",
                               pydsdoc::metaschema::EventDoc::descr)
@@ -633,7 +1171,16 @@ namespace pydeepstream {
                          return (NvDsPayload *) data;
                      },
                      py::return_value_policy::reference,
-                     pydsdoc::metaschema::PayloadDoc::cast);
+                     pydsdoc::metaschema::PayloadDoc::cast)
+
+                .def("get_bytes",
+                     [](const NvDsPayload &self) {
+                         if (self.payload == nullptr)
+                             return py::bytes();
+                         return py::bytes((const char *) self.payload,
+                                          self.payloadSize);
+                     },
+                     pydsdoc::metaschema::PayloadDoc::get_bytes);
 
         m.def("alloc_nvds_payload",
               []() {
@@ -644,6 +1191,36 @@ namespace pydeepstream {
               py::return_value_policy::reference,
               pydsdoc::methodsDoc::alloc_nvds_payload);
 
+        /**
+         * Type casting to @NvDsEventMsgMeta
+         */
+        m.def("glist_get_nvds_event_msg_meta",
+              [](void *data) {
+                  return (NvDsEventMsgMeta *) data;
+              },
+              py::return_value_policy::reference);
+
+        m.def("glist_get_nvds_event_msg_meta",
+              [](size_t data) {
+                  return (NvDsEventMsgMeta *) data;
+              },
+              py::return_value_policy::reference);
+        /**
+         * Type casting to @NvDsVehicleObject
+         */
+        m.def("glist_get_nvds_vehicle_object",
+              [](void *data) {
+                  return (NvDsVehicleObject *) data;
+              },
+              py::return_value_policy::reference);
+        /**
+         * Type casting to @NvDsPersonObject
+         */
+        m.def("glist_get_nvds_person_object",
+              [](void *data) {
+                  return (NvDsPersonObject *) data;
+              },
+              py::return_value_policy::reference);
     }
 
 }
@@ -8,7 +8,8 @@
 
 #include "include/bind_custom_msg_blob.hpp"
 
-#include <string>
+#include <cstring>
+#include <vector>
 
 #include "pyds.hpp"
 
@@ -22,54 +23,152 @@ struct NvDsCustomMsgInfoCompat {
     guint len;
 };
 
+/* A blob is allocated once, with the message stored inline after the
+ * NvDsCustomMsgInfo header, and shared by reference count: copying the meta
+ * (e.g. in nvstreamdemux or tee branches) only takes another reference. */
+struct SharedMsgBlob {
+    NvDsCustomMsgInfoCompat info; /* must stay first: user_meta_data points here */
+    gint refcount;
+    gchar data[1];
+};
+
+/* Copies len bytes and appends a '\0', so text blobs stay valid C strings */
+static SharedMsgBlob* shared_blob_new(const char* data, size_t len) {
+    SharedMsgBlob* blob = (SharedMsgBlob*)g_malloc(sizeof(SharedMsgBlob) + len);
+    memcpy(blob->data, data, len);
+    blob->data[len] = '\0';
+    blob->info.message = blob->data;
+    /* SDK dsmeta_payload uses custom_blob->size as string length (no null); match test4. */
+    blob->info.len = (guint)len;
+    blob->refcount = 1;
+    return blob;
+}
+
+static SharedMsgBlob* shared_blob_ref(SharedMsgBlob* blob) {
+    g_atomic_int_inc(&blob->refcount);
+    return blob;
+}
+
+static void shared_blob_unref(SharedMsgBlob* blob) {
+    if (g_atomic_int_dec_and_test(&blob->refcount)) g_free(blob);
+}
+
 static void* custom_msg_blob_copy_func(void* data, void* user_data) {
     (void)user_data;
     NvDsUserMeta* src = (NvDsUserMeta*)data;
-    NvDsCustomMsgInfoCompat* src_info = (NvDsCustomMsgInfoCompat*)src->user_meta_data;
-    if (!src_info || !src_info->message) return nullptr;
-    NvDsCustomMsgInfoCompat* dest =
-        (NvDsCustomMsgInfoCompat*)g_malloc(sizeof(NvDsCustomMsgInfoCompat));
-    dest->message = g_strdup(src_info->message);
-    dest->len = src_info->len;
-    return dest;
+    SharedMsgBlob* blob = (SharedMsgBlob*)src->user_meta_data;
+    if (!blob) return nullptr;
+    return shared_blob_ref(blob);
 }
 
 static void custom_msg_blob_release_func(void* data, void* user_data) {
     (void)user_data;
     NvDsUserMeta* src = (NvDsUserMeta*)data;
-    NvDsCustomMsgInfoCompat* info = (NvDsCustomMsgInfoCompat*)src->user_meta_data;
-    if (info) {
-        g_free(info->message);
-        info->message = nullptr;
-        info->len = 0;
-        g_free(info);
-    }
+    SharedMsgBlob* blob = (SharedMsgBlob*)src->user_meta_data;
+    if (blob) shared_blob_unref(blob);
     src->user_meta_data = nullptr;
 }
 
+/* Makes the single owned copy of a str (its cached UTF-8 form) or of any
+ * object supporting the buffer protocol (bytes, bytearray, memoryview,
+ * numpy arrays, ...). */
+static SharedMsgBlob* shared_blob_from_object(py::handle obj) {
+    if (PyUnicode_Check(obj.ptr())) {
+        Py_ssize_t len = 0;
+        const char* utf8 = PyUnicode_AsUTF8AndSize(obj.ptr(), &len);
+        if (!utf8) throw py::error_already_set();
+        return shared_blob_new(utf8, (size_t)len);
+    }
+    if (!PyObject_CheckBuffer(obj.ptr()))
+        throw py::type_error("custom message blob must be str or a bytes-like object");
+    Py_buffer view;
+    if (PyObject_GetBuffer(obj.ptr(), &view, PyBUF_C_CONTIGUOUS) != 0)
+        throw py::error_already_set();
+    SharedMsgBlob* blob = shared_blob_new((const char*)view.buf, (size_t)view.len);
+    PyBuffer_Release(&view);
+    return blob;
+}
+
+/* Attaches one reference of blob to the frame; returns false (and keeps the
+ * reference with the caller) if the batch user meta pool is exhausted. */
+static bool attach_shared_blob(NvDsFrameMeta* frame_meta, NvDsBatchMeta* batch_meta,
+                               SharedMsgBlob* blob) {
+    NvDsUserMeta* user_meta = nvds_acquire_user_meta_from_pool(batch_meta);
+    if (!user_meta) return false;
+    user_meta->user_meta_data = blob;
+    /* SDK payload lib (msg2p-newapi) checks meta_type == NVDS_CUSTOM_MSG_BLOB;
+     * must use the enum from nvdsmeta.h, not a quark. */
+    user_meta->base_meta.meta_type = NVDS_CUSTOM_MSG_BLOB;
+    user_meta->base_meta.copy_func = (NvDsMetaCopyFunc)custom_msg_blob_copy_func;
+    user_meta->base_meta.release_func = (NvDsMetaReleaseFunc)custom_msg_blob_release_func;
+    nvds_add_user_meta_to_frame(frame_meta, user_meta);
+    return true;
+}
+
 void bind_custom_msg_blob(py::module& m) {
     m.def(
         "nvds_add_custom_msg_blob_to_frame",
-        [](NvDsFrameMeta* frame_meta, NvDsBatchMeta* batch_meta, const std::string& json_str) {
+        [](NvDsFrameMeta* frame_meta, NvDsBatchMeta* batch_meta, py::object json_str) {
             if (!frame_meta || !batch_meta) return;
-            NvDsUserMeta* user_meta = nvds_acquire_user_meta_from_pool(batch_meta);
-            if (!user_meta) return;
-            NvDsCustomMsgInfoCompat* info =
-                (NvDsCustomMsgInfoCompat*)g_malloc(sizeof(NvDsCustomMsgInfoCompat));
-            info->message = g_strdup(json_str.c_str());
-            /* SDK dsmeta_payload uses custom_blob->size as string length (no null); match test4. */
-            info->len = (guint)json_str.size();
-            user_meta->user_meta_data = info;
-            /* SDK payload lib (msg2p-newapi) checks meta_type == NVDS_CUSTOM_MSG_BLOB;
-             * must use the enum from nvdsmeta.h, not a quark. */
-            user_meta->base_meta.meta_type = NVDS_CUSTOM_MSG_BLOB;
-            user_meta->base_meta.copy_func = (NvDsMetaCopyFunc)custom_msg_blob_copy_func;
-            user_meta->base_meta.release_func = (NvDsMetaReleaseFunc)custom_msg_blob_release_func;
-            nvds_add_user_meta_to_frame(frame_meta, user_meta);
+            SharedMsgBlob* blob = shared_blob_from_object(json_str);
+            if (!attach_shared_blob(frame_meta, batch_meta, blob)) shared_blob_unref(blob);
         },
         "frame_meta"_a, "batch_meta"_a, "json_str"_a,
         "Attach NVDS_CUSTOM_MSG_BLOB user meta to frame (msg2p-newapi: payload lib attaches this "
-        "to payload).");
+        "to payload). json_str may be a str or any bytes-like object (e.g. a CTFB binary "
+        "payload from common.ctface_payload.encode()); it is copied once and shared, not "
+        "duplicated, when the meta is copied.");
+
+    m.def(
+        "nvds_add_custom_msg_blobs_to_frames",
+        [](NvDsBatchMeta* batch_meta, const py::sequence& frame_metas, py::object blobs) {
+            if (!batch_meta) return 0;
+            size_t num_frames = py::len(frame_metas);
+            bool shared = PyUnicode_Check(blobs.ptr()) || PyObject_CheckBuffer(blobs.ptr());
+            if (!shared && (!py::isinstance<py::sequence>(blobs) || py::len(blobs) != num_frames))
+                throw py::value_error("blobs must be a single blob or one blob per frame");
+            /* Cast every frame before allocating anything, so a bad element
+             * cannot leave blobs or references behind */
+            std::vector<NvDsFrameMeta*> frames;
+            frames.reserve(num_frames);
+            for (size_t i = 0; i < num_frames; i++)
+                frames.push_back(frame_metas[i].cast<NvDsFrameMeta*>());
+            std::vector<SharedMsgBlob*> frame_blobs(num_frames, nullptr);
+            SharedMsgBlob* common = nullptr;
+            try {
+                if (shared) {
+                    common = shared_blob_from_object(blobs);
+                } else {
+                    py::sequence per_frame = py::reinterpret_borrow<py::sequence>(blobs);
+                    for (size_t i = 0; i < num_frames; i++)
+                        if (frames[i]) frame_blobs[i] = shared_blob_from_object(per_frame[i]);
+                }
+            } catch (...) {
+                for (SharedMsgBlob* blob : frame_blobs)
+                    if (blob) shared_blob_unref(blob);
+                throw;
+            }
+            int attached = 0;
+            for (size_t i = 0; i < num_frames; i++) {
+                if (!frames[i]) continue;
+                SharedMsgBlob* blob = common ? shared_blob_ref(common) : frame_blobs[i];
+                frame_blobs[i] = nullptr;
+                if (!attach_shared_blob(frames[i], batch_meta, blob)) {
+                    shared_blob_unref(blob);
+                    break;
+                }
+                attached++;
+            }
+            /* Batch user meta pool exhausted: drop the blobs nobody took */
+            for (SharedMsgBlob* blob : frame_blobs)
+                if (blob) shared_blob_unref(blob);
+            if (common) shared_blob_unref(common);
+            return attached;
+        },
+        "batch_meta"_a, "frame_metas"_a, "blobs"_a,
+        "Attach NVDS_CUSTOM_MSG_BLOB user meta to many frames at once. blobs is either one str / "
+        "bytes-like object, copied once and shared by all frames, or a sequence with one blob "
+        "per frame. Returns the number of frames the blob was attached to.");
 }
 
 }  // namespace pydeepstream
@@ -38,6 +38,11 @@
 
 #include <ndarrayobject.h>*/
 
+#include <atomic>
+#include <cstdlib>
+#include <mutex>
+#include <string>
+
 #define PYDS_VERSION "1.2.2"
 
 using namespace std;
@@ -45,7 +50,176 @@ namespace py = pybind11;
 
 namespace pydeepstream {
 
+namespace {
+
+/// A group of rarely used bindings. It is registered into the submodule
+/// pyds.<name> on first access, and its names are then copied into the flat
+/// pyds namespace, so pyds.NvDsEventMsgMeta and pyds.schema.NvDsEventMsgMeta
+/// are the same object.
+struct LazyGroup {
+    const char *name;
+    const char *doc;
+    void (*bind)(py::module &);
+    const char *depends;      ///< group registered first, or nullptr
+    const char *const *names; ///< names the group registers, nullptr terminated
+    std::atomic<bool> loaded;
+};
+
+// Names registered by each group (classes, enums with their exported values,
+// functions), so that module __getattr__ loads only the group owning a name
+// and fails right away for unknown names. Loading a group warns about any
+// name missing here.
+const char *const schema_names[] = {
+    "NVDS_EVENT_CUSTOM", "NVDS_EVENT_EMPTY", "NVDS_EVENT_ENTRY", "NVDS_EVENT_EXIT",
+    "NVDS_EVENT_FORCE32", "NVDS_EVENT_MOVING", "NVDS_EVENT_PARKED", "NVDS_EVENT_RESERVED",
+    "NVDS_EVENT_RESET", "NVDS_EVENT_STOPPED", "NVDS_OBEJCT_TYPE_FORCE32",
+    "NVDS_OBJECT_TYPE_BAG", "NVDS_OBJECT_TYPE_BICYCLE", "NVDS_OBJECT_TYPE_CUSTOM",
+    "NVDS_OBJECT_TYPE_FACE", "NVDS_OBJECT_TYPE_FACE_EXT", "NVDS_OBJECT_TYPE_PERSON",
+    "NVDS_OBJECT_TYPE_PERSON_EXT", "NVDS_OBJECT_TYPE_RESERVED", "NVDS_OBJECT_TYPE_ROADSIGN",
+    "NVDS_OBJECT_TYPE_UNKNOWN", "NVDS_OBJECT_TYPE_VEHICLE", "NVDS_OBJECT_TYPE_VEHICLE_EXT",
+    "NVDS_PAYLOAD_CUSTOM", "NVDS_PAYLOAD_DEEPSTREAM", "NVDS_PAYLOAD_DEEPSTREAM_MINIMAL",
+    "NVDS_PAYLOAD_FORCE32", "NVDS_PAYLOAD_RESERVED", "NvDsCoordinate", "NvDsEvent",
+    "NvDsEventMsgMeta", "NvDsEventType", "NvDsFaceObject", "NvDsFaceObjectWithExt",
+    "NvDsGeoLocation", "NvDsObjectSignature", "NvDsObjectType", "NvDsPayload",
+    "NvDsPayloadType", "NvDsPersonObject", "NvDsPersonObjectExt", "NvDsRect",
+    "NvDsVehicleObject", "NvDsVehicleObjectExt", "alloc_nvds_event",
+    "alloc_nvds_event_msg_meta", "alloc_nvds_face_object", "alloc_nvds_payload",
+    "alloc_nvds_person_object", "alloc_nvds_vehicle_object", "alloc_pooled_nvds_event_msg_meta",
+    "attach_pooled_event_msg_metas", "attach_pooled_event_msg_metas_from_arrays",
+    "event_msg_meta_pool_set_max_idle", "event_msg_meta_pool_stats", "generate_ts_rfc3339",
+    "generate_ts_rfc3339_from_ntp", "glist_get_nvds_event_msg_meta",
+    "glist_get_nvds_person_object", "glist_get_nvds_vehicle_object", "stamp_event_msg_metas",
+    nullptr
+};
+const char *const tracker_names[] = {
+    "NvDsObjReid", "NvDsTargetMiscDataBatch", "NvDsTargetMiscDataFrame",
+    "NvDsTargetMiscDataObject", "NvDsTargetMiscDataStream", nullptr
+};
+const char *const analytics_names[] = {
+    "NvDsAnalyticsFrameMeta", "NvDsAnalyticsObjInfo", nullptr
+};
+const char *const opticalflow_names[] = {
+    "NvDsOpticalFlowMeta", "NvOFFlowVector", nullptr
+};
+const char *const meta360_names[] = {
+    "INSIDE_AISLE_360D", "ROI_ENTRY_360D", "ROI_EXIT_360D", "ROI_STATUS_360D", "RectDim",
+    nullptr
+};
+const char *const roi_names[] = {
+    "NvDsDataType", "NvDsDataType_FP16", "NvDsDataType_FP32", "NvDsDataType_INT32",
+    "NvDsDataType_INT8", "NvDsDataType_UINT32", "NvDsDataType_UINT8", "NvDsRoiMeta",
+    "NvDsUnitType", "NvDsUnitType_FullFrame", "NvDsUnitType_Object", "NvDsUnitType_ROI", nullptr
+};
+const char *const preprocess_names[] = {
+    "GstNvDsPreProcessBatchMeta", "NvDsPreProcessTensorMeta", nullptr
+};
+const char *const custom_names[] = {
+    "CTFaceObjectMeta", "CustomDataStruct", "alloc_ct_face_obj_struct", "alloc_custom_struct",
+    "nvds_add_custom_msg_blob_to_frame", "nvds_add_custom_msg_blobs_to_frames", nullptr
+};
+
+LazyGroup lazy_groups[] = {
+    {"schema", "Event message and payload schema (nvmsgconv / nvmsgbroker)", bindschema,
+     nullptr, schema_names, false},
+    {"tracker", "Tracker past frame and re-identification metadata", bindtrackermeta, nullptr,
+     tracker_names, false},
+    {"analytics", "nvdsanalytics metadata", bindanalyticsmeta, nullptr, analytics_names, false},
+    {"opticalflow", "Optical flow metadata", bindopticalflowmeta, nullptr, opticalflow_names,
+     false},
+    {"meta360", "360 degree camera metadata", bindmeta360, nullptr, meta360_names, false},
+    {"roi", "ROI metadata", bindroimeta, nullptr, roi_names, false},
+    {"preprocess", "nvdspreprocess metadata", bindpreprocessmeta, "roi", preprocess_names,
+     false},
+    {"custom", "Custom user metadata of the sample applications",
+     [](py::module &m) {
+         bindcustom(m);
+         pyds_usbcamera_test::ct_face_obj_bind(m);
+         bind_custom_msg_blob(m);
+     },
+     nullptr, custom_names, false},
+};
+
+std::mutex lazy_groups_mutex;
+
+LazyGroup *find_lazy_group(const std::string &name) {
+    for (auto &group : lazy_groups)
+        if (name == group.name) return &group;
+    return nullptr;
+}
+
+LazyGroup *find_lazy_group_of(const std::string &name) {
+    for (auto &group : lazy_groups)
+        for (const char *const *n = group.names; *n; n++)
+            if (name == *n) return &group;
+    return nullptr;
+}
+
+bool is_listed(const LazyGroup &group, const std::string &name) {
+    for (const char *const *n = group.names; *n; n++)
+        if (name == *n) return true;
+    return false;
+}
+
+void load_lazy_group_locked(py::module &pyds, LazyGroup &group) {
+    if (group.loaded) return;
+    if (group.depends) load_lazy_group_locked(pyds, *find_lazy_group(group.depends));
+    py::module sub = pyds.def_submodule(group.name, group.doc);
+    group.bind(sub);
+    py::dict flat = pyds.attr("__dict__");
+    py::dict names = sub.attr("__dict__");
+    // A name already in pyds would hide the group's object (and its
+    // overloads) behind the existing one, so refuse instead of dropping it
+    for (auto item : names) {
+        std::string name = py::str(item.first);
+        if (name.rfind("__", 0) == 0) continue;
+        if (flat.contains(item.first) && flat[item.first].ptr() != item.second.ptr())
+            throw std::runtime_error("pyds: binding group '" + std::string(group.name) +
+                                     "' redefines pyds." + name +
+                                     "; add overloads in the module that owns it");
+    }
+    for (auto item : names) {
+        std::string name = py::str(item.first);
+        if (name.rfind("__", 0) == 0) continue;
+        flat[item.first] = item.second;
+        if (!is_listed(group, name)) {
+            std::string msg = "pyds: " + name + " of binding group '" + group.name +
+                              "' is missing from its name table";
+            if (PyErr_WarnEx(PyExc_RuntimeWarning, msg.c_str(), 1) < 0)
+                throw py::error_already_set();
+        }
+    }
+    py::module::import("sys").attr("modules")[py::str(std::string("pyds.") + group.name)] = sub;
+    group.loaded = true;
+}
+
+py::module load_lazy_group(py::module &pyds, LazyGroup &group) {
+    {
+        // Wait for the lock without holding the GIL (or, on free-threaded
+        // python, while detached) so a concurrent loader can finish
+        py::gil_scoped_release release;
+        lazy_groups_mutex.lock();
+    }
+    std::lock_guard<std::mutex> lock(lazy_groups_mutex, std::adopt_lock);
+    load_lazy_group_locked(pyds, group);
+    return pyds.attr(group.name);
+}
+
+void load_all_lazy_groups(py::module &pyds) {
+    for (auto &group : lazy_groups) load_lazy_group(pyds, group);
+}
+
+}  // namespace
+
+// Global state of the bindings is guarded by its own locks, so the module
+// can be imported by free-threaded python without re-enabling the GIL
+#if PYBIND11_VERSION_HEX >= 0x020D0000
+PYBIND11_MODULE(pyds, m, py::mod_gil_not_used()) {
+#else
+#ifdef Py_GIL_DISABLED
+#error "free-threaded python requires pybind11 2.13 or newer (py::mod_gil_not_used)"
+#endif
 PYBIND11_MODULE(pyds, m) {
+#endif
     m.doc() = "pybind11 bindings for gstnvdsmeta"; /* this will be the doc string*/
     m.attr("__version__") = PYDS_VERSION;
 
@@ -57,23 +231,45 @@ PYBIND11_MODULE(pyds, m) {
 
     bindnvosd(m);
     bindnvdsmeta(m);
-    bindschema(m);
     bindfunctions(m);
-    bindtrackermeta(m);
-    bindmeta360(m);
-    bindanalyticsmeta(m);
     bindgstnvdsmeta(m);
     bindnvbufsurface(m);
     bindnvdsinfer(m);
-    bindopticalflowmeta(m);
     bindutils(m);
 
-    // register
-    pydeepstream::bindcustom(m);
-    pyds_usbcamera_test::ct_face_obj_bind(m);
-    pydeepstream::bind_custom_msg_blob(m);
+    m.def("__dir__", [m]() mutable {
+        load_all_lazy_groups(m);
+        return py::list(m.attr("__dict__").cast<py::dict>().attr("keys")());
+    });
+
+    m.def("load_lazy_bindings", [m]() mutable { load_all_lazy_groups(m); },
+          "Registers all lazily registered binding groups (schema, tracker, analytics, "
+          "opticalflow, meta360, roi, preprocess, custom) now.");
+    m.def("load_lazy_bindings", [m](const std::string &name) mutable -> py::object {
+        LazyGroup *group = find_lazy_group(name);
+        if (!group) throw py::value_error("unknown binding group '" + name + "'");
+        return load_lazy_group(m, *group);
+    }, py::arg("name"), "Registers the binding group 'name' now and returns its submodule.");
+
+    // The groups of lazy_groups are registered on first access (module
+    // __getattr__, PEP 562), or right away with PYDS_EAGER_IMPORT=1.
+    // __getattr__ must be defined last: m.def() looks up the name it defines
+    // (for overloads), which would go through __getattr__ and load everything
+    m.def("__getattr__", [m](const std::string &name) mutable -> py::object {
+        if (name.rfind("__", 0) == 0)
+            throw py::attribute_error("module 'pyds' has no attribute '" + name + "'");
+        if (LazyGroup *group = find_lazy_group(name)) return load_lazy_group(m, *group);
+        // Unknown names fail without loading anything, so hasattr() probes
+        // keep the groups lazy
+        if (LazyGroup *group = find_lazy_group_of(name)) {
+            load_lazy_group(m, *group);
+            py::dict flat = m.attr("__dict__");
+            if (flat.contains(name)) return flat[py::str(name)];
+        }
+        throw py::attribute_error("module 'pyds' has no attribute '" + name + "'");
+    });
 
-    bindpreprocessmeta(m);
-    bindroimeta(m);
+    const char *eager = std::getenv("PYDS_EAGER_IMPORT");
+    if (eager && *eager && std::string(eager) != "0") load_all_lazy_groups(m);
 }  // end PYBIND11_MODULE(pyds, m)
 }  // namespace pydeepstream
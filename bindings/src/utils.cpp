@@ -21,8 +21,12 @@
 #include <cstring>
 #include <ctime>
 #include <sys/timeb.h>
+#include <algorithm>
 #include <functional>
 #include <iostream>
+#include <shared_mutex>
+#include <stdexcept>
+#include <unordered_map>
 #include "gstnvdsmeta.h"
 #include "pyds.hpp"
 #include "nvdsmeta_schema.h"
@@ -57,6 +61,84 @@ namespace pydeepstream {
 
 // Utils
 namespace pydeepstream {
+    namespace {
+        char *user_meta_block(const utils::UserMetaLayout &layout, NvDsUserMeta *meta) {
+            if (meta->base_meta.meta_type != layout.meta_type || meta->user_meta_data == nullptr)
+                throw py::value_error("user meta does not hold a " + layout.descriptor);
+            return static_cast<char *>(meta->user_meta_data);
+        }
+
+        template<typename T>
+        T load(const char *p) {
+            T v;
+            memcpy(&v, p, sizeof(T));
+            return v;
+        }
+
+        template<typename T>
+        void store(char *p, T v) {
+            memcpy(p, &v, sizeof(T));
+        }
+
+        py::object get_user_meta_field(const char *block, const utils::UserMetaField &field) {
+            const char *p = block + field.offset;
+            switch (field.kind) {
+                case utils::UserMetaField::BOOL: return py::bool_(load<gboolean>(p) != 0);
+                case utils::UserMetaField::INT8: return py::int_(load<gint8>(p));
+                case utils::UserMetaField::UINT8: return py::int_(load<guint8>(p));
+                case utils::UserMetaField::INT16: return py::int_(load<gint16>(p));
+                case utils::UserMetaField::UINT16: return py::int_(load<guint16>(p));
+                case utils::UserMetaField::INT32: return py::int_(load<gint32>(p));
+                case utils::UserMetaField::UINT32: return py::int_(load<guint32>(p));
+                case utils::UserMetaField::INT64: return py::int_(load<gint64>(p));
+                case utils::UserMetaField::UINT64: return py::int_(load<guint64>(p));
+                case utils::UserMetaField::FLOAT32: return py::float_(load<float>(p));
+                case utils::UserMetaField::FLOAT64: return py::float_(load<double>(p));
+                case utils::UserMetaField::CHARS: return py::str(p, strnlen(p, field.size));
+                case utils::UserMetaField::STRING: {
+                    const char *str = load<const char *>(p);
+                    if (str == nullptr)
+                        return py::none();
+                    return py::str(str);
+                }
+            }
+            return py::none();
+        }
+
+        void set_user_meta_field(char *block, const utils::UserMetaField &field,
+                                 py::handle value) {
+            char *p = block + field.offset;
+            switch (field.kind) {
+                case utils::UserMetaField::BOOL: store<gboolean>(p, value.cast<bool>()); break;
+                case utils::UserMetaField::INT8: store(p, value.cast<gint8>()); break;
+                case utils::UserMetaField::UINT8: store(p, value.cast<guint8>()); break;
+                case utils::UserMetaField::INT16: store(p, value.cast<gint16>()); break;
+                case utils::UserMetaField::UINT16: store(p, value.cast<guint16>()); break;
+                case utils::UserMetaField::INT32: store(p, value.cast<gint32>()); break;
+                case utils::UserMetaField::UINT32: store(p, value.cast<guint32>()); break;
+                case utils::UserMetaField::INT64: store(p, value.cast<gint64>()); break;
+                case utils::UserMetaField::UINT64: store(p, value.cast<guint64>()); break;
+                case utils::UserMetaField::FLOAT32: store(p, value.cast<float>()); break;
+                case utils::UserMetaField::FLOAT64: store(p, value.cast<double>()); break;
+                case utils::UserMetaField::CHARS: {
+                    // Truncated so that the terminating NUL always fits
+                    const std::string str = value.cast<std::string>();
+                    size_t n = std::min(str.size(), field.size - 1);
+                    memcpy(p, str.data(), n);
+                    memset(p + n, 0, field.size - n);
+                    break;
+                }
+                case utils::UserMetaField::STRING: {
+                    char *old = load<char *>(p);
+                    store<char *>(p, value.is_none() ? nullptr
+                                                     : g_strdup(value.cast<std::string>().c_str()));
+                    g_free(old);
+                    break;
+                }
+            }
+        }
+    }
+
     void bindutils(py::module &m) {
         py::class_<NvDsObjEncOutParams>(m, "NvDsObjEncOutParams",
                                         pydsdoc::utilsdoc::NvDsObjEncOutParamsDoc::descr)
@@ -103,12 +185,64 @@ namespace pydeepstream {
                      },
                      py::return_value_policy::reference,
                      pydsdoc::utilsdoc::NvDsObjEncUsrArgsDoc::cast);
+
+        py::class_<utils::UserMetaLayout>(m, "UserMetaLayout",
+                                          pydsdoc::utilsdoc::UserMetaLayoutDoc::descr)
+                .def_property_readonly("meta_type", [](const utils::UserMetaLayout &self) {
+                    return (int) self.meta_type;
+                })
+                .def_readonly("descriptor", &utils::UserMetaLayout::descriptor)
+                .def_readonly("size", &utils::UserMetaLayout::size)
+                .def_property_readonly("fields", [](const utils::UserMetaLayout &self) {
+                    py::list fields;
+                    for (const auto &f: self.fields)
+                        fields.append(py::make_tuple(f.name, f.type, f.offset));
+                    return fields;
+                })
+                .def("alloc",
+                     [](const utils::UserMetaLayout &self, NvDsUserMeta *meta) {
+                         meta->user_meta_data = self.alloc();
+                         meta->base_meta.meta_type = self.meta_type;
+                         meta->base_meta.copy_func = (NvDsMetaCopyFunc) utils::user_meta_layout_copy_func;
+                         meta->base_meta.release_func = (NvDsMetaReleaseFunc) utils::user_meta_layout_release_func;
+                         return (size_t) meta->user_meta_data;
+                     },
+                     "meta"_a,
+                     pydsdoc::utilsdoc::UserMetaLayoutDoc::alloc)
+                .def("get",
+                     [](const utils::UserMetaLayout &self, NvDsUserMeta *meta,
+                        const std::string &name) {
+                         return get_user_meta_field(user_meta_block(self, meta), self.field(name));
+                     },
+                     "meta"_a,
+                     "name"_a,
+                     pydsdoc::utilsdoc::UserMetaLayoutDoc::get)
+                .def("set",
+                     [](const utils::UserMetaLayout &self, NvDsUserMeta *meta,
+                        const std::string &name, py::handle value) {
+                         set_user_meta_field(user_meta_block(self, meta), self.field(name), value);
+                     },
+                     "meta"_a,
+                     "name"_a,
+                     "value"_a,
+                     pydsdoc::utilsdoc::UserMetaLayoutDoc::set)
+                .def("to_dict",
+                     [](const utils::UserMetaLayout &self, NvDsUserMeta *meta) {
+                         char *block = user_meta_block(self, meta);
+                         py::dict values;
+                         for (const auto &f: self.fields)
+                             values[py::str(f.name)] = get_user_meta_field(block, f);
+                         return values;
+                     },
+                     "meta"_a,
+                     pydsdoc::utilsdoc::UserMetaLayoutDoc::to_dict);
     }
 }
 
 namespace pydeepstream::utils {
 
     std::unordered_map<std::string, std::shared_ptr<char>> font_name_memory;
+    std::mutex font_name_mutex;
     static const char copyfuncname[] = "copy_func"; // must be unique
     static const char freefuncname[] = "free_func"; // must be unique
     /// The returned pointer from get_fn_ptr_from_std_function is the same for all
@@ -146,17 +280,179 @@ namespace pydeepstream::utils {
     }
 
 
+    namespace {
+        struct FieldType {
+            const char *name;
+            UserMetaField::Kind kind;
+            size_t size;
+        };
+
+        const FieldType field_types[] = {
+                {"bool", UserMetaField::BOOL, sizeof(gboolean)},
+                {"int8", UserMetaField::INT8, 1},
+                {"uint8", UserMetaField::UINT8, 1},
+                {"int16", UserMetaField::INT16, 2},
+                {"uint16", UserMetaField::UINT16, 2},
+                {"int32", UserMetaField::INT32, 4},
+                {"uint32", UserMetaField::UINT32, 4},
+                {"int64", UserMetaField::INT64, 8},
+                {"uint64", UserMetaField::UINT64, 8},
+                {"float32", UserMetaField::FLOAT32, 4},
+                {"float64", UserMetaField::FLOAT64, 8},
+                {"str", UserMetaField::STRING, sizeof(char *)},
+        };
+
+        /// Parses "int32", "str", ... or "char[N]" into kind, size and alignment
+        void parse_field_type(const std::string &type, UserMetaField &field, size_t &align) {
+            for (const auto &t: field_types) {
+                if (type == t.name) {
+                    field.kind = t.kind;
+                    field.size = t.size;
+                    align = t.size;
+                    return;
+                }
+            }
+            if (type.size() > 6 && type.compare(0, 5, "char[") == 0 && type.back() == ']') {
+                const std::string count = type.substr(5, type.size() - 6);
+                if (count.find_first_not_of("0123456789") == std::string::npos) {
+                    field.kind = UserMetaField::CHARS;
+                    field.size = std::stoul(count);
+                    align = 1;
+                    if (field.size > 0)
+                        return;
+                }
+            }
+            throw std::invalid_argument("Unsupported user meta field type: " + type);
+        }
+
+        struct UserMetaRegistry {
+            std::shared_mutex mutex;
+            std::unordered_map<int, std::unique_ptr<UserMetaLayout>> layouts;
+        };
+
+        /// Leaked on purpose: copy / release may still run while the module
+        /// is torn down at exit
+        UserMetaRegistry &user_meta_registry() {
+            static auto *registry = new UserMetaRegistry();
+            return *registry;
+        }
+    }
+
+    gpointer UserMetaLayout::alloc() const {
+        return g_malloc0(size);
+    }
+
+    gpointer UserMetaLayout::copy(gconstpointer src) const {
+        auto *dst = static_cast<char *>(g_malloc(size));
+        memcpy(dst, src, size);
+        for (size_t offset: string_offsets) {
+            char **str = reinterpret_cast<char **>(dst + offset);
+            if (*str != nullptr)
+                *str = g_strdup(*str);
+        }
+        return dst;
+    }
+
+    void UserMetaLayout::release(gpointer data) const {
+        auto *block = static_cast<char *>(data);
+        for (size_t offset: string_offsets)
+            g_free(*reinterpret_cast<char **>(block + offset));
+        g_free(block);
+    }
+
+    const UserMetaField &UserMetaLayout::field(const std::string &name) const {
+        for (const auto &f: fields) {
+            if (f.name == name)
+                return f;
+        }
+        throw std::out_of_range("No field " + name + " in user meta " + descriptor);
+    }
+
+    const UserMetaLayout &
+    register_user_meta_layout(const std::string &descriptor,
+                              const std::vector<std::pair<std::string, std::string>> &fields) {
+        if (fields.empty())
+            throw std::invalid_argument("User meta " + descriptor + " has no fields");
+        auto layout = std::make_unique<UserMetaLayout>();
+        layout->meta_type = nvds_get_user_meta_type((gchar *) descriptor.c_str());
+        layout->descriptor = descriptor;
+        size_t offset = 0;
+        size_t max_align = 1;
+        for (const auto &[name, type]: fields) {
+            for (const auto &f: layout->fields) {
+                if (f.name == name)
+                    throw std::invalid_argument("Duplicate user meta field: " + name);
+            }
+            UserMetaField field{name, type, UserMetaField::INT32, 0, 0};
+            size_t align;
+            parse_field_type(type, field, align);
+            offset = (offset + align - 1) / align * align;
+            field.offset = offset;
+            offset += field.size;
+            max_align = std::max(max_align, align);
+            if (field.kind == UserMetaField::STRING)
+                layout->string_offsets.push_back(field.offset);
+            layout->fields.push_back(std::move(field));
+        }
+        layout->size = (offset + max_align - 1) / max_align * max_align;
+
+        auto &registry = user_meta_registry();
+        std::unique_lock lock(registry.mutex);
+        auto found = registry.layouts.find(layout->meta_type);
+        if (found != registry.layouts.end()) {
+            const UserMetaLayout &existing = *found->second;
+            bool same = existing.descriptor == descriptor &&
+                        existing.fields.size() == layout->fields.size();
+            for (size_t i = 0; same && i < existing.fields.size(); i++) {
+                same = existing.fields[i].name == layout->fields[i].name &&
+                       existing.fields[i].type == layout->fields[i].type;
+            }
+            // Metas of the existing layout may still be in flight
+            if (!same)
+                throw std::invalid_argument(
+                        "User meta " + descriptor + " is already registered with other fields");
+            return existing;
+        }
+        const UserMetaLayout &registered = *layout;
+        registry.layouts.emplace(registered.meta_type, std::move(layout));
+        return registered;
+    }
+
+    const UserMetaLayout *find_user_meta_layout(NvDsMetaType meta_type) {
+        auto &registry = user_meta_registry();
+        std::shared_lock lock(registry.mutex);
+        auto found = registry.layouts.find(meta_type);
+        return found == registry.layouts.end() ? nullptr : found->second.get();
+    }
+
+    gpointer user_meta_layout_copy_func(gpointer data, gpointer user_data) {
+        auto *src_meta = static_cast<NvDsUserMeta *>(data);
+        if (src_meta->user_meta_data == nullptr)
+            return nullptr;
+        const UserMetaLayout *layout = find_user_meta_layout(src_meta->base_meta.meta_type);
+        if (layout == nullptr)
+            return nullptr;
+        return layout->copy(src_meta->user_meta_data);
+    }
+
+    void user_meta_layout_release_func(gpointer data, gpointer user_data) {
+        auto *meta = static_cast<NvDsUserMeta *>(data);
+        if (meta == nullptr || meta->user_meta_data == nullptr)
+            return;
+        const UserMetaLayout *layout = find_user_meta_layout(meta->base_meta.meta_type);
+        if (layout != nullptr)
+            layout->release(meta->user_meta_data);
+        meta->user_meta_data = nullptr;
+    }
+
     void generate_ts_rfc3339(char *buf, int buf_size) {
-        time_t tloc;
-        struct tm tm_log{};
-        struct timespec ts{};
-        char strmsec[6]; //.nnnZ\0
-        clock_gettime(CLOCK_REALTIME, &ts);
-        memcpy(&tloc, (void *) (&ts.tv_sec), sizeof(time_t));
-        gmtime_r(&tloc, &tm_log);
-        strftime(buf, buf_size, "%Y-%m-%dT%H:%M:%S", &tm_log);
-        int ms = ts.tv_nsec / 1000000;
-        g_snprintf(strmsec, sizeof(strmsec), ".%.3dZ", ms);
-        strncat(buf, strmsec, buf_size);
+        format_ts_rfc3339_now(buf, buf_size);
+    }
+
+    void generate_ts_rfc3339_from_ntp(char *buf, int buf_size, guint64 ntp_timestamp) {
+        if (ntp_timestamp == 0)
+            format_ts_rfc3339_now(buf, buf_size);
+        else
+            format_ts_rfc3339_ns(buf, buf_size, ntp_timestamp);
     }
 }
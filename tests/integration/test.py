@@ -15,6 +15,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bisect
+import os
+import subprocess
+import threading
+import time
+
 import pytest
 import pyds
 
@@ -117,6 +123,51 @@ def test_pipeline1():
     assert data_probe["obj_counter"]["bicycle"] > 0
 
 
+def test_pipeline_pooled_event_bad_key():
+    ### INIT DATA
+    good = {"type": 0, "bbox": (1.0, 2.0, 3.0, 4.0), "objectId": "a"}
+    bad = {"type": 0, "objectId": "b", "no_such_field": 1}
+
+    # attaches a good event, then a list whose second event is invalid
+    def frame_function(batch_meta, frame_meta, dict_data, gst_buffer):
+        if dict_data["frames"] >= 10:
+            return
+        dict_data["frames"] += 1
+        pyds.attach_pooled_event_msg_metas(batch_meta, frame_meta, [good])
+        try:
+            pyds.attach_pooled_event_msg_metas(batch_meta, frame_meta, [good, bad])
+        except KeyError:
+            dict_data["errors"] += 1
+        l_user = frame_meta.frame_user_meta_list
+        while l_user is not None:
+            user_meta = pyds.NvDsUserMeta.cast(l_user.data)
+            if user_meta.base_meta.meta_type == pyds.NvDsMetaType.NVDS_EVENT_MSG_META:
+                msg_meta = pyds.NvDsEventMsgMeta.cast(user_meta.user_meta_data)
+                dict_data["events"] += 1
+                # ts is exposed as an address, 0 for NULL
+                dict_data["with_ts"] += msg_meta.ts != 0 and pyds.get_string(msg_meta.ts) != ""
+            l_user = l_user.next
+
+    def box_function(batch_meta, frame_meta, obj_meta, dict_data, gst_buffer):
+        pass
+
+    data_probe = {"frames": 0, "errors": 0, "events": 0, "with_ts": 0}
+    probe_function = FrameIterator(frame_function, box_function, data_probe)
+    sp = PipelineFakesink(STANDARD_PROPERTIES1, is_integrated_gpu())
+    sp.set_probe(probe_function)
+
+    ### LAUNCH BEHAVIOR
+    sp.run()
+
+    ### CHECK OUTPUT
+    assert data_probe["errors"] == data_probe["frames"] == 10
+    # the bad event was not attached, the ones before it were, complete
+    assert data_probe["events"] == 2 * data_probe["frames"]
+    assert data_probe["with_ts"] == data_probe["events"]
+    # every block, including the one of the bad event, went back to the pool
+    assert pyds.event_msg_meta_pool_stats()["in_use"] == 0
+
+
 def test_pipeline2():
     ### INIT DATA
 
@@ -344,3 +395,100 @@ def test_pipeline3():
 
     # Destroy context for Object Encoding
     pyds.nvds_obj_enc_destroy_context (obj_ctx_handle)
+
+
+def test_pipeline_gil_release():
+    # Skip test on WSL due to libjpeg.so segmentation fault
+    if platform_info.is_wsl():
+        pytest.skip("Skipping test_pipeline_gil_release on WSL due to known issue in object encoding")
+
+    ### INIT DATA
+    num_encoded_frames = 60
+
+    sp = PipelineFakesink(STANDARD_PROPERTIES1, is_integrated_gpu())
+    obj_ctx_handle = pyds.nvds_obj_enc_create_context(0)
+    data_probe = {"native": [], "ticks": [], "done": threading.Event()}
+
+    # Probe thread: whole frame encoding, timed around the native calls only
+    def frame_function(batch_meta, frame_meta, dict_data, gst_buffer):
+        if len(dict_data["native"]) >= num_encoded_frames:
+            dict_data["done"].set()
+            return
+        frameData = pyds.NvDsObjEncUsrArgs()
+        frameData.isFrame = 1
+        frameData.saveImg = False
+        frameData.attachUsrMeta = False
+        frameData.quality = 80
+        start = time.perf_counter()
+        pyds.nvds_obj_enc_process(obj_ctx_handle, frameData, hash(gst_buffer), None, frame_meta)
+        pyds.nvds_obj_enc_finish(obj_ctx_handle)
+        dict_data["native"].append((start, time.perf_counter()))
+
+    def box_function(batch_meta, frame_meta, obj_meta, dict_data, gst_buffer):
+        pass
+
+    # Second thread standing in for the probe of another stream: pure Python
+    # work, which can only progress while the first one is in native code if
+    # the bindings release the GIL there
+    def python_work(dict_data):
+        ticks = dict_data["ticks"]
+        while not dict_data["done"].is_set():
+            sum(range(1000))
+            ticks.append(time.perf_counter())
+
+    probe_function = FrameIterator(frame_function, box_function, data_probe)
+    sp.set_fix_elem_probe("primary-inference", "src", probe_function)
+    worker = threading.Thread(target=python_work, args=(data_probe,), daemon=True)
+
+    ### LAUNCH BEHAVIOR
+    worker.start()
+    sp.run()
+    data_probe["done"].set()
+    worker.join()
+    pyds.nvds_obj_enc_destroy_context(obj_ctx_handle)
+
+    ### CHECK OUTPUT
+    native = data_probe["native"]
+    ticks = data_probe["ticks"]
+    assert len(native) == num_encoded_frames
+    native_time = sum(end - start for start, end in native)
+    ticks_in_native = sum(bisect.bisect_left(ticks, end) - bisect.bisect_right(ticks, start)
+                          for start, end in native)
+    tick_rate = len(ticks) / (ticks[-1] - ticks[0])
+    # With the GIL held by the native calls the worker could not tick at all
+    # inside them; allow for it sharing the CPU with the pipeline threads
+    assert ticks_in_native > 0.25 * tick_rate * native_time
+
+
+# Moved from the core bindings into the lazily loaded schema group
+SCHEMA_GLIST_CASTS = ("glist_get_nvds_event_msg_meta", "glist_get_nvds_vehicle_object",
+                      "glist_get_nvds_person_object")
+
+
+def _run_fresh_pyds(code):
+    """ Runs code in a fresh interpreter, where no binding group is loaded
+    yet, with warnings turned into errors """
+    env = {k: v for k, v in os.environ.items() if k != "PYDS_EAGER_IMPORT"}
+    return subprocess.run([sys.executable, "-W", "error", "-c", code], env=env,
+                          capture_output=True, text=True)
+
+
+@pytest.mark.parametrize("name", SCHEMA_GLIST_CASTS)
+def test_lazy_bindings_moved_names_importable(name):
+    result = _run_fresh_pyds(
+        f"import pyds\nfrom pyds import {name}\nassert '{name}' in dir(pyds)")
+    assert result.returncode == 0, result.stderr
+
+
+def test_lazy_bindings_unknown_name_loads_nothing():
+    result = _run_fresh_pyds(
+        "import sys, pyds\n"
+        "assert not hasattr(pyds, 'no_such_binding')\n"
+        "assert not [m for m in sys.modules if m.startswith('pyds.')]")
+    assert result.returncode == 0, result.stderr
+
+
+def test_lazy_bindings_name_tables_complete():
+    # Loading a group warns about every name missing from its table
+    result = _run_fresh_pyds("import pyds\npyds.load_lazy_bindings()")
+    assert result.returncode == 0, result.stderr
@@ -45,6 +45,16 @@ class FrameIterator:
         if self._fun_post_process:
             self._fun_post_process(gst_buffer)
 
+    def replay(self, batches):
+        """ Runs the callbacks on recorded batches (common.meta_log.MetaLogReader)
+        instead of buffers, in the order of __call__; gst_buffer is None """
+        for batch in batches:
+            for frame in batch.frames:
+                for obj in frame.objects:
+                    self._process_obj_function(batch, frame, obj, None)
+                self._process_frame_function(batch, frame, None)
+            self._post_process_function(None)
+
     def __call__(self, pad, info, u_data):
 
         gst_buffer = info.get_buffer()
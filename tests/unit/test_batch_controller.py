@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common.batch_controller import BatchConfig, slot_span, tiler_layout
+
+
+def test_tiler_layout_covers_every_tile():
+    for num_sources in range(1, 65):
+        rows, columns = tiler_layout(num_sources)
+        assert rows * columns >= num_sources
+    assert tiler_layout(0) == (1, 1)
+    assert tiler_layout(3) == (1, 3)
+
+
+def test_batch_config_sparse_source_ids():
+    ### INIT DATA
+    # Source 1 was deleted, its pad index stays unused
+    source_ids = [0, 2, 3]
+
+    ### EXECUTING BEHAVIOR
+    config = BatchConfig(len(source_ids), (1, 2, 4, 8), num_slots=slot_span(source_ids))
+    dense = BatchConfig(3, (1, 2, 4, 8))
+
+    ### CHECKING RESULTS
+    # The tiler places tile i at grid position i, so id 3 needs a 4th cell
+    assert config.tiler_rows * config.tiler_columns > max(source_ids)
+    assert config.mux_batch_size == 4
+    assert config.pgie_batch_size == 4
+    assert (dense.mux_batch_size, dense.tiler_rows, dense.tiler_columns) == (3, 1, 3)
+
+
+def test_batch_config_limits():
+    assert slot_span([]) == 0
+    assert BatchConfig(0, (1, 2, 4)).mux_batch_size == 1
+    # Never above the largest engine or the explicit maximum
+    assert BatchConfig(2, (1, 2, 4), num_slots=9).mux_batch_size == 4
+    assert BatchConfig(2, (1, 2, 4, 8), max_batch_size=6, num_slots=9).mux_batch_size == 6
+    assert BatchConfig(2, (1, 2, 4, 8), max_batch_size=6, num_slots=9).pgie_batch_size == 8
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common.batch_tuner import PushTimeoutTuner, load_trace, simulate, \
+    synthetic_trace
+
+
+def test_tuner_increases_timeout_when_underfilled():
+    ### INIT DATA
+    # Batches opened with a 1ms timeout close long before the other sources'
+    # frames arrive, so they are mostly partial
+    arrivals = synthetic_trace(num_sources=8, fps=30, duration_s=20,
+                               jitter_us=1000, seed=1)
+    tuner = PushTimeoutTuner(1000, latency_slo_us=40000, target_fill=0.95)
+
+    ### EXECUTING BEHAVIOR
+    summary = simulate(arrivals, 8, tuner)
+
+    ### CHECKING RESULTS
+    assert summary["frames"] == len(arrivals)
+    assert tuner.timeout_us > 1000
+    assert tuner.timeout_us <= 40000
+    assert any(d["reason"] == "underfilled, increase"
+               for d in summary["decisions"])
+    assert summary["decisions"][-1]["fill"] > summary["decisions"][0]["fill"]
+
+
+def test_tuner_respects_latency_slo():
+    arrivals = synthetic_trace(num_sources=8, fps=10, duration_s=30,
+                               jitter_us=0, seed=2)
+    tuner = PushTimeoutTuner(5000, latency_slo_us=20000)
+
+    summary = simulate(arrivals, 8, tuner)
+
+    # Frames of 10 fps sources with random phase are up to 100ms apart, so a
+    # full batch is out of reach and the timeout must stop at the SLO
+    assert tuner.timeout_us == 20000
+    assert summary["max_latency_us"] <= 20000
+    assert summary["decisions"][-1]["reason"] == "underfilled, at latency SLO"
+
+
+def test_tuner_decreases_timeout_when_filled():
+    arrivals = synthetic_trace(num_sources=4, fps=30, duration_s=30,
+                               jitter_us=500, seed=3)
+    tuner = PushTimeoutTuner(33000, latency_slo_us=40000, target_fill=0.9)
+
+    simulate(arrivals, 4, tuner)
+
+    assert tuner.timeout_us < 33000
+    assert any(d.reason == "filled, decrease" for d in tuner.decisions)
+
+
+def test_load_trace(tmp_path):
+    trace = tmp_path / "arrivals.csv"
+    trace.write_text("arrival_us,source_id\n200,1\n100,0\n")
+
+    assert load_trace(str(trace)) == [(100, 0), (200, 1)]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common.bringup_profiler import BringupProfiler
+
+
+def _profiled_bringup(on_complete=None):
+    """ NULL->READY of a two element pipeline, in the order GStreamer posts
+    it: sink first, then source, then the pipeline itself """
+    profiler = BringupProfiler(origin=0.0, on_complete=on_complete)
+    profiler.record_element("pipeline")
+    profiler.record_element("src", "pipeline", "videotestsrc")
+    profiler.record_element("infer", "pipeline", "nvinfer")
+    profiler.record_element("sink", "pipeline", "fakesink", is_sink=True)
+    profiler.add_phase("Gst.init", 0.0, 0.25)
+    profiler.record_transition("sink", "NULL", "READY", 1.0)
+    profiler.record_transition("infer", "NULL", "READY", 9.0)
+    profiler.record_transition("src", "NULL", "READY", 9.5)
+    profiler.record_transition("pipeline", "NULL", "READY", 9.5)
+    profiler.record_transition("sink", "READY", "PAUSED", 10.0)
+    return profiler
+
+
+def test_bringup_profiler_attributes_sequential_transitions():
+    ### INIT DATA
+    profiler = _profiled_bringup()
+
+    ### EXECUTING BEHAVIOR
+    spans = dict(((e, o, n), (start, end)) for e, o, n, start, end in profiler.spans())
+    waterfall = profiler.waterfall()
+
+    ### CHECKING RESULTS
+    # each child starts when its previous sibling finished the same change
+    assert spans[("infer", "NULL", "READY")] == (1.0, 9.0)
+    assert spans[("src", "NULL", "READY")] == (9.0, 9.5)
+    assert spans[("sink", "READY", "PAUSED")] == (1.0, 10.0)
+    assert waterfall["registry_load_ms"] == 250.0
+    assert waterfall["elements"]["infer"]["factory"] == "nvinfer"
+    assert waterfall["elements"]["infer"]["transitions"][0]["start_ms"] == 1000.0
+
+
+def test_bringup_profiler_completes_on_sink_buffer():
+    ### INIT DATA
+    completed = []
+    profiler = _profiled_bringup(on_complete=completed.append)
+
+    ### EXECUTING BEHAVIOR
+    profiler.set_playing()
+    profiler.record_first_buffer("src", "src", 11.0)
+    before_sink = list(completed)
+    profiler.record_first_buffer("sink", "sink", 12.0)
+    profiler.record_first_buffer("sink", "sink", 13.0)
+
+    ### CHECKING RESULTS
+    assert before_sink == []
+    assert completed == [profiler]
+    trace = profiler.chrome_trace()
+    firsts = [e for e in trace["traceEvents"] if e.get("cat") == "buffer"]
+    assert [e["ts"] for e in firsts] == [11000000.0, 12000000.0]
+    json.dumps(trace)
+
+
+def test_bringup_profiler_pipeline(tmp_path):
+    """ Stock elements, with a fake processing delay in identity """
+    gi = pytest.importorskip("gi")
+    gi.require_version("Gst", "1.0")
+    from gi.repository import Gst
+    Gst.init(None)
+
+    ### INIT DATA
+    pipeline = Gst.parse_launch(
+        "videotestsrc num-buffers=5 name=src ! identity sleep-time=200000 name=slow "
+        "! fakesink name=sink")
+    completed = []
+    profiler = BringupProfiler(on_complete=completed.append)
+
+    ### EXECUTING BEHAVIOR
+    profiler.attach(pipeline)
+    pipeline.set_state(Gst.State.PLAYING)
+    pipeline.get_bus().timed_pop_filtered(5 * Gst.SECOND, Gst.MessageType.EOS)
+    pipeline.set_state(Gst.State.NULL)
+    profiler.write(str(tmp_path / "bringup"))
+
+    ### CHECKING RESULTS
+    assert completed == [profiler]
+    elements = profiler.waterfall()["elements"]
+    assert elements["sink"]["first_buffers"]["sink"] - \
+        elements["slow"]["first_buffers"]["sink"] >= 200.0
+    assert ("READY", "PAUSED") in [(t["from"], t["to"]) for t in elements["sink"]["transitions"]]
+    assert (tmp_path / "bringup.trace.json").exists()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common import ctface_payload
+
+WRITER_DIR = os.path.join(os.path.dirname(__file__),
+                          '../../bindings/custom_msg2p_ctface_bind/src')
+
+FACES = [
+    {"id": "face-1", "name": "Zoë \"Z\"", "confidence": 0.875, "frameId": 42,
+     "sensorid": 3,
+     "bbox": {"left": 10.5, "top": 20.25, "width": 64.0, "height": 80.0},
+     "ts": "2025-01-01T00:00:00.000Z", "objectId": "7", "sensorStr": "sensor-3"},
+    {"id": "face-2", "name": "", "confidence": 0.5, "frameId": 43,
+     "sensorid": -1,
+     "bbox": {"left": 0.0, "top": 0.0, "width": 1.0, "height": 1.0},
+     "ts": "", "objectId": "", "sensorStr": ""},
+]
+
+
+def test_binary_round_trip():
+    ### INIT DATA
+    payload = ctface_payload.encode(FACES)
+
+    ### EXECUTING BEHAVIOR
+    decoded = ctface_payload.decode(payload)
+
+    ### CHECKING RESULTS
+    assert ctface_payload.is_binary(payload)
+    # Values above are exactly representable as float32
+    assert decoded == FACES
+    assert len(payload) < len(json.dumps(FACES).encode())
+
+
+def test_decode_json_payload():
+    payload = json.dumps(FACES).encode() + b"\0"
+
+    assert not ctface_payload.is_binary(payload)
+    assert ctface_payload.decode(payload) == FACES
+
+
+def test_decode_rejects_truncated_payload():
+    payload = ctface_payload.encode(FACES)
+
+    for size in (3, 10, len(payload) - 1):
+        with pytest.raises(ValueError):
+            ctface_payload.decode(payload[:size])
+
+
+@pytest.mark.skipif(shutil.which("g++") is None, reason="needs g++")
+def test_decode_cpp_writer_output(tmp_path):
+    # The C++ encoder used by libnvds_msg2p_ctface must produce what the
+    # Python decoder reads
+    source = tmp_path / "ctfb.cpp"
+    source.write_text(r'''
+#include <cstdio>
+#include "binary_writer.hpp"
+int main() {
+    BinaryWriter w(1);
+    ctfb_begin(w);
+    ctfb_record(w, "face-1", "Zo\xc3\xab \"Z\"", 0.875, 42, 3, 10.5f, 20.25f, 64.0f,
+                80.0f, "2025-01-01T00:00:00.000Z", "7", "sensor-3");
+    ctfb_record(w, "face-2", nullptr, 0.5, 43, -1, 0.0f, 0.0f, 1.0f, 1.0f,
+                nullptr, nullptr, "");
+    ctfb_end(w, 2);
+    fwrite(w.data(), 1, w.size(), stdout);
+    return 0;
+}
+''')
+    binary = tmp_path / "ctfb"
+    subprocess.run(["g++", "-std=c++17", "-I", WRITER_DIR, str(source),
+                    "-o", str(binary)], check=True)
+
+    payload = subprocess.run([str(binary)], check=True,
+                             capture_output=True).stdout
+
+    assert payload == ctface_payload.encode(FACES)
+    assert ctface_payload.decode(payload) == FACES
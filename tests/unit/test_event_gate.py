@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common.event_gate import EventGate
+
+BBOX = (100.0, 100.0, 50.0, 100.0)
+
+
+def test_event_gate_suppresses_duplicates():
+    ### INIT DATA
+    gate = EventGate(min_interval=1.0, bbox_threshold=0.2)
+
+    ### EXECUTING BEHAVIOR
+    # A static object observed at 30 fps for 3 seconds
+    emitted = [gate.should_emit(0, 7, 0, BBOX, 0.9, i / 30.0)
+               for i in range(90)]
+
+    ### CHECKING RESULTS
+    assert emitted[0]
+    assert sum(emitted) == 1
+    assert gate.stats()["suppressed"] == 89
+
+
+def test_event_gate_emits_on_change_after_min_interval():
+    gate = EventGate(min_interval=1.0, bbox_threshold=0.2,
+                     confidence_threshold=0.2)
+    moved = (130.0, 100.0, 50.0, 100.0)
+
+    assert gate.should_emit(0, 7, 0, BBOX, 0.9, 0.0)
+    # Changed, but too soon
+    assert not gate.should_emit(0, 7, 0, moved, 0.9, 0.5)
+    # Small move below threshold
+    assert not gate.should_emit(0, 7, 0, (105.0, 100.0, 50.0, 100.0), 0.9, 1.5)
+    assert gate.should_emit(0, 7, 0, moved, 0.9, 1.5)
+    assert gate.should_emit(0, 7, 0, moved, 0.4, 2.6)
+    # Other keys are independent
+    assert gate.should_emit(1, 7, 0, BBOX, 0.9, 2.6)
+    assert gate.should_emit(0, 8, 0, BBOX, 0.9, 2.6)
+    assert gate.should_emit(0, 7, 2, BBOX, 0.9, 2.6)
+
+
+def test_event_gate_heartbeat_and_ttl():
+    gate = EventGate(min_interval=1.0, max_interval=5.0, ttl=2.0,
+                     max_entries=2)
+
+    assert gate.should_emit(0, 1, 0, BBOX, 0.9, 0.0)
+    assert not gate.should_emit(0, 1, 0, BBOX, 0.9, 1.9)
+    assert not gate.should_emit(0, 1, 0, BBOX, 0.9, 3.8)
+    assert gate.should_emit(0, 1, 0, BBOX, 0.9, 5.0)
+
+    # Entries 1 and 2 are evicted when the table is over capacity
+    assert gate.should_emit(0, 2, 0, BBOX, 0.9, 5.5)
+    assert gate.should_emit(0, 3, 0, BBOX, 0.9, 5.6)
+    assert gate.should_emit(0, 4, 0, BBOX, 0.9, 5.7)
+    assert len(gate) == 2
+    assert gate.should_emit(0, 2, 0, BBOX, 0.9, 5.8)
+    assert gate.stats()["evicted"] == 3
+    assert gate.stats()["expired"] == 0
+
+
+def test_event_gate_ttl_expiry():
+    ### INIT DATA
+    gate = EventGate(min_interval=1.0, ttl=2.0, max_entries=16)
+    assert gate.should_emit(0, 1, 0, BBOX, 0.9, 0.0)
+    assert gate.should_emit(0, 2, 0, BBOX, 0.9, 0.0)
+
+    ### EXECUTING BEHAVIOR
+    # Key 2 keeps being seen, key 1 is not seen for more than ttl
+    for i in range(1, 6):
+        assert not gate.should_emit(0, 2, 0, BBOX, 0.9, i * 0.5)
+    len_after_ttl = len(gate)
+    emitted_again = gate.should_emit(0, 1, 0, BBOX, 0.9, 3.0)
+
+    ### CHECKING RESULTS
+    assert len_after_ttl == 1
+    # The unchanged bbox would be suppressed if key 1 were still known
+    assert emitted_again
+    assert gate.stats()["expired"] == 1
+    assert gate.stats()["evicted"] == 0
+    assert len(gate) == 2
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__),
+                             '../../apps/rtsp_src_server_d/'))
+from loadgen import (RESYNC_INTERVALS, ClipSpec, FramePacer, assign_clips,
+                     index_access_units, start_index)
+
+AUD = b"\x00\x00\x00\x01\x09\xf0"
+SPS = b"\x00\x00\x00\x01\x67\x42\x00\x1e"
+IDR = b"\x00\x00\x01\x65\x88\x84"
+SLICE = b"\x00\x00\x01\x41\x9a\x02"
+
+
+def test_index_access_units_h264():
+    ### INIT DATA
+    stream = AUD + SPS + IDR + AUD + SLICE + AUD + SLICE + AUD + IDR
+
+    ### EXECUTING BEHAVIOR
+    units = index_access_units(stream, "h264")
+
+    ### CHECKING RESULTS
+    assert [keyframe for _, _, keyframe in units] == [True, False, False, True]
+    # Access units cover the whole stream without gaps
+    assert units[0][0] == 0
+    for (offset, size, _), (next_offset, _, _) in zip(units, units[1:]):
+        assert offset + size == next_offset
+    assert units[-1][0] + units[-1][1] == len(stream)
+    assert stream[units[1][0]:units[1][0] + units[1][1]] == AUD + SLICE
+
+
+def test_start_index_rewinds_to_keyframe():
+    units = [(0, 1, True), (1, 1, False), (2, 1, False), (3, 1, True), (4, 1, False)]
+
+    assert start_index(units, 2) == 0
+    assert start_index(units, 4) == 3
+    # Offsets wrap around the clip
+    assert start_index(units, 8) == 3
+
+
+def test_clip_spec_name_round_trip():
+    spec = ClipSpec("h265", 1280, 720, 30, 60, "high", 10)
+
+    parsed = ClipSpec.from_name(spec.name)
+
+    assert parsed.name == spec.name
+    assert (parsed.width, parsed.height, parsed.fps, parsed.gop) == (1280, 720, 30, 60)
+    assert ClipSpec.from_name("notes.txt") is None
+
+
+def test_assign_clips_is_reproducible():
+    clips = [("a", None), ("b", None), ("c", None)]
+
+    first = assign_clips(clips, 7, seed=5)
+
+    assert first == assign_clips(clips, 7, seed=5)
+    assert {path for path, _ in first} == {"a", "b", "c"}
+
+
+def _run_ticks(pacer, ticks):
+    """Frames a tick loop pushes, as in serve(): every due frame per tick."""
+    frames = 0
+    for now in ticks:
+        while pacer.due(now):
+            frames += 1
+            pacer.advance(now)
+    return frames
+
+
+def test_frame_pacer_keeps_nominal_fps_with_tick_lag():
+    ### INIT DATA
+    rng = random.Random(1)
+    pacer = FramePacer(30)
+    pacer.start(0.0)
+    # 2 ms timer that fires up to 6 ms late
+    ticks, now = [], 0.0
+    while now < 10.0:
+        now += 0.002 + rng.uniform(0, 0.006)
+        ticks.append(now)
+
+    ### EXECUTING BEHAVIOR
+    frames = _run_ticks(pacer, ticks)
+
+    ### CHECKING RESULTS
+    assert abs(frames - 10.0 * 30) <= 1
+
+
+def test_frame_pacer_resyncs_after_stall():
+    ### INIT DATA
+    pacer = FramePacer(30)
+    pacer.start(0.0)
+
+    ### EXECUTING BEHAVIOR
+    before = _run_ticks(pacer, [i * 0.002 for i in range(500)])
+    # The main loop stalls for a second
+    burst = _run_ticks(pacer, [2.0])
+    after = _run_ticks(pacer, [2.0 + i * 0.002 for i in range(1, 501)])
+
+    ### CHECKING RESULTS
+    assert before == 30
+    # No catch-up burst of the ~30 missed frames, pacing restarts at the stall
+    assert burst <= RESYNC_INTERVALS + 2
+    assert abs(after - 30) <= 1
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common.meta_log import MetaLogReader, MetaLogWriter
+
+
+def _object(object_id, class_id, left):
+    return {"object_id": object_id, "class_id": class_id, "obj_label": "car",
+            "unique_component_id": 1, "confidence": 0.5,
+            "left": left, "top": 2.0, "width": 30.0, "height": 40.0,
+            "tracker_confidence": 0.75, "tracker_left": left, "tracker_top": 2.0,
+            "tracker_width": 30.0, "tracker_height": 40.0,
+            "classifiers": [{"unique_component_id": 2, "result_class_id": 5,
+                             "result_prob": 0.25, "result_label": "red"}],
+            "analytics": {"roi_status": ["RF"], "oc_status": [], "lc_status": ["Exit"],
+                          "dir_status": "South"}}
+
+
+def _batch(batch_id, num_sources=2, num_objects=3):
+    return [{"batch_id": batch_id, "batch_size": num_sources, "source_id": s,
+             "frame_num": batch_id, "buf_pts": batch_id * 33333333, "ntp_timestamp": 0,
+             "source_frame_width": 1920, "source_frame_height": 1080,
+             "analytics": '{"objInROIcnt": {"RF": 1}}' if s == 0 else None,
+             "objects": [_object(100 * s + i, i % 4, float(i)) for i in range(num_objects)]}
+            for s in range(num_sources)]
+
+
+def test_meta_log_round_trip_with_rotation(tmp_path):
+    ### INIT DATA
+    prefix = str(tmp_path / "log")
+    writer = MetaLogWriter(prefix, flush_batches=4, rotate_frames=10)
+
+    ### EXECUTING BEHAVIOR
+    for batch_id in range(12):
+        writer.append_batch(_batch(batch_id))
+    writer.close()
+    batches = list(MetaLogReader(prefix + "-*.arrow"))
+
+    ### CHECKING RESULTS
+    assert len(writer.files) == 3
+    assert writer.frames_written == 24
+    assert [b.batch_id for b in batches] == list(range(12))
+    assert all(b.num_frames_in_batch == 2 and len(b.frames) == 2 for b in batches)
+    frame = batches[5].frames[0]
+    assert (frame.source_id, frame.frame_num, frame.num_obj_meta) == (0, 5, 3)
+    assert frame.analytics == {"objInROIcnt": {"RF": 1}}
+    obj = batches[5].frames[1].objects[2]
+    assert (obj.object_id, obj.class_id, obj.rect_params.left) == (102, 2, 2.0)
+    assert obj.tracker_bbox_info.org_bbox_coords.width == 30.0
+    assert obj.classifiers[0].result_label == "red"
+    assert obj.analytics.lc_status == ["Exit"]
+
+
+def test_meta_log_readable_before_close(tmp_path):
+    ### INIT DATA
+    prefix = str(tmp_path / "log")
+    writer = MetaLogWriter(prefix, flush_batches=1000, flush_interval=1000.0)
+
+    ### EXECUTING BEHAVIOR
+    for batch_id in range(3):
+        writer.append_batch(_batch(batch_id))
+    writer.flush()
+    writer.append_batch(_batch(3))
+
+    ### CHECKING RESULTS
+    # a killed app loses only what was not flushed
+    assert [b.batch_id for b in MetaLogReader(writer.files)] == [0, 1, 2]
+    writer.close()
+
+
+def test_meta_log_import_does_not_load_pyarrow():
+    """ Apps import meta_log unconditionally, pyarrow must only be loaded by
+    --record-meta """
+    apps = os.path.join(os.path.dirname(__file__), '../../apps/')
+    code = "import sys, common.meta_log; sys.exit('pyarrow' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=apps).returncode == 0
+
+
+def test_meta_log_replay_into_callbacks(tmp_path):
+    """ The recorded batches drive the FrameIterator callbacks of the
+    integration tests """
+    pytest.importorskip("gi")
+    pytest.importorskip("pyds")
+    sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+    from tests.testcommon.frame_iterator import FrameIterator
+
+    ### INIT DATA
+    prefix = str(tmp_path / "log")
+    writer = MetaLogWriter(prefix)
+    for batch_id in range(5):
+        writer.append_batch(_batch(batch_id, num_sources=1, num_objects=4))
+    writer.close()
+    data = {"objects": {}, "frames": [], "labels": set()}
+
+    def box_function(batch_meta, frame_meta, obj_meta, dict_data, gst_buffer):
+        counts = dict_data["objects"]
+        counts[obj_meta.class_id] = counts.get(obj_meta.class_id, 0) + 1
+        # classifier results are replayed as a plain list, not classifier_meta_list
+        dict_data["labels"].update(c.result_label for c in obj_meta.classifiers)
+
+    def frame_function(batch_meta, frame_meta, dict_data, gst_buffer):
+        dict_data["frames"].append((batch_meta.batch_id, frame_meta.num_obj_meta))
+
+    ### EXECUTING BEHAVIOR
+    FrameIterator(frame_function, box_function, data).replay(MetaLogReader(writer.files))
+
+    ### CHECKING RESULTS
+    assert data["objects"] == {0: 5, 1: 5, 2: 5, 3: 5}
+    assert data["frames"] == [(batch_id, 4) for batch_id in range(5)]
+    assert data["labels"] == {"red"}
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common.msg_batcher import (FileTransport, MessageBatcher, decode_batch,
+                                read_records)
+
+
+def _read_batches(path):
+    with open(path, "rb") as f:
+        return [(headers, decode_batch(headers, body))
+                for headers, body in read_records(f)]
+
+
+def test_msg_batcher_batches_by_count(tmp_path):
+    ### INIT DATA
+    path = str(tmp_path / "batches.bin")
+    batcher = MessageBatcher(FileTransport(path), max_messages=10,
+                             max_delay_ms=10000)
+    payloads = [b'{"id": %d}' % i for i in range(25)]
+
+    ### EXECUTING BEHAVIOR
+    for p in payloads:
+        batcher.submit("events", p)
+    batcher.close()
+
+    ### CHECKING RESULTS
+    batches = _read_batches(path)
+    assert [h["count"] for h, _ in batches] == [10, 10, 5]
+    assert all(h["topic"] == "events" for h, _ in batches)
+    assert [p for _, batch in batches for p in batch] == payloads
+    assert batcher.stats()["batches"] == 3
+
+
+def test_msg_batcher_zlib_round_trip(tmp_path):
+    ### INIT DATA
+    path = str(tmp_path / "batches.bin")
+    batcher = MessageBatcher(FileTransport(path), compression="zlib")
+    payloads = [b'{"sensor": "cam-0", "object": %d}' % i for i in range(100)]
+
+    ### EXECUTING BEHAVIOR
+    for p in payloads:
+        batcher.submit("a", p)
+    batcher.submit("b", b"\x00binary\xff")
+    batcher.close()
+
+    ### CHECKING RESULTS
+    batches = dict((h["topic"], (h, b)) for h, b in _read_batches(path))
+    assert batches["a"][0]["compression"] == "zlib"
+    assert batches["a"][1] == payloads
+    assert batches["b"][1] == [b"\x00binary\xff"]
+    stats = batcher.stats()
+    assert stats["bytes_out"] < stats["bytes_in"]
+
+
+def test_msg_batcher_flushes_after_delay(tmp_path):
+    ### INIT DATA
+    path = str(tmp_path / "batches.bin")
+    batcher = MessageBatcher(FileTransport(path), max_messages=1000,
+                             max_delay_ms=20)
+
+    ### EXECUTING BEHAVIOR
+    batcher.submit("events", b"first")
+    deadline = time.monotonic() + 5.0
+    while batcher.stats()["batches"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    sent_before_close = batcher.stats()["batches"]
+    batcher.close()
+
+    ### CHECKING RESULTS
+    assert sent_before_close == 1
+    assert _read_batches(path)[0][1] == [b"first"]
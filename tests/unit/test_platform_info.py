@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sys
+import types
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common import platform_info
+from common.platform_info import PlatformInfo
+from common.startup_timer import StartupTimer
+
+
+def _fake_cuda(monkeypatch, integrated, calls):
+    """ Installs a cuda.bindings stand-in that counts cuInit calls """
+    def cuInit(flags):
+        calls.append("cuInit")
+        return (0,)
+
+    driver = types.SimpleNamespace(
+        CUresult=types.SimpleNamespace(CUDA_SUCCESS=0),
+        cuInit=cuInit,
+        cuDeviceGetCount=lambda: (0, 1))
+    runtime = types.SimpleNamespace(
+        cudaError_t=types.SimpleNamespace(cudaSuccess=0),
+        cudaGetDeviceProperties=lambda dev: (0, types.SimpleNamespace(integrated=integrated)))
+    bindings = types.ModuleType("cuda.bindings")
+    bindings.driver, bindings.runtime = driver, runtime
+    monkeypatch.setitem(sys.modules, "cuda", types.ModuleType("cuda"))
+    monkeypatch.setitem(sys.modules, "cuda.bindings", bindings)
+
+
+def test_platform_cache_skips_cuda(tmp_path, monkeypatch):
+    ### INIT DATA
+    cache = tmp_path / "platform_info.json"
+    monkeypatch.setenv("DS_PLATFORM_CACHE", str(cache))
+    monkeypatch.setattr(platform_info, "platform_cache_key",
+                        lambda: {"boot_id": "b1", "driver": "570.1"})
+    calls = []
+    _fake_cuda(monkeypatch, True, calls)
+
+    ### EXECUTING BEHAVIOR
+    first = PlatformInfo().is_integrated_gpu()
+    second = PlatformInfo().is_integrated_gpu()
+
+    ### CHECKING RESULTS
+    assert first is True and second is True
+    assert calls == ["cuInit"]
+    assert json.loads(cache.read_text())["facts"] == {"integrated_gpu": True}
+
+
+def test_platform_cache_invalidated_by_new_boot(tmp_path, monkeypatch):
+    ### INIT DATA
+    cache = tmp_path / "platform_info.json"
+    cache.write_text(json.dumps({"key": {"boot_id": "old", "driver": "570.1"},
+                                 "facts": {"integrated_gpu": True}}))
+    monkeypatch.setenv("DS_PLATFORM_CACHE", str(cache))
+    monkeypatch.setattr(platform_info, "platform_cache_key",
+                        lambda: {"boot_id": "new", "driver": "570.1"})
+    calls = []
+    _fake_cuda(monkeypatch, False, calls)
+
+    ### EXECUTING BEHAVIOR
+    integrated = PlatformInfo().is_integrated_gpu()
+
+    ### CHECKING RESULTS
+    assert integrated is False
+    assert calls == ["cuInit"]
+    assert json.loads(cache.read_text())["key"]["boot_id"] == "new"
+
+
+def test_platform_cache_write_failure_leaves_no_temp_file(tmp_path, monkeypatch):
+    ### INIT DATA
+    # A directory in place of the cache file makes the final rename fail
+    cache = tmp_path / "platform_info.json"
+    cache.mkdir()
+    monkeypatch.setenv("DS_PLATFORM_CACHE", str(cache))
+    monkeypatch.setattr(platform_info, "platform_cache_key",
+                        lambda: {"boot_id": "b1", "driver": "570.1"})
+
+    ### EXECUTING BEHAVIOR
+    platform_info.store_platform_cache({"integrated_gpu": True})
+    # Not JSON serializable, fails in json.dump
+    platform_info.store_platform_cache({"integrated_gpu": object()})
+
+    ### CHECKING RESULTS
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["platform_info.json"]
+
+
+def test_startup_timer_phases(capsys):
+    ### INIT DATA
+    ticks = iter([0.0, 0.5, 0.75, 2.0])
+    timer = StartupTimer(clock=lambda: next(ticks))
+
+    ### EXECUTING BEHAVIOR
+    timer.mark("import")
+    timer.mark("Gst.init")
+    timer.mark("element creation")
+    timer.report()
+
+    ### CHECKING RESULTS
+    assert [p for p, _, _ in timer.phases] == ["import", "Gst.init", "element creation"]
+    assert [d for _, d, _ in timer.phases] == [0.5, 0.25, 1.25]
+    assert timer.total() == 2.0
+    assert "element creation" in capsys.readouterr().out
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common.shm_frames import FrameSelector, ShmFrameExporter, ShmFrameReader
+
+
+@pytest.fixture
+def exporter():
+    exp = ShmFrameExporter("ds_frames_test_%d" % os.getpid(), 8, 4, slabs=2, max_readers=2)
+    yield exp
+    exp.close()
+
+
+def _frame(value):
+    return np.full((4, 8, 4), value, dtype=np.uint8)
+
+
+def test_shm_frames_zero_copy_round_trip(exporter):
+    ### INIT DATA
+    reader = ShmFrameReader(exporter.name)
+    selector = FrameSelector(streams=[1], interval=2)
+    metas = [SimpleNamespace(source_id=s, frame_num=n) for n in range(4) for s in (0, 1)]
+
+    ### EXECUTING BEHAVIOR
+    selected = [m.frame_num for m in metas if selector.select(m)]
+    exporter.export(_frame(7), source_id=1, frame_num=10, buf_pts=1000)
+    frames = reader.poll()
+
+    ### CHECKING RESULTS
+    assert selected == [0, 2]
+    assert len(frames) == 1
+    frame = frames[0]
+    assert (frame.source_id, frame.frame_num, frame.buf_pts) == (1, 10, 1000)
+    assert frame.array.shape == (4, 8, 4)
+    assert (frame.array == 7).all()
+    # a view of the mapped slab, not a copy
+    assert np.shares_memory(frame.array, reader._pool.data)
+    assert not frame.array.flags.writeable
+    frame.release()
+    assert frame.array is None
+    assert reader.poll() == []
+    reader.close()
+
+
+def test_shm_frames_held_slabs_are_not_reused(exporter):
+    ### INIT DATA
+    reader = ShmFrameReader(exporter.name)
+
+    ### EXECUTING BEHAVIOR
+    assert exporter.export(_frame(1))
+    assert exporter.export(_frame(2))
+    held = reader.poll()
+    dropped = not exporter.export(_frame(3))
+    held[0].release()
+    reused = exporter.export(_frame(4))
+    frames = reader.poll()
+
+    ### CHECKING RESULTS
+    assert dropped and exporter.dropped == 1
+    assert reused
+    assert held[1].array[0, 0, 0] == 2
+    assert frames[0].slab == held[0].slab and frames[0].array[0, 0, 0] == 4
+    reader.close()
+    # closing the reader released its frames
+    assert exporter.export(_frame(5)) and exporter.export(_frame(6))
+
+
+def test_shm_frames_dead_readers_and_lost_frames_release_slabs(exporter):
+    ### INIT DATA
+    reader = ShmFrameReader(exporter.name)
+    dead = ShmFrameReader(exporter.name)
+
+    ### EXECUTING BEHAVIOR
+    assert exporter.export(_frame(1))
+    reader.poll()[0].release()
+    dead.poll()  # holds frame 0 and never releases it
+    dead._pool.readers["pid"][dead.slot] = 2 ** 31 - 1  # no such process
+    exported = 0
+    for i in range(10):
+        exported += exporter.export(_frame(i))
+        for frame in reader.poll():
+            frame.release()
+    exporter.export(_frame(0))
+    exporter._pool.desc["crc"][11 % exporter.descriptors] ^= 1  # torn descriptor
+    frames = reader.poll()
+
+    ### CHECKING RESULTS
+    # the dead reader was reaped instead of pinning the slabs
+    assert exported == 10 and exporter.dropped == 0
+    # the slab of the frame that could not be read went back to the pool
+    assert frames == [] and reader.lost == 1
+    assert not exporter._pool.refs[:, reader.slot].any()
+    reader.close()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common.shm_meta import OBJECT_DTYPE, ShmMetaPublisher, ShmMetaReader
+
+
+@pytest.fixture
+def publisher():
+    pub = ShmMetaPublisher("ds_meta_test_%d" % os.getpid(), slots=8, max_objects=4)
+    yield pub
+    pub.close()
+
+
+def _objects(n):
+    return [(i, i % 2, 0.5, 10.0 * i, 20.0, 30.0, 40.0, 0.9) for i in range(n)]
+
+
+def test_shm_meta_round_trip(publisher):
+    ### INIT DATA
+    reader = ShmMetaReader(publisher.name)
+    array = np.zeros(2, OBJECT_DTYPE)
+    array["object_id"] = [7, 8]
+
+    ### EXECUTING BEHAVIOR
+    publisher.publish(0, 10, _objects(3), buf_pts=1000)
+    publisher.publish(1, 11, _objects(6))
+    publisher.publish(2, 12, array)
+    frames = reader.poll()
+
+    ### CHECKING RESULTS
+    assert list(frames["source_id"]) == [0, 1, 2]
+    assert list(frames["num_objects"]) == [3, 4, 2]
+    assert list(frames["dropped_objects"]) == [0, 2, 0]
+    assert frames[0]["buf_pts"] == 1000
+    assert list(frames[0]["objects"]["left"][:3]) == [0.0, 10.0, 20.0]
+    assert list(frames[2]["objects"]["object_id"][:2]) == [7, 8]
+    assert len(reader.poll()) == 0
+    reader.close()
+
+
+def test_shm_meta_reader_overrun_counts_lost(publisher):
+    ### INIT DATA
+    reader = ShmMetaReader(publisher.name)
+
+    ### EXECUTING BEHAVIOR
+    for i in range(20):
+        publisher.publish(0, i, _objects(1))
+    frames = reader.poll()
+
+    ### CHECKING RESULTS
+    # the ring keeps the last 8 frames
+    assert list(frames["frame_num"]) == list(range(12, 20))
+    assert reader.lost == 12
+    reader.close()
+
+
+def test_shm_meta_rejects_slots_being_written(publisher, monkeypatch):
+    ### INIT DATA
+    import common.shm_meta as shm_meta
+    monkeypatch.setattr(shm_meta, "MAX_READ_ATTEMPTS", 3)
+    reader = ShmMetaReader(publisher.name)
+    for i in range(3):
+        publisher.publish(0, i, _objects(2))
+    ring = publisher._ring
+
+    ### EXECUTING BEHAVIOR
+    ring.seq[1] += 1  # publisher "in the middle" of rewriting frame 1
+    ring.objects[2, 1]["left"] = -1.0  # torn copy of frame 2, crc mismatch
+    frames = reader.poll()
+
+    ### CHECKING RESULTS
+    assert list(frames["frame_num"]) == [0]
+    assert reader.lost == 2
+    reader.close()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("gi")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common.source_bin_pool import DEFAULT_CLASS, SourceBinPool, codec_class
+
+H264_1080P = "h264-1920x1080"
+
+
+class FakeWarmBin:
+    """ Stands in for WarmSourceBin, no GStreamer elements needed """
+
+    def __init__(self, name, codec_class, decoder_properties):
+        self.codec_class = codec_class
+        self.uri = None
+        self.attach_time = None
+        self.bin = SimpleNamespace(get_name=lambda: name)
+        self.parked = 0
+        self.on_buffer = None
+
+    def retarget(self, uri):
+        self.uri = uri
+
+    def park(self):
+        self.parked += 1
+        return True
+
+    def watch_buffers(self, callback):
+        self.on_buffer = callback
+
+
+def _source(uri, user_data=None):
+    return SimpleNamespace(uri=uri, user_data=user_data)
+
+
+def test_codec_class():
+    assert codec_class("video/x-h264", 1920, 1080) == H264_1080P
+    assert codec_class("video/x-h265", 1280, 720) == "h265-1280x720"
+
+
+def test_source_bin_pool_acquire_return_and_class_matching():
+    ### INIT DATA
+    pool = SourceBinPool(classes=[H264_1080P], min_idle=1, bin_class=FakeWarmBin)
+    pool.prewarm()
+    parked = pool._idle[H264_1080P][0]
+
+    ### EXECUTING BEHAVIOR
+    camera = _source("rtsp://cam0", H264_1080P)
+    bin_hit = pool.bin_factory(camera)
+    bin_other_class = pool.bin_factory(_source("rtsp://cam1", "h265-1280x720"))
+    bin_default = pool.bin_factory(_source("rtsp://cam2"))
+    parked.on_buffer(parked)
+    parked.on_buffer(parked)
+    pool.bin_releaser(camera, bin_hit)
+    bin_again = pool.bin_factory(_source("rtsp://cam3", H264_1080P))
+
+    ### CHECKING RESULTS
+    # Only a bin of the requested class is reused
+    assert bin_hit is parked.bin
+    assert bin_other_class is not parked.bin and bin_default is not parked.bin
+    # A returned bin is parked again and handed to the next camera of its class
+    assert parked.parked == 2
+    assert bin_again is parked.bin and parked.uri == "rtsp://cam3"
+    stats = pool.stats()
+    assert (stats[H264_1080P]["hits"], stats[H264_1080P]["misses"]) == (2, 0)
+    assert stats[H264_1080P]["ttff_count"] == 1
+    assert (stats["h265-1280x720"]["hits"], stats["h265-1280x720"]["misses"]) == (0, 1)
+    assert stats[DEFAULT_CLASS]["misses"] == 1
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common.trace_recorder import TraceRecorder
+
+
+class _Named:
+    def __init__(self, name, parent=None):
+        self._name, self._parent = name, parent
+
+    def get_name(self):
+        return self._name
+
+    def get_parent(self):
+        return self._parent
+
+
+class _Info:
+    def get_buffer(self):
+        return "buffer"
+
+
+def _read_fields(data):
+    """ Decodes one level of protobuf into [(field number, value)] """
+    fields, pos = [], 0
+
+    def varint():
+        nonlocal pos
+        value, shift = 0, 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7f) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value
+
+    while pos < len(data):
+        key = varint()
+        if key & 7 == 0:
+            fields.append((key >> 3, varint()))
+        else:
+            length = varint()
+            fields.append((key >> 3, data[pos:pos + length]))
+            pos += length
+    return fields
+
+
+def test_trace_recorder_ring_keeps_latest():
+    ### INIT DATA
+    recorder = TraceRecorder(capacity=4, tagger=lambda b: (-1, -1))
+
+    ### EXECUTING BEHAVIOR
+    for i in range(10):
+        recorder.record("span%d" % i, "element", "queue1", i * 1000, 500)
+
+    ### CHECKING RESULTS
+    assert [e[2] for e in recorder.events()] == ["span6", "span7", "span8", "span9"]
+    assert recorder.dropped() == 6
+
+
+def test_trace_recorder_wraps_probe_and_spreads_overlaps():
+    ### INIT DATA
+    ticks = iter(range(0, 100000, 10))
+    recorder = TraceRecorder(tagger=lambda b: (3, 42), clock=lambda: next(ticks))
+    calls = []
+
+    def osd_probe(pad, info, u_data):
+        calls.append(u_data)
+        return "OK"
+
+    ### EXECUTING BEHAVIOR
+    probe = recorder.wrap_probe(osd_probe)
+    result = probe(_Named("sink", _Named("nvosd")), _Info(), 0)
+    # two buffers waiting in the same queue at once
+    recorder.record("queue1", "queue", "queue1", 100, 50)
+    recorder.record("queue1", "queue", "queue1", 120, 50)
+    trace = recorder.chrome_trace()
+
+    ### CHECKING RESULTS
+    assert result == "OK" and calls == [0]
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert spans[0]["name"] == "osd_probe"
+    assert spans[0]["args"] == {"source_id": 3, "frame_num": 42}
+    tracks = dict((e["tid"], e["args"]["name"]) for e in trace["traceEvents"] if e["ph"] == "M")
+    assert sorted(tracks[e["tid"]] for e in spans[1:]) == ["queue1", "queue1 #1"]
+    assert tracks[spans[0]["tid"]] == "nvosd:sink"
+    json.dumps(trace)
+
+
+def test_trace_recorder_disabled_is_free():
+    ### INIT DATA
+    recorder = TraceRecorder(enabled=False)
+
+    def probe(pad, info, u_data):
+        return "OK"
+
+    ### EXECUTING BEHAVIOR
+    wrapped = recorder.wrap_probe(probe)
+    recorder.record("x", "element", "x", 0, 1)
+
+    ### CHECKING RESULTS
+    assert wrapped is probe
+    assert recorder.events() == []
+
+
+def test_trace_recorder_perfetto_packets():
+    ### INIT DATA
+    recorder = TraceRecorder(tagger=lambda b: (-1, -1))
+    recorder.record("nvinfer", "element", "pgie", 1000, 250, source_id=1, frame_num=-1)
+
+    ### EXECUTING BEHAVIOR
+    packets = [value for number, value in _read_fields(recorder.perfetto_trace())]
+
+    ### CHECKING RESULTS
+    descriptor, begin, end = [dict(_read_fields(p)) for p in packets]
+    assert dict(_read_fields(descriptor[60]))[2] == b"pgie"
+    assert begin[8] == 1000 and end[8] == 1250
+    begin_event = _read_fields(begin[11])
+    assert (9, 1) in begin_event and (23, b"nvinfer") in begin_event
+    annotations = [dict(_read_fields(v)) for n, v in begin_event if n == 4]
+    assert annotations[1] == {10: b"frame_num", 4: 0xffffffffffffffff}
+    assert (9, 2) in _read_fields(end[11])
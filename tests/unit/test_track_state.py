@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../apps/'))
+from common.track_state import TrackStateStore
+
+
+def test_track_state_update_and_lookup():
+    ### INIT DATA
+    store = TrackStateStore(capacity=16, fields=[("counted", "?")])
+
+    ### EXECUTING BEHAVIOR
+    first = store.update([0, 0, 1], [7, 8, 7], 1, class_ids=[2, 0, 2],
+                         bboxes=[(1, 2, 3, 4)] * 3)
+    store["counted"][first[0]] = True
+    # the same track twice in a batch, and a new one
+    second = store.update([0, 0, 0], [7, 9, 7], 2, confidences=[0.5, 0.6, 0.7])
+
+    ### CHECKING RESULTS
+    assert len(set(first.tolist())) == 3
+    assert second[0] == second[2] == first[0]
+    assert len(store) == 4
+    assert store.get(1, 7) == first[2]
+    assert store.get(1, 8) == -1
+    slot = first[0]
+    assert (store["first_seen"][slot], store["last_seen"][slot]) == (1, 2)
+    # seen once in the first batch and twice in the second
+    assert store["hits"][slot] == 3
+    assert store["class_id"][slot] == 2
+    assert store["counted"][slot] and not store["counted"][second[1]]
+    assert store["confidence"][slot] == pytest.approx(0.7)
+    assert list(store["left"][first]) == [1, 1, 1]
+    assert store.stats()["inserted"] == 4
+
+
+def test_track_state_ttl_expiry_frees_slots():
+    ### INIT DATA
+    store = TrackStateStore(capacity=4, ttl=10, sweep_interval=5)
+    store.update([0, 0], [1, 2], 0)
+
+    ### EXECUTING BEHAVIOR
+    store.update([0], [2], 8)
+    store.update([0], [3], 15)  # sweep: track 1 not seen for 15
+    slots = store.update([0, 0], [4, 5], 16)
+
+    ### CHECKING RESULTS
+    assert store.get(0, 1) == -1
+    assert store.get(0, 2) >= 0
+    assert len(store) == 4
+    assert store.stats()["expired"] == 1
+    assert store["first_seen"][slots[0]] == 16 and store["hits"][slots[0]] == 1
+
+
+def test_track_state_memory_cap_evicts_least_recently_seen():
+    ### INIT DATA
+    store = TrackStateStore(capacity=4, ttl=1000)
+    for now, object_id in enumerate([1, 2, 3, 4]):
+        store.update([0], [object_id], now)
+
+    ### EXECUTING BEHAVIOR
+    # track 1 is seen again, two new tracks have to make room
+    store.update([0, 0, 0], [1, 5, 6], 10)
+
+    ### CHECKING RESULTS
+    assert len(store) == 4
+    assert sorted(store["object_id"][store.live_slots()].tolist()) == [1, 4, 5, 6]
+    assert store.stats()["evicted"] == 2
+    assert store.nbytes < 4096
+
+
+def test_track_state_batch_overflow_drops_new_tracks():
+    ### INIT DATA
+    store = TrackStateStore(capacity=4, ttl=1000, fields=[("counted", "?")])
+    store.update([0, 0, 0, 0], [1, 2, 3, 4], 0)
+
+    ### EXECUTING BEHAVIOR
+    # tracks 1 and 2 are seen again: only two slots can be evicted for the
+    # four new tracks, one of them repeated
+    slots = store.update([0, 0, 0, 0, 0, 0, 0], [1, 2, 5, 6, 7, 8, 5], 10,
+                         confidences=np.arange(7) / 10, counted=True)
+
+    ### CHECKING RESULTS
+    assert len(store) == 4
+    assert slots[0] == store.get(0, 1) and slots[1] == store.get(0, 2)
+    assert slots[2] == slots[6] == store.get(0, 5) >= 0
+    assert slots[3] == store.get(0, 6) >= 0
+    assert list(slots[4:6]) == [-1, -1]
+    assert store.get(0, 7) == store.get(0, 8) == -1
+    assert store.stats()["evicted"] == 2 and store.stats()["dropped"] == 2
+    assert store["hits"][slots[2]] == 2 and store["hits"][slots[0]] == 2
+    assert store["confidence"][slots[3]] == pytest.approx(0.3)
+    assert store["counted"][store.live_slots()].all()
+
+
+def test_track_state_index_matches_dict():
+    ### INIT DATA
+    rng = np.random.default_rng(0)
+    store = TrackStateStore(capacity=512, ttl=20, sweep_interval=1)
+    reference = {}
+
+    ### EXECUTING BEHAVIOR
+    # churn through tombstones, rebuilds and vectorized probing
+    for now in range(300):
+        sources = rng.integers(0, 3, 40)
+        objects = rng.integers(now * 4, now * 4 + 100, 40)
+        store.update(sources, objects, now)
+        for key in zip(sources.tolist(), objects.tolist()):
+            reference[key] = now
+        reference = {k: seen for k, seen in reference.items() if seen >= now - 20}
+        if now % 50 == 0:
+            removed = list(reference)[:10]
+            store.remove([k[0] for k in removed], [k[1] for k in removed])
+            for key in removed:
+                del reference[key]
+
+    ### CHECKING RESULTS
+    assert len(store) == len(reference)
+    keys = list(reference)
+    slots = store.lookup([k[0] for k in keys], [k[1] for k in keys])
+    assert (slots >= 0).all() and len(set(slots.tolist())) == len(keys)
+    assert list(store["last_seen"][slots]) == [reference[k] for k in keys]
+    assert list(store["object_id"][slots]) == [k[1] for k in keys]